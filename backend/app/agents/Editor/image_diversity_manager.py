@@ -18,6 +18,8 @@ from ...utils.log.hybridlogging import HybridLogger
 from ...utils.isolation.session_isolation import SessionAwareMixin
 from ...utils.log.logging_manager import LoggingManager
 from ...utils.data.pdf_vector_manager import PDFVectorManager
+from ...utils.data.async_pdf_vector_manager import AsyncPDFVectorManager
+from ...utils.data.image_records import ImageStore
 from ...utils.isolation.ai_search_isolation import AISearchIsolationManager
 import onnxruntime as ort
 
@@ -35,6 +37,7 @@ class ImageDiversityManager(SessionAwareMixin):
         
         # ✅ 벡터 매니저 통합
         self.vector_manager = vector_manager
+        self.async_vector_manager = AsyncPDFVectorManager.from_sync(vector_manager)
         self.isolation_manager = AISearchIsolationManager()
         
         self.similarity_threshold = similarity_threshold
@@ -147,47 +150,51 @@ class ImageDiversityManager(SessionAwareMixin):
             
             self.logger.info(f"실제 섹션 수: {total_sections}개 (하위 섹션 포함)")
             
+            # ✅ 이미지 dict를 레코드 저장소로 변환 (이후 단계는 정수 id만 주고받음)
+            store = ImageStore.from_dicts(images)
+            image_ids = list(range(len(store)))
+            
             # 2. 강화된 중복 이미지 제거
-            unique_images = await self._enhanced_duplicate_removal(images)
+            unique_ids = await self._enhanced_duplicate_removal(store, image_ids)
             
             # ✅ 3. 이미지 부족 시 확장 처리
-            if len(unique_images) < total_sections:
-                expanded_images = self._expand_image_pool(unique_images, total_sections)
-                self.logger.info(f"이미지 풀 확장: {len(unique_images)} → {len(expanded_images)}개")
+            if len(unique_ids) < total_sections:
+                expanded_ids = self._expand_image_pool(store, unique_ids, total_sections)
+                self.logger.info(f"이미지 풀 확장: {len(unique_ids)} → {len(expanded_ids)}개")
             else:
-                expanded_images = unique_images
+                expanded_ids = unique_ids
             
             # 4. 이미지 품질 평가
-            quality_enhanced_images = await self._enhance_image_quality_scores(expanded_images)
+            await self._enhance_image_quality_scores(store, expanded_ids)
             
             # 5. 벡터 검색 기반 이미지 의미 패턴 수집
             if unified_patterns:
                 semantic_patterns = await self._collect_image_semantic_patterns(
-                    quality_enhanced_images, unified_patterns
+                    store, expanded_ids, unified_patterns
                 )
             else:
                 semantic_patterns = {}
             
             # 6. CLIP 기반 이미지 클러스터링 (가능한 경우)
-            if self.clip_available and len(quality_enhanced_images) > 5:
-                clustered_images = await self._cluster_images_with_clip_and_vectors(
-                    quality_enhanced_images, semantic_patterns
+            if self.clip_available and len(expanded_ids) > 5:
+                clustered_ids = await self._cluster_images_with_clip_and_vectors(
+                    store, expanded_ids, semantic_patterns
                 )
             else:
-                clustered_images = {"default_cluster": quality_enhanced_images}
+                clustered_ids = {"default_cluster": expanded_ids}
             
             # 7. 벡터 패턴 기반 대표 이미지 선택 (중복 방지 강화)
-            representative_images = self._select_representative_images_with_enhanced_deduplication(
-                clustered_images, semantic_patterns
+            representative_ids = self._select_representative_images_with_enhanced_deduplication(
+                store, clustered_ids
             )
             
             # ✅ 8. 모든 섹션에 균등 배치 보장
             allocation_plan = await self._allocate_images_to_all_sections(
-                representative_images, actual_sections, semantic_patterns
+                store, representative_ids, actual_sections, semantic_patterns
             )
             
             # 9. 결과 로깅
-            await self._log_diversity_optimization_results(allocation_plan, images, actual_sections)
+            await self._log_diversity_optimization_results(allocation_plan, images, actual_sections, store)
             
             self.logger.info(f"전체 섹션 이미지 배치 완료: {len(allocation_plan)}개 섹션에 할당")
             
@@ -242,17 +249,18 @@ class ImageDiversityManager(SessionAwareMixin):
         
         return actual_sections
 
-    async def _enhanced_duplicate_removal(self, images: List[Dict]) -> List[Dict]:
+    async def _enhanced_duplicate_removal(self, store: ImageStore, image_ids: List[int]) -> List[int]:
         """✅ 강화된 중복 제거 (URL + Hash + Content 기반)"""
-        unique_images = []
+        unique_ids = []
         seen_urls = set()
         seen_hashes = set()
         processed_content_hashes = set()
         
-        for image_data in images:
+        for image_id in image_ids:
+            record = store.get(image_id)
             try:
-                image_url = image_data.get("image_url", "")
-                image_name = image_data.get("image_name", "")
+                image_url = record.image_url
+                image_name = record.image_name
                 
                 if not image_url:
                     continue
@@ -271,7 +279,7 @@ class ImageDiversityManager(SessionAwareMixin):
                         continue
                     
                     # ✅ 3. 콘텐츠 기반 3차 중복 검사
-                    content_hash = self._generate_content_hash(image_data)
+                    content_hash = self._generate_content_hash(record)
                     if content_hash in processed_content_hashes:
                         self.logger.debug(f"콘텐츠 중복 제거: {image_name}")
                         continue
@@ -282,35 +290,35 @@ class ImageDiversityManager(SessionAwareMixin):
                     processed_content_hashes.add(content_hash)
                     self.processed_hashes.add(image_hash)
                     
-                    image_data["perceptual_hash"] = image_hash
-                    image_data["content_hash"] = content_hash
-                    unique_images.append(image_data)
+                    record.perceptual_hash = image_hash
+                    record.content_hash = content_hash
+                    unique_ids.append(image_id)
                     
                     self.logger.debug(f"고유 이미지 추가: {image_name}")
                 else:
                     # 해시 계산 실패 시 URL만으로 중복 검사
                     seen_urls.add(image_url)
-                    unique_images.append(image_data)
+                    unique_ids.append(image_id)
                     
             except Exception as e:
-                self.logger.error(f"강화된 중복 검사 실패 {image_data.get('image_name', 'Unknown')}: {e}")
+                self.logger.error(f"강화된 중복 검사 실패 {record.image_name or 'Unknown'}: {e}")
                 # 오류 발생 시에도 이미지 포함 (안전장치)
-                if image_data not in unique_images:
-                    unique_images.append(image_data)
+                if image_id not in unique_ids:
+                    unique_ids.append(image_id)
         
-        self.logger.info(f"강화된 중복 제거 완료: {len(images)} → {len(unique_images)}개")
-        return unique_images
+        self.logger.info(f"강화된 중복 제거 완료: {len(image_ids)} → {len(unique_ids)}개")
+        return unique_ids
 
-    def _generate_content_hash(self, image_data: Dict) -> str:
+    def _generate_content_hash(self, record) -> str:
         """이미지 메타데이터 기반 콘텐츠 해시 생성"""
         try:
             # 이미지의 주요 메타데이터를 조합하여 해시 생성
             content_parts = [
-                image_data.get("city", ""),
-                image_data.get("country", ""),
-                image_data.get("location", ""),
-                str(image_data.get("width", 0)),
-                str(image_data.get("height", 0))
+                record.city or "",
+                record.country or "",
+                record.location or "",
+                str(record.width or 0),
+                str(record.height or 0)
             ]
             
             content_string = "|".join(content_parts)
@@ -322,33 +330,29 @@ class ImageDiversityManager(SessionAwareMixin):
             self.logger.error(f"콘텐츠 해시 생성 실패: {e}")
             return ""
 
-    def _expand_image_pool(self, unique_images: List[Dict], required_count: int) -> List[Dict]:
+    def _expand_image_pool(self, store: ImageStore, unique_ids: List[int], required_count: int) -> List[int]:
         """✅ 이미지 부족 시 이미지 풀 확장"""
-        if len(unique_images) >= required_count:
-            return unique_images
+        if len(unique_ids) >= required_count or not unique_ids:
+            return unique_ids
         
-        expanded_images = unique_images.copy()
+        expanded_ids = list(unique_ids)
         
         # 기존 이미지를 순환하여 필요한 수만큼 확장
-        while len(expanded_images) < required_count:
-            for img in unique_images:
-                if len(expanded_images) >= required_count:
+        while len(expanded_ids) < required_count:
+            for original_index, image_id in enumerate(unique_ids):
+                if len(expanded_ids) >= required_count:
                     break
                 
-                # 이미지 복사본 생성 (URL은 유지, 메타데이터 약간 변경)
-                expanded_img = img.copy()
-                expanded_img["expanded_copy"] = True
-                expanded_img["original_index"] = unique_images.index(img)
-                
-                expanded_images.append(expanded_img)
+                # 복사본 레코드 생성 (URL/메타데이터는 원본과 공유)
+                expanded_ids.append(store.add_copy(image_id, original_index=original_index))
         
-        return expanded_images
+        return expanded_ids
 
-    async def _allocate_images_to_all_sections(self, images: List[Dict], 
+    async def _allocate_images_to_all_sections(self, store: ImageStore, image_ids: List[int], 
                                              actual_sections: List[Dict], 
                                              semantic_patterns: Dict) -> Dict:
         """✅ 모든 섹션에 이미지 배치 보장"""
-        total_images = len(images)
+        total_images = len(image_ids)
         total_sections = len(actual_sections)
         
         if total_sections == 0:
@@ -369,17 +373,19 @@ class ImageDiversityManager(SessionAwareMixin):
             
             # 이미지 할당
             end_index = min(current_image_index + allocation_count, total_images)
-            allocated_images = images[current_image_index:end_index]
+            allocated_ids = image_ids[current_image_index:end_index]
             
             # 이미지가 부족한 경우 첫 번째 이미지로 채우기
-            while len(allocated_images) < 1 and images:
-                allocated_images.append(images[0])
+            if not allocated_ids and image_ids:
+                allocated_ids = [image_ids[0]]
             
             section_key = f"section_{section['section_index']}"
             
+            # ✅ 하위 에이전트 경계에서만 dict로 변환
             allocation_plan[section_key] = {
-                "images": allocated_images,
-                "count": len(allocated_images),
+                "images": store.to_dicts(allocated_ids),
+                "image_ids": list(allocated_ids),
+                "count": len(allocated_ids),
                 "section_title": section["title"],
                 "diversity_score": 0.7,  # 기본 다양성 점수
                 "avg_quality": 0.75,
@@ -390,7 +396,7 @@ class ImageDiversityManager(SessionAwareMixin):
             
             current_image_index = end_index
             
-            self.logger.info(f"섹션 {section_key} 이미지 할당: {len(allocated_images)}개")
+            self.logger.info(f"섹션 {section_key} 이미지 할당: {len(allocated_ids)}개")
         
         return allocation_plan
 
@@ -597,13 +603,17 @@ class ImageDiversityManager(SessionAwareMixin):
             self.logger.error(f"유사도 검사 실패: {e}")
             return False
 
-    async def _enhance_image_quality_scores(self, images: List[Dict]) -> List[Dict]:
-        """✅ 이미지 품질 점수 향상 (접근 실패 시에도 처리)"""
-        enhanced_images = []
-        
-        for image_data in images:
+    async def _enhance_image_quality_scores(self, store: ImageStore, image_ids: List[int]) -> None:
+        """✅ 이미지 품질 점수 향상 (접근 실패 시에도 처리, 점수는 저장소 열 배열에 기록)"""
+        for image_id in image_ids:
             try:
-                image_url = image_data.get("image_url", "")
+                root_id = store.root_id(image_id)
+                # 확장 복사본은 원본 점수 재사용 (동일 URL 재다운로드 방지)
+                if root_id != image_id and store.has_quality[root_id]:
+                    store.set_quality(image_id, store.quality_dict(root_id))
+                    continue
+                
+                image_url = store.get(image_id).image_url
                 
                 if image_url:
                     # ✅ 접근 가능 여부와 관계없이 기본 품질 점수 부여
@@ -620,22 +630,14 @@ class ImageDiversityManager(SessionAwareMixin):
                             "note": "Default score due to access failure"
                         }
                     
-                    image_data["quality_scores"] = quality_scores
-                    image_data["overall_quality"] = quality_scores.get("overall", 0.6)
+                    store.set_quality(image_id, quality_scores)
                 else:
-                    image_data["quality_scores"] = {"overall": 0.4}
-                    image_data["overall_quality"] = 0.4
-                
-                enhanced_images.append(image_data)
+                    store.set_quality(image_id, {"overall": 0.4})
                 
             except Exception as e:
                 self.logger.error(f"품질 점수 계산 실패: {e}")
                 # ✅ 실패해도 이미지 포함 (배치 보장)
-                image_data["quality_scores"] = {"overall": 0.4}
-                image_data["overall_quality"] = 0.4
-                enhanced_images.append(image_data)
-        
-        return enhanced_images
+                store.set_quality(image_id, {"overall": 0.4})
 
     async def _assess_image_quality_async(self, image_url: str) -> Dict[str, float]:
         """✅ 블롭 스토리지 지원 비동기 이미지 품질 평가"""
@@ -723,16 +725,17 @@ class ImageDiversityManager(SessionAwareMixin):
             }
 
     # ✅ 벡터 패턴 관련 메서드들
-    async def _collect_image_semantic_patterns(self, images: List[Dict], 
+    async def _collect_image_semantic_patterns(self, store: ImageStore, image_ids: List[int], 
                                              unified_patterns: Dict) -> Dict:
         """✅ 벡터 검색 기반 이미지 의미 패턴 수집"""
         try:
             image_patterns = {}
             
-            for i, image_data in enumerate(images):
+            for i, image_id in enumerate(image_ids):
+                record = store.get(image_id)
                 # 이미지 설명 기반 쿼리 생성
-                description = image_data.get("description", "")
-                location = image_data.get("city", "") + " " + image_data.get("country", "")
+                description = record.description or ""
+                location = (record.city or "") + " " + (record.country or "")
                 query = f"image {description} {location}".strip()
                 
                 if not query or query == "image":
@@ -740,11 +743,14 @@ class ImageDiversityManager(SessionAwareMixin):
                 
                 # 3개 벡터 인덱스에서 검색
                 patterns = await self._search_cross_index_patterns(query)
+                semantic_score = self._calculate_pattern_relevance(patterns)
+                store.set_semantic_score(image_id, semantic_score)
                 
                 image_patterns[f"image_{i}"] = {
+                    "image_id": image_id,
                     "query": query,
                     "patterns": patterns,
-                    "semantic_score": self._calculate_pattern_relevance(patterns)
+                    "semantic_score": semantic_score
                 }
             
             return image_patterns
@@ -783,11 +789,8 @@ class ImageDiversityManager(SessionAwareMixin):
     async def _search_magazine_patterns(self, query: str) -> List[Dict]:
         """매거진 벡터 인덱스 검색"""
         try:
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    query, "magazine-vector-index", top_k=3
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                query, "magazine-vector-index", top_k=3
             )
             return self.isolation_manager.filter_contaminated_data(
                 results, f"magazine_patterns_{hash(query)}"
@@ -799,11 +802,8 @@ class ImageDiversityManager(SessionAwareMixin):
     async def _search_jsx_patterns(self, query: str) -> List[Dict]:
         """JSX 컴포넌트 벡터 인덱스 검색"""
         try:
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    query, "jsx-component-vector-index", top_k=3
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                query, "jsx-component-vector-index", top_k=3
             )
             return self.isolation_manager.filter_contaminated_data(
                 results, f"jsx_patterns_{hash(query)}"
@@ -815,11 +815,8 @@ class ImageDiversityManager(SessionAwareMixin):
     async def _search_semantic_patterns(self, query: str) -> List[Dict]:
         """텍스트 의미 벡터 인덱스 검색"""
         try:
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    query, "text-semantic-patterns-index", top_k=3
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                query, "text-semantic-patterns-index", top_k=3
             )
             return self.isolation_manager.filter_contaminated_data(
                 results, f"semantic_patterns_{hash(query)}"
@@ -852,31 +849,31 @@ class ImageDiversityManager(SessionAwareMixin):
         return relevance_score
 
     # ✅ CLIP 관련 메서드들
-    async def _cluster_images_with_clip_and_vectors(self, images: List[Dict], 
-                                                   semantic_patterns: Dict) -> Dict[str, List[Dict]]:
+    async def _cluster_images_with_clip_and_vectors(self, store: ImageStore, image_ids: List[int], 
+                                                   semantic_patterns: Dict) -> Dict[str, List[int]]:
         """✅ CLIP + 벡터 패턴 기반 이미지 클러스터링"""
-        if not self.clip_available or len(images) < 3:
-            return {"default_cluster": images}
+        if not self.clip_available or len(image_ids) < 3:
+            return {"default_cluster": image_ids}
         
         try:
-            self.logger.info(f"CLIP + 벡터 기반 클러스터링 시작: {len(images)}개 이미지")
+            self.logger.info(f"CLIP + 벡터 기반 클러스터링 시작: {len(image_ids)}개 이미지")
             
-            # CLIP 임베딩 생성
-            clip_embeddings = await self._generate_clip_embeddings(images)
+            # CLIP 임베딩 생성 (저장소 임베딩 열에 기록)
+            clip_embeddings = await self._generate_clip_embeddings(store, image_ids)
             
             if clip_embeddings is None or len(clip_embeddings) == 0:
-                return {"default_cluster": images}
+                return {"default_cluster": image_ids}
             
             # 벡터 패턴 점수를 CLIP 임베딩에 통합
             enhanced_embeddings = self._enhance_embeddings_with_vector_patterns(
-                clip_embeddings, images, semantic_patterns
+                clip_embeddings, store, image_ids
             )
             
             # DBSCAN 클러스터링 수행
             clustering = DBSCAN(eps=0.7, min_samples=1, metric='cosine', algorithm='brute')
             cluster_labels = clustering.fit_predict(enhanced_embeddings)
             
-            # 클러스터별 이미지 그룹화
+            # 클러스터별 이미지 id 그룹화
             clusters = {}
             for i, label in enumerate(cluster_labels):
                 cluster_key = f"cluster_{label}" if label != -1 else "outliers"
@@ -884,50 +881,43 @@ class ImageDiversityManager(SessionAwareMixin):
                 if cluster_key not in clusters:
                     clusters[cluster_key] = []
                 
-                clusters[cluster_key].append(images[i])
+                clusters[cluster_key].append(image_ids[i])
             
             self.logger.info(f"벡터 강화 클러스터링 완료: {len(clusters)}개 클러스터")
             return clusters
             
         except Exception as e:
             self.logger.error(f"벡터 강화 클러스터링 실패: {e}")
-            return {"default_cluster": images}
+            return {"default_cluster": image_ids}
 
     def _enhance_embeddings_with_vector_patterns(self, clip_embeddings: np.ndarray, 
-                                                images: List[Dict], 
-                                                semantic_patterns: Dict) -> np.ndarray:
-        """CLIP 임베딩에 벡터 패턴 정보 통합"""
-        enhanced_embeddings = clip_embeddings.copy()
+                                                store: ImageStore, 
+                                                image_ids: List[int]) -> np.ndarray:
+        """CLIP 임베딩에 벡터 패턴 정보 통합 (벡터화 연산)"""
+        # 패턴 점수를 임베딩에 가중치로 적용 (최대 10% 가중치)
+        pattern_scores = store.semantic_scores[np.asarray(image_ids, dtype=np.int64)]
+        weight_factors = 1.0 + (pattern_scores * 0.1)
+        enhanced_embeddings = clip_embeddings * weight_factors[:, np.newaxis]
         
-        for i, image_data in enumerate(images):
-            pattern_key = f"image_{i}"
-            if pattern_key in semantic_patterns:
-                pattern_score = semantic_patterns[pattern_key].get("semantic_score", 0.0)
-                
-                # 패턴 점수를 임베딩에 가중치로 적용
-                weight_factor = 1.0 + (pattern_score * 0.1)  # 최대 10% 가중치
-                enhanced_embeddings[i] = enhanced_embeddings[i] * weight_factor
-                
-                # 정규화
-                norm = np.linalg.norm(enhanced_embeddings[i])
-                if norm > 0:
-                    enhanced_embeddings[i] = enhanced_embeddings[i] / norm
-        
-        return enhanced_embeddings
+        # 정규화
+        norms = np.linalg.norm(enhanced_embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return enhanced_embeddings / norms
 
-    async def _generate_clip_embeddings(self, images: List[Dict]) -> Optional[np.ndarray]:
+    async def _generate_clip_embeddings(self, store: ImageStore, image_ids: List[int]) -> Optional[np.ndarray]:
         """✅ 블롭 스토리지 지원 CLIP 임베딩 생성"""
         try:
             if not self.clip_available or not self.onnx_session:
                 return None
-                
-            embeddings = []
             
-            for image_data in images:
-                image_url = image_data.get("image_url", "")
+            for image_id in image_ids:
+                if store.has_embedding[image_id]:
+                    continue
+                
+                image_url = store.get(image_id).image_url
                 
                 if image_url in self.image_embeddings_cache:
-                    embeddings.append(self.image_embeddings_cache[image_url])
+                    store.set_embedding(image_id, self.image_embeddings_cache[image_url])
                     continue
                 
                 try:
@@ -968,72 +958,65 @@ class ImageDiversityManager(SessionAwareMixin):
                         normalized_embedding = embedding / norm if norm != 0 else embedding
                         
                         self.image_embeddings_cache[image_url] = normalized_embedding
-                        embeddings.append(normalized_embedding)
-                    else:
-                        # 이미지 로드 실패 시 기본 임베딩
-                        embeddings.append(np.zeros(512))
+                        store.set_embedding(image_id, normalized_embedding)
+                    # 이미지 로드 실패 시 기본(0) 임베딩 행 유지
                         
                 except Exception as e:
                     self.logger.error(f"블롭 기반 임베딩 생성 실패 {image_url}: {e}")
-                    embeddings.append(np.zeros(512))
             
-            return np.array(embeddings) if embeddings else None
+            return store.embedding_matrix(image_ids) if image_ids else None
             
         except Exception as e:
             self.logger.error(f"CLIP 임베딩 생성 전체 실패: {e}")
             return None
 
-    def _select_representative_images_with_enhanced_deduplication(self, clusters: Dict[str, List[Dict]], 
-                                                               semantic_patterns: Dict) -> List[Dict]:
+    def _select_representative_images_with_enhanced_deduplication(self, store: ImageStore, 
+                                                               clusters: Dict[str, List[int]]) -> List[int]:
         """✅ 강화된 중복 방지 대표 이미지 선택"""
-        representative_images = []
+        representative_ids = []
         global_seen_hashes = set()
         global_seen_urls = set()
         global_seen_content = set()
         
-        for cluster_name, cluster_images in clusters.items():
-            scored_images = []
-            
-            for img in cluster_images:
-                img_hash = img.get("perceptual_hash", "")
-                img_url = img.get("image_url", "")
-                content_hash = img.get("content_hash", "")
-                quality = img.get("overall_quality", 0.5)
-                
-                # ✅ 전역 중복 검사
-                if (img_hash and img_hash in global_seen_hashes) or \
-                   (img_url and img_url in global_seen_urls) or \
-                   (content_hash and content_hash in global_seen_content):
+        for cluster_name, cluster_ids in clusters.items():
+            if not cluster_ids:
+                continue
+            
+            # 종합 점수 계산 (품질 60% + 벡터 패턴 40%) - 열 배열 벡터 연산
+            id_array = np.asarray(cluster_ids, dtype=np.int64)
+            quality = np.where(store.has_quality[id_array], store.quality[id_array, 0], 0.5)
+            combined_scores = (quality * 0.6) + (store.semantic_scores[id_array] * 0.4)
+            
+            # ✅ 전역 중복 검사 (이전 클러스터에서 선택된 이미지 기준, 같은 클러스터 안에서는 검사하지 않음)
+            candidate_positions = []
+            for position, image_id in enumerate(cluster_ids):
+                record = store.get(image_id)
+                if (record.perceptual_hash and record.perceptual_hash in global_seen_hashes) or \
+                   (record.image_url and record.image_url in global_seen_urls) or \
+                   (record.content_hash and record.content_hash in global_seen_content):
                     continue
-                
-                # 벡터 패턴 점수 추가
-                image_index = cluster_images.index(img)
-                pattern_key = f"image_{image_index}"
-                vector_score = semantic_patterns.get(pattern_key, {}).get("semantic_score", 0.0)
-                
-                # 종합 점수 계산
-                combined_score = (quality * 0.6) + (vector_score * 0.4)
-                
-                scored_images.append((img, combined_score, img_hash, img_url, content_hash))
+                candidate_positions.append(position)
             
-            # 점수순으로 정렬
-            scored_images.sort(key=lambda x: x[1], reverse=True)
+            # 점수순으로 정렬 (동점이면 기존 순서 유지)
+            candidate_positions.sort(key=lambda position: -combined_scores[position])
             
             # 상위 이미지들 선택 (전역 중복 제거)
-            for img, score, img_hash, img_url, content_hash in scored_images:
-                if score >= 0.3:
-                    representative_images.append(img)
+            for position in candidate_positions:
+                if combined_scores[position] >= 0.3:
+                    image_id = cluster_ids[position]
+                    record = store.get(image_id)
+                    representative_ids.append(image_id)
                     
                     # 전역 중복 방지 세트에 추가
-                    if img_hash:
-                        global_seen_hashes.add(img_hash)
-                    if img_url:
-                        global_seen_urls.add(img_url)
-                    if content_hash:
-                        global_seen_content.add(content_hash)
+                    if record.perceptual_hash:
+                        global_seen_hashes.add(record.perceptual_hash)
+                    if record.image_url:
+                        global_seen_urls.add(record.image_url)
+                    if record.content_hash:
+                        global_seen_content.add(record.content_hash)
         
-        self.logger.info(f"강화된 중복 방지 대표 이미지 선택 완료: {len(representative_images)}개")
-        return representative_images
+        self.logger.info(f"강화된 중복 방지 대표 이미지 선택 완료: {len(representative_ids)}개")
+        return representative_ids
 
     def _ensure_all_sections_have_images(self, images: List[Dict], sections: List[Dict]) -> Dict:
         """✅ 모든 섹션에 이미지 배치 보장 (기본 방식)"""
@@ -1068,7 +1051,8 @@ class ImageDiversityManager(SessionAwareMixin):
 
     async def _log_diversity_optimization_results(self, allocation_plan: Dict, 
                                                 original_images: List[Dict], 
-                                                sections: List[Dict]) -> None:
+                                                sections: List[Dict],
+                                                store: Optional[ImageStore] = None) -> None:
         """다양성 최적화 결과 로깅"""
         try:
             total_allocated = sum(data["count"] for data in allocation_plan.values())
@@ -1091,7 +1075,16 @@ class ImageDiversityManager(SessionAwareMixin):
                 "clip_used": self.clip_available,
                 "vector_enhanced": True,
                 "optimization_timestamp": time.time(),
-                "allocation_details": allocation_plan
+                # ✅ 전체 이미지 dict 대신 경량 요약만 로깅/저장
+                "allocation_details": {
+                    section_key: {
+                        "section_title": data.get("section_title", ""),
+                        "count": data["count"],
+                        "images": store.summary(data["image_ids"]) if store and "image_ids" in data
+                        else [img.get("image_name", "") for img in data.get("images", [])]
+                    }
+                    for section_key, data in allocation_plan.items()
+                }
             }
             
             await self.logging_manager.log_agent_response(
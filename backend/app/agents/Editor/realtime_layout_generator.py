@@ -1,19 +1,38 @@
-import asyncio
 import numpy as np
 import time
 import json
 from typing import Dict, List, Any, Optional, Tuple
 from ...utils.data.pdf_vector_manager import PDFVectorManager
+from ...utils.data.async_pdf_vector_manager import AsyncPDFVectorManager
+from ...utils.data.layout_lookup_table import get_layout_lookup_table, make_lookup_key
 from ...utils.isolation.ai_search_isolation import AISearchIsolationManager
 from ...utils.isolation.session_isolation import SessionAwareMixin
 from ...utils.log.logging_manager import LoggingManager
 
+# (쿼리 종류, 인덱스, top_k) - _search_*_patterns 메서드와 동일한 설정
+LAYOUT_QUERY_TARGETS = (
+    ("template", "jsx-component-vector-index", 5),
+    ("placement", "magazine-vector-index", 5),
+    ("balance", "text-semantic-patterns-index", 5),
+    ("responsive", "jsx-component-vector-index", 3),
+)
+
+# 제목 감정 키워드 (감정적 포커스 결정 및 조회 테이블 스타일 키)
+EMOTIONAL_KEYWORDS = {
+    "excitement": ["모험", "흥미", "신나는", "역동"],
+    "calm": ["평온", "고요", "차분", "휴식"],
+    "elegance": ["우아", "세련", "고급", "품격"],
+    "energy": ["활기", "생동", "열정", "에너지"]
+}
+
+
 class RealtimeLayoutGenerator(SessionAwareMixin):
     """실시간 레이아웃 생성기 - AI Search 벡터 패턴 기반 고급 레이아웃 전략 수립"""
     
     def __init__(self, vector_manager: PDFVectorManager, logger: Any):
         super().__init__()
         self.vector_manager = vector_manager
+        self.async_vector_manager = AsyncPDFVectorManager.from_sync(vector_manager)
         self.logger = logger
         self.isolation_manager = AISearchIsolationManager()
         self.logging_manager = LoggingManager(self.logger)
@@ -33,8 +52,8 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
         self.__init_session_awareness__()
         self.logger.info("✅ RealtimeLayoutGenerator 초기화 완료")
 
-    async def generate_layout_strategy_for_section(self, section_data: Dict) -> Dict:
-        """✅ 섹션별 레이아웃 전략 생성 (AI Search 벡터 패턴 기반)"""
+    async def generate_layout_strategy_for_section(self, section_data: Dict, use_lookup_table: bool = True) -> Dict:
+        """✅ 섹션별 레이아웃 전략 생성 (사전 계산 테이블 우선, 없으면 AI Search 벡터 패턴 기반)"""
         
         try:
             section_id = section_data.get("section_id", "unknown")
@@ -42,6 +61,17 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
             content = section_data.get("content", "")
             images = section_data.get("images", [])
             
+            # 0. 사전 계산된 조합이면 검색 없이 테이블 전략 사용
+            if use_lookup_table:
+                lookup_key = self.strategy_lookup_key(section_data)
+                lookup_table = get_layout_lookup_table()
+                strategy = lookup_table.get_strategy(lookup_key)
+                if strategy is not None:
+                    strategy["section_title"] = title
+                    strategy["lookup_table"] = {"key": lookup_key, "version": lookup_table.version}
+                    self.logger.info(f"레이아웃 전략 테이블 조회: {title} → {strategy.get('layout_type', 'unknown')} ({lookup_key})")
+                    return strategy
+            
             self.logger.info(f"레이아웃 전략 생성 시작: {title} (이미지: {len(images)}개)")
             
             # 1. 콘텐츠 특성 분석
@@ -129,25 +159,19 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
         """✅ AI Search 벡터 패턴 수집 (레이아웃 특화)"""
         
         try:
-            title = section_data.get("title", "")
-            content = section_data.get("content", "")[:200]  # 처음 200자만
-            image_count = len(section_data.get("images", []))
+            queries = self._build_layout_queries(section_data)
             
             # 1. 템플릿 레이아웃 패턴 검색
-            template_query = f"magazine template layout {title} images:{image_count}"
-            template_patterns = await self._search_template_layout_patterns(template_query)
+            template_patterns = await self._search_template_layout_patterns(queries["template"])
             
             # 2. 콘텐츠 배치 패턴 검색
-            placement_query = f"content placement text image balance {content}"
-            placement_patterns = await self._search_content_placement_patterns(placement_query)
+            placement_patterns = await self._search_content_placement_patterns(queries["placement"])
             
             # 3. 시각적 균형 패턴 검색
-            balance_query = f"visual balance design layout hierarchy {title}"
-            balance_patterns = await self._search_visual_balance_patterns(balance_query)
+            balance_patterns = await self._search_visual_balance_patterns(queries["balance"])
             
             # 4. 반응형 디자인 패턴 검색
-            responsive_query = f"responsive design mobile tablet desktop layout"
-            responsive_patterns = await self._search_responsive_design_patterns(responsive_query)
+            responsive_patterns = await self._search_responsive_design_patterns(queries["responsive"])
             
             vector_patterns = {
                 "template_patterns": template_patterns,
@@ -165,15 +189,44 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
             self.logger.error(f"벡터 패턴 수집 실패: {e}")
             return {"template_patterns": [], "placement_patterns": [], "balance_patterns": [], "responsive_patterns": []}
 
+    def _build_layout_queries(self, section_data: Dict) -> Dict[str, str]:
+        """섹션별 레이아웃 패턴 검색 쿼리 생성"""
+        title = section_data.get("title", "")
+        content = section_data.get("content", "")[:200]  # 처음 200자만
+        image_count = len(section_data.get("images", []))
+
+        return {
+            "template": f"magazine template layout {title} images:{image_count}",
+            "placement": f"content placement text image balance {content}",
+            "balance": f"visual balance design layout hierarchy {title}",
+            "responsive": "responsive design mobile tablet desktop layout",
+        }
+
+    def strategy_lookup_key(self, section_data: Dict) -> str:
+        """사전 계산 테이블 키: (레이아웃 선호도, 이미지 수, 본문 길이 구간, 제목 감정 스타일)"""
+        content_length = len(section_data.get("content", ""))
+        image_count = len(section_data.get("images", []))
+        style = self._emotion_from_title(section_data.get("title", "")) or "balanced"
+        return make_lookup_key(self._suggest_layout_preference(content_length, image_count),
+                               image_count, content_length, style)
+
+    def plan_vector_searches(self, section_data: Dict) -> List[Tuple]:
+        """generate_layout_strategy_for_section이 실행할 벡터 검색 요청 목록 (섹션 간 검색 계획용)"""
+        if get_layout_lookup_table().has_strategy(self.strategy_lookup_key(section_data)):
+            # 테이블로 처리되는 섹션은 검색하지 않음
+            return []
+        queries = self._build_layout_queries(section_data)
+        return [
+            (index_name, self.isolation_manager.clean_query_from_azure_keywords(queries[name]), top_k, None)
+            for name, index_name, top_k in LAYOUT_QUERY_TARGETS
+        ]
+
     async def _search_template_layout_patterns(self, query: str) -> List[Dict]:
         """템플릿 레이아웃 패턴 검색"""
         try:
             clean_query = self.isolation_manager.clean_query_from_azure_keywords(query)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    clean_query, "jsx-component-vector-index", top_k=5
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                clean_query, "jsx-component-vector-index", top_k=5
             )
             return self.isolation_manager.filter_contaminated_data(results, f"template_patterns_{hash(query)}")
         except Exception as e:
@@ -184,11 +237,8 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
         """콘텐츠 배치 패턴 검색"""
         try:
             clean_query = self.isolation_manager.clean_query_from_azure_keywords(query)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    clean_query, "magazine-vector-index", top_k=5
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                clean_query, "magazine-vector-index", top_k=5
             )
             return self.isolation_manager.filter_contaminated_data(results, f"placement_patterns_{hash(query)}")
         except Exception as e:
@@ -199,11 +249,8 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
         """시각적 균형 패턴 검색"""
         try:
             clean_query = self.isolation_manager.clean_query_from_azure_keywords(query)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    clean_query, "text-semantic-patterns-index", top_k=5
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                clean_query, "text-semantic-patterns-index", top_k=5
             )
             return self.isolation_manager.filter_contaminated_data(results, f"balance_patterns_{hash(query)}")
         except Exception as e:
@@ -214,11 +261,8 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
         """반응형 디자인 패턴 검색"""
         try:
             clean_query = self.isolation_manager.clean_query_from_azure_keywords(query)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    clean_query, "jsx-component-vector-index", top_k=3
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                clean_query, "jsx-component-vector-index", top_k=3
             )
             return self.isolation_manager.filter_contaminated_data(results, f"responsive_patterns_{hash(query)}")
         except Exception as e:
@@ -553,19 +597,9 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
                                                template_patterns: List[Dict]) -> str:
         """패턴 기반 감정적 포커스 결정"""
         
-        title = section_data.get("title", "").lower()
-        
-        # 제목에서 감정 키워드 추출
-        emotional_keywords = {
-            "excitement": ["모험", "흥미", "신나는", "역동"],
-            "calm": ["평온", "고요", "차분", "휴식"],
-            "elegance": ["우아", "세련", "고급", "품격"],
-            "energy": ["활기", "생동", "열정", "에너지"]
-        }
-        
-        for emotion, keywords in emotional_keywords.items():
-            if any(keyword in title for keyword in keywords):
-                return emotion
+        emotion = self._emotion_from_title(section_data.get("title", ""))
+        if emotion:
+            return emotion
         
         # 패턴에서 스타일 힌트 추출
         for pattern in template_patterns[:3]:
@@ -577,6 +611,14 @@ class RealtimeLayoutGenerator(SessionAwareMixin):
         
         return "balanced"
 
+    def _emotion_from_title(self, title: str) -> Optional[str]:
+        """제목의 감정 키워드 → 감정 스타일 (없으면 None)"""
+        title = title.lower()
+        for emotion, keywords in EMOTIONAL_KEYWORDS.items():
+            if any(keyword in title for keyword in keywords):
+                return emotion
+        return None
+
     def _extract_key_features_from_patterns(self, template_patterns: List[Dict]) -> List[str]:
         """패턴에서 주요 특징 추출"""
         features = []
@@ -1,11 +1,10 @@
-import asyncio
 import json
 import re
 import numpy as np
 import os
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from crewai import Agent, Task, Crew
+from typing import Dict, List, Any
+from crewai import Agent
 from ...custom_llm import get_azure_llm
 from .semantic_analysis_engine import SemanticAnalysisEngine
 from .image_diversity_manager import ImageDiversityManager
@@ -14,19 +13,23 @@ from ..jsx.template_selector import SectionStyleAnalyzer
 from ..jsx.unified_jsx_generator import UnifiedJSXGenerator
 from ...utils.isolation.ai_search_isolation import AISearchIsolationManager
 from ...utils.data.pdf_vector_manager import PDFVectorManager
+from ...utils.data.async_pdf_vector_manager import AsyncPDFVectorManager
+from ...utils.data.search_query_planner import SearchQueryPlanner, get_active_search_plan, search_plan_scope
 from ...utils.isolation.session_isolation import SessionAwareMixin
 from ...utils.isolation.agent_communication_isolation import InterAgentCommunicationMixin
 from ...utils.log.logging_manager import LoggingManager
+from ...utils.data.llm_structured_output import ContentStructureAnalysis, agent_system_message
 from ...db.magazine_db_utils import MagazineDBUtils
 
 class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
     """통합 멀티모달 에이전트 - RealtimeLayoutGenerator 완전 통합 + 하이브리드 방식"""
     
     def __init__(self, vector_manager: PDFVectorManager, logger: Any):
-        self.llm = get_azure_llm()
+        self.llm = get_azure_llm(self.__class__.__name__)
         self.logger = logger
         self.isolation_manager = AISearchIsolationManager()
         self.vector_manager = vector_manager
+        self.async_vector_manager = AsyncPDFVectorManager.from_sync(vector_manager)
         
         # ✅ CLIP 세션 공유를 위한 초기화
         self._initialize_shared_clip_session()
@@ -143,55 +146,59 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
                     image_analysis.extend(existing_images)
                     self.current_image_analysis = image_analysis
             
-            # 1. 의미 분석 (공유 CLIP 세션 사용)
-            self.logger.info("1단계: 공유 CLIP 기반 의미 분석 실행")
-            texts_for_analysis = self._extract_texts_from_sections(magazine_content.get('sections', []))
-            similarity_data = await self.semantic_engine.calculate_semantic_similarity(
-                texts_for_analysis, image_analysis
-            )
+            # 섹션 간 벡터 검색 계획 (2단계 이후 모든 컴포넌트의 검색이 계획 결과를 우선 사용)
+            search_planner = SearchQueryPlanner(self.async_vector_manager)
+            with search_plan_scope(search_planner):
+                # 1. 의미 분석 (공유 CLIP 세션 사용)
+                self.logger.info("1단계: 공유 CLIP 기반 의미 분석 실행")
+                texts_for_analysis = self._extract_texts_from_sections(magazine_content.get('sections', []))
+                similarity_data = await self.semantic_engine.calculate_semantic_similarity(
+                    texts_for_analysis, image_analysis
+                )
             
-            # 2. 통합 벡터 패턴 수집
-            self.logger.info("2단계: 통합 벡터 패턴 수집")
-            unified_patterns = await self._collect_unified_vector_patterns(
-                magazine_content, image_analysis
-            )
+                # 2. 통합 벡터 패턴 수집
+                self.logger.info("2단계: 통합 벡터 패턴 수집")
+                unified_patterns = await self._collect_unified_vector_patterns(
+                    magazine_content, image_analysis
+                )
             
-            # ✅ 3. 이미지 다양성 최적화 및 섹션별 할당
-            self.logger.info("3단계: 이미지 다양성 최적화 및 섹션별 할당")
-            optimization_result = await self._execute_image_allocation(
-                image_analysis, magazine_content.get('sections', []), unified_patterns
-            )
-            self.image_allocation_result = optimization_result
+                # ✅ 3. 이미지 다양성 최적화 및 섹션별 할당
+                self.logger.info("3단계: 이미지 다양성 최적화 및 섹션별 할당")
+                optimization_result = await self._execute_image_allocation(
+                    image_analysis, magazine_content.get('sections', []), unified_patterns
+                )
+                self.image_allocation_result = optimization_result
             
-            # 4. 요약 없는 CrewAI 분석
-            self.logger.info("4단계: 요약 없는 CrewAI 구조 분석")
-            structured_content = await self._execute_crew_analysis_without_summary(
-                magazine_content, image_analysis, similarity_data, unified_patterns, user_id
-            )
+                # 4. 요약 없는 CrewAI 분석
+                self.logger.info("4단계: 요약 없는 CrewAI 구조 분석")
+                structured_content = await self._execute_crew_analysis_without_summary(
+                    magazine_content, image_analysis, similarity_data, unified_patterns, user_id
+                )
             
-            # ✅ 5. RealtimeLayoutGenerator 기반 향상된 JSX 생성
-            self.logger.info("5단계: RealtimeLayoutGenerator 통합 JSX 생성")
-            final_sections = await self._process_sections_with_enhanced_layouts(
-                structured_content, unified_patterns, optimization_result
-            )
+                # ✅ 5. RealtimeLayoutGenerator 기반 향상된 JSX 생성
+                self.logger.info("5단계: RealtimeLayoutGenerator 통합 JSX 생성")
+                final_sections = await self._process_sections_with_enhanced_layouts(
+                    structured_content, unified_patterns, optimization_result
+                )
             
-            # 6. 최종 결과 구성
-            result = {
-                "content_sections": final_sections,
-                "processing_metadata": {
-                    "unified_processing": True,
-                    "crew_ai_enhanced": True,
-                    "structured_processing": True,
-                    "layout_generator_enhanced": True,
-                    "total_sections": len(final_sections),
-                    "original_content_preserved": True,
-                    "hybrid_approach": True,
-                    "images_allocated": len(image_analysis),
-                    "sections_with_images": self._count_sections_with_images(final_sections),
-                    "realtime_layout_applied": True
+                # 6. 최종 결과 구성
+                result = {
+                    "content_sections": final_sections,
+                    "processing_metadata": {
+                        "unified_processing": True,
+                        "crew_ai_enhanced": True,
+                        "structured_processing": True,
+                        "layout_generator_enhanced": True,
+                        "total_sections": len(final_sections),
+                        "original_content_preserved": True,
+                        "hybrid_approach": True,
+                        "images_allocated": len(image_analysis),
+                        "sections_with_images": self._count_sections_with_images(final_sections),
+                        "realtime_layout_applied": True
+                    }
                 }
-            }
             
+            self.logger.info(f"벡터 검색 계획 통계: {search_planner.summary()}")
             self.logger.info("=== RealtimeLayoutGenerator 통합 하이브리드 멀티모달 매거진 처리 완료 ===")
             return result
             
@@ -208,9 +215,29 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
             # 1. 기존 방식으로 기본 섹션 데이터 준비
             enhanced_sections = await self._prepare_enhanced_sections(structured_content, optimization_result)
             
+            search_planner = get_active_search_plan()
+            
             # ✅ 2. RealtimeLayoutGenerator로 레이아웃 전략 수립
+            if search_planner is not None:
+                await search_planner.prefetch([
+                    request
+                    for section_data in enhanced_sections
+                    for request in self.layout_generator.plan_vector_searches(section_data)
+                ])
             layout_strategies = await self._generate_layout_strategies(enhanced_sections, unified_patterns)
             
+            if search_planner is not None:
+                await search_planner.prefetch([
+                    request
+                    for i, section_data in enumerate(enhanced_sections)
+                    for request in self.template_selector.plan_vector_searches(
+                        self._build_template_selection_input(
+                            section_data, layout_strategies.get(f"section_{i}", {}), unified_patterns
+                        ),
+                        layout_strategies.get(f"section_{i}", {})
+                    )
+                ])
+            
             # ✅ 3. 전략 기반 템플릿 선택 및 JSX 생성
             final_sections = await self._generate_jsx_with_layout_strategies(
                 enhanced_sections, layout_strategies, unified_patterns
@@ -297,12 +324,7 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
             layout_strategy = layout_strategies.get(section_key, {})
             
             # ✅ 레이아웃 전략을 템플릿 선택에 활용
-            enhanced_section_data = {
-                **section_data,
-                "layout_strategy": layout_strategy,
-                "ai_search_patterns": unified_patterns.get("ai_search_patterns", []),
-                "jsx_patterns": unified_patterns.get("jsx_template_patterns", [])
-            }
+            enhanced_section_data = self._build_template_selection_input(section_data, layout_strategy, unified_patterns)
             
             # 전략 기반 템플릿 선택
             template_code = await self.template_selector.analyze_and_select_template(
@@ -328,6 +350,15 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
         
         return final_sections
 
+    def _build_template_selection_input(self, section_data: Dict, layout_strategy: Dict, unified_patterns: Dict) -> Dict:
+        """템플릿 선택기 입력 데이터 (레이아웃 전략 + 통합 패턴 포함)"""
+        return {
+            **section_data,
+            "layout_strategy": layout_strategy,
+            "ai_search_patterns": unified_patterns.get("ai_search_patterns", []),
+            "jsx_patterns": unified_patterns.get("jsx_template_patterns", [])
+        }
+
     def _get_fallback_strategy_for_section(self, section_data: Dict) -> Dict:
         """섹션별 폴백 전략 생성"""
         image_count = len(section_data.get("images", []))
@@ -395,12 +426,15 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
             )
             
             # 콘텐츠 구조 분석
-            self.logger.info("CrewAI: 전체 데이터 기반 구조 분석 시작...")
-            content_analysis_task = self._create_enhanced_content_analysis_task(full_context, user_id)
-            content_crew = Crew(agents=[self.content_structure_agent], tasks=[content_analysis_task], verbose=False)
-            content_result = content_crew.kickoff()
-            
-            return await self._process_crew_results(content_result)
+            self.logger.info("전체 데이터 기반 구조 분석 시작 (ContentStructureAnalysis 스키마 출력)...")
+            # ✅ CrewAI 실행기 대신 에이전트 페르소나로 직접 호출: 응답이 스키마로 고정되므로
+            # 자유 형식 결과의 정규식 추출/따옴표 치환/파싱 실패 폴백이 필요 없고, 동기 kickoff로 이벤트 루프를 막지 않음
+            content_analysis = await self.llm.ainvoke_structured(
+                [agent_system_message(self.content_structure_agent),
+                 {"role": "user", "content": self._create_enhanced_content_analysis_prompt(full_context, user_id)}],
+                ContentStructureAnalysis
+            )
+            return content_analysis.model_dump()
             
         except Exception as e:
             self.logger.error(f"요약 없는 CrewAI 분석 실패: {e}")
@@ -958,6 +992,8 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
                 "section_mappings": {}
             }
             
+            # (섹션 키, 검색용 섹션 데이터, 결과에 추가할 메타데이터) 목록
+            section_inputs = []
             section_index = 0  # 전체 섹션 인덱스 (하위 섹션 포함)
             
             for i, section in enumerate(sections):
@@ -966,20 +1002,13 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
                 
                 # 하위 섹션이 없는 경우 - 단일 섹션으로 처리
                 if not sub_sections:
-                    section_key = f"section_{section_index}"
-                    
-                    # 패턴 수집 및 융합
-                    patterns = await self._collect_section_patterns(section)
-                    unified_patterns["section_mappings"][section_key] = patterns
-                    
+                    section_inputs.append((f"section_{section_index}", section, {}))
                     section_index += 1
                 else:
                     # 하위 섹션이 있는 경우 - 각 하위 섹션을 개별적으로 처리
                     section_title = section.get("title", f"섹션 {i+1}")
                     
                     for j, sub_section in enumerate(sub_sections):
-                        section_key = f"section_{section_index}"
-                        
                         # 상위 섹션의 제목을 하위 섹션 제목에 추가
                         combined_title = f"{section_title}, {sub_section.get('title', '')}"
                         
@@ -992,24 +1021,51 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
                             "parent_section_id": section.get("section_id", ""),
                             "parent_section_title": section_title
                         }
-                        
-                        # 패턴 수집 및 융합
-                        patterns = await self._collect_section_patterns(enhanced_sub_section)
-                        patterns.update({
+                        section_inputs.append((f"section_{section_index}", enhanced_sub_section, {
                             "is_subsection": True,
                             "parent_section_id": section.get("section_id", ""),
                             "parent_section_title": section_title
-                        })
-                        
-                        unified_patterns["section_mappings"][section_key] = patterns
+                        }))
                         section_index += 1
             
+            # 모든 섹션의 검색을 미리 묶어서 실행 (섹션 수와 무관한 왕복 횟수)
+            search_planner = get_active_search_plan()
+            if search_planner is not None:
+                await self._prefetch_section_patterns(search_planner, [item[1] for item in section_inputs])
+            
+            for section_key, section_data, extra_metadata in section_inputs:
+                # 패턴 수집 및 융합
+                patterns = await self._collect_section_patterns(section_data)
+                patterns.update(extra_metadata)
+                unified_patterns["section_mappings"][section_key] = patterns
+            
             return unified_patterns
             
         except Exception as e:
             self.logger.error(f"통합 벡터 패턴 수집 실패: {e}")
             return {"section_mappings": {}}
 
+    async def _prefetch_section_patterns(self, search_planner: SearchQueryPlanner, sections: List[Dict]):
+        """_collect_section_patterns가 보낼 검색을 섹션 전체에 대해 2단계로 미리 실행
+        (JSX/매거진 쿼리는 AI Search 패턴 결과에 의존)"""
+        clean = self.isolation_manager.clean_query_from_azure_keywords
+
+        await search_planner.prefetch([
+            ("text-semantic-patterns-index", clean(self._build_ai_search_query(section)), 5, None)
+            for section in sections
+        ])
+
+        dependent_requests = []
+        for section in sections:
+            ai_patterns = await self._search_ai_patterns(self._build_ai_search_query(section))
+            dependent_requests.append(
+                ("jsx-component-vector-index", clean(self._build_jsx_template_query(section, ai_patterns)), 5, None)
+            )
+            dependent_requests.append(
+                ("magazine-vector-index", clean(self._build_magazine_layout_query(section, ai_patterns)), 5, None)
+            )
+        await search_planner.prefetch(dependent_requests)
+
     async def _collect_section_patterns(self, section: Dict) -> Dict:
         """개별 섹션의 패턴 수집"""
         # 1. AI Search 패턴 수집
@@ -1072,11 +1128,8 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
         """AI Search 패턴 검색"""
         try:
             clean_query = self.isolation_manager.clean_query_from_azure_keywords(query)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    clean_query, "text-semantic-patterns-index", top_k=5
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                clean_query, "text-semantic-patterns-index", top_k=5
             )
             return self.isolation_manager.filter_contaminated_data(results, f"ai_patterns_{hash(query)}")
         except Exception as e:
@@ -1087,11 +1140,8 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
         """JSX 템플릿 벡터 검색"""
         try:
             clean_query = self.isolation_manager.clean_query_from_azure_keywords(query)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    clean_query, "jsx-component-vector-index", top_k=5
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                clean_query, "jsx-component-vector-index", top_k=5
             )
             return self.isolation_manager.filter_contaminated_data(results, f"jsx_templates_{hash(query)}")
         except Exception as e:
@@ -1102,11 +1152,8 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
         """매거진 레이아웃 벡터 검색"""
         try:
             clean_query = self.isolation_manager.clean_query_from_azure_keywords(query)
-            results = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.vector_manager.search_similar_layouts(
-                    clean_query, "magazine-vector-index", top_k=5
-                )
+            results = await self.async_vector_manager.search_similar_layouts(
+                clean_query, "magazine-vector-index", top_k=5
             )
             return self.isolation_manager.filter_contaminated_data(results, f"magazine_patterns_{hash(query)}")
         except Exception as e:
@@ -1123,148 +1170,9 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
         """템플릿 순위 매기기"""
         return [p.get("jsx_code", "DefaultTemplate.jsx") for p in jsx_patterns[:3]]
 
-    async def _process_crew_results(self, crew_result):
-        """CrewAI 결과 안전하게 처리 (JSON 파싱 강화)"""
-        try:
-            if crew_result is None:
-                self.logger.warning("CrewAI 결과가 None입니다.")
-                return self._create_fallback_content_result({})
-            
-            # CrewAI 결과에서 텍스트 추출
-            result_text = ""
-            if hasattr(crew_result, 'raw') and crew_result.raw:
-                result_text = str(crew_result.raw)
-            elif hasattr(crew_result, 'result') and crew_result.result:
-                result_text = str(crew_result.result)
-            elif hasattr(crew_result, 'output') and crew_result.output:
-                result_text = str(crew_result.output)
-            else:
-                result_text = str(crew_result)
-            
-            # ✅ 빈 문자열 및 공백 체크
-            if not result_text or result_text.strip() == "":
-                self.logger.warning("CrewAI 결과가 빈 문자열입니다.")
-                return self._create_fallback_content_result({})
-            
-            # ✅ JSON 형식 검증 및 추출
-            if isinstance(result_text, str):
-                # 마크다운 코드 블록 제거
-                json_match = re.search(r'``````', result_text, re.DOTALL | re.IGNORECASE)
-                if json_match:
-                    result_text = json_match.group(1).strip()
-                
-                # 일반 코드 블록 제거
-                elif '```' in result_text:
-                    json_match = re.search(r'```\s*(.*?)\s*```', result_text, re.DOTALL)
-                    if json_match:
-                        result_text = json_match.group(1).strip()
-                
-                # ✅ JSON 객체 패턴 추출
-                json_pattern = r'\{.*\}'
-                json_match = re.search(json_pattern, result_text, re.DOTALL)
-                if json_match:
-                    result_text = json_match.group(0)
-                
-                # ✅ JSON 파싱 시도
-                try:
-                    # 문자열 정리
-                    cleaned_text = result_text.strip()
-                    
-                    # 잘못된 따옴표 수정
-                    cleaned_text = cleaned_text.replace("'", '"')
-                    
-                    # JSON 파싱
-                    parsed_result = json.loads(cleaned_text)
-                    
-                    # ✅ 필수 필드 검증
-                    if self._validate_crew_result_structure(parsed_result):
-                        return parsed_result
-                    else:
-                        self.logger.warning("CrewAI 결과 구조가 올바르지 않습니다.")
-                        return self._create_fallback_content_result({})
-                        
-                except json.JSONDecodeError as e:
-                    self.logger.warning(f"JSON 파싱 실패: {e}")
-                    self.logger.warning(f"파싱 시도한 텍스트: {result_text[:200]}...")
-                    
-                    # ✅ 텍스트에서 정보 추출 시도
-                    extracted_data = self._extract_data_from_text(result_text)
-                    if extracted_data:
-                        return extracted_data
-                    else:
-                        return self._create_fallback_content_result({})
-            
-            return self._create_fallback_content_result({})
-
-        except Exception as e:
-            self.logger.error(f"CrewAI 결과 처리 실패: {e}")
-            return self._create_fallback_content_result({})
-        
-    def _extract_data_from_text(self, text: str) -> Optional[Dict]:
-        """텍스트에서 구조화된 데이터 추출 시도"""
-        try:
-            # 섹션 제목 추출
-            title_pattern = r'(?:제목|title)[:：]\s*([^\n]+)'
-            titles = re.findall(title_pattern, text, re.IGNORECASE)
-            
-            if titles:
-                sections = []
-                for i, title in enumerate(titles[:3]):  # 최대 3개
-                    section = {
-                        "title": title.strip(),
-                        "template_recommendations": {},
-                        "style_preferences": [],
-                        "layout_suggestions": []
-                    }
-                    sections.append(section)
-                
-                return {
-                    "analysis": "text_extraction",
-                    "sections": sections,
-                    "status": "extracted_from_text"
-                }
-            
-            return None
-            
-        except Exception as e:
-            self.logger.error(f"텍스트 데이터 추출 실패: {e}")
-            return None
-            
-    def _validate_crew_result_structure(self, data: Dict) -> bool:
-        """CrewAI 결과 구조 검증"""
-        try:
-            # 기본 구조 확인
-            if not isinstance(data, dict):
-                return False
-            
-            # sections 필드 확인
-            if "sections" not in data:
-                return False
-            
-            sections = data["sections"]
-            if not isinstance(sections, list):
-                return False
-            
-            # 각 섹션의 필수 필드 확인
-            for section in sections:
-                if not isinstance(section, dict):
-                    return False
-                
-                required_fields = ["title"]
-                for field in required_fields:
-                    if field not in section:
-                        return False
-            
-            return True
-            
-        except Exception:
-            return False
-        
-
-    def _create_enhanced_content_analysis_task(self, full_context: str, user_id: str) -> Task:
-        """향상된 콘텐츠 분석 태스크 생성 (JSON 형식 강화)"""
-        return Task(
-            description=f"""
+    def _create_enhanced_content_analysis_prompt(self, full_context: str, user_id: str) -> str:
+        """향상된 콘텐츠 분석 프롬프트 생성 (응답 형식은 ContentStructureAnalysis 스키마로 고정)"""
+        return f"""
     다음 완전한 매거진 데이터를 분석하여 최적의 구조화 계획을 수립하세요:
 
     **완전한 매거진 데이터:**
@@ -1276,9 +1184,8 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
     3. 이미지 배치를 위한 레이아웃 제안
     4. JSX 생성을 위한 메타데이터 준비
 
-    **중요: 반드시 아래 JSON 형식으로만 응답하세요. 다른 텍스트는 포함하지 마세요.**
+    **아래 JSON 형식으로 응답하세요.**
 
-    ```json
     {{
     "analysis": "content_structure_analysis",
     "sections": [
@@ -1295,19 +1202,7 @@ class UnifiedMultimodalAgent(SessionAwareMixin, InterAgentCommunicationMixin):
     ],
     "status": "completed"
     }}
-    주의사항:
-
-    위 JSON 형식을 정확히 따르세요
-
-    마크다운 코드 블록(```)은 사용하지 마세요
-
-    추가 설명이나 텍스트는 포함하지 마세요
-
-    유효한 JSON만 반환하세요
-    """,
-    expected_output="구조화된 섹션별 분석 및 추천 결과 (순수 JSON 형식)",
-    agent=self.content_structure_agent
-    )
+    """
 
     def _create_fallback_content_result(self, magazine_content: Dict) -> Dict:
         """콘텐츠 구조 분석 실패 시 기본 결과 생성 (JSON 파싱 실패 대응)"""
@@ -11,13 +11,14 @@ from .content_refiner import ContentRefiner
 from ...utils.log.hybridlogging import get_hybrid_logger
 from ...utils.log.logging_manager import LoggingManager
 from ...custom_llm import get_azure_llm
-from crewai import Agent, Task, Crew
+from ...utils.data.llm_structured_output import SectionContent, agent_system_message
+from crewai import Agent, Crew
 
 class ContentCreatorV2Agent:
     """인터뷰와 에세이 에이전트를 통합하는 새로운 콘텐츠 생성자 - 첫 번째 에이전트 (로그 수집만 - 비동기 처리)"""
 
     def __init__(self):
-        self.llm = get_azure_llm()
+        self.llm = get_azure_llm(self.__class__.__name__)
         self.interview_manager = InterviewAgentManager()
         self.essay_manager = EssayAgentManager()
         self.content_planner = ContentPlannerAgent()
@@ -506,14 +507,14 @@ class ContentCreatorV2Agent:
 
     async def _process_interview_async(self, qa_map: Dict[str, str]) -> Dict[str, str]:
         """인터뷰 형식 처리 (비동기)"""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.interview_manager.process_all_interviews, qa_map
+        return await asyncio.to_thread(
+            self.interview_manager.process_all_interviews, qa_map
         )
 
     async def _process_essay_async(self, qa_map: Dict[str, str]) -> Dict[str, str]:
         """에세이 형식 처리 (비동기)"""
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self.essay_manager.run_all, qa_map
+        return await asyncio.to_thread(
+            self.essay_manager.run_all, qa_map
         )
 
     async def _process_image_analysis_async(self, image_analysis_results: List[Dict]) -> str:
@@ -636,9 +637,8 @@ class ContentCreatorV2Agent:
             
             self.logger.info(f"섹션 {section_id}: '{title}' 콘텐츠 생성 중 (목표 길이: {target_length_per_section}자)")
             
-            # ✅ 길이 제한이 포함된 섹션별 콘텐츠 생성 태스크
-            section_task = Task(
-                description=f"""
+            # ✅ 길이 제한이 포함된 섹션별 콘텐츠 생성 프롬프트
+            section_prompt = f"""
     **섹션 {section_id} 콘텐츠 생성 (길이 제한 적용)**
 
     당신은 여행 매거진의 한 섹션을 작성해야 합니다. **중요: 이 섹션의 본문은 반드시 {target_length_per_section}자 이내로 작성해야 합니다.**
@@ -670,7 +670,7 @@ class ContentCreatorV2Agent:
     5. **자연스러운 마무리**: 지정된 길이 내에서 자연스럽게 마무리되어야 합니다.
 
     **출력 형식:**
-    아래 JSON 형식으로 출력하세요. 다른 설명이나 주석은 포함하지 마세요.
+    아래 JSON 형식으로 출력하세요.
 
     {{
     "section_id": "{section_id}",
@@ -679,40 +679,19 @@ class ContentCreatorV2Agent:
     "body": "이 섹션의 본문 내용... (반드시 {target_length_per_section}자 이내)"
     }}
 
-    text
-
     **중요 지침:**
     - **절대적 길이 제한**: {target_length_per_section}자를 초과하지 마세요.
     - **핵심 내용 우선**: 가장 중요하고 흥미로운 부분만 선별하세요.
     - **완전한 문장**: 모든 문장은 완전한 형태여야 합니다.
     - **자연스러운 흐름**: 짧아도 읽기 자연스러워야 합니다.
-    """,
-                agent=agent,
-                expected_output=f"섹션 {section_id} '{title}'에 대한 {target_length_per_section}자 이내의 JSON 형식 콘텐츠"
-            )
-            
-            # 비동기 태스크 실행
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, agent.execute_task, section_task
-            )
-            
-            # JSON 응답 추출 및 파싱
-            import json
-            import re
-            
-            # JSON 부분만 추출
-            json_match = re.search(r'``````', str(response), re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = str(response)
-            
-            # 불필요한 마크다운이나 설명 제거
-            json_str = re.sub(r'``````', '', json_str).strip()
+    """
             
             try:
-                # JSON 파싱
-                section_content = json.loads(json_str)
+                # ✅ 에이전트 페르소나 + SectionContent 스키마로 고정한 직접 호출
+                # (CrewAI 실행기의 자유 형식 응답 대신 검증된 JSON을 받아 정규식 추출/파싱 실패 폴백 제거)
+                section_content = (await self.llm.ainvoke_structured(
+                    [agent_system_message(agent), {"role": "user", "content": section_prompt}], SectionContent
+                )).model_dump()
                 
                 # ✅ 길이 검증 및 조정
                 body_content = section_content.get('body', '')
@@ -726,7 +705,7 @@ class ContentCreatorV2Agent:
                 self.logger.info(f"섹션 {section_id}: '{title}' 콘텐츠 생성 완료 ({len(section_content.get('body', ''))}자)")
                 
             except Exception as e:
-                self.logger.error(f"섹션 {section_id} 콘텐츠 파싱 실패: {e}")
+                self.logger.error(f"섹션 {section_id} 콘텐츠 생성 실패: {e}")
                 # 실패 시 기본 콘텐츠 생성 (길이 제한 적용)
                 fallback_body = f"이 섹션에서는 {summary} 내용을 다룹니다."
                 if len(fallback_body) > target_length_per_section:
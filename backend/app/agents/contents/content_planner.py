@@ -1,14 +1,14 @@
 import asyncio
-import json
 from typing import Dict, List, Any
 from ...custom_llm import get_azure_llm
+from ...utils.data.llm_structured_output import StructurePlan
 from ...utils.log.hybridlogging import get_hybrid_logger
 
 class ContentPlannerAgent:
     """콘텐츠 분석 및 구조 설계를 담당하는 에이전트"""
     
     def __init__(self):
-        self.llm = get_azure_llm()
+        self.llm = get_azure_llm(self.__class__.__name__)
         self.logger = get_hybrid_logger(self.__class__.__name__)
     
     async def analyze_and_plan_structure(self, interview_results: Dict[str, str], 
@@ -47,10 +47,9 @@ class ContentPlannerAgent:
 4. 각 섹션의 핵심 내용을 요약하고, 매력적인 섹션 제목을 정해주세요.
 
 **출력 형식:**
-아래의 JSON 형식으로 출력하세요. 다른 설명이나 주석은 포함하지 마세요.
+아래의 JSON 형식으로 출력하세요.
 estimated_length 필드에는 "짧음", "중간", "김" 중 하나의 값만 입력하세요.
 
-```json
 {{
   "proposed_title": "매거진의 전체 제목",
   "proposed_subtitle": "매거진의 부제목",
@@ -64,7 +63,6 @@ estimated_length 필드에는 "짧음", "중간", "김" 중 하나의 값만 입
     }}
   ]
 }}
-```
 
 **중요 지침:**
 - 섹션 개수는 콘텐츠의 양과 복잡성에 따라 자유롭게 결정하세요. (최소 3개, 최대 10개 권장)
@@ -74,30 +72,10 @@ estimated_length 필드에는 "짧음", "중간", "김" 중 하나의 값만 입
 """
         
         try:
-            # LLM을 통한 구조 설계 (ainvoke 사용)
-            response = await self.llm.ainvoke(prompt)
-            
-            # JSON 응답 추출 및 파싱
-            import re
-            
-            # JSON 부분만 추출
-            json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = response
-            
-            # 불필요한 마크다운이나 설명 제거
-            json_str = re.sub(r'```(json)?|```', '', json_str).strip()
-            
-            # JSON 파싱
-            try:
-                structure_plan = json.loads(json_str)
-                self.logger.info(f"구조 설계 완료: {len(structure_plan.get('sections', []))}개 섹션")
-                return structure_plan
-            except Exception as e:
-                self.logger.error(f"JSON 파싱 실패: {str(e)}")
-                return self._create_default_structure_plan()
+            # ✅ 응답을 StructurePlan 스키마로 고정한 LLM 호출 (정규식 추출/파싱 실패 폴백 없음)
+            structure_plan = (await self.llm.ainvoke_structured(prompt, StructurePlan)).model_dump()
+            self.logger.info(f"구조 설계 완료: {len(structure_plan['sections'])}개 섹션")
+            return structure_plan
             
         except Exception as e:
             self.logger.error(f"구조 설계 실패: {str(e)}")
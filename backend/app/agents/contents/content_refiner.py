@@ -1,15 +1,20 @@
 import asyncio
 import re
 import json
+from contextlib import aclosing
 from typing import Dict, List, Any, Tuple
-from ...custom_llm import get_azure_llm
+from ...custom_llm import StreamCompletion, get_azure_llm
+from ...utils.data.stream_parsers import IncrementalJSONArrayParser
 from ...utils.log.hybridlogging import get_hybrid_logger
 
+# 섹션 분할 프롬프트를 바꾸면 올림 (이전 캐시 응답 무효화)
+SECTION_SPLIT_PROMPT_VERSION = "1"
+
 class ContentRefiner:
     """콘텐츠 분량 검토 및 지능적 분할을 담당하는 클래스"""
     
     def __init__(self, max_section_length: int = 1000):
-        self.llm = get_azure_llm()
+        self.llm = get_azure_llm(self.__class__.__name__)
         self.logger = get_hybrid_logger(self.__class__.__name__)
         self.max_section_length = max_section_length
     
@@ -86,27 +91,43 @@ class ContentRefiner:
 """
         
         try:
-            # LLM을 통한 섹션 분할 (ainvoke 사용)
-            response = await self.llm.ainvoke(prompt)
-            
-            # JSON 응답 추출 및 파싱
-            # JSON 부분만 추출
-            json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(1)
-            else:
-                json_str = response
-            
-            # 불필요한 마크다운이나 설명 제거
-            json_str = re.sub(r'```(json)?|```', '', json_str).strip()
-            
-            # JSON 파싱
-            sub_sections = json.loads(json_str)
+            # LLM을 통한 섹션 분할 (스트리밍, 하위 섹션 객체가 완성될 때마다 처리)
+            parser = IncrementalJSONArrayParser()
+            sub_sections = []
+            completion = StreamCompletion()
+            stream = self.llm.astream(prompt, cacheable=True, agent_name="ContentRefiner",
+                                      prompt_version=SECTION_SPLIT_PROMPT_VERSION, completion=completion)
+            async with aclosing(stream):
+                async for delta in stream:
+                    for sub_section in parser.feed(delta):
+                        # 각 하위 섹션에 원본 섹션 정보 추가
+                        sub_section['parent_section_id'] = section_id
+                        sub_section['parent_section_title'] = title
+                        sub_sections.append(sub_section)
+                    if parser.done:
+                        # 배열이 닫히면 뒤따르는 설명은 받지 않음
+                        completion.mark_complete()
+                        break
+            response = parser.text
             
-            # 각 하위 섹션에 원본 섹션 정보 추가
-            for sub_section in sub_sections:
-                sub_section['parent_section_id'] = section_id
-                sub_section['parent_section_title'] = title
+            if not sub_sections:
+                # 증분 파싱 실패 시 전체 응답에서 JSON 부분만 추출
+                json_match = re.search(r'```json\s*(.*?)\s*```', response, re.DOTALL)
+                if json_match:
+                    json_str = json_match.group(1)
+                else:
+                    json_str = response
+                
+                # 불필요한 마크다운이나 설명 제거
+                json_str = re.sub(r'```(json)?|```', '', json_str).strip()
+                
+                # JSON 파싱
+                sub_sections = json.loads(json_str)
+                
+                # 각 하위 섹션에 원본 섹션 정보 추가
+                for sub_section in sub_sections:
+                    sub_section['parent_section_id'] = section_id
+                    sub_section['parent_section_title'] = title
             
             # 문장 경계 검증
             sub_sections = self._verify_sentence_boundaries(sub_sections)
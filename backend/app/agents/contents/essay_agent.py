@@ -6,7 +6,7 @@ class EssayAgentBase:
     def __init__(self, name: str, instruction: Dict):
         self.name = name
         self.instruction = instruction
-        self.llm = get_azure_llm()
+        self.llm = get_azure_llm(self.__class__.__name__)
 
     def create_agent(self):
         return Agent(
@@ -6,7 +6,7 @@ class InterviewAgentBase:
     def __init__(self, name: str, instruction: Dict):
         self.name = name
         self.instruction = instruction
-        self.llm = get_azure_llm()
+        self.llm = get_azure_llm(self.__class__.__name__)
 
     def get_question(self) -> str:
         return self.instruction.get("page_instruction", {}).get("source", "질문이 없습니다.")
@@ -3,10 +3,23 @@ from ..custom_llm import get_azure_llm
 import asyncio
 import aiohttp
 import os
+import time
+from contextlib import nullcontext
 from datetime import datetime
 import logging
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from ..utils.data.blob_storage import BlobStorageManager
+from ..utils.data.reverse_geocoder import location_from_blob_metadata
+from ..utils.data.llm_response_cache import get_llm_response_cache, make_llm_cache_key
+from ..utils.data.llm_scheduler import get_llm_scheduler
+from ..utils.data.llm_structured_output import (
+    ImageFeatureAnalysis, ImageLocationAnalysis, LLMOutputValidationError, parse_llm_output, response_format_for,
+    response_format_fingerprint, salvage_llm_output
+)
+from ..utils.log.llm_telemetry import LLMCallRecord, get_llm_telemetry
+
+# 분석 프롬프트(_build_analysis_messages)를 바꾸면 올림 (이전 캐시 응답 무효화)
+IMAGE_ANALYSIS_PROMPT_VERSION = "2"
 
 class ImageAnalyzerAgent:
     def __init__(self):
@@ -16,7 +29,7 @@ class ImageAnalyzerAgent:
         
         # ✅ LLM 초기화를 try-catch로 보호
         try:
-            self.llm = get_azure_llm()
+            self.llm = get_azure_llm(self.__class__.__name__)
         except Exception as e:
             self._safe_log(f"LLM 초기화 실패: {e}")
             self.llm = None
@@ -91,8 +104,96 @@ class ImageAnalyzerAgent:
             return None
 
     # 나머지 메서드들은 기존과 동일하되, 모든 로깅을 _safe_log로 변경
-    async def analyze_single_image_async(self, session: aiohttp.ClientSession, image, semaphore: asyncio.Semaphore, image_index: int) -> Dict[str, Any]:
-        """단일 이미지를 비동기로 분석"""
+    def _lookup_exif_location_sync(self, image) -> Optional[Dict[str, Any]]:
+        """업로드 시 EXIF GPS를 역지오코딩해 저장한 Blob 메타데이터(국가/도시) 조회 (동기)"""
+        if not self.blob_manager:
+            return None
+
+        return location_from_blob_metadata(self.blob_manager.get_blob_metadata(image))
+
+    async def _lookup_exif_location(self, image) -> Optional[Dict[str, Any]]:
+        """EXIF GPS 기반 위치 조회 (메타데이터가 없거나 실패 시 None → LLM 분석으로 폴백)"""
+        try:
+            loop = asyncio.get_event_loop()
+            return await loop.run_in_executor(None, self._lookup_exif_location_sync, image)
+        except Exception as e:
+            self._safe_log(f"이미지 '{image.name}' EXIF GPS 조회 실패: {e}")
+            return None
+
+    def _build_analysis_messages(self, image_url: str, geo_location: Dict[str, Any] = None) -> List[Dict[str, Any]]:
+        """분석 메시지 구성 (EXIF 위치가 있으면 촬영 위치/설명만 요청)"""
+        if geo_location:
+            return [
+                {
+                    "role": "system",
+                    "content": f"""당신은 여행 사진 분석 전문가입니다. 이 사진은 GPS 기준 {geo_location['country']} {geo_location['city']} 인근에서 촬영되었습니다.
+
+출력 형식 (JSON):
+{{"location": "구체적 장소명", "description": "사진 고유 특징"}}
+
+국가와 도시는 이미 확인되었으므로 다시 언급하지 마세요."""
+                },
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": "이 이미지의 촬영 위치(location)와 특징(description)을 JSON으로 분석해주세요."
+                        },
+                        {
+                            "type": "image_url",
+                            "image_url": {
+                                "url": image_url
+                            }
+                        }
+                    ]
+                }
+            ]
+
+        return [
+            {
+                "role": "system",
+                "content": """당신은 지리적 위치 식별 전문가입니다. 이미지의 지리적, 건축적, 문화적 특징을 분석하여 위치를 특정합니다.
+
+분석 기준:
+- 건축물의 양식과 구조적 특징
+- 자연환경과 지형적 요소
+- 도시 인프라와 교통 시설
+- 문화적 표식과 언어적 단서
+- 사진의 구도와 색감
+
+출력 형식 (JSON):
+{"country": "국가명", "city": "도시/지역명", "location": "구체적 장소명", "description": "사진 고유 특징"}
+
+분석 시 지리적 정보만 제공하고 다른 내용은 언급하지 마세요."""
+            },
+            {
+                "role": "user",
+                "content": [
+                    {
+                        "type": "text",
+                        "text": "이 이미지의 지리적 위치(country, city, location)와 특징(description)을 JSON으로 분석해주세요.\n\n건축물, 자연환경, 문화적 요소를 기반으로 위치를 특정해주세요."
+                    },
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": image_url
+                        }
+                    }
+                ]
+            }
+        ]
+
+    def _parse_analysis(self, result: str, schema) -> Tuple[Dict[str, str], bool]:
+        """응답 → (필드, 검증 통과 여부). 검증 실패(잘린 JSON 등) 시 응답에서 읽을 수 있는 필드만 사용"""
+        try:
+            return parse_llm_output(result, schema).model_dump(), True
+        except LLMOutputValidationError:
+            return salvage_llm_output(result, schema), False
+
+    async def analyze_single_image_async(self, session: aiohttp.ClientSession, image, semaphore: asyncio.Semaphore,
+                                         image_index: int) -> Dict[str, Any]:
+        """단일 이미지를 비동기로 분석 (EXIF GPS 우선, LLM은 설명 생성에만 사용)"""
         async with semaphore:
             try:
                 
@@ -101,107 +202,114 @@ class ImageAnalyzerAgent:
                 
                 image_url = self.blob_manager.get_image_url(image)
 
+                # ✅ 1단계: 업로드 시 EXIF GPS로 확인한 국가/도시 (있으면 LLM은 장소/설명만 분석)
+                geo_location = await self._lookup_exif_location(image)
+
                 # 비동기 Azure OpenAI API 호출
                 headers = {
                     'Content-Type': 'application/json',
                     'api-key': os.getenv("AZURE_API_KEY")
                 }
 
+                deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
+                # ✅ 응답을 JSON 스키마로 고정 (줄 단위 텍스트 파싱 대신 pydantic 검증)
+                schema = ImageFeatureAnalysis if geo_location else ImageLocationAnalysis
                 payload = {
-                    "model": os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME"),
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": """당신은 지리적 위치 식별 전문가입니다. 이미지의 지리적, 건축적, 문화적 특징을 분석하여 위치를 특정합니다.
-
-분석 기준:
-- 건축물의 양식과 구조적 특징
-- 자연환경과 지형적 요소
-- 도시 인프라와 교통 시설
-- 문화적 표식과 언어적 단서
-- 사진의 구도와 색감
-
-출력 형식:
-국가: [국가명]
-도시: [도시/지역명]
-촬영 위치: [구체적 장소명]
-자세한 설명: [사진 고유 특징]
-
-분석 시 지리적 정보만 제공하고 다른 내용은 언급하지 마세요."""
-                        },
-                        {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "text",
-                                    "text": "이 이미지의 지리적 위치를 다음 형식으로 분석해주세요:\n\n국가:\n도시:\n촬영 위치:\n자세한 설명:\n\n건축물, 자연환경, 문화적 요소를 기반으로 위치를 특정해주세요."
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": image_url
-                                    }
-                                }
-                            ]
-                        }
-                    ],
+                    "model": deployment,
+                    "messages": self._build_analysis_messages(image_url, geo_location),
                     "temperature": 0.1,
-                    "max_tokens": 150
+                    "max_tokens": 400,
+                    "response_format": response_format_for(schema)
                 }
 
+                # ✅ 같은 이미지/위치 힌트의 재분석은 캐시된 응답 사용 (재생성 시 토큰 비용 없음)
+                response_cache = get_llm_response_cache()
+                prompt_version = f"{IMAGE_ANALYSIS_PROMPT_VERSION}:{response_format_fingerprint(payload['response_format'])}"
+                cache_key = make_llm_cache_key(deployment, payload["messages"], payload["temperature"],
+                                               payload["max_tokens"], prompt_version) if response_cache else None
+                result = response_cache.get(cache_key, "ImageAnalyzerAgent") if cache_key else None
+                if result is not None and not self._parse_analysis(result, schema)[1]:
+                    # 검증에 실패하는 캐시 응답(이전에 저장된 잘린 응답 등)은 재사용하지 않음
+                    result = None
+                fetched = result is None
+
                 api_url = f"{os.getenv('AZURE_API_BASE')}/openai/deployments/{os.getenv('AZURE_OPENAI_DEPLOYMENT_NAME')}/chat/completions?api-version={os.getenv('AZURE_API_VERSION')}"
                 
-                async with session.post(api_url, json=payload, headers=headers) as response:
-                    if response.status == 200:
-                        result_data = await response.json()
-                        result = result_data['choices'][0]['message']['content']
-                        
-                        # 결과 형식 검증 및 정제
-                        lines = result.strip().split('\n')
-                        parsed_result = {}
-                        
-                        for line in lines:
-                            if ':' in line:
-                                key, value = line.split(':', 1)
-                                key = key.strip()
-                                value = value.strip()
-                                
-                                if key == "국가":
-                                    parsed_result["country"] = value
-                                elif key == "도시":
-                                    parsed_result["city"] = value
-                                elif key == "촬영 위치":
-                                    parsed_result["location"] = value
-                                elif key == "자세한 설명":
-                                    parsed_result["description"] = value
-
-                        analysis_result = {
-                            "image_name": image.name,
-                            "image_url": image_url,
-                            "country": parsed_result.get("country", "미상"),
-                            "city": parsed_result.get("city", "미상"),
-                            "location": parsed_result.get("location", "미상"),
-                            "description": parsed_result.get("description", "특징없음"),
-                            "raw_location": result,
-                            "confidence_score": 0.9 if all(k in parsed_result for k in ["country", "city", "location"]) else 0.5
-                        }
+                # ✅ AzureOpenAILLM을 거치지 않는 호출도 같은 텔레메트리에 기록
+                record = LLMCallRecord("ImageAnalyzerAgent", deployment, "async", cached=result is not None)
+                try:
+                    if result is None:
+                        # ✅ 다른 LLM 호출과 같은 스케줄러 슬롯 사용 (이미지 토큰은 추정하지 않고 응답 최대 토큰만 반영)
+                        scheduler = get_llm_scheduler()
+                        async with (scheduler.slot(payload["max_tokens"]) if scheduler else nullcontext(0.0)) as waited:
+                            record.queue_wait_ms = waited * 1000
+                            request_started = time.perf_counter()
+                            async with session.post(api_url, json=payload, headers=headers) as response:
+                                if response.status != 200:
+                                    error_text = await response.text()
+                                    raise Exception(f"API 호출 실패: {response.status} - {error_text}")
+                                result_data = await response.json()
+                                result = result_data['choices'][0]['message']['content']
+                        record.requests = 1
+                        record.network_ms = (time.perf_counter() - request_started) * 1000
+                        usage = result_data.get('usage') or {}
+                        record.prompt_tokens = usage.get('prompt_tokens', 0)
+                        record.completion_tokens = usage.get('completion_tokens', 0)
+                        record.finish_reason = result_data['choices'][0].get('finish_reason')
+                    record.success = True
+                except Exception as e:
+                    record.error = str(e)
+                    raise
+                finally:
+                    get_llm_telemetry().record(record)
+
+                # 결과 스키마 검증 (빈 값은 미상으로 처리), 끝까지 생성되고 검증된 응답만 캐시
+                fields, valid = self._parse_analysis(result, schema)
+                if not valid:
+                    self._safe_log(f"이미지 '{image.name}' 응답 스키마 검증 실패 (finish_reason={record.finish_reason}) - 부분 결과 사용")
+                elif fetched and cache_key and record.finish_reason == "stop":
+                    response_cache.put(cache_key, result, "ImageAnalyzerAgent")
+                parsed_result = {key: value.strip() for key, value in fields.items() if value.strip()}
+
+                # ✅ EXIF GPS 결과가 있으면 국가/도시는 GPS 값을 신뢰
+                if geo_location:
+                    parsed_result["country"] = geo_location["country"]
+                    parsed_result["city"] = geo_location["city"]
+
+                analysis_result = {
+                    "image_name": image.name,
+                    "image_url": image_url,
+                    "country": parsed_result.get("country", "미상"),
+                    "city": parsed_result.get("city", "미상"),
+                    "location": parsed_result.get("location", "미상"),
+                    "description": parsed_result.get("description", "특징없음"),
+                    "raw_location": "\n".join(f"{label}: {parsed_result[key]}" for key, label in (
+                        ("country", "국가"), ("city", "도시"), ("location", "촬영 위치"), ("description", "자세한 설명")
+                    ) if key in parsed_result),
+                    "confidence_score": 0.9 if valid and all(k in parsed_result for k in ["country", "city", "location"]) else 0.5,
+                    "location_source": "exif_gps" if geo_location else "llm_vision"
+                }
+
+                if geo_location:
+                    analysis_result["confidence_score"] = max(analysis_result["confidence_score"], geo_location["confidence_score"])
 
-                        self._safe_log(f"이미지 '{image.name}' 정밀 분석 완료:")
-                        self._safe_log(f" 국가: {parsed_result.get('country', '미상')}")
-                        self._safe_log(f" 도시: {parsed_result.get('city', '미상')}")
-                        self._safe_log(f" 위치: {parsed_result.get('location', '미상')}")
-                        self._safe_log(f" 특징: {parsed_result.get('description', '특징없음')}")
+                self._safe_log(f"이미지 '{image.name}' 정밀 분석 완료:")
+                self._safe_log(f" 국가: {parsed_result.get('country', '미상')}")
+                self._safe_log(f" 도시: {parsed_result.get('city', '미상')}")
+                self._safe_log(f" 위치: {parsed_result.get('location', '미상')}")
+                self._safe_log(f" 특징: {parsed_result.get('description', '특징없음')}")
                         
-                        return analysis_result
-                    else:
-                        error_text = await response.text()
-                        raise Exception(f"API 호출 실패: {response.status} - {error_text}")
+                return analysis_result
 
             except Exception as e:
                 self._safe_log(f"이미지 '{image.name}' 분석 중 오류 발생: {str(e)}")
+                # LLM 호출이 실패해도 EXIF GPS로 확인한 국가/도시는 유지
+                known_location = locals().get("geo_location") or {}
                 return {
                     "image_name": image.name,
                     "image_url": image_url if 'image_url' in locals() else "URL 생성 실패",
+                    "country": known_location.get("country", "미상"),
+                    "city": known_location.get("city", "미상"),
                     "location": f"분석 오류: {str(e)}"
                 }
 
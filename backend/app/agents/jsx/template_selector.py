@@ -1,6 +1,7 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from ...utils.log.hybridlogging import get_hybrid_logger
-from ...utils.data.pdf_vector_manager import PDFVectorManager
+from ...utils.data.async_pdf_vector_manager import AsyncPDFVectorManager
+from ...utils.data.layout_lookup_table import get_layout_lookup_table, make_lookup_key
 
 class SectionStyleAnalyzer:
     """
@@ -11,10 +12,10 @@ class SectionStyleAnalyzer:
     def __init__(self):
         self.logger = get_hybrid_logger(self.__class__.__name__)
         try:
-            self.vector_manager = PDFVectorManager(default_index="jsx-component-vector-index")
-            self.logger.info("PDFVectorManager 초기화 성공 (JSX 컴포넌트 인덱스)")
+            self.vector_manager = AsyncPDFVectorManager(default_index="jsx-component-vector-index")
+            self.logger.info("AsyncPDFVectorManager 초기화 성공 (JSX 컴포넌트 인덱스)")
         except Exception as e:
-            self.logger.error(f"PDFVectorManager 초기화 실패: {e}")
+            self.logger.error(f"AsyncPDFVectorManager 초기화 실패: {e}")
             self.vector_manager = None
 
     async def analyze_and_select_template(self, section_data: Dict, layout_strategy: Optional[Dict] = None) -> str:
@@ -26,68 +27,71 @@ class SectionStyleAnalyzer:
         self.logger.info(f"섹션 분석 및 템플릿 선택 시작: '{title}'")
 
         if not self.vector_manager:
-            self.logger.warning("PDFVectorManager가 초기화되지 않았습니다. 기본 템플릿을 반환합니다.")
+            self.logger.warning("AsyncPDFVectorManager가 초기화되지 않았습니다. 기본 템플릿을 반환합니다.")
             return self._get_default_template()
 
+        # 0. 사전 계산된 조합이면 검색 없이 테이블 템플릿 사용
+        jsx_code = await self._select_template_from_lookup(section_data, layout_strategy)
+        if jsx_code:
+            return jsx_code
+
+        best_template = await self.search_best_template(section_data, layout_strategy)
+        if best_template is None:
+            self.logger.warning("검색된 템플릿이 없습니다. 기본 템플릿을 사용합니다.")
+            return self._get_default_template()
+
+        # 6. 최적 템플릿 코드 반환 (선택된 템플릿만 본문 포인트 조회, 캐시 사용)
+        await self.vector_manager.hydrate_heavy_fields([best_template], "jsx-component-vector-index")
+        template_name = best_template.get('component_name', best_template.get('id', 'unknown'))
+        
+        self.logger.info(f"최적 템플릿 선택 완료: {template_name} (점수: {best_template.get('score', 0):.3f})")
+        
+        jsx_code = best_template.get('jsx_code')
+        if not jsx_code:
+            self.logger.warning(f"선택된 템플릿 '{template_name}'에 JSX 코드가 없습니다. 기본 템플릿을 사용합니다.")
+            return self._get_default_template()
+            
+        return jsx_code
+
+    async def search_best_template(self, section_data: Dict, layout_strategy: Optional[Dict] = None) -> Optional[Dict]:
+        """벡터 검색 + 필터링으로 최적 템플릿 후보 선택 (jsx_code 미포함, 결과 없으면 None)"""
         # ✅ 통합 벡터 패턴 활용
         metadata = section_data.get('metadata', {})
         ai_search_patterns = metadata.get('ai_search_patterns', [])
         jsx_patterns = metadata.get('jsx_patterns', [])
 
-        # 콘텐츠 추출
-        final_content = section_data.get('final_content', '')
-        if not final_content and 'content' in section_data:
-            final_content = section_data.get('content', '')
+        # 1~2. 검색 쿼리 텍스트 생성 및 이미지 수 추출
+        query_text, image_count, query_source = self._build_search_query(section_data, layout_strategy)
+        self.logger.info(f"{query_source} 검색 쿼리 생성: '{query_text}', 이미지 수: {image_count}")
 
-        # 1. 검색 쿼리 텍스트 생성 (통합 패턴 활용)
-        if ai_search_patterns or jsx_patterns:
-            self.logger.info("통합 벡터 패턴 기반 검색 쿼리 생성")
-            query_text = self._create_query_from_unified_patterns(section_data, ai_search_patterns, jsx_patterns)
-        elif layout_strategy:
-            self.logger.info(f"레이아웃 전략 기반 검색 쿼리 생성: {layout_strategy.get('layout_type', '알 수 없음')} 타입")
-            query_text = self._create_query_from_layout_strategy(section_data, layout_strategy)
-        else:
-            self.logger.info("기본 검색 쿼리 생성")
-            query_text = self._create_query_text(final_content, metadata)
-                
-        # 2. 이미지 수 추출
-        image_count = metadata.get('image_count')
-        if image_count is None:
-            if layout_strategy and "image_placement" in layout_strategy:
-                if layout_strategy["image_placement"].lower() == "없음":
-                    image_count = 0
-                else:
-                    image_count = 1
-            elif "image" in final_content.lower() or "photo" in final_content.lower():
-                image_count = 2
-            else:
-                image_count = 0
-        
-        self.logger.info(f"생성된 검색 쿼리: '{query_text}', 이미지 수: {image_count}")
-
-        # ✅ 3. PDFVectorManager를 통해 템플릿 검색 (results 변수 정의)
+        # ✅ 3. AsyncPDFVectorManager를 통해 템플릿 검색 (results 변수 정의)
         results = []  # ✅ 초기화 추가
         try:
-            results = self.vector_manager.search_similar_layouts(
-                query_text=query_text,
-                index_name="jsx-component-vector-index",
-                top_k=5
-            )
+            # 어휘 신뢰도가 충분하면 임베딩/벡터 검색 생략 (이미지 수는 아래 필터 단계에서 동일하게 적용)
+            results = self.vector_manager.search_lexical_templates(query_text, top_k=5)
+            if results is None:
+                # 후보는 순위 필드만 조회 (jsx_code는 최종 선택된 템플릿만 6단계에서 조회)
+                results = await self.vector_manager.search_similar_layouts(
+                    query_text=query_text,
+                    index_name="jsx-component-vector-index",
+                    top_k=5,
+                    include_heavy_fields=False
+                )
             
             if not results:
                 self.logger.info("직접 검색 결과 없음, 레이아웃 추천 시도")
-                results = self.vector_manager.get_layout_recommendations(
+                results = await self.vector_manager.get_layout_recommendations(
                     content_description=query_text,
                     image_count=image_count,
-                    index_type="jsx-component-vector-index"
+                    index_type="jsx-component-vector-index",
+                    include_heavy_fields=False
                 )
         except Exception as e:
             self.logger.error(f"템플릿 검색 중 오류 발생: {e}")
             results = []
 
         if not results:
-            self.logger.warning("검색된 템플릿이 없습니다. 기본 템플릿을 사용합니다.")
-            return self._get_default_template()
+            return None
 
         # ✅ 4. 콘텐츠 길이 기반 필터링 (results 정의 후 실행)
         content_length = len(section_data.get("content", ""))
@@ -98,6 +102,9 @@ class SectionStyleAnalyzer:
 
         # ✅ 5. 통합 패턴 기반 필터링 우선 적용
         if len(results) > 1:
+            if any(pattern.get('features') for pattern in jsx_patterns):
+                # 특성 매칭은 jsx_code 기준이므로 이 경우에만 후보 본문 조회 (본문 캐시 사용)
+                await self.vector_manager.hydrate_heavy_fields(results, "jsx-component-vector-index")
             filtered_results = self._filter_by_unified_patterns(results, ai_search_patterns, jsx_patterns)
             
             if not filtered_results and layout_strategy:
@@ -109,18 +116,37 @@ class SectionStyleAnalyzer:
             if filtered_results:
                 results = filtered_results
 
-        # 6. 최적 템플릿 코드 반환
-        best_template = results[0]
-        template_name = best_template.get('component_name', best_template.get('id', 'unknown'))
-        
-        self.logger.info(f"최적 템플릿 선택 완료: {template_name} (점수: {best_template.get('score', 0):.3f})")
-        
-        jsx_code = best_template.get('jsx_code')
-        if not jsx_code:
-            self.logger.warning(f"선택된 템플릿 '{template_name}'에 JSX 코드가 없습니다. 기본 템플릿을 사용합니다.")
-            return self._get_default_template()
-            
-        return jsx_code
+        return results[0]
+
+    def template_lookup_key(self, section_data: Dict, layout_strategy: Optional[Dict] = None) -> Optional[str]:
+        """사전 계산 테이블 키 (섹션별 통합 패턴이 있으면 None → 실시간 검색)"""
+        metadata = section_data.get('metadata', {})
+        if metadata.get('ai_search_patterns') or metadata.get('jsx_patterns'):
+            return None
+        layout_strategy = layout_strategy or {}
+        content = section_data.get('final_content') or section_data.get('content', '')
+        return make_lookup_key(
+            layout_strategy.get('layout_type') or "none",
+            len(section_data.get('images', [])),
+            len(content),
+            layout_strategy.get('emotional_focus') or "balanced"
+        )
+
+    async def _select_template_from_lookup(self, section_data: Dict, layout_strategy: Optional[Dict] = None) -> Optional[str]:
+        """테이블 템플릿의 jsx_code (미적중이거나 본문 조회 실패 시 None)"""
+        lookup_key = self.template_lookup_key(section_data, layout_strategy)
+        if lookup_key is None:
+            return None
+        template = get_layout_lookup_table().get_template(lookup_key)
+        if template is None:
+            return None
+
+        await self.vector_manager.hydrate_heavy_fields([template], "jsx-component-vector-index")
+        if not template.get('jsx_code'):
+            self.logger.warning(f"테이블 템플릿 '{template.get('component_name', template['id'])}' 본문 조회 실패, 실시간 검색 사용")
+            return None
+        self.logger.info(f"템플릿 테이블 조회: {template.get('component_name', template['id'])} ({lookup_key})")
+        return template['jsx_code']
 
     def _create_query_from_unified_patterns(self, section_data: Dict, ai_search_patterns: List[Dict], jsx_patterns: List[Dict]) -> str:
         """✅ 통합 벡터 패턴 기반 검색 쿼리 생성"""
@@ -311,6 +337,54 @@ class SectionStyleAnalyzer:
         
         return " ".join(filter(None, query_parts))
         
+    def _build_search_query(self, section_data: Dict, layout_strategy: Optional[Dict] = None) -> Tuple[str, int, str]:
+        """템플릿 검색 쿼리, 이미지 수, 쿼리 생성 방식 반환 (검색 계획 수립 시에도 사용)"""
+        metadata = section_data.get('metadata', {})
+        ai_search_patterns = metadata.get('ai_search_patterns', [])
+        jsx_patterns = metadata.get('jsx_patterns', [])
+
+        # 콘텐츠 추출
+        final_content = section_data.get('final_content', '')
+        if not final_content and 'content' in section_data:
+            final_content = section_data.get('content', '')
+
+        # 1. 검색 쿼리 텍스트 생성 (통합 패턴 활용)
+        if ai_search_patterns or jsx_patterns:
+            query_source = "통합 벡터 패턴 기반"
+            query_text = self._create_query_from_unified_patterns(section_data, ai_search_patterns, jsx_patterns)
+        elif layout_strategy:
+            query_source = f"레이아웃 전략({layout_strategy.get('layout_type', '알 수 없음')}) 기반"
+            query_text = self._create_query_from_layout_strategy(section_data, layout_strategy)
+        else:
+            query_source = "기본"
+            query_text = self._create_query_text(final_content, metadata)
+
+        # 2. 이미지 수 추출
+        image_count = metadata.get('image_count')
+        if image_count is None:
+            if layout_strategy and "image_placement" in layout_strategy:
+                if layout_strategy["image_placement"].lower() == "없음":
+                    image_count = 0
+                else:
+                    image_count = 1
+            elif "image" in final_content.lower() or "photo" in final_content.lower():
+                image_count = 2
+            else:
+                image_count = 0
+
+        return query_text, image_count, query_source
+
+    def plan_vector_searches(self, section_data: Dict, layout_strategy: Optional[Dict] = None) -> List[Tuple]:
+        """analyze_and_select_template가 실행할 벡터 검색 요청 목록 (섹션 간 검색 계획용)"""
+        lookup_key = self.template_lookup_key(section_data, layout_strategy)
+        if lookup_key is not None and get_layout_lookup_table().has_template(lookup_key):
+            return []
+        query_text, _, _ = self._build_search_query(section_data, layout_strategy)
+        if self.vector_manager and self.vector_manager.search_lexical_templates(query_text, top_k=5) is not None:
+            # 어휘 빠른 경로로 처리되는 섹션은 벡터 검색을 미리 실행하지 않음
+            return []
+        return [("jsx-component-vector-index", query_text, 5, None)]
+
     def _get_default_template(self) -> str:
         """기본 템플릿 반환"""
         return """
@@ -3,21 +3,25 @@ import json
 import time
 import re
 import html
+from contextlib import aclosing
 from typing import Dict, List, Any
-from ...custom_llm import get_azure_llm
+from ...custom_llm import StreamCompletion, get_azure_llm
 from ...utils.isolation.ai_search_isolation import AISearchIsolationManager
 from ...utils.isolation.session_isolation import SessionAwareMixin
 from ...utils.isolation.agent_communication_isolation import InterAgentCommunicationMixin
 from ...utils.log.logging_manager import LoggingManager
 from ...utils.data.jsx_vector_manager import JSXVectorManager
 from ...utils.data.pdf_vector_manager import PDFVectorManager
+from ...utils.data.stream_parsers import IncrementalJSXParser
 
 _CHEVRON_RE = re.compile(r'<{2,}\s*([A-Za-z/])')
+# JSX 생성 프롬프트(_create_jsx_generation_prompt)를 바꾸면 올림 (이전 캐시 응답 무효화)
+JSX_GENERATION_PROMPT_VERSION = "1"
 
 class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
 
     def __init__(self, logger: Any = None, vector_manager: PDFVectorManager = None):
-        self.llm = get_azure_llm()
+        self.llm = get_azure_llm(self.__class__.__name__)
         self.logger = logger
         self._setup_logging_system()
         
@@ -107,7 +111,7 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
             is_subsection = content_data.get("metadata", {}).get("is_subsection", False)
             
             # ✅ 1단계: 콘텐츠 요구사항 분석
-            content_requirements = self._analyze_content_requirements(content_data)
+            content_requirements = await self._analyze_content_requirements(content_data)
             
             # ✅ 2단계: 템플릿 구조 분석 및 적합성 평가
             if template_code and len(template_code.strip()) > 100:
@@ -158,7 +162,7 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
             self.logger.error(f"지능형 JSX 생성 실패: {e}")
             return self._create_fallback_jsx(content_data, str(e))
 
-    def _analyze_content_requirements(self, content_data: Dict) -> Dict:
+    async def _analyze_content_requirements(self, content_data: Dict) -> Dict:
         """✅ 콘텐츠 요구사항을 벡터 데이터와 매칭하여 분석"""
         
         images = content_data.get("images", [])
@@ -181,7 +185,7 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
         # ✅ 벡터 검색으로 유사한 콘텐츠 패턴 찾기
         if self.jsx_vector_available:
             try:
-                similar_patterns = self.jsx_vector_manager.search_jsx_components(
+                similar_patterns = await self.jsx_vector_manager.search_jsx_components_async(
                     query_text=f"content about {content[:100]}",
                     top_k=3
                 )
@@ -355,7 +359,7 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
         try:
             # 1. 이미지 레이아웃 개선
             if "add_image_layout" in content_requirements.get("enhancement_suggestions", []):
-                image_layouts = self.jsx_vector_manager.search_jsx_components(
+                image_layouts = await self.jsx_vector_manager.search_jsx_components_async(
                     query_text="multiple images gallery grid layout responsive",
                     category="image_focused",
                     image_count=content_requirements["image_count"],
@@ -369,7 +373,7 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
             
             # 2. 콘텐츠 영역 개선
             if "add_content_section" in content_requirements.get("enhancement_suggestions", []):
-                text_layouts = self.jsx_vector_manager.search_jsx_components(
+                text_layouts = await self.jsx_vector_manager.search_jsx_components_async(
                     query_text="text content paragraph layout typography",
                     category="text_focused",
                     top_k=3
@@ -482,7 +486,7 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
             # 콘텐츠 타입에 맞는 스타일 패턴 검색
             content_type = content_requirements.get("content_type", "general")
             
-            style_patterns = self.jsx_vector_manager.search_jsx_components(
+            style_patterns = await self.jsx_vector_manager.search_jsx_components_async(
                 query_text=f"{content_type} style design layout modern",
                 top_k=3
             )
@@ -665,7 +669,7 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
                 return self._generate_jsx_from_scratch(content_data)
             
             # 콘텐츠 요구사항에 맞는 템플릿 추천
-            recommendations = self.jsx_vector_manager.get_jsx_recommendations(
+            recommendations = await self.jsx_vector_manager.get_jsx_recommendations_async(
                 content_description=f"{content_requirements['content_type']} content with {content_requirements['image_count']} images",
                 image_count=content_requirements["image_count"],
                 layout_preference=content_requirements.get("layout_preference", "flex")
@@ -1127,11 +1131,11 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
             
             prompt = self._create_jsx_generation_prompt(content_data, template_code, subsection_info)
 
-            if not hasattr(self.llm, 'ainvoke'):
-                raise AttributeError("LLM 객체에 ainvoke 메서드가 없습니다.")
+            if not hasattr(self.llm, 'astream'):
+                raise AttributeError("LLM 객체에 astream 메서드가 없습니다.")
             
             self.logger.info(f"'{title}' 섹션에 대한 지능형 JSX 생성을 시작합니다...")
-            generated_code = await self.llm.ainvoke(prompt)
+            generated_code = await self._stream_jsx_code(prompt, title)
             
             if not generated_code or not isinstance(generated_code, str):
                 raise ValueError("LLM으로부터 유효한 JSX 코드를 받지 못했습니다.")
@@ -1148,6 +1152,30 @@ class UnifiedJSXGenerator(SessionAwareMixin, InterAgentCommunicationMixin):
             fallback_result = self._simple_template_substitution(content_data, self._get_default_template())
             return fallback_result
 
+    async def _stream_jsx_code(self, prompt: str, title: str) -> str:
+        """스트리밍으로 JSX 생성: 코드 블록이 닫히는 즉시 반환 (뒤따르는 설명 텍스트는 생성하지 않음)"""
+        parser = IncrementalJSXParser()
+
+        def report_progress(event: Dict):
+            if event["event"] == "first_token":
+                self.logger.info(f"'{title}' 섹션 JSX 첫 토큰 수신 ({event['ttft_ms']:.0f}ms)")
+
+        completion = StreamCompletion()
+        stream = self.llm.astream(prompt, cacheable=True, agent_name="UnifiedJSXGenerator",
+                                  prompt_version=JSX_GENERATION_PROMPT_VERSION, on_progress=report_progress,
+                                  completion=completion)
+        async with aclosing(stream):
+            async for delta in stream:
+                if parser.feed(delta):
+                    # 코드 블록이 닫히면 필요한 부분을 모두 받음
+                    completion.mark_complete()
+                    break
+
+        if parser.errors:
+            self.logger.warning(f"'{title}' 섹션 JSX 괄호 불일치: {parser.errors[:3]}")
+        # 코드 블록이 있으면 펜스로 감싸 반환 (_extract_jsx_code와 동일한 처리 경로 유지)
+        return f"```jsx\n{parser.code}\n```" if parser.complete else parser.text
+
     def _create_jsx_generation_prompt(self, content_data: Dict, template_code: str, subsection_info: str = "") -> str:
         """JSX 생성용 LLM 프롬프트를 구성합니다."""
         
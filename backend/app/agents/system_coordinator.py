@@ -8,6 +8,8 @@ from typing import Dict, List, Any
 from ..utils.log.hybridlogging import get_hybrid_logger
 from ..utils.data.blob_storage import BlobStorageManager
 from ..utils.log.logging_manager import LoggingManager
+from ..utils.log.llm_telemetry import get_llm_telemetry, llm_job_context
+from ..utils.data.llm_scheduler import PRIORITY_INTERACTIVE, llm_priority_context
 
 from .image_analyzer import ImageAnalyzerAgent
 from .contents.content_creator import ContentCreatorV2Crew
@@ -73,8 +75,37 @@ class SystemCoordinator:
     async def coordinate_complete_magazine_generation(self, user_input: str = None,
                                                       image_folder: str = None,
                                                       generate_pdf: bool = True,
-                                                      output_pdf_path: str = None) -> Dict:
-        """✅ 완전 통합 매거진 생성 프로세스 (PDF 생성 포함)"""
+                                                      output_pdf_path: str = None,
+                                                      priority: str = PRIORITY_INTERACTIVE) -> Dict:
+        """✅ 완전 통합 매거진 생성 프로세스 (PDF 생성 포함, LLM 호출은 magazine_id 기준으로 집계)
+
+        priority는 LLM 호출 스케줄러의 우선순위 클래스 (interactive / background / batch)
+        """
+        with llm_job_context(self.magazine_id), llm_priority_context(priority, self.user_id):
+            try:
+                return await self._run_complete_magazine_generation(
+                    user_input, image_folder, generate_pdf, output_pdf_path
+                )
+            finally:
+                self._log_llm_telemetry_summary()
+
+    def _log_llm_telemetry_summary(self):
+        """작업 종료 시 LLM 사용량 요약 로깅"""
+        summary = get_llm_telemetry().get_job_summary(self.magazine_id)
+        if not summary:
+            return
+        totals = summary["totals"]
+        self.logger.info(
+            f"📊 LLM 사용량: 호출 {totals['calls']}회 (캐시 {totals['cached']}), "
+            f"토큰 {totals['prompt_tokens']}+{totals['completion_tokens']}, "
+            f"대기 {totals['queue_wait_ms'] / 1000:.1f}초, 네트워크 {totals['network_ms'] / 1000:.1f}초, "
+            f"재시도 {totals['retries']}회, 비용 ${totals['cost_usd']:.4f}"
+        )
+
+    async def _run_complete_magazine_generation(self, user_input: str = None,
+                                                image_folder: str = None,
+                                                generate_pdf: bool = True,
+                                                output_pdf_path: str = None) -> Dict:
 
         self.logger.info("=== 📝 완전 통합 아키텍처 기반 매거진 생성 시작 ===")
         
@@ -289,8 +320,9 @@ class SystemCoordinator:
             if hasattr(self.content_creator, 'execute_content_creation') and asyncio.iscoroutinefunction(self.content_creator.execute_content_creation):
                 magazine_content = await self.content_creator.execute_content_creation(combined_text, image_analysis_results)
             else:
-                magazine_content = await asyncio.get_event_loop().run_in_executor(
-                    None, self.content_creator.execute_content_creation_sync, combined_text, image_analysis_results
+                # to_thread: 작업 컨텍스트(LLM 텔레메트리 job ID)를 스레드로 전달
+                magazine_content = await asyncio.to_thread(
+                    self.content_creator.execute_content_creation_sync, combined_text, image_analysis_results
                 )
 
             if not magazine_content:
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 #from .routes import auth, articles, comments, profiles, speech, storage, analytics, magazine
-from .routes import auth, articles, comments, profiles, speech, storage, analytics, daily, magazine
+from .routes import auth, articles, comments, profiles, speech, storage, analytics, daily, magazine, health, telemetry
 
 def create_api_router() -> APIRouter:
     """모든 라우터를 통합하는 API 라우터 생성"""
@@ -16,4 +16,6 @@ def create_api_router() -> APIRouter:
     api_router.include_router(analytics.router)
     api_router.include_router(magazine.router)
     api_router.include_router(daily.router)
+    api_router.include_router(health.router)
+    api_router.include_router(telemetry.router)
     return api_router
\ No newline at end of file
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from ..dependencies import require_auth
+from ...utils.data.dependency_health import DEPENDENCIES, get_dependency_health_monitor
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+@router.get("/", summary="외부 의존성 상태 반환")
+async def dependency_health(request: Request, refresh: bool = False):
+    """백그라운드 점검으로 캐시된 Search / OpenAI / Cosmos / Blob 상태를 반환합니다.
+    refresh=true면 즉시 다시 점검합니다 (외부 서비스를 호출하므로 로그인 필요)."""
+    if refresh:
+        await require_auth(request)
+    monitor = get_dependency_health_monitor()
+    dependencies = await monitor.refresh() if refresh else monitor.get_status()
+
+    statuses = [result["status"] for result in dependencies.values()]
+    if "unhealthy" in statuses:
+        overall = "unhealthy"
+    elif "degraded" in statuses or "unknown" in statuses:
+        overall = "degraded"
+    else:
+        overall = "healthy"
+
+    return JSONResponse(status_code=200, content={
+        "success": True,
+        "status": overall,
+        "interval_seconds": monitor.interval,
+        "dependencies": dependencies
+    })
+
+@router.get("/{dependency}", summary="특정 의존성 상태 반환")
+async def single_dependency_health(dependency: str):
+    """search / openai / cosmos / blob 중 하나의 캐시된 점검 결과를 반환합니다."""
+    if dependency not in DEPENDENCIES:
+        return JSONResponse(status_code=404, content={
+            "success": False,
+            "message": f"알 수 없는 의존성: {dependency}",
+            "supported": list(DEPENDENCIES)
+        })
+    return JSONResponse(status_code=200, content={
+        "success": True,
+        "dependency": dependency,
+        **get_dependency_health_monitor().get_status(dependency)
+    })
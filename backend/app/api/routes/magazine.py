@@ -7,6 +7,7 @@ import logging
 
 from ...crud.data.database import get_db
 from ...agents.system_coordinator import SystemCoordinator
+from ...utils.data.llm_scheduler import PRIORITY_BACKGROUND
 from ...utils.log.hybridlogging import get_hybrid_logger
 from ..dependencies import require_auth
 from ...db.magazine_db_utils import MagazineDBUtils
@@ -127,10 +128,12 @@ async def generate_magazine_async(
             
             system_coordinator = SystemCoordinator(user_id=user_id, magazine_id=magazine_id)
             
+            # 응답을 기다리는 사용자가 없으므로 LLM 호출은 대화형 요청에 양보
             final_result = await system_coordinator.coordinate_complete_magazine_generation(
                 user_input=user_input,
                 image_folder=image_folder,
-                generate_pdf=generate_pdf
+                generate_pdf=generate_pdf,
+                priority=PRIORITY_BACKGROUND
             )
             
             if "error" not in final_result:
@@ -94,7 +94,7 @@ async def edit_profile(
         content = await profile_image.read()
 
         # Optional: Safety check
-        is_safe, analysis = is_image_safe_for_upload(content, profile_image.filename)
+        is_safe, analysis = is_image_safe_for_upload(content, profile_image.filename, user_id=user_id)
         if not is_safe:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -17,7 +17,9 @@ from ...crud.utils.azure_utils import (
     upload_interview_result,
     delete_interview_result,
     list_text_files,
-    list_user_folders
+    list_user_folders,
+    check_images_safety_batch,
+    is_supported_image_format
 )
 from ..dependencies import require_auth
  
@@ -47,23 +49,42 @@ async def upload_user_images(
     uploaded = []
     skipped = []
  
+    # 파일을 먼저 모두 읽은 뒤 안전성 검사를 동시에 수행 (판정은 캐시되어 업로드 시 재사용)
+    contents = []
     for file in files:
         try:
-            content = await file.read()
-            success, final_filename = upload_image_if_not_exists(user_id, magazine_id, file.filename, content)
+            contents.append((file.filename, await file.read()))
+        except Exception as e:
+            skipped.append({"filename": file.filename, "reason": f"Upload error: {str(e)}"})
+ 
+    safety_results = await check_images_safety_batch(
+        [(filename, content) for filename, content in contents if is_supported_image_format(filename)],
+        user_id=user_id
+    )
+    safety_iter = iter(safety_results)
+ 
+    for filename, content in contents:
+        try:
+            if is_supported_image_format(filename):
+                is_safe, safety_result = next(safety_iter)
+                if not is_safe:
+                    skipped.append({"filename": filename, "reason": f"Image failed content safety check: {safety_result}"})
+                    continue
+ 
+            success, final_filename = upload_image_if_not_exists(user_id, magazine_id, filename, content)
            
             if success:
                 uploaded.append({
-                    "original_filename": file.filename,
+                    "original_filename": filename,
                     "stored_filename": final_filename
                 })
             else:
-                skipped.append({"filename": file.filename, "reason": "Upload failed"})
+                skipped.append({"filename": filename, "reason": "Upload failed"})
                
         except ValueError as e:
-            skipped.append({"filename": file.filename, "reason": str(e)})
+            skipped.append({"filename": filename, "reason": str(e)})
         except Exception as e:
-            skipped.append({"filename": file.filename, "reason": f"Upload error: {str(e)}"})
+            skipped.append({"filename": filename, "reason": f"Upload error: {str(e)}"})
  
     return JSONResponse(
         status_code=207,
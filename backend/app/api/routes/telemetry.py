@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
+
+from ..dependencies import require_auth
+from ...db.magazine_db_utils import MagazineDBUtils
+from ...utils.data.llm_latency_tracker import get_llm_latency_tracker
+from ...utils.data.llm_rate_limiter import get_completion_size_tracker, get_llm_rate_limiter_stats
+from ...utils.data.llm_response_cache import get_llm_response_cache
+from ...utils.data.llm_scheduler import get_llm_scheduler
+from ...utils.log.llm_telemetry import get_llm_telemetry
+
+router = APIRouter(prefix="/telemetry", tags=["telemetry"])
+
+@router.get("/llm", summary="에이전트별 LLM 사용량 반환")
+async def llm_telemetry_summary():
+    """프로세스 시작 이후 에이전트별 LLM 호출 수, 토큰, 대기/네트워크 시간, 재시도, 헤지/타임아웃, 종료 사유, 비용과 제한기/예상 응답 크기/캐시/지연 시간 분포, 우선순위 클래스별 대기열 깊이/대기 시간을 반환합니다."""
+    response_cache = get_llm_response_cache()
+    scheduler = get_llm_scheduler()
+    return JSONResponse(status_code=200, content={
+        "success": True,
+        **get_llm_telemetry().get_summary(),
+        "rate_limiters": get_llm_rate_limiter_stats(),
+        "expected_completion_tokens": get_completion_size_tracker().stats(),
+        "response_cache": response_cache.stats() if response_cache else None,
+        "latency": get_llm_latency_tracker().stats(),
+        "scheduler": scheduler.stats() if scheduler else None
+    })
+
+@router.get("/llm/{magazine_id}", summary="매거진 작업별 LLM 사용량 반환")
+async def llm_job_telemetry(magazine_id: str, include_calls: bool = False, user_id: str = Depends(require_auth)):
+    """매거진 생성 작업 하나의 LLM 사용량을 에이전트별로 반환합니다. include_calls=true면 최근 호출 기록을 포함합니다."""
+    magazine_data = await MagazineDBUtils.get_magazine_by_id(magazine_id)
+    if magazine_data and magazine_data.get("user_id") != user_id:
+        return JSONResponse(status_code=403, content={
+            "success": False,
+            "message": "해당 매거진에 접근할 권한이 없습니다."
+        })
+
+    summary = get_llm_telemetry().get_job_summary(magazine_id, include_calls=include_calls)
+    if summary is None:
+        return JSONResponse(status_code=404, content={
+            "success": False,
+            "message": f"기록된 LLM 사용량이 없습니다: {magazine_id}"
+        })
+    return JSONResponse(status_code=200, content={"success": True, **summary})
@@ -8,7 +8,12 @@ from dotenv import load_dotenv
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from PIL import Image, ImageOps
+import asyncio
 import io
+import threading
+
+from .safety_prefilter import get_image_safety_prefilter
+from ...utils.data.reverse_geocoder import extract_location_metadata
 
 
 
@@ -23,6 +28,25 @@ CONTENT_SAFETY_KEY = os.getenv("CONTENT_SAFETY_KEY", "").strip().strip("'\"").rs
 
 blob_service_client = BlobServiceClient.from_connection_string(AZURE_CONNECTION_STRING)
 
+_content_safety_client = None
+_content_safety_client_lock = threading.Lock()
+
+
+def get_content_safety_client() -> ContentSafetyClient:
+    """Return a process-wide ContentSafetyClient (reuses its HTTP connection pool)"""
+    global _content_safety_client
+    if not CONTENT_SAFETY_ENDPOINT or not CONTENT_SAFETY_KEY:
+        raise ValueError("Content Safety endpoint and key must be configured")
+    if _content_safety_client is None:
+        with _content_safety_client_lock:
+            if _content_safety_client is None:
+                _content_safety_client = ContentSafetyClient(
+                    endpoint=CONTENT_SAFETY_ENDPOINT,
+                    credential=AzureKeyCredential(CONTENT_SAFETY_KEY)
+                )
+    return _content_safety_client
+
+
 def get_or_create_container():
     container_name = "user"
     container_client = blob_service_client.get_container_client(container_name)
@@ -45,12 +69,19 @@ def upload_image_if_not_exists(user_id: str, magazine_id: str, filename: str, co
     if not is_supported_image_format(filename):
         raise ValueError(f"Unsupported image format: {filename}")
     
-    # Check content safety first (with original content)
-    is_safe, safety_result = is_image_safe_for_upload(content, filename)
+    # Check content safety first (with original content; cached verdicts are reused)
+    is_safe, safety_result = is_image_safe_for_upload(content, filename, user_id=user_id)
     if not is_safe:
         raise ValueError(f"Image failed content safety check: {safety_result}")
     
-    # Process image (convert to RGB, apply EXIF rotation)
+    # Reverse-geocode EXIF GPS once at upload time; only country/city are kept as blob metadata
+    try:
+        location_metadata = extract_location_metadata(content)
+    except Exception as e:
+        print(f"⚠️ EXIF GPS 위치 추출 실패 ({filename}): {e}")
+        location_metadata = {}
+
+    # Process image (convert to RGB, apply EXIF rotation, strip EXIF including GPS)
     processed_content = process_image_bytes(content)
     
     # Generate sequential filename
@@ -64,7 +95,8 @@ def upload_image_if_not_exists(user_id: str, magazine_id: str, filename: str, co
     blob_client.upload_blob(
         processed_content, 
         overwrite=False,
-        content_settings=ContentSettings(content_type="image/jpeg")
+        content_settings=ContentSettings(content_type="image/jpeg"),
+        metadata=location_metadata or None
     )
     
     return True, new_filename
@@ -110,16 +142,7 @@ def analyze_image_from_blob(image_content: bytes, filename: str = "") -> dict:
     Analyze image content using Azure Content Safety API.
     Returns result dict including 'should_filter' flag and per-category analysis.
     """
-    if not CONTENT_SAFETY_ENDPOINT or not CONTENT_SAFETY_KEY:
-        raise ValueError("Content Safety endpoint and key must be configured")
-    
-    print(f"Using Content Safety endpoint: {CONTENT_SAFETY_ENDPOINT}")
-    print(f"Content Safety key configured: {'Yes' if CONTENT_SAFETY_KEY else 'No'}")
-    
-    client = ContentSafetyClient(
-        endpoint=CONTENT_SAFETY_ENDPOINT,
-        credential=AzureKeyCredential(CONTENT_SAFETY_KEY)
-    )
+    client = get_content_safety_client()
 
     # Create the request with proper image data
     image_data = ImageData(content=image_content)
@@ -167,14 +190,35 @@ def analyze_image_from_blob(image_content: bytes, filename: str = "") -> dict:
     return results
 
 
-def is_image_safe_for_upload(image_bytes: bytes, filename: str = "") -> tuple[bool, dict]:
+def is_image_safe_for_upload(image_bytes: bytes, filename: str = "", user_id: str = None) -> tuple[bool, dict]:
+    """
+    Check image safety with the local prefilter first (verdict cache, per-user pHash
+    allowlist, local ONNX NSFW model). Azure Content Safety is only called for images
+    the local stage cannot confidently pass.
+    """
     try:
-        result = analyze_image_from_blob(image_bytes, filename)
-        return not result["should_filter"], result
+        return get_image_safety_prefilter().check(image_bytes, filename, user_id, analyze_image_from_blob)
     except Exception as e:
         return False, {"error": str(e)}
 
 
+async def check_images_safety_batch(items: list[tuple[str, bytes]], user_id: str = None,
+                                    max_concurrent: int = 8) -> list[tuple[bool, dict]]:
+    """
+    Run safety checks for several (filename, content) pairs concurrently.
+    Results are returned in input order and stored in the verdict cache, so a
+    following upload_image_if_not_exists call does not hit the remote API again.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent)
+    loop = asyncio.get_running_loop()
+
+    async def _check(filename: str, content: bytes) -> tuple[bool, dict]:
+        async with semaphore:
+            return await loop.run_in_executor(None, is_image_safe_for_upload, content, filename, user_id)
+
+    return await asyncio.gather(*[_check(filename, content) for filename, content in items])
+
+
 def upload_profile_image(user_id: str, content: bytes, filename: str = "profile_image.jpg") -> str:
     """
     Uploads the user's profile image to Azure Blob Storage and returns the blob URL.
@@ -277,7 +321,7 @@ def list_text_files(user_id: str, magazine_id: str):
 def process_image_bytes(image_bytes: bytes) -> bytes:
     """
     Process image bytes: apply EXIF rotation and convert to RGB
-    Returns processed image as JPEG bytes
+    Returns processed image as JPEG bytes (EXIF, including GPS, is not kept)
     """
     # Open image directly from bytes
     img = Image.open(io.BytesIO(image_bytes))
@@ -333,13 +377,7 @@ def analyze_text_from_blob(text_content: str, filename: str = "") -> dict:
     Analyze text content using Azure Content Safety API.
     Returns result dict including 'should_filter' flag and per-category analysis.
     """
-    if not CONTENT_SAFETY_ENDPOINT or not CONTENT_SAFETY_KEY:
-        raise ValueError("Content Safety endpoint and key must be configured")
-    
-    client = ContentSafetyClient(
-        endpoint=CONTENT_SAFETY_ENDPOINT,
-        credential=AzureKeyCredential(CONTENT_SAFETY_KEY)
-    )
+    client = get_content_safety_client()
 
     request = AnalyzeTextOptions(text=text_content)
 
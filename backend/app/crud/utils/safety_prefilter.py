@@ -0,0 +1,293 @@
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+# ✅ 선택적 의존성 - 없으면 해당 단계만 건너뛰고 Azure Content Safety로 폴백
+try:
+    import numpy as np
+    from PIL import Image, ImageOps
+    IMAGE_LIBS_AVAILABLE = True
+except ImportError:
+    IMAGE_LIBS_AVAILABLE = False
+
+try:
+    import imagehash
+    IMAGEHASH_AVAILABLE = True
+except ImportError:
+    IMAGEHASH_AVAILABLE = False
+
+try:
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+
+load_dotenv()
+
+# 기대 모델: 224x224 RGB 입력(ImageNet 평균/표준편차 정규화, NCHW 또는 NHWC)의 5-클래스 NSFW 분류기 ONNX 변환본
+# 출력 클래스 순서: 0=drawings, 1=hentai, 2=neutral, 3=porn, 4=sexy (안전 클래스 = drawings, neutral)
+DEFAULT_NSFW_MODEL_PATH = Path(__file__).parent.parent.parent / "model" / "nsfw_onnx" / "nsfw_classifier.onnx"
+
+NSFW_MODEL_PATH = Path(os.getenv("NSFW_ONNX_MODEL_PATH", str(DEFAULT_NSFW_MODEL_PATH)))
+# 안전 클래스 인덱스 (쉼표 구분, P(NSFW) = 1 - 안전 클래스 확률 합). 다른 모델을 쓰면 레이블 순서에 맞게 지정
+# 예: [safe, nsfw] 2-클래스 모델은 "0". 출력이 1개(시그모이드)인 모델은 그 값을 P(NSFW)로 사용
+NSFW_SAFE_CLASS_INDICES = tuple(
+    int(index) for index in os.getenv("NSFW_SAFE_CLASS_INDICES", "0,2").split(",") if index.strip()
+)
+# 로컬 모델의 NSFW 확률이 이 값 이하일 때만 "확실히 안전"으로 통과 (그 외는 Azure 검사)
+NSFW_SAFE_THRESHOLD = float(os.getenv("NSFW_SAFE_THRESHOLD", "0.05"))
+# 사용자 승인 이미지와의 pHash 해밍 거리 허용치
+PHASH_MAX_DISTANCE = int(os.getenv("SAFETY_PHASH_MAX_DISTANCE", "4"))
+SAFETY_CACHE_SIZE = int(os.getenv("SAFETY_VERDICT_CACHE_SIZE", "4096"))
+SAFETY_CACHE_TTL_SECONDS = int(os.getenv("SAFETY_VERDICT_CACHE_TTL", str(24 * 3600)))
+ALLOWLIST_MAX_PER_USER = 500
+
+
+def content_sha256(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class SafetyVerdictCache:
+    """콘텐츠 해시(sha256) 기준 안전성 판정 LRU 캐시"""
+
+    def __init__(self, max_size: int = SAFETY_CACHE_SIZE, ttl_seconds: int = SAFETY_CACHE_TTL_SECONDS):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, bool, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, content_hash: str) -> Optional[Tuple[bool, dict]]:
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is None or time.time() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[content_hash]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(content_hash)
+            self.hits += 1
+            return entry[1], entry[2]
+
+    def put(self, content_hash: str, is_safe: bool, result: dict):
+        with self._lock:
+            self._entries[content_hash] = (time.time(), is_safe, result)
+            self._entries.move_to_end(content_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+
+class PerceptualHashAllowlist:
+    """사용자별로 이미 승인된 이미지의 pHash 목록 (재업로드/리사이즈본은 원격 검사 생략)"""
+
+    def __init__(self, max_distance: int = PHASH_MAX_DISTANCE, max_per_user: int = ALLOWLIST_MAX_PER_USER):
+        self.max_distance = max_distance
+        self.max_per_user = max_per_user
+        self._hashes: Dict[str, "OrderedDict[str, object]"] = {}
+        self._lock = threading.Lock()
+
+    def contains(self, user_id: str, phash) -> bool:
+        if not user_id or phash is None:
+            return False
+        with self._lock:
+            user_hashes = list(self._hashes.get(user_id, {}).values())
+        return any(phash - approved <= self.max_distance for approved in user_hashes)
+
+    def add(self, user_id: str, phash):
+        if not user_id or phash is None:
+            return
+        with self._lock:
+            user_hashes = self._hashes.setdefault(user_id, OrderedDict())
+            user_hashes[str(phash)] = phash
+            while len(user_hashes) > self.max_per_user:
+                user_hashes.popitem(last=False)
+
+
+class LocalNSFWClassifier:
+    """소형 ONNX NSFW 분류기 (입력 224x224 RGB, P(NSFW) = 1 - 안전 클래스 확률 합)"""
+
+    def __init__(self, model_path: Path = NSFW_MODEL_PATH, safe_class_indices: Tuple[int, ...] = NSFW_SAFE_CLASS_INDICES):
+        self.model_path = Path(model_path)
+        self.safe_class_indices = safe_class_indices
+        self.session = None
+        self.input_name = None
+        self.input_layout = "NCHW"
+        self.available = False
+        self._lock = threading.Lock()
+
+        if not (ONNX_AVAILABLE and IMAGE_LIBS_AVAILABLE):
+            return
+        if not self.model_path.exists():
+            print(f"⚠️ NSFW ONNX 모델 파일을 찾을 수 없습니다: {self.model_path} (Azure Content Safety만 사용)")
+            return
+
+        try:
+            self.session = ort.InferenceSession(str(self.model_path), providers=['CPUExecutionProvider'])
+            model_input = self.session.get_inputs()[0]
+            self.input_name = model_input.name
+            # (N, 224, 224, 3) 형태의 모델(Keras 변환본)도 지원
+            if len(model_input.shape) == 4 and model_input.shape[-1] == 3:
+                self.input_layout = "NHWC"
+            self.available = True
+            print(f"✅ 로컬 NSFW 분류기 로드 완료: {self.model_path.name}")
+        except Exception as e:
+            print(f"⚠️ 로컬 NSFW 분류기 로드 실패: {e}")
+
+    def _preprocess(self, img: "Image.Image"):
+        img = img.convert("RGB").resize((224, 224))
+        array = np.asarray(img, dtype=np.float32) / 255.0
+        mean = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+        std = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+        array = (array - mean) / std
+        if self.input_layout == "NCHW":
+            array = array.transpose(2, 0, 1)
+        return array[np.newaxis, ...]
+
+    def predict_nsfw_probability(self, img: "Image.Image") -> Optional[float]:
+        if not self.available:
+            return None
+        try:
+            with self._lock:
+                outputs = self.session.run(None, {self.input_name: self._preprocess(img)})
+            scores = np.asarray(outputs[0], dtype=np.float32).reshape(-1)
+            if scores.size == 1:
+                return float(scores[0])
+            # 로짓 출력이면 softmax 적용
+            if scores.min() < 0 or abs(float(scores.sum()) - 1.0) > 1e-3:
+                exp = np.exp(scores - scores.max())
+                scores = exp / exp.sum()
+            if not self.safe_class_indices or max(self.safe_class_indices) >= scores.size:
+                # 레이블 설정이 모델 출력과 맞지 않으면 로컬 분류기를 끄고 Azure 검사만 사용
+                print(f"⚠️ NSFW_SAFE_CLASS_INDICES {self.safe_class_indices}가 모델 출력 클래스 수({scores.size})와 맞지 않아 로컬 분류기를 비활성화합니다")
+                self.available = False
+                return None
+            return max(0.0, 1.0 - float(scores[list(self.safe_class_indices)].sum()))
+        except Exception as e:
+            print(f"⚠️ 로컬 NSFW 추론 실패: {e}")
+            return None
+
+
+class ImageSafetyPrefilter:
+    """Azure Content Safety 호출 전 로컬 1차 필터
+
+    순서: sha256 판정 캐시 → 사용자 pHash 허용 목록 → 로컬 ONNX 분류기 → Azure Content Safety
+    로컬 단계는 "확실히 안전"한 이미지만 통과시키며 차단 판정은 항상 Azure 결과를 따릅니다.
+    """
+
+    def __init__(self, classifier: Optional[LocalNSFWClassifier] = None):
+        self.verdict_cache = SafetyVerdictCache()
+        self.allowlist = PerceptualHashAllowlist()
+        self.classifier = classifier if classifier is not None else LocalNSFWClassifier()
+        self._stats_lock = threading.Lock()
+        self.stats = {"cache": 0, "allowlist": 0, "local_model": 0, "remote": 0, "errors": 0}
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def _open_image(self, image_bytes: bytes):
+        if not IMAGE_LIBS_AVAILABLE:
+            return None
+        try:
+            img = Image.open(io.BytesIO(image_bytes))
+            return ImageOps.exif_transpose(img)
+        except Exception:
+            return None
+
+    def check(self, image_bytes: bytes, filename: str, user_id: Optional[str],
+              remote_check: Callable[[bytes, str], dict]) -> Tuple[bool, dict]:
+        """이미지 안전성 판정. remote_check는 Azure Content Safety 분석 함수"""
+        content_hash = content_sha256(image_bytes)
+
+        # 1. 동일 콘텐츠 판정 캐시
+        cached = self.verdict_cache.get(content_hash)
+        if cached is not None:
+            self._count("cache")
+            is_safe, result = cached
+            return is_safe, {**result, "filename": filename, "verdict_source": "cache"}
+
+        img = self._open_image(image_bytes)
+        phash = imagehash.phash(img) if (img is not None and IMAGEHASH_AVAILABLE) else None
+
+        # 2. 사용자가 이미 승인받은 이미지와 지각적으로 동일
+        if self.allowlist.contains(user_id, phash):
+            self._count("allowlist")
+            result = self._local_result(filename, image_bytes, "phash_allowlist")
+            self.verdict_cache.put(content_hash, True, result)
+            return True, result
+
+        # 3. 로컬 NSFW 분류기가 확실히 안전하다고 판단
+        nsfw_probability = self.classifier.predict_nsfw_probability(img) if img is not None else None
+        if nsfw_probability is not None and nsfw_probability <= NSFW_SAFE_THRESHOLD:
+            self._count("local_model")
+            result = self._local_result(filename, image_bytes, "local_model")
+            result["nsfw_probability"] = round(nsfw_probability, 4)
+            self.verdict_cache.put(content_hash, True, result)
+            self.allowlist.add(user_id, phash)
+            return True, result
+
+        # 4. Azure Content Safety (오류는 캐시하지 않음)
+        try:
+            result = remote_check(image_bytes, filename)
+        except Exception as e:
+            self._count("errors")
+            return False, {"error": str(e)}
+
+        self._count("remote")
+        is_safe = not result["should_filter"]
+        result["verdict_source"] = "azure_content_safety"
+        if nsfw_probability is not None:
+            result["nsfw_probability"] = round(nsfw_probability, 4)
+        self.verdict_cache.put(content_hash, is_safe, result)
+        if is_safe:
+            self.allowlist.add(user_id, phash)
+        return is_safe, result
+
+    def _local_result(self, filename: str, image_bytes: bytes, source: str) -> dict:
+        return {
+            "filename": filename,
+            "image_size": len(image_bytes),
+            "analysis": {},
+            "should_filter": False,
+            "verdict_source": source
+        }
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats["verdict_cache"] = self.verdict_cache.stats()
+        stats["local_model_available"] = self.classifier.available
+        return stats
+
+
+_prefilter_instance: Optional[ImageSafetyPrefilter] = None
+_prefilter_lock = threading.Lock()
+
+
+def get_image_safety_prefilter() -> ImageSafetyPrefilter:
+    """프로세스 공유 프리필터 (모델/캐시/허용 목록 1회 초기화)"""
+    global _prefilter_instance
+    if _prefilter_instance is None:
+        with _prefilter_lock:
+            if _prefilter_instance is None:
+                _prefilter_instance = ImageSafetyPrefilter()
+    return _prefilter_instance
@@ -2,18 +2,132 @@ import os
 import json
 import asyncio
 import random
+import threading
 import time
+import weakref
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+import httpx
 from dotenv import load_dotenv
 from crewai.llm import BaseLLM
-from openai import AzureOpenAI
-from typing import Any, Dict, List, Optional, Union
+from openai import APITimeoutError, AsyncAzureOpenAI, AzureOpenAI, RateLimitError
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
+from .utils.data.llm_latency_tracker import LatencyKey, get_llm_latency_tracker
+from .utils.data.llm_rate_limiter import (
+    estimate_tokens, get_completion_size_tracker, get_llm_rate_limiter, retry_after_seconds
+)
+from .utils.data.llm_response_cache import get_llm_response_cache, make_llm_cache_key
+from .utils.data.llm_scheduler import get_llm_scheduler
+from .utils.data.llm_structured_output import (
+    SchemaT, parse_llm_output, response_format_for, response_format_fingerprint
+)
+from .utils.log.llm_telemetry import LLMCallRecord, get_llm_telemetry
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원에 필요)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 load_dotenv()
 
+# ✅ 프로세스 공유 HTTP 커넥션 풀 설정 (LLM 인스턴스마다 클라이언트/풀을 만들지 않음)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "50"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "120"))
+LLM_REQUEST_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "10"))
+LLM_HTTP2_ENABLED = os.getenv("LLM_HTTP2_ENABLED", "true").lower() == "true" and HTTP2_AVAILABLE
+LLM_MAX_TOKENS = 4000
+LLM_DEFAULT_TEMPERATURE = 0.7
+
+_ClientKey = Tuple[str, str, str]
+
+
+def _http_client_options() -> Dict[str, Any]:
+    return {
+        "http2": LLM_HTTP2_ENABLED,
+        "limits": httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+        ),
+        "timeout": httpx.Timeout(LLM_REQUEST_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+    }
+
+
+# 동기 클라이언트는 스레드 안전하므로 프로세스 전체에서 공유 (CrewAI 동기 호출용)
+_sync_clients: Dict[_ClientKey, AzureOpenAI] = {}
+_sync_clients_lock = threading.Lock()
+# httpx.AsyncClient는 생성된 이벤트 루프에 묶이므로 루프별로 공유
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[_ClientKey, AsyncAzureOpenAI]]" = weakref.WeakKeyDictionary()
+
+
+def get_shared_sync_client(api_key: str, azure_endpoint: str, api_version: str) -> AzureOpenAI:
+    """프로세스 공유 동기 Azure OpenAI 클라이언트 (keep-alive 커넥션 풀 재사용)"""
+    key = (azure_endpoint, api_version, api_key)
+    client = _sync_clients.get(key)
+    if client is None:
+        with _sync_clients_lock:
+            client = _sync_clients.get(key)
+            if client is None:
+                client = AzureOpenAI(
+                    api_key=api_key,
+                    azure_endpoint=azure_endpoint,
+                    api_version=api_version,
+                    max_retries=0,  # 재시도는 _call_with_backoff에서 (429를 전역 제한기에 반영하기 위해)
+                    http_client=httpx.Client(**_http_client_options())
+                )
+                _sync_clients[key] = client
+    return client
+
+
+def get_shared_async_client(api_key: str, azure_endpoint: str, api_version: str) -> AsyncAzureOpenAI:
+    """현재 이벤트 루프의 공유 비동기 Azure OpenAI 클라이언트 (없으면 생성)"""
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    key = (azure_endpoint, api_version, api_key)
+    if key not in clients:
+        clients[key] = AsyncAzureOpenAI(
+            api_key=api_key,
+            azure_endpoint=azure_endpoint,
+            api_version=api_version,
+            max_retries=0,
+            http_client=httpx.AsyncClient(**_http_client_options())
+        )
+        print(f"🔗 AzureOpenAILLM: 공유 비동기 커넥션 풀 생성 (HTTP/2: {LLM_HTTP2_ENABLED}, "
+              f"최대 연결 {LLM_MAX_CONNECTIONS})")
+    return clients[key]
+
+
+async def close_shared_llm_clients():
+    """공유 LLM 클라이언트 종료 (앱 종료 시 호출 - 현재 루프의 비동기 풀 + 동기 풀)"""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.close()
+    with _sync_clients_lock:
+        sync_clients = list(_sync_clients.values())
+        _sync_clients.clear()
+    for client in sync_clients:
+        client.close()
+
+
+class StreamCompletion:
+    """스트리밍 소비자의 완료 신호 (필요한 부분을 모두 받았을 때 mark_complete 호출)
+
+    조기 중단된 스트림은 이 신호가 있을 때만 정상 종료로 보고 캐시합니다.
+    """
+
+    def __init__(self):
+        self.complete = False
+
+    def mark_complete(self):
+        self.complete = True
+
+
 class AzureOpenAILLM(BaseLLM):
     """Azure OpenAI API를 직접 사용하는 사용자 정의 LLM 클래스 (개선된 버전)"""
 
-    def __init__(self):
+    def __init__(self, agent_name: str = "unknown"):
         # 환경 변수 확인 및 가져오기
         self.api_key = os.getenv("AZURE_API_KEY")
         self.azure_endpoint = os.getenv("AZURE_API_BASE")
@@ -32,19 +146,31 @@ class AzureOpenAILLM(BaseLLM):
         # 부모 클래스 초기화
         super().__init__(model=f"azure/{self.deployment_name}")
 
-        # ✅ 개선된 Azure OpenAI 클라이언트 초기화 (타임아웃 및 재시도 설정)
-        self.client = AzureOpenAI(
-            api_key=self.api_key,
-            azure_endpoint=self.azure_endpoint,
-            api_version=self.api_version,
-            timeout=120.0,  # 120초 타임아웃 설정
-            max_retries=3   # 최대 3회 재시도
-        )
-        
-        # ✅ Rate limiting을 위한 설정
-        self.last_call_time = 0
-        self.min_call_interval = 0.5  # 호출 간 최소 간격 (초)
-        self.semaphore = asyncio.Semaphore(3)  # 최대 3개 동시 호출
+        # ✅ 텔레메트리 집계용 기본 에이전트 이름 (호출 시 agent_name으로 재정의 가능)
+        self.agent_name = agent_name
+        self.telemetry = get_llm_telemetry()
+
+        # ✅ 프로세스 공유 동기 클라이언트 (CrewAI의 동기 call 경로, 타임아웃/재시도는 공유 설정)
+        self.client = get_shared_sync_client(self.api_key, self.azure_endpoint, self.api_version)
+
+        # ✅ 배포별 전역 RPM/TPM 토큰 버킷 (모든 LLM 인스턴스 공유, 비활성화 시 None)
+        self.rate_limiter = get_llm_rate_limiter(self.deployment_name)
+        # ✅ (배포, 프롬프트 종류)별 예상 응답 크기 (예산은 max_tokens 대신 이 크기로 예약, 프로세스 공유)
+        self.completion_sizes = get_completion_size_tracker()
+
+        # ✅ 응답 캐시 (호출 시 cacheable=True로 표시한 호출에만 적용, 비활성화 시 None)
+        self.response_cache = get_llm_response_cache()
+
+        # ✅ (배포, 프롬프트 종류)별 지연 시간 분포 → 적응형 타임아웃 / 헤지 요청 (프로세스 공유)
+        self.latency_tracker = get_llm_latency_tracker()
+
+        # ✅ 동시 요청 슬롯 스케줄러 (우선순위 클래스 + 사용자별 공정 큐잉, 비활성화 시 None)
+        self.scheduler = get_llm_scheduler()
+
+    @property
+    def async_client(self) -> AsyncAzureOpenAI:
+        """현재 이벤트 루프의 공유 비동기 클라이언트 (스레드 풀을 점유하지 않는 네이티브 비동기 호출)"""
+        return get_shared_async_client(self.api_key, self.azure_endpoint, self.api_version)
 
     def call(
         self,
@@ -52,64 +178,177 @@ class AzureOpenAILLM(BaseLLM):
         tools: Optional[List[dict]] = None,
         callbacks: Optional[List[Any]] = None,
         available_functions: Optional[Dict[str, Any]] = None,
+        *,
+        temperature: float = LLM_DEFAULT_TEMPERATURE,
+        cacheable: bool = False,
+        agent_name: Optional[str] = None,
+        prompt_version: str = "1",
+        prompt_class: Optional[str] = None,
     ) -> Union[str, Any]:
-        """LLM에 메시지를 전송하고 응답을 받습니다 (개선된 버전)."""
-        
-        # ✅ Rate limiting 적용
-        self._apply_rate_limiting()
+        """LLM에 메시지를 전송하고 응답을 받습니다 (개선된 버전).
+
+        cacheable=True면 (배포, 메시지, temperature, max_tokens, prompt_version)이 같은 이전 응답을 재사용합니다.
+        프롬프트 템플릿을 바꾸면 prompt_version을 올려 이전 응답이 재사용되지 않게 합니다.
+        prompt_class는 지연 시간 분포(적응형 타임아웃)를 구분하는 기준이며 기본값은 에이전트 이름입니다.
+        """
+        record = LLMCallRecord(agent_name or self.agent_name, self.deployment_name, "sync")
         
         try:
             # 문자열 메시지를 적절한 형식으로 변환
             if isinstance(messages, str):
                 messages = [{"role": "user", "content": messages}]
 
+            cache_key = self._response_cache_key(messages, tools, temperature, cacheable, prompt_version)
+            if cache_key:
+                cached = self.response_cache.get(cache_key, record.agent_name)
+                if cached is not None:
+                    record.cached = record.success = True
+                    return cached
+
             # ✅ Exponential backoff를 적용한 재시도 로직
-            return self._call_with_backoff(messages, tools, available_functions)
+            content = self._call_with_backoff(messages, tools, available_functions, temperature=temperature,
+                                              record=record, latency_key=self._latency_key(record, prompt_class))
+            if cache_key and self._is_cacheable_response(record, content):
+                self.response_cache.put(cache_key, content, record.agent_name)
+            record.success = True
+            return content
 
         except Exception as e:
+            record.error = str(e)
             print(f"LLM 호출 오류: {str(e)}")
             raise RuntimeError(f"LLM 요청 실패: {str(e)}")
+        finally:
+            self.telemetry.record(record)
+
+    def _response_cache_key(self, messages, tools, temperature: float, cacheable: bool,
+                            prompt_version: str, response_format: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """캐시 대상이면 키 반환 (도구 호출은 함수 실행 결과에 의존하므로 제외)"""
+        if not cacheable or tools or self.response_cache is None:
+            return None
+        if response_format:
+            prompt_version = f"{prompt_version}:{response_format_fingerprint(response_format)}"
+        return make_llm_cache_key(self.deployment_name, messages, temperature, LLM_MAX_TOKENS, prompt_version)
+
+    @staticmethod
+    def _is_valid_output(content: str, output_validator: Optional[Callable[[str], Any]]) -> bool:
+        if output_validator is None:
+            return True
+        try:
+            output_validator(content)
+        except Exception:
+            return False
+        return True
 
-    def _apply_rate_limiting(self):
-        """Rate limiting 적용"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time
-        
-        if time_since_last < self.min_call_interval:
-            wait_time = self.min_call_interval - time_since_last
-            time.sleep(wait_time)
-        
-        self.last_call_time = time.time()
-
-    def _call_with_backoff(self, messages, tools=None, available_functions=None, max_retries=3):
-        """Exponential backoff를 적용한 API 호출"""
+    def _is_cacheable_response(self, record: LLMCallRecord, content,
+                               output_validator: Optional[Callable[[str], Any]] = None) -> bool:
+        """끝까지 생성되고(finish_reason=stop) 검증을 통과한 응답만 캐시 (잘린 응답이 TTL 동안 재사용되지 않게)"""
+        return (isinstance(content, str) and record.finish_reason == "stop"
+                and self._is_valid_output(content, output_validator))
+
+    def _latency_key(self, record: LLMCallRecord, prompt_class: Optional[str]) -> LatencyKey:
+        return (self.deployment_name, prompt_class or record.agent_name)
+
+    def _estimate_request_tokens(self, messages, latency_key: LatencyKey) -> int:
+        """예약할 토큰 수: 프롬프트 추정치 + 이 프롬프트 종류의 예상 응답 크기 (실제 사용량은 응답 후 보정)"""
+        return estimate_tokens(messages, self.completion_sizes.expected(latency_key, LLM_MAX_TOKENS))
+
+    @contextmanager
+    def _scheduled(self, estimated_tokens: int, record: LLMCallRecord) -> Iterator[None]:
+        """스케줄러 슬롯을 잡고 요청 1건 수행 (동기), 슬롯 대기 시간은 queue_wait에 합산"""
+        if self.scheduler is None:
+            yield
+            return
+        with self.scheduler.slot_sync(estimated_tokens) as waited:
+            record.queue_wait_ms += waited * 1000
+            yield
+
+    @asynccontextmanager
+    async def _scheduled_async(self, estimated_tokens: int, record: LLMCallRecord) -> AsyncIterator[None]:
+        if self.scheduler is None:
+            yield
+            return
+        async with self.scheduler.slot(estimated_tokens) as waited:
+            record.queue_wait_ms += waited * 1000
+            yield
+
+    def _acquire_rate_limit(self, estimated_tokens: int, record: LLMCallRecord):
+        """전역 버킷에서 요청/토큰 예산 확보 (동기), 대기 시간은 텔레메트리에 기록"""
+        if self.rate_limiter:
+            record.queue_wait_ms += self.rate_limiter.acquire_sync(estimated_tokens) * 1000
+
+    async def _acquire_rate_limit_async(self, estimated_tokens: int, record: LLMCallRecord):
+        if self.rate_limiter:
+            record.queue_wait_ms += await self.rate_limiter.acquire(estimated_tokens) * 1000
+
+    def _record_response(self, record: LLMCallRecord, estimated_tokens: int, response, request_started: float,
+                         latency_key: LatencyKey):
+        """응답 1건의 네트워크 시간/usage를 텔레메트리, 예상 응답 크기, 전역 버킷에 반영"""
+        record.requests += 1
+        record.network_ms += (time.perf_counter() - request_started) * 1000
+        record.add_usage(response)
+        usage = getattr(response, "usage", None)
+        self.completion_sizes.record(latency_key, getattr(usage, "completion_tokens", None))
+        if self.rate_limiter:
+            self.rate_limiter.record_usage(estimated_tokens, getattr(usage, "total_tokens", None))
+
+    def _record_rate_limit_error(self, error: Exception) -> bool:
+        """429면 Retry-After를 전역 버킷에 반영하고 True (대기는 버킷이 담당)"""
+        if not isinstance(error, RateLimitError):
+            return False
+        if self.rate_limiter:
+            self.rate_limiter.penalize(retry_after_seconds(error))
+        return self.rate_limiter is not None
+
+    def _call_with_backoff(self, messages, tools=None, available_functions=None, max_retries=3,
+                           temperature=LLM_DEFAULT_TEMPERATURE, record: Optional[LLMCallRecord] = None,
+                           latency_key: Optional[LatencyKey] = None):
+        """Exponential backoff를 적용한 API 호출 (요청마다 적응형 타임아웃 적용)"""
         
+        record = record or LLMCallRecord(self.agent_name, self.deployment_name, "sync")
+        latency_key = latency_key or self._latency_key(record, None)
         last_exception = None
+        rate_limited = False
         
         for attempt in range(max_retries):
             try:
-                # ✅ 재시도 시 지연 적용
+                # ✅ 재시도 시 지연 적용 (429 이후에는 전역 버킷이 Retry-After만큼 대기시킴)
                 if attempt > 0:
-                    delay = min(2 ** attempt + random.uniform(0, 1), 30)  # 최대 30초
-                    print(f"재시도 {attempt + 1}/{max_retries} - {delay:.2f}초 대기 중...")
-                    time.sleep(delay)
+                    record.retries = attempt
+                    if not rate_limited:
+                        delay = min(2 ** attempt + random.uniform(0, 1), 30)  # 최대 30초
+                        print(f"재시도 {attempt + 1}/{max_retries} - {delay:.2f}초 대기 중...")
+                        time.sleep(delay)
 
                 # API 호출
-                if tools and self.supports_function_calling():
-                    response = self.client.chat.completions.create(
-                        model=self.deployment_name,
-                        messages=messages,
-                        tools=tools,
-                        temperature=0.7,
-                        max_tokens=4000
-                    )
-                else:
-                    response = self.client.chat.completions.create(
-                        model=self.deployment_name,
-                        messages=messages,
-                        temperature=0.7,
-                        max_tokens=4000
-                    )
+                estimated_tokens = self._estimate_request_tokens(messages, latency_key)
+                with self._scheduled(estimated_tokens, record):
+                    self._acquire_rate_limit(estimated_tokens, record)
+                    timeout = self.latency_tracker.adaptive_timeout(latency_key)
+                    request_started = time.perf_counter()
+                    try:
+                        if tools and self.supports_function_calling():
+                            response = self.client.chat.completions.create(
+                                model=self.deployment_name,
+                                messages=messages,
+                                tools=tools,
+                                temperature=temperature,
+                                max_tokens=4000,
+                                timeout=timeout
+                            )
+                        else:
+                            response = self.client.chat.completions.create(
+                                model=self.deployment_name,
+                                messages=messages,
+                                temperature=temperature,
+                                max_tokens=4000,
+                                timeout=timeout
+                            )
+                    except APITimeoutError:
+                        record.timeouts += 1
+                        self.latency_tracker.record(latency_key, timeout, timed_out=True)
+                        raise
+                    self.latency_tracker.record(latency_key, time.perf_counter() - request_started)
+                self._record_response(record, estimated_tokens, response, request_started, latency_key)
 
                 # ✅ 응답 검증
                 if not response or not response.choices:
@@ -122,12 +361,13 @@ class AzureOpenAILLM(BaseLLM):
                 # 함수 호출 처리 (기존 로직 유지)
                 if (tools and self.supports_function_calling() 
                     and response.choices[0].message.tool_calls and available_functions):
-                    return self._handle_function_call(response, messages, available_functions)
+                    return self._handle_function_call(response, messages, available_functions, record, latency_key)
 
                 return content
 
             except Exception as e:
                 last_exception = e
+                rate_limited = self._record_rate_limit_error(e)
                 print(f"시도 {attempt + 1} 실패: {e}")
                 
                 if attempt == max_retries - 1:
@@ -136,7 +376,8 @@ class AzureOpenAILLM(BaseLLM):
         # 모든 재시도 실패
         raise RuntimeError(f"최대 재시도 {max_retries} 후 실패: {last_exception}")
 
-    def _handle_function_call(self, response, messages, available_functions):
+    def _handle_function_call(self, response, messages, available_functions, record: LLMCallRecord,
+                              latency_key: LatencyKey):
         """함수 호출 처리 (기존 로직 유지)"""
         tool_call = response.choices[0].message.tool_calls[0]
         function_name = tool_call.function.name
@@ -154,12 +395,17 @@ class AzureOpenAILLM(BaseLLM):
                 "content": str(function_response)
             })
             
-            second_response = self.client.chat.completions.create(
-                model=self.deployment_name,
-                messages=messages,
-                temperature=0.7,
-                max_tokens=4000
-            )
+            estimated_tokens = self._estimate_request_tokens(messages, latency_key)
+            with self._scheduled(estimated_tokens, record):
+                self._acquire_rate_limit(estimated_tokens, record)
+                request_started = time.perf_counter()
+                second_response = self.client.chat.completions.create(
+                    model=self.deployment_name,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=4000
+                )
+            self._record_response(record, estimated_tokens, second_response, request_started, latency_key)
             return second_response.choices[0].message.content
 
     async def ainvoke(
@@ -168,80 +414,246 @@ class AzureOpenAILLM(BaseLLM):
         tools: Optional[List[dict]] = None,
         callbacks: Optional[List[Any]] = None,
         available_functions: Optional[Dict[str, Any]] = None,
+        *,
+        temperature: float = LLM_DEFAULT_TEMPERATURE,
+        cacheable: bool = False,
+        agent_name: Optional[str] = None,
+        prompt_version: str = "1",
+        prompt_class: Optional[str] = None,
+        response_format: Optional[Dict[str, Any]] = None,
+        output_validator: Optional[Callable[[str], Any]] = None,
     ) -> str:
-        """비동기 LLM 호출 (개선된 버전)"""
+        """비동기 LLM 호출 (개선된 버전, 캐시/prompt_class 옵션은 call과 동일).
+
+        p95가 지나도록 응답이 없으면 헤지 예산 안에서 같은 요청을 한 번 더 보내 먼저 온 응답을 사용합니다.
+        response_format은 chat.completions에 그대로 전달됩니다 (스키마 검증까지 하려면 ainvoke_structured 사용).
+        output_validator(응답)가 예외를 발생시키는 응답은 캐시에 저장하지 않고, 그런 캐시 응답은 재사용하지 않습니다.
+        """
+        record = LLMCallRecord(agent_name or self.agent_name, self.deployment_name, "async")
         
-        async with self.semaphore:  # ✅ 동시 호출 수 제한
+        try:
+            formatted_messages = self._format_messages(messages)
+
+            cache_key = self._response_cache_key(formatted_messages, tools, temperature, cacheable, prompt_version,
+                                                 response_format)
+            if cache_key:
+                cached = self.response_cache.get(cache_key, record.agent_name)
+                if cached is not None and self._is_valid_output(cached, output_validator):
+                    record.cached = record.success = True
+                    return cached
+
+            # ✅ 비동기 Exponential backoff 적용 (호출 속도는 전역 버킷이 제한)
+            content = await self._ainvoke_with_backoff(
+                formatted_messages, tools, available_functions, temperature=temperature, record=record,
+                latency_key=self._latency_key(record, prompt_class), response_format=response_format
+            )
+            if cache_key and self._is_cacheable_response(record, content, output_validator):
+                self.response_cache.put(cache_key, content, record.agent_name)
+            record.success = True
+            return content
+
+        except Exception as e:
+            record.error = str(e)
+            print(f"비동기 LLM 호출 오류: {str(e)}")
+            raise RuntimeError(f"비동기 LLM 요청 실패: {str(e)}")
+        finally:
+            self.telemetry.record(record)
+
+    async def ainvoke_structured(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        schema: Type[SchemaT],
+        *,
+        temperature: float = LLM_DEFAULT_TEMPERATURE,
+        cacheable: bool = False,
+        agent_name: Optional[str] = None,
+        prompt_version: str = "1",
+        prompt_class: Optional[str] = None,
+    ) -> SchemaT:
+        """응답을 schema(pydantic 모델)의 JSON 스키마로 고정한 비동기 호출 → 검증된 모델 반환.
+
+        모델이 스키마에 맞는 JSON만 생성하므로 정규식 추출이나 복구 호출 없이 한 번에 검증합니다.
+        검증에 실패하면 재시도하지 않고 LLMOutputValidationError를 발생시킵니다 (검증된 응답만 캐시).
+        """
+        content = await self.ainvoke(
+            messages, temperature=temperature, cacheable=cacheable, agent_name=agent_name,
+            prompt_version=prompt_version, prompt_class=prompt_class, response_format=response_format_for(schema),
+            output_validator=lambda text: parse_llm_output(text, schema)
+        )
+        return parse_llm_output(content, schema)
+
+    @staticmethod
+    def _format_messages(messages) -> List[Dict[str, Any]]:
+        """메시지 형식 변환 (문자열/문자열 리스트 → chat 메시지 리스트)"""
+        if isinstance(messages, str):
+            return [{"role": "user", "content": messages}]
+        if isinstance(messages, list):
+            if messages and isinstance(messages[0], str):
+                return [{"role": "user", "content": messages[0]}]
+            return messages
+        return [{"role": "user", "content": str(messages)}]
+
+    async def astream(
+        self,
+        messages: Union[str, List[Dict[str, str]]],
+        *,
+        temperature: float = LLM_DEFAULT_TEMPERATURE,
+        cacheable: bool = False,
+        agent_name: Optional[str] = None,
+        prompt_version: str = "1",
+        prompt_class: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_retries: int = 3,
+        completion: Optional[StreamCompletion] = None,
+    ) -> AsyncIterator[str]:
+        """스트리밍 비동기 호출: 응답 텍스트 델타를 도착하는 대로 반환 (stream=True).
+
+        on_progress에는 첫 토큰 도착({"event": "first_token", "ttft_ms"})과 종료({"event": "completed"}) 이벤트가 전달됩니다.
+        소비자가 필요한 부분까지 받고 반복을 중단하면 요청이 취소되어 남은 토큰을 생성하지 않습니다.
+        cacheable=True면 끝까지 받은 텍스트를 저장하고, 적중 시 전체를 델타 하나로 반환합니다.
+        조기 중단한 스트림은 소비자가 중단 전에 completion.mark_complete()를 호출한 경우에만 그 지점까지 저장합니다
+        (예외나 취소로 닫힌 스트림은 저장하지 않음).
+        재시도는 첫 토큰 전(연결/429)까지만 수행하며, 연결 단계에는 prompt_class의 적응형 타임아웃을 적용합니다.
+        """
+        record = LLMCallRecord(agent_name or self.agent_name, self.deployment_name, "stream")
+        formatted_messages = self._format_messages(messages)
+        cache_key = self._response_cache_key(formatted_messages, None, temperature, cacheable, prompt_version)
+        if cache_key:
+            cached = self.response_cache.get(cache_key, record.agent_name)
+            if cached is not None:
+                record.cached = record.success = True
+                self.telemetry.record(record)
+                if on_progress:
+                    on_progress({"event": "first_token", "agent": record.agent_name, "ttft_ms": 0.0, "cached": True})
+                yield cached
+                return
+
+        started = time.perf_counter()
+        latency_key = self._latency_key(record, prompt_class)
+        estimated_tokens = 0
+        stream = None
+        rate_limited = False
+        # 스트림이 끝날 때까지 스케줄러 슬롯 유지
+        slot = AsyncExitStack()
+        for attempt in range(max_retries):
+            if attempt > 0:
+                record.retries = attempt
+                if not rate_limited:
+                    delay = min(2 ** attempt + random.uniform(0, 1), 30)
+                    print(f"스트리밍 재시도 {attempt + 1}/{max_retries} - {delay:.2f}초 대기 중...")
+                    await asyncio.sleep(delay)
             try:
-                # ✅ 비동기 Rate limiting 적용
-                await self._apply_rate_limiting_async()
-                
-                # 메시지 형식 변환
-                if isinstance(messages, str):
-                    formatted_messages = [{"role": "user", "content": messages}]
-                elif isinstance(messages, list):
-                    if messages and isinstance(messages[0], str):
-                        formatted_messages = [{"role": "user", "content": messages[0]}]
-                    else:
-                        formatted_messages = messages
-                else:
-                    formatted_messages = [{"role": "user", "content": str(messages)}]
-
-                # ✅ 비동기 Exponential backoff 적용
-                return await self._ainvoke_with_backoff(
-                    formatted_messages, tools, available_functions
+                estimated_tokens = self._estimate_request_tokens(formatted_messages, latency_key)
+                await slot.enter_async_context(self._scheduled_async(estimated_tokens, record))
+                await self._acquire_rate_limit_async(estimated_tokens, record)
+                request_started = time.perf_counter()
+                stream = await self.async_client.chat.completions.create(
+                    model=self.deployment_name,
+                    messages=formatted_messages,
+                    temperature=temperature,
+                    max_tokens=LLM_MAX_TOKENS,
+                    stream=True,
+                    timeout=self.latency_tracker.adaptive_timeout(latency_key)
                 )
-
+                break
             except Exception as e:
-                print(f"비동기 LLM 호출 오류: {str(e)}")
-                raise RuntimeError(f"비동기 LLM 요청 실패: {str(e)}")
-
-    async def _apply_rate_limiting_async(self):
-        """비동기 Rate limiting 적용"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_call_time
-        
-        if time_since_last < self.min_call_interval:
-            wait_time = self.min_call_interval - time_since_last
-            await asyncio.sleep(wait_time)
-        
-        self.last_call_time = time.time()
+                await slot.aclose()
+                record.timeouts += 1 if isinstance(e, APITimeoutError) else 0
+                rate_limited = self._record_rate_limit_error(e)
+                print(f"스트리밍 시도 {attempt + 1} 실패: {e}")
+                if attempt == max_retries - 1:
+                    record.error = str(e)
+                    self.telemetry.record(record)
+                    raise RuntimeError(f"스트리밍 LLM 요청 실패: {e}")
 
-    async def _ainvoke_with_backoff(self, formatted_messages, tools=None, available_functions=None, max_retries=3):
-        """비동기 Exponential backoff를 적용한 API 호출"""
+        received: List[str] = []
+        completed = False
+        try:
+            async for chunk in stream:
+                # Azure는 콘텐츠 필터 결과 등 choices가 빈 청크를 보냄
+                if not chunk.choices:
+                    continue
+                record.finish_reason = chunk.choices[0].finish_reason or record.finish_reason
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                if not received:
+                    record.ttft_ms = round((time.perf_counter() - started) * 1000, 1)
+                    if on_progress:
+                        on_progress({"event": "first_token", "agent": record.agent_name, "ttft_ms": record.ttft_ms})
+                received.append(delta)
+                yield delta
+            completed = True
+        except GeneratorExit:
+            # 완료 신호가 있을 때만 필요한 부분까지 받은 정상 중단 (예외/취소로 닫힌 경우 제외)
+            completed = completion is not None and completion.complete
+            record.finish_reason = record.finish_reason or ("consumer_stopped" if completed else "consumer_closed")
+            raise
+        except Exception as e:
+            record.error = str(e)
+            raise
+        finally:
+            await stream.close()
+            await slot.aclose()
+            text = "".join(received)
+            # 스트리밍 응답에는 usage가 없으므로 추정치 사용
+            record.requests += 1
+            record.network_ms += (time.perf_counter() - request_started) * 1000
+            record.prompt_tokens += estimate_tokens(formatted_messages)
+            record.completion_tokens += estimate_tokens(text)
+            record.usage_estimated = True
+            record.success = completed
+            if record.finish_reason in ("stop", "length"):
+                # 조기 중단된 응답은 예상 응답 크기에 반영하지 않음
+                self.completion_sizes.record(latency_key, estimate_tokens(text))
+            self.telemetry.record(record)
+            if self.rate_limiter:
+                self.rate_limiter.record_usage(estimated_tokens, record.prompt_tokens + record.completion_tokens)
+            # 끝까지 받았거나 소비자가 필요한 만큼 받고 중단한 응답만 저장 (max_tokens에서 잘린 응답 제외)
+            if cache_key and completed and text.strip() and record.finish_reason in ("stop", "consumer_stopped"):
+                self.response_cache.put(cache_key, text, record.agent_name)
+            if on_progress:
+                on_progress({"event": "completed", "agent": record.agent_name, "chars": len(text),
+                             "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)})
+
+    async def _ainvoke_with_backoff(self, formatted_messages, tools=None, available_functions=None, max_retries=3,
+                                    temperature=LLM_DEFAULT_TEMPERATURE, record: Optional[LLMCallRecord] = None,
+                                    latency_key: Optional[LatencyKey] = None,
+                                    response_format: Optional[Dict[str, Any]] = None):
+        """비동기 Exponential backoff를 적용한 API 호출 (적응형 타임아웃 + 헤지 요청)"""
         
+        record = record or LLMCallRecord(self.agent_name, self.deployment_name, "async")
+        latency_key = latency_key or self._latency_key(record, None)
         last_exception = None
+        rate_limited = False
         
         for attempt in range(max_retries):
             try:
-                # ✅ 재시도 시 비동기 지연 적용
+                # ✅ 재시도 시 비동기 지연 적용 (429 이후에는 전역 버킷이 대기시킴)
                 if attempt > 0:
-                    delay = min(2 ** attempt + random.uniform(0, 1), 30)  # 최대 30초
-                    print(f"비동기 재시도 {attempt + 1}/{max_retries} - {delay:.2f}초 대기 중...")
-                    await asyncio.sleep(delay)
-
-                # ✅ 비동기 API 호출
+                    record.retries = attempt
+                    if not rate_limited:
+                        delay = min(2 ** attempt + random.uniform(0, 1), 30)  # 최대 30초
+                        print(f"비동기 재시도 {attempt + 1}/{max_retries} - {delay:.2f}초 대기 중...")
+                        await asyncio.sleep(delay)
+
+                # ✅ 네이티브 비동기 API 호출 (공유 커넥션 풀)
+                request = {
+                    "model": self.deployment_name,
+                    "messages": formatted_messages,
+                    "temperature": temperature,
+                    "max_tokens": 4000
+                }
                 if tools and self.supports_function_calling():
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: self.client.chat.completions.create(
-                            model=self.deployment_name,
-                            messages=formatted_messages,
-                            tools=tools,
-                            temperature=0.7,
-                            max_tokens=4000
-                        )
-                    )
-                else:
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        None,
-                        lambda: self.client.chat.completions.create(
-                            model=self.deployment_name,
-                            messages=formatted_messages,
-                            temperature=0.7,
-                            max_tokens=4000
-                        )
-                    )
+                    request["tools"] = tools
+                if response_format:
+                    request["response_format"] = response_format
+                estimated_tokens = self._estimate_request_tokens(formatted_messages, latency_key)
+                async with self._scheduled_async(estimated_tokens, record):
+                    await self._acquire_rate_limit_async(estimated_tokens, record)
+                    request_started = time.perf_counter()
+                    response = await self._create_with_hedging(request, latency_key, estimated_tokens, record)
+                self._record_response(record, estimated_tokens, response, request_started, latency_key)
 
                 # ✅ 응답 검증 강화
                 if not response or not response.choices:
@@ -255,13 +667,14 @@ class AzureOpenAILLM(BaseLLM):
                 if (tools and self.supports_function_calling() 
                     and response.choices[0].message.tool_calls and available_functions):
                     return await self._handle_function_call_async(
-                        response, formatted_messages, available_functions
+                        response, formatted_messages, available_functions, record, latency_key
                     )
 
                 return content
 
             except Exception as e:
                 last_exception = e
+                rate_limited = self._record_rate_limit_error(e)
                 print(f"비동기 시도 {attempt + 1} 실패: {e}")
                 
                 if attempt == max_retries - 1:
@@ -270,7 +683,82 @@ class AzureOpenAILLM(BaseLLM):
         # 모든 재시도 실패
         raise RuntimeError(f"비동기 최대 재시도 {max_retries} 후 실패: {last_exception}")
 
-    async def _handle_function_call_async(self, response, formatted_messages, available_functions):
+    async def _create_with_hedging(self, request: Dict[str, Any], latency_key: LatencyKey, estimated_tokens: int,
+                                   record: LLMCallRecord):
+        """적응형 타임아웃으로 요청하고, p95까지 응답이 없으면 헤지 예산 안에서 같은 요청을 한 번 더 보내 먼저 온 응답 사용.
+
+        늦게 끝난 쪽은 취소합니다. 헤지 요청도 전역 버킷 예산을 쓰며, 지금 예산이 없으면 보내지 않습니다.
+        이긴 쪽 예약은 호출자가 응답 usage로 보정하고, 헤지로 추가 예약한 1건은 진 쪽 요청 기준으로 여기서 보정합니다.
+        """
+        timeout = self.latency_tracker.adaptive_timeout(latency_key)
+        hedge_after = self.latency_tracker.hedge_delay(latency_key)
+        self.latency_tracker.note_request()
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self.async_client.chat.completions.create(**request, timeout=timeout))
+        hedge = None
+        winner = None
+        tasks = [primary]
+        try:
+            if hedge_after is not None and hedge_after < timeout:
+                await asyncio.wait(tasks, timeout=hedge_after)
+                if not primary.done() and self._try_acquire_hedge(estimated_tokens):
+                    record.hedged = True
+                    print(f"⏱️ {record.agent_name}: {hedge_after:.1f}초(p95) 초과 - 헤지 요청 전송")
+                    # 헤지 요청은 원 요청의 남은 기한까지만 대기
+                    hedge = asyncio.ensure_future(
+                        self.async_client.chat.completions.create(**request, timeout=timeout - hedge_after)
+                    )
+                    tasks.append(hedge)
+                    self.latency_tracker.note_hedge_sent()
+
+            last_error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.latency_tracker.note_hedge_won()
+                        self.latency_tracker.record(latency_key, time.perf_counter() - started)
+                        winner = task
+                        return task.result()
+                    last_error = task.exception()
+
+            if isinstance(last_error, APITimeoutError):
+                record.timeouts += 1
+                self.latency_tracker.record(latency_key, timeout, timed_out=True)
+            raise last_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # 진 쪽의 실패를 회수 (미회수 예외 경고 방지)
+            if hedge is not None:
+                self._settle_hedge_reservation(primary if winner is hedge else hedge, estimated_tokens, request)
+
+    def _settle_hedge_reservation(self, loser: asyncio.Future, estimated_tokens: int, request: Dict[str, Any]):
+        """헤지로 추가 예약한 예산 보정: 진 쪽이 완료됐으면 실제 usage, 취소/실패했으면 프롬프트만 쓴 것으로 보고 응답 예약분 환급"""
+        if self.rate_limiter is None:
+            return
+        actual_tokens = None
+        if loser.done() and not loser.cancelled() and loser.exception() is None:
+            actual_tokens = getattr(getattr(loser.result(), "usage", None), "total_tokens", None)
+        if actual_tokens is None:
+            actual_tokens = estimate_tokens(request["messages"])
+        self.rate_limiter.record_usage(estimated_tokens, actual_tokens)
+
+    def _try_acquire_hedge(self, estimated_tokens: int) -> bool:
+        if not self.latency_tracker.try_acquire_hedge():
+            return False
+        if self.rate_limiter is None or self.rate_limiter.try_acquire(estimated_tokens):
+            return True
+        # 레이트 리밋으로 보내지 못한 헤지는 예산을 돌려받음
+        self.latency_tracker.refund_hedge()
+        return False
+
+    async def _handle_function_call_async(self, response, formatted_messages, available_functions,
+                                          record: LLMCallRecord, latency_key: LatencyKey):
         """비동기 함수 호출 처리"""
         tool_call = response.choices[0].message.tool_calls[0]
         function_name = tool_call.function.name
@@ -291,15 +779,17 @@ class AzureOpenAILLM(BaseLLM):
                 "content": str(function_response)
             })
             
-            second_response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
+            estimated_tokens = self._estimate_request_tokens(formatted_messages, latency_key)
+            async with self._scheduled_async(estimated_tokens, record):
+                await self._acquire_rate_limit_async(estimated_tokens, record)
+                request_started = time.perf_counter()
+                second_response = await self.async_client.chat.completions.create(
                     model=self.deployment_name,
                     messages=formatted_messages,
                     temperature=0.7,
                     max_tokens=4000
                 )
-            )
+            self._record_response(record, estimated_tokens, second_response, request_started, latency_key)
             return second_response.choices[0].message.content or ""
 
     def supports_function_calling(self) -> bool:
@@ -314,6 +804,6 @@ class AzureOpenAILLM(BaseLLM):
         """LLM의 컨텍스트 윈도우 크기 반환"""
         return 8192
 
-def get_azure_llm():
-    """Azure OpenAI LLM 인스턴스 생성"""
-    return AzureOpenAILLM()
+def get_azure_llm(agent_name: str = "unknown"):
+    """Azure OpenAI LLM 인스턴스 생성 (agent_name은 텔레메트리 집계 기준)"""
+    return AzureOpenAILLM(agent_name=agent_name)
@@ -0,0 +1,160 @@
+import argparse
+import io
+import random
+import sys
+import time
+from pathlib import Path
+
+# app 디렉토리를 import 경로에 추가 (scripts/ 에서 직접 실행 가능하도록)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.data.reverse_geocoder import (  # noqa: E402
+    OfflineReverseGeocoder,
+    KDTREE_AVAILABLE,
+    PIL_AVAILABLE,
+    extract_gps_from_image_bytes,
+)
+
+# (설명, 위도, 경도, 기대 도시(영문), 기대 국가 코드) - 도심에서 벗어난 실제 명소 좌표
+GROUND_TRUTH = [
+    ("경복궁", 37.5796, 126.9770, "Seoul", "KR"),
+    ("해운대 해수욕장", 35.1587, 129.1604, "Busan", "KR"),
+    ("성산일출봉", 33.4581, 126.9425, "Jeju", "KR"),
+    ("불국사", 35.7900, 129.3320, "Gyeongju", "KR"),
+    ("기요미즈데라", 34.9949, 135.7850, "Kyoto", "JP"),
+    ("센소지", 35.7148, 139.7967, "Tokyo", "JP"),
+    ("도톤보리", 34.6687, 135.5013, "Osaka", "JP"),
+    ("타이베이 101", 25.0340, 121.5645, "Taipei", "TW"),
+    ("왓 아룬", 13.7437, 100.4888, "Bangkok", "TH"),
+    ("미케 비치", 16.0610, 108.2470, "Da Nang", "VN"),
+    ("마리나 베이 샌즈", 1.2834, 103.8607, "Singapore", "SG"),
+    ("에펠탑", 48.8584, 2.2945, "Paris", "FR"),
+    ("콜로세움", 41.8902, 12.4922, "Rome", "IT"),
+    ("산 마르코 광장", 45.4341, 12.3388, "Venice", "IT"),
+    ("사그라다 파밀리아", 41.4036, 2.1744, "Barcelona", "ES"),
+    ("알람브라 궁전", 37.1761, -3.5881, "Granada", "ES"),
+    ("벨렝탑", 38.6916, -9.2160, "Lisbon", "PT"),
+    ("카를교", 50.0865, 14.4114, "Prague", "CZ"),
+    ("타워 브리지", 51.5055, -0.0754, "London", "GB"),
+    ("브란덴부르크 문", 52.5163, 13.3777, "Berlin", "DE"),
+    ("이아 마을", 36.4618, 25.3753, "Santorini", "GR"),
+    ("타임스 스퀘어", 40.7580, -73.9855, "New York", "US"),
+    ("금문교", 37.8199, -122.4783, "San Francisco", "US"),
+    ("와이키키 해변", 21.2767, -157.8270, "Honolulu", "US"),
+    ("시드니 오페라 하우스", -33.8568, 151.2153, "Sydney", "AU"),
+    ("슈거로프 산", -22.9486, -43.1566, "Rio de Janeiro", "BR"),
+]
+
+# 어떤 도시와도 멀리 떨어진 좌표 - 결과가 None 이어야 함
+OUT_OF_RANGE = [
+    ("태평양 한가운데", 0.0, -160.0),
+    ("남극", -80.0, 0.0),
+    ("사하라 사막 중심", 23.0, 13.0),
+]
+
+
+def _build_exif_jpeg(lat: float, lon: float) -> bytes:
+    """GPS EXIF가 포함된 테스트용 JPEG 생성"""
+    from PIL import Image
+
+    def to_dms(value):
+        value = abs(value)
+        degrees = int(value)
+        minutes_float = (value - degrees) * 60
+        minutes = int(minutes_float)
+        seconds = round((minutes_float - minutes) * 60 * 100)
+        return ((degrees, 1), (minutes, 1), (seconds, 100))
+
+    img = Image.new("RGB", (32, 32), (120, 160, 200))
+    exif = img.getexif()
+    gps_ifd = exif.get_ifd(0x8825)
+    gps_ifd[1] = "N" if lat >= 0 else "S"
+    gps_ifd[2] = to_dms(lat)
+    gps_ifd[3] = "E" if lon >= 0 else "W"
+    gps_ifd[4] = to_dms(lon)
+
+    buffer = io.BytesIO()
+    img.save(buffer, format="JPEG", exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def check_accuracy(geocoder: OfflineReverseGeocoder) -> bool:
+    print("\n=== 정확도 검증 ===")
+    passed = 0
+    for label, lat, lon, expected_city, expected_country in GROUND_TRUTH:
+        result = geocoder.lookup(lat, lon)
+        ok = bool(result) and result["city_en"] == expected_city and result["country_code"] == expected_country
+        passed += ok
+        found = f"{result['city_en']} ({result['distance_km']}km)" if result else "None"
+        print(f"  {'✅' if ok else '❌'} {label}: 기대={expected_city} 결과={found}")
+
+    for label, lat, lon in OUT_OF_RANGE:
+        result = geocoder.lookup(lat, lon)
+        ok = result is None
+        passed += ok
+        print(f"  {'✅' if ok else '❌'} {label}: 기대=None 결과={result['city_en'] if result else 'None'}")
+
+    total = len(GROUND_TRUTH) + len(OUT_OF_RANGE)
+    print(f"정확도: {passed}/{total} ({passed / total:.1%})")
+    return passed == total
+
+
+def check_exif_roundtrip() -> bool:
+    print("\n=== EXIF GPS 추출 검증 ===")
+    if not PIL_AVAILABLE:
+        print("  ⚠️ Pillow 미설치 - 건너뜀")
+        return True
+
+    ok_all = True
+    for label, lat, lon, _, _ in GROUND_TRUTH[:5]:
+        coordinates = extract_gps_from_image_bytes(_build_exif_jpeg(lat, lon))
+        ok = bool(coordinates) and abs(coordinates[0] - lat) < 1e-3 and abs(coordinates[1] - lon) < 1e-3
+        ok_all = ok_all and ok
+        print(f"  {'✅' if ok else '❌'} {label}: {coordinates}")
+
+    no_gps = extract_gps_from_image_bytes(b"not an image")
+    print(f"  {'✅' if no_gps is None else '❌'} 잘못된 바이트: {no_gps}")
+    return ok_all and no_gps is None
+
+
+def check_latency(geocoder: OfflineReverseGeocoder, iterations: int, max_ms: float) -> bool:
+    print("\n=== 지연 시간 측정 ===")
+    rng = random.Random(42)
+    queries = [(rng.uniform(-60, 70), rng.uniform(-180, 180)) for _ in range(iterations)]
+
+    start = time.perf_counter()
+    for lat, lon in queries:
+        geocoder.lookup(lat, lon)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    per_lookup_ms = elapsed_ms / iterations
+
+    print(f"  백엔드: {'KD-트리 (scikit-learn)' if KDTREE_AVAILABLE else '선형 탐색'}")
+    print(f"  {iterations}회 조회: 총 {elapsed_ms:.1f}ms, 1회당 {per_lookup_ms:.3f}ms (기준 {max_ms}ms)")
+    return per_lookup_ms <= max_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 EXIF GPS 역지오코더 정확도/지연 시간 검증")
+    parser.add_argument("--iterations", type=int, default=2000, help="지연 시간 측정 조회 횟수")
+    parser.add_argument("--max-ms", type=float, default=1.0, help="조회 1회당 허용 최대 지연 시간(ms)")
+    parser.add_argument("--skip-latency", action="store_true",
+                        help="정확도/EXIF 검증만 실행 (빌드 게이트처럼 실행 환경 성능이 일정하지 않은 곳에서 사용)")
+    args = parser.parse_args()
+
+    load_start = time.perf_counter()
+    geocoder = OfflineReverseGeocoder()
+    print(f"데이터셋 로드: {len(geocoder.places)}개 도시, {(time.perf_counter() - load_start) * 1000:.1f}ms")
+
+    results = [check_accuracy(geocoder), check_exif_roundtrip()]
+    if not args.skip_latency:
+        results.append(check_latency(geocoder, args.iterations, args.max_ms))
+
+    if all(results):
+        print("\n✅ 모든 검증 통과")
+        return 0
+    print("\n❌ 일부 검증 실패")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# backend 디렉토리를 import 경로에 추가 (에이전트 모듈의 상대 import를 위해 app 패키지로 로드)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from app.agents.Editor.realtime_layout_generator import EMOTIONAL_KEYWORDS, RealtimeLayoutGenerator  # noqa: E402
+from app.agents.jsx.template_selector import SectionStyleAnalyzer  # noqa: E402
+from app.utils.data.layout_lookup_table import (  # noqa: E402
+    LAYOUT_LOOKUP_TABLE_PATH,
+    MAX_IMAGE_BUCKET,
+    LayoutLookupTable,
+    write_lookup_table,
+)
+from app.utils.data.pdf_vector_manager import PDFVectorManager  # noqa: E402
+from app.utils.log.hybridlogging import get_hybrid_logger  # noqa: E402
+
+# 길이 구간별 대표 본문 길이 (layout_lookup_table.LENGTH_BUCKETS 구간의 중간값)
+LENGTH_SAMPLES = {"short": 150, "medium": 350, "long": 900}
+SAMPLE_SENTENCE = "여행지의 풍경과 사람들, 그리고 그곳에서 보낸 하루의 기록을 차분하게 담았습니다. "
+# 스타일(제목 감정)별 대표 제목 - None은 감정 키워드 없는 일반 제목
+SAMPLE_TITLES = {None: "여행 이야기", **{emotion: f"{keywords[0]} 가득한 여행" for emotion, keywords in EMOTIONAL_KEYWORDS.items()}}
+
+
+def build_sample_sections():
+    """(이미지 수, 길이 구간, 스타일) 전 조합의 대표 섹션 (레이아웃 타입은 나머지 조건으로 결정됨)"""
+    sections = []
+    for image_count in range(MAX_IMAGE_BUCKET + 1):
+        for bucket, length in LENGTH_SAMPLES.items():
+            content = (SAMPLE_SENTENCE * (length // len(SAMPLE_SENTENCE) + 1))[:length]
+            for style, title in SAMPLE_TITLES.items():
+                sections.append({
+                    "section_id": f"lookup_{image_count}_{bucket}_{style or 'balanced'}",
+                    "title": title,
+                    "content": content,
+                    "images": [{"url": f"sample_{i}.jpg", "description": ""} for i in range(image_count)],
+                })
+    return sections
+
+
+async def build_table(generator: RealtimeLayoutGenerator, selector: SectionStyleAnalyzer):
+    strategies, templates = {}, {}
+    sections = build_sample_sections()
+
+    for position, section in enumerate(sections, 1):
+        strategy_key = generator.strategy_lookup_key(section)
+        strategy = await generator.generate_layout_strategy_for_section(section, use_lookup_table=False)
+        if strategy.get("fallback_used") or not strategy.get("ai_search_patterns_used"):
+            # 검색 실패 결과를 테이블에 고정하지 않음 (런타임에 실시간 검색)
+            print(f"  ⚠️ [{position}/{len(sections)}] {strategy_key}: 검색 패턴 없음 - 제외")
+            continue
+        strategy.pop("section_title", None)
+        strategies.setdefault(strategy_key, strategy)
+
+        template_key = selector.template_lookup_key(section, strategy)
+        if template_key in templates:
+            continue
+        best_template = await selector.search_best_template(section, strategy)
+        if best_template is None:
+            print(f"  ⚠️ [{position}/{len(sections)}] {template_key}: 템플릿 후보 없음 - 제외")
+            continue
+        templates[template_key] = {
+            "id": best_template["id"],
+            "component_name": best_template.get("component_name", ""),
+            "score": best_template.get("score", 0.0),
+        }
+        print(f"  [{position}/{len(sections)}] {strategy_key} → {strategy.get('layout_type')} / "
+              f"{templates[template_key]['component_name']}")
+
+    return strategies, templates
+
+
+def benchmark_lookup(path: Path, keys, iterations: int):
+    """저장된 아티팩트를 새로 로드해 키 조회 지연 시간 측정"""
+    table = LayoutLookupTable(path)
+    table.get_strategy(keys[0])  # 로드 시간 제외
+
+    start = time.perf_counter()
+    for i in range(iterations):
+        table.get_strategy(keys[i % len(keys)])
+    per_lookup_us = (time.perf_counter() - start) * 1_000_000 / iterations
+    print(f"전략 조회 1회당 {per_lookup_us:.2f}µs ({iterations}회, 사본 반환 포함)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="레이아웃 전략 / 템플릿 사전 계산 조회 테이블 빌드")
+    parser.add_argument("--output", type=Path, default=LAYOUT_LOOKUP_TABLE_PATH, help="아티팩트 경로")
+    parser.add_argument("--dry-run", action="store_true", help="계산만 하고 저장하지 않음")
+    parser.add_argument("--iterations", type=int, default=10000, help="조회 지연 시간 측정 횟수")
+    args = parser.parse_args()
+
+    logger = get_hybrid_logger("LayoutLookupTableBuilder")
+    generator = RealtimeLayoutGenerator(PDFVectorManager(), logger)
+    selector = SectionStyleAnalyzer()
+    if selector.vector_manager is None:
+        print("❌ 템플릿 검색용 벡터 매니저를 초기화할 수 없습니다")
+        return 1
+
+    print("=== 조합별 전략/템플릿 계산 ===")
+    strategies, templates = asyncio.run(build_table(generator, selector))
+    if not strategies:
+        print("❌ 계산된 전략이 없습니다 (검색 인덱스 연결 확인)")
+        return 1
+
+    print(f"\n전략 {len(strategies)}개, 템플릿 {len(templates)}개")
+    if args.dry_run:
+        return 0
+
+    artifact = write_lookup_table(strategies, templates, args.output, metadata={
+        "source_indexes": ["jsx-component-vector-index", "magazine-vector-index", "text-semantic-patterns-index"],
+    })
+    print(f"✅ 저장: {args.output} (버전 {artifact['version']})")
+    benchmark_lookup(args.output, list(strategies), args.iterations)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
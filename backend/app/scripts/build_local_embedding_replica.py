@@ -0,0 +1,98 @@
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# app 디렉토리를 import 경로에 추가 (scripts/ 에서 직접 실행 가능하도록)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.data.local_embedding import ONNX_EMBEDDING_AVAILABLE, get_local_embedder  # noqa: E402
+from utils.data.pdf_vector_manager import PDFVectorManager, SUPPORTED_INDEXES  # noqa: E402
+
+# 실제 섹션/템플릿 검색에서 자주 나오는 한국어 여행 쿼리
+KOREAN_TRAVEL_QUERIES = [
+    "제주도 바다 풍경과 해안 도로 드라이브",
+    "서울 골목길 카페 탐방 에세이",
+    "부산 해운대 야경과 광안대교",
+    "경주 불국사 역사 유적 여행기",
+    "강원도 설악산 단풍 등산 코스",
+    "전주 한옥마을 전통 음식 체험",
+    "여수 밤바다 낭만 여행",
+    "도쿄 시부야 거리 쇼핑과 맛집",
+    "파리 에펠탑 근처 감성 산책",
+    "가족과 함께한 따뜻한 온천 여행",
+    "혼자 떠난 배낭여행의 설렘과 고독",
+    "이미지 여러 장 갤러리형 여행 매거진 레이아웃",
+    "사진 한 장과 긴 글 중심의 에세이 레이아웃",
+    "여행 일정표와 지도 중심 구성",
+    "감성적인 여행 사진 콜라주",
+]
+
+
+def benchmark_recall(index_names, top_k: int) -> bool:
+    """원격 ada-002 검색 결과를 기준으로 로컬 임베딩 복제본 검색의 recall@k와 쿼리 임베딩 지연 시간 비교"""
+    print(f"\n=== recall@{top_k} (기준: ada-002 원격 검색) ===")
+    remote = PDFVectorManager(isolation_enabled=False, search_backend="remote", embedding_backend="azure")
+    local = PDFVectorManager(isolation_enabled=False, search_backend="local", embedding_backend="local_onnx")
+    if local.embedding_backend != "local_onnx":
+        print("❌ 로컬 임베딩 백엔드를 사용할 수 없습니다")
+        return False
+
+    ok = True
+    for index_name in index_names:
+        recalls = []
+        for query in KOREAN_TRAVEL_QUERIES:
+            expected = {r["id"] for r in remote.search_similar_layouts(query, index_name, top_k, include_heavy_fields=False)}
+            actual = {r["id"] for r in local.search_similar_layouts(query, index_name, top_k, include_heavy_fields=False)}
+            if expected:
+                recalls.append(len(expected & actual) / len(expected))
+        if not recalls:
+            print(f"  ⚠️ {index_name}: 기준 결과 없음")
+            ok = False
+            continue
+        print(f"  {index_name}: 평균 recall@{top_k} {statistics.mean(recalls):.3f} "
+              f"(최소 {min(recalls):.2f}, 쿼리 {len(recalls)}개)")
+
+    print("\n=== 쿼리 임베딩 지연 시간 (캐시 미사용) ===")
+    embedder = get_local_embedder()
+    embedder.embed(["warmup"])
+    local_ms, remote_ms = [], []
+    for query in KOREAN_TRAVEL_QUERIES:
+        start = time.perf_counter()
+        embedder.embed([query])
+        local_ms.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        remote.openai_client.embeddings.create(input=[query], model="text-embedding-ada-002")
+        remote_ms.append((time.perf_counter() - start) * 1000)
+    print(f"  로컬 ONNX: 중앙값 {statistics.median(local_ms):.1f}ms / ada-002: 중앙값 {statistics.median(remote_ms):.1f}ms")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 ONNX 임베딩 모델로 벡터 복제본 재구축 + ada-002 대비 recall 측정")
+    parser.add_argument("--indexes", nargs="*", default=list(SUPPORTED_INDEXES.keys()),
+                        choices=list(SUPPORTED_INDEXES.keys()), help="대상 인덱스 (기본: 전체)")
+    parser.add_argument("--benchmark-only", action="store_true", help="재구축 없이 기존 복제본으로 recall만 측정")
+    parser.add_argument("--top-k", type=int, default=5, help="recall@k의 k")
+    parser.add_argument("--batch-size", type=int, default=32, help="재구축 임베딩 배치 크기")
+    args = parser.parse_args()
+
+    if not ONNX_EMBEDDING_AVAILABLE:
+        print("❌ onnxruntime/tokenizers가 설치되어 있지 않습니다")
+        return 1
+
+    if not args.benchmark_only:
+        manager = PDFVectorManager(isolation_enabled=False, search_backend="remote", embedding_backend="azure")
+        results = manager.rebuild_local_embedding_replica(args.indexes, batch_size=args.batch_size)
+        failed = [name for name, result in results.items() if result["status"] != "rebuilt"]
+        if failed:
+            print(f"❌ 재구축 실패: {', '.join(failed)}")
+            return 1
+
+    return 0 if benchmark_recall(args.indexes, args.top_k) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import argparse
+import json
+import os
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from transformers import AutoModel, AutoTokenizer
+
+DEFAULT_MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+DEFAULT_OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  "model", "multilingual_embedding_onnx")
+
+
+def convert_model(model_name: str, output_dir: str):
+    """
+    다국어 문장 임베딩 모델(트랜스포머 본체)을 ONNX로 변환하고 양자화합니다.
+    풀링/정규화는 utils/data/local_embedding.py에서 수행합니다.
+    """
+    print(f"모델 변환 시작: {model_name}")
+    print(f"출력 디렉토리: {output_dir}")
+    os.makedirs(output_dir, exist_ok=True)
+
+    # 1. 원본 모델/토크나이저 로드
+    print("1/4: 원본 모델 로드 중...")
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+
+    # 2. ONNX로 변환 (배치/시퀀스 길이 동적)
+    onnx_path = os.path.join(output_dir, "model.onnx")
+    print(f"2/4: ONNX로 변환 중... -> {onnx_path}")
+    sample = tokenizer(["제주도 바다 여행", "서울 골목 카페 탐방"], padding=True, return_tensors="pt")
+    input_names = ["input_ids", "attention_mask"]
+    inputs = (sample["input_ids"], sample["attention_mask"])
+    if "token_type_ids" in sample:
+        input_names.append("token_type_ids")
+        inputs = inputs + (sample["token_type_ids"],)
+
+    dynamic_axes = {name: {0: "batch_size", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch_size", 1: "sequence"}
+    torch.onnx.export(
+        model,
+        inputs,
+        onnx_path,
+        export_params=True,
+        opset_version=14,
+        do_constant_folding=True,
+        input_names=input_names,
+        output_names=["last_hidden_state"],
+        dynamic_axes=dynamic_axes
+    )
+
+    # 3. 동적 양자화 (CPU 추론 속도/용량 개선)
+    quant_path = os.path.join(output_dir, "model.quant.onnx")
+    print(f"3/4: 양자화 중... -> {quant_path}")
+    quantize_dynamic(onnx_path, quant_path, weight_type=QuantType.QInt8)
+
+    # 4. tokenizers 라이브러리용 tokenizer.json + 메타데이터 저장
+    print("4/4: 토크나이저/메타데이터 저장 중...")
+    tokenizer.backend_tokenizer.save(os.path.join(output_dir, "tokenizer.json"))
+    meta = {
+        "model_name": model_name.split("/")[-1],
+        "source": model_name,
+        "dimensions": model.config.hidden_size,
+        "pad_token": tokenizer.pad_token,
+        "pad_token_id": tokenizer.pad_token_id,
+        "pooling": "mean",
+        "normalized": True
+    }
+    with open(os.path.join(output_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    print("✅ 변환 완료")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다국어 문장 임베딩 모델을 ONNX로 변환 및 양자화합니다.")
+    parser.add_argument("--model-name", type=str, default=DEFAULT_MODEL_NAME, help="Hugging Face 모델 이름")
+    parser.add_argument("--output-dir", type=str, default=DEFAULT_OUTPUT_DIR, help="출력 디렉토리")
+    args = parser.parse_args()
+
+    convert_model(args.model_name, args.output_dir)
@@ -0,0 +1,43 @@
+import argparse
+import sys
+from pathlib import Path
+
+# app 디렉토리를 import 경로에 추가 (scripts/ 에서 직접 실행 가능하도록)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.data.pdf_vector_manager import PDFVectorManager, SUPPORTED_INDEXES  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 인덱스 filterable/facetable 필드 스키마 마이그레이션 (멱등)")
+    parser.add_argument("--indexes", nargs="*", default=list(SUPPORTED_INDEXES.keys()),
+                        choices=list(SUPPORTED_INDEXES.keys()), help="대상 인덱스 (기본: 전체)")
+    parser.add_argument("--dry-run", action="store_true", help="변경 없이 필요한 작업만 출력")
+    parser.add_argument("--backfill-jsx-features", action="store_true",
+                        help="스키마 보정 후 JSX 구조 특징 필드 값 계산/저장")
+    args = parser.parse_args()
+
+    manager = PDFVectorManager(isolation_enabled=False, search_backend="remote")
+    results = manager.migrate_filterable_fields(args.indexes, dry_run=args.dry_run)
+
+    exit_code = 0
+    for index_name, result in results.items():
+        if result["status"] == "error":
+            print(f"  ❌ {index_name}: {result['error']}")
+            exit_code = 1
+            continue
+        print(f"  {index_name}: 정상 {result['ok']} / 추가 {result['added']} / 재색인 필요 {result['rebuild_required']}")
+        if result["rebuild_required"]:
+            exit_code = 1
+
+    if args.backfill_jsx_features:
+        if args.dry_run and results.get("jsx-component-vector-index", {}).get("added"):
+            print("  ⚠️ 특징 필드가 아직 스키마에 없어 백필 계산을 건너뜁니다 (--dry-run)")
+        else:
+            backfill = manager.backfill_jsx_structure_features(dry_run=args.dry_run)
+            print(f"  jsx-component-vector-index: 구조 특징 {backfill['updated']}/{backfill['scanned']}개")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# app 디렉토리를 import 경로에 추가 (scripts/ 에서 직접 실행 가능하도록)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils.data.local_vector_replica import (  # noqa: E402
+    HNSWLIB_AVAILABLE,
+    get_local_vector_replica,
+)
+from utils.data.pdf_vector_manager import PDFVectorManager, SUPPORTED_INDEXES  # noqa: E402
+
+
+def benchmark_local_search(index_names, iterations: int) -> bool:
+    """임의 벡터로 로컬 k-NN 검색 지연 시간 측정 (네트워크 불필요)"""
+    print("\n=== 로컬 검색 지연 시간 ===")
+    replica = get_local_vector_replica()
+    rng = random.Random(42)
+    ok = True
+
+    for index_name in index_names:
+        if not replica.has_index(index_name):
+            print(f"  ⚠️ {index_name}: 복제본 없음 - 건너뜀")
+            ok = False
+            continue
+
+        replica.search(index_name, [0.0] * 1536, 1)  # 로드 시간 제외
+        queries = [[rng.gauss(0, 1) for _ in range(1536)] for _ in range(iterations)]
+
+        start = time.perf_counter()
+        for query in queries:
+            replica.search(index_name, query, 10)
+        per_query_ms = (time.perf_counter() - start) * 1000 / iterations
+        print(f"  {index_name}: top-10 검색 1회당 {per_query_ms:.3f}ms ({iterations}회)")
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Azure AI Search 벡터 인덱스 → 로컬 HNSW 복제본 동기화")
+    parser.add_argument("--indexes", nargs="*", default=list(SUPPORTED_INDEXES.keys()),
+                        choices=list(SUPPORTED_INDEXES.keys()), help="동기화할 인덱스 (기본: 전체)")
+    parser.add_argument("--benchmark-only", action="store_true", help="동기화 없이 기존 복제본 검색 지연 시간만 측정")
+    parser.add_argument("--iterations", type=int, default=200, help="지연 시간 측정 검색 횟수")
+    args = parser.parse_args()
+
+    if not HNSWLIB_AVAILABLE:
+        print("❌ hnswlib(chroma-hnswlib)가 설치되어 있지 않습니다")
+        return 1
+
+    if not args.benchmark_only:
+        manager = PDFVectorManager(isolation_enabled=False, search_backend="remote")
+        results = manager.sync_local_replica(args.indexes)
+        failed = [name for name, result in results.items() if result["status"] != "synced"]
+        print(f"\n복제본 경로: {get_local_vector_replica().replica_dir}")
+        if failed:
+            print(f"❌ 동기화 실패: {', '.join(failed)}")
+            return 1
+
+    return 0 if benchmark_local_search(args.indexes, args.iterations) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
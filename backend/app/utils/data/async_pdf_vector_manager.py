@@ -0,0 +1,380 @@
+import asyncio
+import os
+import weakref
+from typing import Dict, List, Optional
+
+from openai import AsyncAzureOpenAI
+from azure.core.credentials import AzureKeyCredential
+from azure.search.documents.aio import SearchClient as AsyncSearchClient
+from azure.search.documents.indexes.aio import SearchIndexClient as AsyncSearchIndexClient
+from dotenv import load_dotenv
+
+from .pdf_vector_manager import (
+    SUPPORTED_INDEXES,
+    PDFVectorManager,
+    VectorSearchCommonMixin,
+)
+from .embedding_cache import get_embedding_cache
+from .search_result_cache import get_search_result_cache
+from .parsed_document_cache import get_parsed_document_cache
+from .embedding_batcher import AsyncEmbeddingMicroBatcher
+from .search_query_planner import get_active_search_plan
+
+
+load_dotenv()
+
+
+class _SharedAsyncClients:
+    """이벤트 루프별 공유 aio 클라이언트 (커넥션 풀 재사용, 루프 간 공유 금지)"""
+
+    def __init__(self):
+        search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
+        search_credential = AzureKeyCredential(os.getenv("AZURE_SEARCH_KEY"))
+        self.search_endpoint = search_endpoint
+        self.search_credential = search_credential
+        self.search_clients: Dict[str, AsyncSearchClient] = {}
+        self.search_index_client = AsyncSearchIndexClient(
+            endpoint=search_endpoint,
+            credential=search_credential
+        )
+        self.openai_client = AsyncAzureOpenAI(
+            api_key=os.getenv("AZURE_OPENAI_KEY"),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION"),
+            azure_endpoint=os.getenv("AZURE_OPENAI_ENDPOINT")
+        )
+        self.embedding_batchers: Dict[str, AsyncEmbeddingMicroBatcher] = {}
+
+    def get_embedding_batcher(self, model: str) -> AsyncEmbeddingMicroBatcher:
+        """임베딩 배포별 루프 공유 마이크로 배처"""
+        if model not in self.embedding_batchers:
+            async def embed_fn(texts: List[str]) -> List[List[float]]:
+                response = await self.openai_client.embeddings.create(input=texts, model=model)
+                return [item.embedding for item in response.data]
+
+            self.embedding_batchers[model] = AsyncEmbeddingMicroBatcher(embed_fn)
+        return self.embedding_batchers[model]
+
+    def get_search_client(self, index_name: str) -> AsyncSearchClient:
+        if index_name not in self.search_clients:
+            print(f"🔗 AsyncPDFVectorManager: '{index_name}' 인덱스에 대한 aio SearchClient 연결을 설정합니다.")
+            self.search_clients[index_name] = AsyncSearchClient(
+                endpoint=self.search_endpoint,
+                index_name=index_name,
+                credential=self.search_credential
+            )
+        return self.search_clients[index_name]
+
+    async def close(self):
+        for client in self.search_clients.values():
+            await client.close()
+        self.search_clients.clear()
+        await self.search_index_client.close()
+        await self.openai_client.close()
+
+
+_shared_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _SharedAsyncClients]" = weakref.WeakKeyDictionary()
+
+
+def _get_shared_clients() -> _SharedAsyncClients:
+    """현재 실행 중인 이벤트 루프의 공유 클라이언트 반환 (없으면 생성)"""
+    loop = asyncio.get_running_loop()
+    clients = _shared_clients.get(loop)
+    if clients is None:
+        clients = _SharedAsyncClients()
+        _shared_clients[loop] = clients
+    return clients
+
+
+async def close_shared_async_clients():
+    """현재 이벤트 루프의 공유 aio 클라이언트 종료 (앱 종료 시 호출)"""
+    loop = asyncio.get_running_loop()
+    clients = _shared_clients.pop(loop, None)
+    if clients is not None:
+        await clients.close()
+
+
+class AsyncPDFVectorManager(VectorSearchCommonMixin):
+    """PDFVectorManager의 비동기 버전 - aio SearchClient + AsyncAzureOpenAI 기반, 동일한 반환 형식"""
+
+    def __init__(self, isolation_enabled=True, default_index="magazine-vector-index",
+                 search_backend: Optional[str] = None, embedding_backend: Optional[str] = None):
+        self.default_index = default_index
+        self.embedding_model = "text-embedding-ada-002"
+        self.supported_indexes = SUPPORTED_INDEXES
+
+        # AI Search 격리 시스템 초기화
+        self._init_isolation(isolation_enabled, "AsyncPDFVectorManager")
+
+        # 벡터 검색 백엔드 (VECTOR_SEARCH_BACKEND 환경 변수 또는 인자)
+        self._init_search_backend(search_backend)
+
+        # 쿼리 임베딩 백엔드 (EMBEDDING_BACKEND 환경 변수 또는 인자)
+        self._init_embedding_backend(embedding_backend)
+
+        print(f"✅ AsyncPDFVectorManager 초기화 완료 (기본 인덱스: {default_index})")
+
+    @classmethod
+    def from_sync(cls, vector_manager: Optional[PDFVectorManager],
+                  default_index: Optional[str] = None) -> "AsyncPDFVectorManager":
+        """기존 PDFVectorManager 설정(격리 여부, 기본 인덱스, 검색/임베딩 백엔드)을 그대로 따르는 비동기 매니저 생성"""
+        if vector_manager is None:
+            return cls(default_index=default_index or "magazine-vector-index")
+        return cls(
+            isolation_enabled=getattr(vector_manager, "isolation_enabled", True),
+            default_index=default_index or getattr(vector_manager, "default_index", "magazine-vector-index"),
+            search_backend=getattr(vector_manager, "search_backend", None),
+            embedding_backend=getattr(vector_manager, "embedding_backend", None)
+        )
+
+    def _get_search_client(self, index_name: str) -> AsyncSearchClient:
+        """인덱스별 aio SearchClient 반환 (루프별 공유 캐시 사용)"""
+        return _get_shared_clients().get_search_client(index_name)
+
+    async def _create_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """AsyncAzureOpenAI Embeddings API로 벡터 생성 (임베딩 캐시 우선, 실패 시 예외 전파)"""
+        if not texts:
+            return []
+
+        # 캐시의 SQLite 디스크 계층 조회/저장은 스레드에서 실행 (이벤트 루프 블로킹 방지)
+        hits, misses = await get_embedding_cache().aget_many(self.embedding_model, texts)
+        results, pending = self._pending_embeddings(texts, hits, misses)
+        if not pending:
+            return results
+
+        print(f"📊 {len(pending)}개 텍스트에 대한 임베딩 생성 중... (캐시 적중 {len(texts) - sum(len(v) for v in pending.values())}개)")
+
+        if self.local_embedder is not None:
+            # 로컬 ONNX 모델은 CPU 작업이므로 루프를 막지 않도록 스레드에서 실행
+            outcomes = await asyncio.to_thread(self.local_embedder.embed, list(pending.keys()))
+        else:
+            # 같은 루프의 다른 호출자 요청과 모아 한 번에 전송
+            batcher = _get_shared_clients().get_embedding_batcher(self.embedding_model)
+            outcomes = await batcher.embed_many(list(pending.keys()))
+
+        succeeded_texts, succeeded_vectors, errors = self._collect_embeddings(results, pending, outcomes)
+        await get_embedding_cache().aput_many(self.embedding_model, succeeded_texts, succeeded_vectors)
+        return self._finish_embeddings(results, pending, succeeded_vectors, errors)
+
+    def get_embedding_batcher_stats(self) -> Dict:
+        """현재 루프의 임베딩 마이크로 배처 통계"""
+        return _get_shared_clients().get_embedding_batcher(self.embedding_model).stats.snapshot()
+
+    async def warm_embedding_cache(self, queries: Optional[List[str]] = None, batch_size: int = 16) -> Dict:
+        """자주 쓰는 쿼리 목록으로 임베딩 캐시 워밍 (기본: FREQUENT_QUERIES)"""
+        texts = self._warmup_texts(queries)
+        for start in range(0, len(texts), batch_size):
+            try:
+                await self._create_embeddings(texts[start:start + batch_size])
+            except Exception as e:
+                print(f"⚠️ 임베딩 캐시 워밍 실패: {e}")
+                break
+        return self.get_embedding_cache_stats()
+
+    async def search_similar_layouts(self, query_text: str, index_name: str = None, top_k: int = 5,
+                                     query_vector: Optional[List[float]] = None,
+                                     filter_expression: Optional[str] = None,
+                                     include_heavy_fields: bool = True) -> List[Dict]:
+        """다중 인덱스 지원 유사 레이아웃 비동기 검색 (AI Search 격리 적용, 사전 계산된 벡터 및 결과 캐시 지원)
+
+        include_heavy_fields=False이면 순위 필드만 반환 (본문은 hydrate_heavy_fields로 지연 조회)
+        """
+        target_index = index_name or self.default_index
+
+        if target_index not in self.supported_indexes:
+            print(f"❌ 지원하지 않는 인덱스: {target_index}")
+            return []
+
+        # 활성 검색 계획(섹션 간 사전 실행 결과)에 있으면 그대로 사용
+        plan = get_active_search_plan()
+        if plan is not None and query_vector is None:
+            planned = plan.lookup(self, target_index, query_text, top_k, filter_expression)
+            if planned is not None:
+                return await self.hydrate_heavy_fields(planned, target_index) if include_heavy_fields else planned
+
+        try:
+            if query_vector is None:
+                clean_query = self._clean_query(query_text)
+
+                query_embeddings = await self._create_embeddings([clean_query])
+                if not query_embeddings:
+                    raise ValueError("임베딩 생성에 실패했습니다.")
+                query_vector = query_embeddings[0]
+
+            cache_key = self._search_cache_key(target_index, query_vector, top_k, filter_expression)
+            results = await get_search_result_cache().get_or_compute_async(
+                cache_key,
+                lambda: self._execute_vector_search(target_index, query_vector, top_k, filter_expression)
+            )
+            return await self.hydrate_heavy_fields(results, target_index) if include_heavy_fields else results
+
+        except Exception as e:
+            print(f"❌ 비동기 벡터 검색 실패 ({target_index}): {e}")
+            if self.isolation_enabled:
+                print("🛡️ 격리된 폴백 결과 반환")
+                return self._get_isolated_fallback_data(target_index)
+            return []
+
+    async def _execute_vector_search(self, target_index: str, query_vector: List[float], top_k: int,
+                                     filter_expression: Optional[str] = None) -> List[Dict]:
+        """aio 벡터 검색 실행 → 파싱 → 격리 후처리 (실패 시 예외 전파)"""
+        # 로컬 HNSW 검색은 1ms 미만 CPU 작업이므로 루프에서 직접 실행
+        local_results = self._try_local_search(target_index, query_vector, top_k, filter_expression)
+        if local_results is not None:
+            return local_results
+
+        search_client = self._get_search_client(target_index)
+        if not self._use_id_only_search(target_index):
+            # 캐시가 차기 전: 필드까지 한 번에 조회 (왕복 1회)
+            raw_results = await search_client.search(**self._build_search_params(
+                target_index, query_vector, top_k, filter_expression, select=self._light_select_fields(target_index)
+            ))
+            return self._finalize_full_results(target_index, [result async for result in raw_results], top_k)
+
+        # 캐시 적중률이 높으면 id와 점수만 조회
+        raw_results = await search_client.search(
+            **self._build_search_params(target_index, query_vector, top_k, filter_expression, select=["id"])
+        )
+        hits = [(result["id"], result.get("@search.score", 0.0)) async for result in raw_results]
+
+        # 파싱 문서 캐시 미적중분만 id 일괄 조회 후 파싱
+        version = self._document_version(target_index)
+        documents, missing_ids = get_parsed_document_cache().get_many(target_index, [hit[0] for hit in hits], version)
+        if missing_ids:
+            lookup_results = await search_client.search(**self._build_document_lookup_params(target_index, missing_ids))
+            documents.update(self._cache_parsed_documents(
+                target_index, [result async for result in lookup_results], version
+            ))
+
+        return self._finalize_results(self._assemble_hits(hits, documents), target_index, top_k)
+
+    async def hydrate_heavy_fields(self, results: List[Dict], index_name: str = None) -> List[Dict]:
+        """검색 결과에 무거운 필드(jsx_code 등)를 채움 (본문 캐시 우선, 미적중분만 포인트 조회)"""
+        target_index = index_name or self.default_index
+        bodies, missing_ids, version = self._split_cached_bodies(target_index, results)
+        if missing_ids:
+            try:
+                bodies.update(self._store_bodies(
+                    target_index, await self._fetch_raw_bodies(target_index, missing_ids), version
+                ))
+            except Exception as e:
+                print(f"⚠️ 문서 본문 비동기 조회 실패 ({target_index}): {e}")
+        return self._attach_bodies(results, bodies)
+
+    async def _fetch_raw_bodies(self, target_index: str, document_ids: List[str]) -> List[Dict]:
+        """무거운 필드 원시 조회 (1건: get_document 포인트 조회, 여러 건: search.in 1회)"""
+        if self.local_replica is not None and self.local_replica.has_index(target_index):
+            return self.local_replica.get_documents(target_index, document_ids)
+
+        fields = ["id", *self._heavy_fields(target_index)]
+        search_client = self._get_search_client(target_index)
+        if len(document_ids) == 1:
+            return [await search_client.get_document(key=document_ids[0], selected_fields=fields)]
+        lookup_results = await search_client.search(
+            **self._build_document_lookup_params(target_index, document_ids, fields)
+        )
+        return [result async for result in lookup_results]
+
+    async def get_layout_recommendations(self, content_description: str, image_count: int,
+                                         index_type: str = "magazine-vector-index",
+                                         include_heavy_fields: bool = True) -> List[Dict]:
+        """콘텐츠 설명과 이미지 수를 바탕으로 레이아웃 추천 (비동기)"""
+        clean_query = self._build_recommendation_query(content_description, image_count)
+        return await self.search_similar_layouts(clean_query, index_type, top_k=3,
+                                                 include_heavy_fields=include_heavy_fields)
+
+    async def verify_index_connectivity(self, index_name: str) -> Dict:
+        """인덱스 연결 상태 및 데이터 확인 (비동기)"""
+        try:
+            try:
+                await _get_shared_clients().search_index_client.get_index(index_name)
+            except Exception:
+                return {
+                    "index_name": index_name,
+                    "exists": False,
+                    "connected": False,
+                    "error": "인덱스가 존재하지 않습니다",
+                    "status": "not_found"
+                }
+
+            search_client = self._get_search_client(index_name)
+            test_results = await search_client.search(
+                search_text="*",
+                top=1,
+                include_total_count=True
+            )
+
+            document_count = await test_results.get_count() or 0
+
+            sample_doc = None
+            async for doc in test_results:
+                sample_doc = dict(doc)
+                break
+
+            return {
+                "index_name": index_name,
+                "exists": True,
+                "connected": True,
+                "document_count": document_count,
+                "sample_fields": list(sample_doc.keys()) if sample_doc else [],
+                "status": "healthy" if document_count > 0 else "empty",
+                "description": self.supported_indexes.get(index_name, {}).get("description", "알 수 없음")
+            }
+
+        except Exception as e:
+            return {
+                "index_name": index_name,
+                "exists": True,
+                "connected": False,
+                "error": str(e),
+                "status": "connection_failed"
+            }
+
+    async def verify_all_indexes(self) -> Dict[str, Dict]:
+        """모든 지원 인덱스의 연결 상태를 동시에 확인"""
+        index_names = list(self.supported_indexes.keys())
+        statuses = await asyncio.gather(*[self.verify_index_connectivity(name) for name in index_names])
+
+        results = {}
+        for index_name, status in zip(index_names, statuses):
+            results[index_name] = status
+
+            if status["connected"] and status["document_count"] > 0:
+                print(f"✅ {index_name}: {status['document_count']}개 문서")
+            elif status["connected"] and status["document_count"] == 0:
+                print(f"⚠️ {index_name}: 연결됨, 데이터 없음")
+            else:
+                print(f"❌ {index_name}: {status.get('error', '연결 실패')}")
+
+        return results
+
+    async def get_index_statistics(self) -> Dict[str, Dict]:
+        """모든 인덱스의 통계 정보 반환 (비동기)"""
+        stats = {}
+
+        for index_name, config in self.supported_indexes.items():
+            try:
+                search_client = self._get_search_client(index_name)
+                results = await search_client.search(
+                    search_text="*",
+                    top=0,
+                    include_total_count=True
+                )
+
+                document_count = await results.get_count() or 0
+
+                stats[index_name] = {
+                    "description": config["description"],
+                    "document_count": document_count,
+                    "vector_field": config["vector_field"],
+                    "status": "active" if document_count > 0 else "empty"
+                }
+
+            except Exception as e:
+                stats[index_name] = {
+                    "description": config["description"],
+                    "document_count": 0,
+                    "error": str(e),
+                    "status": "error"
+                }
+
+        return stats
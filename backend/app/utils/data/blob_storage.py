@@ -23,7 +23,8 @@ class BlobStorageManager:
         # Changed prefix to include user_id and magazine_id
         prefix = f"{self.user_id}/magazine/{self.magazine_id}/images/"
         print(f"DEBUG: Listing blobs with prefix: {prefix}")
-        blob_list = self.container_client.list_blobs(name_starts_with=prefix)
+        # 업로드 시 저장한 위치 메타데이터(국가/도시)를 목록 조회에 함께 포함
+        blob_list = self.container_client.list_blobs(name_starts_with=prefix, include=["metadata"])
         return sorted([blob for blob in blob_list], key=lambda x: x.name)
       
     def get_texts(self):
@@ -52,6 +53,15 @@ class BlobStorageManager:
         download_stream = blob_client.download_blob()
         return download_stream.readall().decode('utf-8')
     
+    def get_blob_metadata(self, blob):
+        """Blob 메타데이터 (목록 조회에 포함된 값 우선, 없으면 속성 조회)"""
+        metadata = getattr(blob, "metadata", None)
+        if metadata is not None:
+            return metadata
+
+        blob_name = blob if isinstance(blob, str) else blob.name
+        return self.container_client.get_blob_client(blob_name).get_blob_properties().metadata or {}
+
     # Helper methods (optional but recommended)
     def build_image_path(self, filename: str) -> str:
         """이미지 파일의 전체 경로 생성"""
@@ -0,0 +1,204 @@
+"""
+외부 의존성(Azure AI Search, Azure OpenAI, Cosmos DB, Blob Storage) 백그라운드 상태 점검
+주기적으로 가벼운 프로브(문서 수 조회, 모델 목록, 메타데이터 조회)를 실행해 결과를 시각과 함께 캐시하고,
+에이전트와 API는 요청마다 검색/임베딩을 실행하는 대신 캐시된 상태를 읽음
+"""
+
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "60"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "10"))
+# 이 주기 배수보다 오래된 결과는 stale로 표시
+HEALTH_STALE_FACTOR = 3
+
+DEPENDENCIES = ("search", "openai", "cosmos", "blob")
+
+
+class DependencyHealthMonitor:
+    """의존성별 최근 점검 결과 캐시 + 주기 점검 태스크"""
+
+    def __init__(self, interval: float = HEALTH_CHECK_INTERVAL, probe_timeout: float = HEALTH_PROBE_TIMEOUT):
+        self.interval = interval
+        self.probe_timeout = probe_timeout
+        self._lock = threading.Lock()
+        self._results: Dict[str, Dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._probes: Dict[str, Callable[[], Dict]] = {
+            "search": self._probe_search,
+            "openai": self._probe_openai,
+            "cosmos": self._probe_cosmos,
+            "blob": self._probe_blob,
+        }
+
+    # ==================== 프로브 (동기, 스레드에서 실행) ====================
+
+    def _probe_search(self) -> Dict:
+        """인덱스별 문서 수 ($count만 조회, 임베딩/벡터 검색 없음)"""
+        from azure.core.credentials import AzureKeyCredential
+        from azure.search.documents import SearchClient
+        from .pdf_vector_manager import SUPPORTED_INDEXES
+
+        credential = AzureKeyCredential(os.getenv("AZURE_SEARCH_KEY"))
+        indexes = {}
+        for index_name in SUPPORTED_INDEXES:
+            try:
+                client = SearchClient(endpoint=os.getenv("AZURE_SEARCH_ENDPOINT"), index_name=index_name,
+                                      credential=credential)
+                document_count = client.get_document_count()
+                indexes[index_name] = {"document_count": document_count,
+                                       "status": "active" if document_count > 0 else "empty"}
+            except Exception as e:
+                indexes[index_name] = {"document_count": 0, "status": "error", "error": str(e)}
+
+        failed = [name for name, info in indexes.items() if info["status"] == "error"]
+        status = "unhealthy" if len(failed) == len(indexes) else "degraded" if failed else "healthy"
+        return {"status": status, "details": {"indexes": indexes}}
+
+    def _probe_openai(self) -> Dict:
+        """채팅(LLM) 엔드포인트와 임베딩 엔드포인트 각각의 모델 목록 조회 (토큰 소비 없음)"""
+        endpoints = {
+            "chat": (os.getenv("AZURE_API_BASE"), os.getenv("AZURE_API_KEY"), os.getenv("AZURE_API_VERSION")),
+            "embedding": (os.getenv("AZURE_OPENAI_ENDPOINT"), os.getenv("AZURE_OPENAI_KEY"),
+                          os.getenv("AZURE_OPENAI_API_VERSION")),
+        }
+        details = {name: self._probe_openai_endpoint(*settings) for name, settings in endpoints.items()}
+
+        failed = [name for name, info in details.items() if info["status"] == "error"]
+        status = "unhealthy" if len(failed) == len(details) else "degraded" if failed else "healthy"
+        return {"status": status, "details": details}
+
+    def _probe_openai_endpoint(self, endpoint: Optional[str], api_key: Optional[str],
+                               api_version: Optional[str]) -> Dict:
+        from openai import AzureOpenAI
+
+        if not endpoint or not api_key:
+            return {"status": "error", "error": "엔드포인트/키 미설정"}
+        try:
+            client = AzureOpenAI(
+                api_key=api_key,
+                api_version=api_version,
+                azure_endpoint=endpoint,
+                timeout=self.probe_timeout,
+                max_retries=0
+            )
+            return {"status": "active", "models": len(list(client.models.list()))}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+
+    def _probe_cosmos(self) -> Dict:
+        """데이터베이스 메타데이터 조회"""
+        from ...db.cosmos_connection import database
+
+        properties = database.read()
+        return {"status": "healthy", "details": {"database": properties.get("id")}}
+
+    def _probe_blob(self) -> Dict:
+        """스토리지 계정 정보 조회"""
+        from azure.storage.blob import BlobServiceClient
+
+        connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+        if not connection_string:
+            return {"status": "unhealthy", "error": "AZURE_STORAGE_CONNECTION_STRING 미설정"}
+        account_info = BlobServiceClient.from_connection_string(connection_string).get_account_information()
+        return {"status": "healthy", "details": {"account_kind": account_info.get("account_kind")}}
+
+    # ==================== 점검 실행 ====================
+
+    async def _run_probe(self, name: str) -> Dict:
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(asyncio.to_thread(self._probes[name]), timeout=self.probe_timeout)
+        except asyncio.TimeoutError:
+            result = {"status": "unhealthy", "error": f"{self.probe_timeout:.0f}초 내 응답 없음"}
+        except Exception as e:
+            result = {"status": "unhealthy", "error": str(e)}
+
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["checked_at"] = datetime.now().isoformat()
+        result["_checked_monotonic"] = time.monotonic()
+        with self._lock:
+            previous = self._results.get(name, {}).get("status")
+            self._results[name] = result
+        if previous != result["status"]:
+            icon = "✅" if result["status"] == "healthy" else "⚠️" if result["status"] == "degraded" else "❌"
+            print(f"{icon} 의존성 상태 변경: {name} {previous or '-'} → {result['status']}")
+        return result
+
+    async def refresh(self) -> Dict[str, Dict]:
+        """모든 의존성 즉시 점검 (병렬)"""
+        await asyncio.gather(*[self._run_probe(name) for name in DEPENDENCIES])
+        return self.get_status()
+
+    async def _run_forever(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        """실행 중인 이벤트 루프에 주기 점검 태스크 등록 (중복 시작 무시)"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run_forever())
+            print(f"✅ 의존성 상태 점검 시작 ({self.interval:.0f}초 주기)")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # ==================== 캐시 조회 ====================
+
+    def get_status(self, dependency: Optional[str] = None) -> Dict:
+        """캐시된 점검 결과 (점검 전이면 unknown, 주기의 3배 이상 지나면 stale=True)"""
+        now = time.monotonic()
+        with self._lock:
+            results = {name: dict(self._results.get(name, {"status": "unknown"})) for name in DEPENDENCIES}
+        for result in results.values():
+            checked = result.pop("_checked_monotonic", None)
+            result["age_seconds"] = round(now - checked, 1) if checked is not None else None
+            result["stale"] = checked is None or now - checked > self.interval * HEALTH_STALE_FACTOR
+        return results[dependency] if dependency else results
+
+    def is_available(self, dependency: str) -> bool:
+        """unhealthy로 확인된 경우만 False (점검 전 unknown은 사용 가능으로 간주)"""
+        with self._lock:
+            return self._results.get(dependency, {}).get("status") != "unhealthy"
+
+    def is_index_available(self, index_name: str) -> bool:
+        with self._lock:
+            indexes = self._results.get("search", {}).get("details", {}).get("indexes", {})
+            return indexes.get(index_name, {}).get("status") != "error"
+
+    def get_index_counts(self) -> Optional[Dict[str, Dict]]:
+        """최근 검색 점검의 인덱스별 문서 수 (없거나 stale이면 None)"""
+        search_status = self.get_status("search")
+        if search_status["stale"] or "details" not in search_status:
+            return None
+        return search_status["details"]["indexes"]
+
+
+_monitor_instance: Optional[DependencyHealthMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_dependency_health_monitor() -> DependencyHealthMonitor:
+    """프로세스 공유 의존성 상태 모니터"""
+    global _monitor_instance
+    if _monitor_instance is None:
+        with _monitor_lock:
+            if _monitor_instance is None:
+                _monitor_instance = DependencyHealthMonitor()
+    return _monitor_instance
@@ -0,0 +1,282 @@
+"""
+임베딩 요청 마이크로 배처
+프로세스 내 모든 호출자(섹션/이미지/패턴 검색)의 임베딩 요청을 모아 N개 또는 T밀리초마다
+한 번의 배치 요청으로 전송하고, 각 호출자의 Future를 자기 벡터로 완료.
+- 429/5xx/연결 오류: 배치 전체를 백오프(Retry-After 우선) 후 재시도
+- 입력 오류(400): 항목별로 다시 보내 문제 입력만 예외로 완료
+- 그 밖의 오류(인증 등): 배치의 모든 항목을 같은 예외로 완료
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+from openai import APIConnectionError
+
+from .llm_rate_limiter import retry_after_seconds
+
+
+load_dotenv()
+
+# Azure OpenAI ada-002 배포는 요청당 입력 수 제한이 있으므로 보수적으로 설정
+EMBEDDING_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_BATCH_MAX_SIZE", "16"))
+EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_MAX_WAIT_MS", "10"))
+EMBEDDING_BATCH_MAX_INFLIGHT = int(os.getenv("EMBEDDING_BATCH_MAX_INFLIGHT", "4"))
+# 일시적 오류(429/5xx/연결)의 배치 재시도 횟수와 지수 백오프 (Retry-After 헤더가 있으면 그 값 사용)
+EMBEDDING_BATCH_MAX_RETRIES = int(os.getenv("EMBEDDING_BATCH_MAX_RETRIES", "3"))
+EMBEDDING_RETRY_BASE_DELAY = 0.5
+EMBEDDING_RETRY_MAX_DELAY = 8.0
+
+# 항목별 재전송으로 문제 입력을 골라낼 수 있는 입력 오류 상태 코드
+_INPUT_ERROR_STATUSES = (400, 413, 422)
+_TRANSIENT_STATUSES = (408, 409, 429)
+
+
+class _BatcherStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counter = {"requests": 0, "batches": 0, "api_inputs": 0, "batch_retries": 0,
+                        "item_retries": 0, "item_failures": 0}
+
+    def add(self, key: str, value: int = 1):
+        with self._lock:
+            self.counter[key] += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counter = dict(self.counter)
+        counter["avg_batch_size"] = counter["api_inputs"] / counter["batches"] if counter["batches"] else 0.0
+        return counter
+
+
+class EmbeddingMicroBatcher:
+    """동기 호출자용 배처 (백그라운드 스레드가 큐를 모아 배치 전송)
+
+    embed_fn: 텍스트 목록 → 같은 순서의 벡터 목록 (실패 시 예외)
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], List[List[float]]],
+                 max_batch_size: int = EMBEDDING_BATCH_MAX_SIZE,
+                 max_wait_ms: float = EMBEDDING_BATCH_MAX_WAIT_MS,
+                 max_inflight: int = EMBEDDING_BATCH_MAX_INFLIGHT):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: List[Tuple[str, Future]] = []
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+        self._executor = ThreadPoolExecutor(max_workers=max_inflight, thread_name_prefix="embedding-batch")
+        self.stats = _BatcherStats()
+
+    def submit(self, text: str) -> Future:
+        future: Future = Future()
+        with self._cond:
+            self._queue.append((text, future))
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        self.stats.add("requests")
+        return future
+
+    def submit_many(self, texts: Sequence[str]) -> List[Future]:
+        return [self.submit(text) for text in texts]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                # 첫 요청 도착 후 최대 대기 시간 또는 배치 크기까지 수집
+                deadline = time.monotonic() + self.max_wait
+                while len(self._queue) < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._queue[:self.max_batch_size]
+                del self._queue[:self.max_batch_size]
+            self._executor.submit(self._flush, batch)
+
+    def _flush(self, batch: List[Tuple[str, Future]]):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        outcomes = _embed_with_retry(self.embed_fn, texts, self.stats)
+        for text, future in batch:
+            _resolve(future, outcomes[text])
+
+
+class AsyncEmbeddingMicroBatcher:
+    """이벤트 루프 호출자용 배처 (루프 1개에 귀속)
+
+    embed_fn: 텍스트 목록 → 같은 순서의 벡터 목록을 반환하는 코루틴 함수
+    """
+
+    def __init__(self, embed_fn: Callable[[List[str]], Awaitable[List[List[float]]]],
+                 max_batch_size: int = EMBEDDING_BATCH_MAX_SIZE,
+                 max_wait_ms: float = EMBEDDING_BATCH_MAX_WAIT_MS):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self._pending: List[Tuple[str, "asyncio.Future"]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+        self.stats = _BatcherStats()
+
+    def submit(self, text: str) -> "asyncio.Future":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.stats.add("requests")
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush_now)
+        return future
+
+    async def embed_many(self, texts: Sequence[str]) -> List:
+        """텍스트별 결과 목록 (벡터 또는 예외 객체)"""
+        futures = [self.submit(text) for text in texts]
+        return await asyncio.gather(*futures, return_exceptions=True)
+
+    def _flush_now(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._pending:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+            task = asyncio.get_running_loop().create_task(self._flush(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _flush(self, batch: List[Tuple[str, "asyncio.Future"]]):
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        outcomes = await self._embed_with_retry(texts)
+        for text, future in batch:
+            if not future.done():
+                outcome = outcomes.get(text, RuntimeError("임베딩 결과 누락"))
+                if isinstance(outcome, Exception):
+                    future.set_exception(outcome)
+                else:
+                    future.set_result(outcome)
+
+    async def _embed_with_retry(self, texts: List[str]) -> Dict[str, object]:
+        """_embed_with_retry의 비동기 버전 (백오프는 asyncio.sleep)"""
+        self.stats.add("batches")
+        self.stats.add("api_inputs", len(texts))
+        for attempt in range(EMBEDDING_BATCH_MAX_RETRIES + 1):
+            try:
+                return _map_vectors(texts, await self.embed_fn(texts))
+            except Exception as e:
+                error = e
+            if not _is_transient_error(error) or attempt == EMBEDDING_BATCH_MAX_RETRIES:
+                break
+            self.stats.add("batch_retries")
+            await asyncio.sleep(_retry_delay(error, attempt))
+
+        if len(texts) > 1 and _is_input_error(error):
+            # 입력 오류만 항목별로 다시 보내 문제 입력을 골라냄
+            self.stats.add("item_retries", len(texts))
+            outcomes: Dict[str, object] = {}
+            for item_outcomes in await asyncio.gather(*[self._embed_with_retry([text]) for text in texts]):
+                outcomes.update(item_outcomes)
+            return outcomes
+        self.stats.add("item_failures", len(texts))
+        return {text: error for text in texts}
+
+
+def _map_vectors(texts: List[str], vectors: List[List[float]]) -> Dict[str, List[float]]:
+    if len(vectors) != len(texts):
+        raise ValueError(f"임베딩 응답 개수 불일치: 요청 {len(texts)}개, 응답 {len(vectors)}개")
+    return dict(zip(texts, vectors))
+
+
+def _is_input_error(error: Exception) -> bool:
+    return getattr(error, "status_code", None) in _INPUT_ERROR_STATUSES
+
+
+def _is_transient_error(error: Exception) -> bool:
+    """배치를 그대로 다시 보내면 성공할 수 있는 오류 (429/5xx/타임아웃/연결 실패)"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        return isinstance(error, (APIConnectionError, TimeoutError, ConnectionError))
+    return status in _TRANSIENT_STATUSES or status >= 500
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    retry_after = retry_after_seconds(error)
+    if retry_after is not None:
+        return retry_after
+    return min(EMBEDDING_RETRY_MAX_DELAY, EMBEDDING_RETRY_BASE_DELAY * 2 ** attempt)
+
+
+def _embed_with_retry(embed_fn: Callable[[List[str]], List[List[float]]], texts: List[str],
+                      stats: _BatcherStats) -> Dict[str, object]:
+    """배치 전송 → {텍스트: 벡터 또는 예외}
+    일시적 오류는 배치 전체를 백오프 후 재시도, 입력 오류는 항목별 재전송, 그 외 오류는 모든 항목 실패
+    """
+    stats.add("batches")
+    stats.add("api_inputs", len(texts))
+    for attempt in range(EMBEDDING_BATCH_MAX_RETRIES + 1):
+        try:
+            return _map_vectors(texts, embed_fn(texts))
+        except Exception as e:
+            error = e
+        if not _is_transient_error(error) or attempt == EMBEDDING_BATCH_MAX_RETRIES:
+            break
+        stats.add("batch_retries")
+        time.sleep(_retry_delay(error, attempt))
+
+    if len(texts) > 1 and _is_input_error(error):
+        stats.add("item_retries", len(texts))
+        outcomes: Dict[str, object] = {}
+        for text in texts:
+            outcomes.update(_embed_with_retry(embed_fn, [text], stats))
+        return outcomes
+    stats.add("item_failures", len(texts))
+    return {text: error for text in texts}
+
+
+def _resolve(future: Future, outcome):
+    if future.done():
+        return
+    if isinstance(outcome, Exception):
+        future.set_exception(outcome)
+    else:
+        future.set_result(outcome)
+
+
+_sync_batchers: Dict[Tuple[str, str], EmbeddingMicroBatcher] = {}
+_sync_batchers_lock = threading.Lock()
+
+
+def _client_identity(openai_client) -> str:
+    """클라이언트 설정(엔드포인트 + 키) 지문 - 설정이 같은 클라이언트끼리만 배처 공유"""
+    endpoint = str(getattr(openai_client, "base_url", "") or "")
+    api_key = str(getattr(openai_client, "api_key", "") or "")
+    return hashlib.sha256(f"{endpoint}|{api_key}".encode("utf-8")).hexdigest()[:16]
+
+
+def get_embedding_batcher(openai_client, model: str) -> EmbeddingMicroBatcher:
+    """(임베딩 배포, 클라이언트 설정)별 프로세스 공유 동기 배처
+    배처는 생성 시 넘겨받은 클라이언트로만 전송하므로, 엔드포인트/키가 다른 호출자는 별도 배처를 사용
+    """
+    key = (model, _client_identity(openai_client))
+    batcher = _sync_batchers.get(key)
+    if batcher is None:
+        with _sync_batchers_lock:
+            batcher = _sync_batchers.get(key)
+            if batcher is None:
+                def embed_fn(texts: List[str]) -> List[List[float]]:
+                    response = openai_client.embeddings.create(input=texts, model=model)
+                    return [item.embedding for item in response.data]
+
+                batcher = EmbeddingMicroBatcher(embed_fn)
+                _sync_batchers[key] = batcher
+    return batcher
@@ -0,0 +1,226 @@
+"""
+임베딩 캐시
+동일한 쿼리 문자열(섹션 제목, 고정 패턴 쿼리, 폴백 텍스트 등)의 ada-002 재호출을 막기 위한
+2단계 캐시 (메모리 LRU → SQLite 디스크). 키는 (임베딩 배포 이름, 정규화된 텍스트)
+"""
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / ".cache" / "embeddings.sqlite3"
+
+EMBEDDING_CACHE_PATH = Path(os.getenv("EMBEDDING_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+EMBEDDING_CACHE_MEMORY_SIZE = int(os.getenv("EMBEDDING_CACHE_MEMORY_SIZE", "2048"))
+# "false"로 설정하면 디스크 계층 없이 메모리 LRU만 사용
+EMBEDDING_CACHE_DISK_ENABLED = os.getenv("EMBEDDING_CACHE_DISK_ENABLED", "true").lower() == "true"
+
+# 파이프라인에서 매 실행마다 그대로 반복되는 쿼리 (서버 시작 시 캐시 워밍용)
+FREQUENT_QUERIES = [
+    "responsive design mobile tablet desktop layout",
+    "multiple images gallery grid layout responsive",
+    "text content paragraph layout typography",
+    "magazine layout design",
+    "react component image",
+    "travel experience positive",
+    "magazine template layout",
+    "visual balance design layout hierarchy",
+]
+
+
+def normalize_embedding_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def make_embedding_key(deployment: str, text: str) -> str:
+    normalized = normalize_embedding_text(text)
+    return hashlib.sha256(f"{deployment}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """메모리 LRU + SQLite 디스크 2단계 임베딩 캐시 (스레드 안전)"""
+
+    def __init__(self, memory_size: int = EMBEDDING_CACHE_MEMORY_SIZE,
+                 disk_path: Optional[Path] = EMBEDDING_CACHE_PATH if EMBEDDING_CACHE_DISK_ENABLED else None):
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats_counter = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+
+        if disk_path is not None:
+            try:
+                disk_path = Path(disk_path)
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(disk_path), check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, deployment TEXT NOT NULL, "
+                    "vector BLOB NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+                self.disk_path = disk_path
+            except Exception as e:
+                print(f"⚠️ 임베딩 디스크 캐시 초기화 실패, 메모리 캐시만 사용합니다: {e}")
+                self._conn = None
+                self.disk_path = None
+        else:
+            self.disk_path = None
+
+    # ===== 메모리 계층 =====
+    def _memory_get(self, key: str) -> Optional[List[float]]:
+        vector = self._memory.get(key)
+        if vector is not None:
+            self._memory.move_to_end(key)
+        return vector
+
+    def _memory_put(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # ===== 디스크 계층 =====
+    def _disk_get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        if self._conn is None or not keys:
+            return {}
+        found = {}
+        try:
+            with self._disk_lock:
+                for start in range(0, len(keys), 500):
+                    chunk = keys[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = array("f", blob).tolist()
+        except Exception as e:
+            print(f"⚠️ 임베딩 디스크 캐시 조회 실패: {e}")
+        return found
+
+    def _disk_put_many(self, deployment: str, items: Dict[str, List[float]]):
+        if self._conn is None or not items:
+            return
+        now = time.time()
+        try:
+            with self._disk_lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, deployment, vector, created_at) VALUES (?, ?, ?, ?)",
+                    [(key, deployment, array("f", vector).tobytes(), now) for key, vector in items.items()]
+                )
+                self._conn.commit()
+        except Exception as e:
+            print(f"⚠️ 임베딩 디스크 캐시 저장 실패: {e}")
+
+    def _lookup_memory(self, keys: Sequence[str]) -> Tuple[Dict[int, List[float]], Dict[str, List[int]]]:
+        """메모리 계층 조회 → (적중 {텍스트 인덱스: 벡터}, 디스크에서 찾을 {키: 텍스트 인덱스 목록})"""
+        hits: Dict[int, List[float]] = {}
+        disk_lookup: Dict[str, List[int]] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory_get(key)
+                if vector is not None:
+                    hits[i] = vector
+                    self.stats_counter["memory_hits"] += 1
+                else:
+                    disk_lookup.setdefault(key, []).append(i)
+        return hits, disk_lookup
+
+    def _merge_disk(self, hits: Dict[int, List[float]], disk_lookup: Dict[str, List[int]],
+                    disk_found: Dict[str, List[float]]) -> List[int]:
+        """디스크 조회 결과를 메모리로 승격하고 적중분에 합침, 미적중 인덱스 목록 반환"""
+        misses: List[int] = []
+        with self._lock:
+            for key, indices in disk_lookup.items():
+                vector = disk_found.get(key)
+                if vector is not None:
+                    self._memory_put(key, vector)
+                    for i in indices:
+                        hits[i] = vector
+                    self.stats_counter["disk_hits"] += len(indices)
+                else:
+                    misses.extend(indices)
+                    self.stats_counter["misses"] += len(indices)
+        return sorted(misses)
+
+    def _put_memory(self, deployment: str, texts: Sequence[str], vectors: Sequence[List[float]]) -> Dict[str, List[float]]:
+        items = {make_embedding_key(deployment, text): list(vector) for text, vector in zip(texts, vectors)}
+        with self._lock:
+            for key, vector in items.items():
+                self._memory_put(key, vector)
+            self.stats_counter["writes"] += len(items)
+        return items
+
+    # ===== 공개 API =====
+    def get_many(self, deployment: str, texts: Sequence[str]) -> Tuple[Dict[int, List[float]], List[int]]:
+        """(캐시 적중 {텍스트 인덱스: 벡터}, 미적중 텍스트 인덱스 목록) 반환"""
+        hits, disk_lookup = self._lookup_memory([make_embedding_key(deployment, text) for text in texts])
+        disk_found = self._disk_get_many(list(disk_lookup.keys()))
+        return hits, self._merge_disk(hits, disk_lookup, disk_found)
+
+    def put_many(self, deployment: str, texts: Sequence[str], vectors: Sequence[List[float]]):
+        """새로 생성한 임베딩 저장 (실패 결과는 호출 측에서 저장하지 않음)"""
+        self._disk_put_many(deployment, self._put_memory(deployment, texts, vectors))
+
+    async def aget_many(self, deployment: str, texts: Sequence[str]) -> Tuple[Dict[int, List[float]], List[int]]:
+        """비동기 호출용 get_many: 메모리 계층은 루프에서 바로, SQLite 디스크 계층만 스레드에서 조회"""
+        hits, disk_lookup = self._lookup_memory([make_embedding_key(deployment, text) for text in texts])
+        disk_found = {}
+        if disk_lookup and self._conn is not None:
+            disk_found = await asyncio.to_thread(self._disk_get_many, list(disk_lookup.keys()))
+        return hits, self._merge_disk(hits, disk_lookup, disk_found)
+
+    async def aput_many(self, deployment: str, texts: Sequence[str], vectors: Sequence[List[float]]):
+        """비동기 호출용 put_many (SQLite 쓰기/커밋은 스레드에서 실행)"""
+        items = self._put_memory(deployment, texts, vectors)
+        if items and self._conn is not None:
+            await asyncio.to_thread(self._disk_put_many, deployment, items)
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counter = dict(self.stats_counter)
+            memory_entries = len(self._memory)
+        lookups = counter["memory_hits"] + counter["disk_hits"] + counter["misses"]
+        return {
+            **counter,
+            "memory_entries": memory_entries,
+            "disk_enabled": self._conn is not None,
+            "disk_path": str(self.disk_path) if self.disk_path else None,
+            "hit_rate": (counter["memory_hits"] + counter["disk_hits"]) / lookups if lookups else 0.0,
+            "memory_hit_rate": counter["memory_hits"] / lookups if lookups else 0.0,
+        }
+
+
+_cache_instance: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """프로세스 공유 임베딩 캐시 (동기/비동기 벡터 매니저 공용)"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = EmbeddingCache()
+    return _cache_instance
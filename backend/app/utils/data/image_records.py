@@ -0,0 +1,215 @@
+"""
+이미지 레코드 저장소
+이미지 파이프라인(중복 제거 → 품질 평가 → 의미 패턴 → CLIP 클러스터링 → 섹션 배치) 단계 간에
+대형 dict 대신 정수 id를 주고받고, 점수/임베딩은 열 단위 numpy 배열에 보관
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+QUALITY_FIELDS = ("overall", "sharpness", "contrast", "brightness", "composition")
+CLIP_EMBEDDING_DIM = 512
+
+# 레코드 필드로 승격되는 이미지 분석 결과 키 (그 외 키는 extra에 보관)
+_CORE_FIELDS = ("image_name", "image_url", "country", "city", "location", "description", "width", "height")
+
+# 로그/세션 저장용 경량 필드
+SUMMARY_FIELDS = ("image_id", "image_name", "image_url", "city", "country", "overall_quality")
+
+
+@dataclass(slots=True)
+class ImageRecord:
+    """이미지 1장의 메타데이터 (점수/임베딩은 ImageStore의 열 배열에 저장)"""
+    image_id: int
+    image_name: str = ""
+    image_url: str = ""
+    country: str = ""
+    city: str = ""
+    location: str = ""
+    description: str = ""
+    width: int = 0
+    height: int = 0
+    perceptual_hash: str = ""
+    content_hash: str = ""
+    source_id: int = -1  # 확장 복사본인 경우 원본 레코드 id
+    original_index: Optional[int] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_expanded_copy(self) -> bool:
+        return self.source_id >= 0
+
+
+class ImageStore:
+    """ImageRecord 목록 + 품질 점수/의미 점수/CLIP 임베딩 열 배열
+    점수 열은 float64로 보관해 dict로 되돌릴 때 입력값이 그대로 나오게 하고 (0.7 → 0.7),
+    평가되지 않은 세부 점수는 NaN으로 두었다가 None으로 반환. 임베딩만 float32
+    """
+
+    def __init__(self, capacity: int = 16, embedding_dim: int = CLIP_EMBEDDING_DIM):
+        capacity = max(1, capacity)
+        self.embedding_dim = embedding_dim
+        self.records: List[ImageRecord] = []
+        self.quality = np.zeros((capacity, len(QUALITY_FIELDS)), dtype=np.float64)
+        self.has_quality = np.zeros(capacity, dtype=bool)
+        self.semantic_scores = np.zeros(capacity, dtype=np.float64)
+        self.embeddings = np.zeros((capacity, embedding_dim), dtype=np.float32)
+        self.has_embedding = np.zeros(capacity, dtype=bool)
+        self.quality_notes: Dict[int, str] = {}
+
+    @classmethod
+    def from_dicts(cls, images: Iterable[Dict[str, Any]]) -> "ImageStore":
+        images = list(images)
+        store = cls(capacity=len(images))
+        for image_data in images:
+            store.add(image_data)
+        return store
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _ensure_capacity(self, size: int):
+        capacity = self.quality.shape[0]
+        if size <= capacity:
+            return
+        new_capacity = max(size, capacity * 2)
+        grow = new_capacity - capacity
+        self.quality = np.vstack([self.quality, np.zeros((grow, self.quality.shape[1]), dtype=np.float64)])
+        self.has_quality = np.concatenate([self.has_quality, np.zeros(grow, dtype=bool)])
+        self.semantic_scores = np.concatenate([self.semantic_scores, np.zeros(grow, dtype=np.float64)])
+        self.embeddings = np.vstack([self.embeddings, np.zeros((grow, self.embedding_dim), dtype=np.float32)])
+        self.has_embedding = np.concatenate([self.has_embedding, np.zeros(grow, dtype=bool)])
+
+    def add(self, image_data: Dict[str, Any]) -> int:
+        """이미지 분석 dict를 레코드로 변환하여 추가하고 id 반환"""
+        image_id = len(self.records)
+        self._ensure_capacity(image_id + 1)
+
+        core = {key: image_data.get(key) for key in _CORE_FIELDS if image_data.get(key) is not None}
+        extra = {key: value for key, value in image_data.items() if key not in _CORE_FIELDS}
+
+        # 이전 파이프라인 결과가 다시 들어온 경우 점수 열로 이동
+        quality_scores = extra.pop("quality_scores", None)
+        extra.pop("overall_quality", None)
+
+        record = ImageRecord(
+            image_id=image_id,
+            perceptual_hash=extra.pop("perceptual_hash", "") or "",
+            content_hash=extra.pop("content_hash", "") or "",
+            extra=extra,
+            **core
+        )
+        self.records.append(record)
+
+        if isinstance(quality_scores, dict):
+            self.set_quality(image_id, quality_scores)
+        return image_id
+
+    def add_copy(self, source_id: int, original_index: Optional[int] = None) -> int:
+        """이미지 풀 확장용 복사본 추가 (메타데이터/점수/임베딩 행 복사, extra는 공유)"""
+        source = self.records[source_id]
+        image_id = len(self.records)
+        self._ensure_capacity(image_id + 1)
+
+        self.records.append(ImageRecord(
+            image_id=image_id,
+            image_name=source.image_name,
+            image_url=source.image_url,
+            country=source.country,
+            city=source.city,
+            location=source.location,
+            description=source.description,
+            width=source.width,
+            height=source.height,
+            perceptual_hash=source.perceptual_hash,
+            content_hash=source.content_hash,
+            source_id=source_id,
+            original_index=original_index,
+            extra=source.extra
+        ))
+
+        self.quality[image_id] = self.quality[source_id]
+        self.has_quality[image_id] = self.has_quality[source_id]
+        self.semantic_scores[image_id] = self.semantic_scores[source_id]
+        self.embeddings[image_id] = self.embeddings[source_id]
+        self.has_embedding[image_id] = self.has_embedding[source_id]
+        return image_id
+
+    def get(self, image_id: int) -> ImageRecord:
+        return self.records[image_id]
+
+    def root_id(self, image_id: int) -> int:
+        """확장 복사본이면 원본 id, 아니면 자기 자신"""
+        record = self.records[image_id]
+        return record.source_id if record.is_expanded_copy else image_id
+
+    # ===== 점수/임베딩 열 =====
+    def set_quality(self, image_id: int, quality_scores: Dict[str, Any]):
+        # 전체 점수만 기본값(0.5)을 두고, 없는 세부 점수는 지어내지 않고 NaN(미평가)으로 저장
+        overall = quality_scores.get("overall")
+        self.quality[image_id, 0] = 0.5 if overall is None else float(overall)
+        for column, name in enumerate(QUALITY_FIELDS[1:], start=1):
+            value = quality_scores.get(name)
+            self.quality[image_id, column] = np.nan if value is None else float(value)
+        self.has_quality[image_id] = True
+        note = quality_scores.get("note") or quality_scores.get("error")
+        if note:
+            self.quality_notes[image_id] = str(note)
+
+    def overall_quality(self, image_id: int, default: float = 0.5) -> float:
+        if not self.has_quality[image_id]:
+            return default
+        return float(self.quality[image_id, 0])
+
+    def quality_dict(self, image_id: int) -> Dict[str, Any]:
+        scores = {name: None if np.isnan(value) else float(value)
+                  for name, value in zip(QUALITY_FIELDS, self.quality[image_id])}
+        if image_id in self.quality_notes:
+            scores["note"] = self.quality_notes[image_id]
+        return scores
+
+    def set_semantic_score(self, image_id: int, score: float):
+        self.semantic_scores[image_id] = score
+
+    def set_embedding(self, image_id: int, embedding: np.ndarray):
+        self.embeddings[image_id] = np.asarray(embedding, dtype=np.float32).reshape(-1)[:self.embedding_dim]
+        self.has_embedding[image_id] = True
+
+    def embedding_matrix(self, ids: Sequence[int]) -> np.ndarray:
+        """지정한 id들의 임베딩 행렬 (len(ids), embedding_dim)"""
+        return self.embeddings[np.asarray(ids, dtype=np.int64)]
+
+    # ===== 직렬화 뷰 =====
+    def to_dict(self, image_id: int, fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """하위 에이전트가 기대하는 기존 이미지 dict 형식으로 변환"""
+        record = self.records[image_id]
+        data: Dict[str, Any] = dict(record.extra)
+        for key in _CORE_FIELDS:
+            value = getattr(record, key)
+            if value or key in ("image_name", "image_url"):
+                data[key] = value
+        if record.perceptual_hash:
+            data["perceptual_hash"] = record.perceptual_hash
+        if record.content_hash:
+            data["content_hash"] = record.content_hash
+        if self.has_quality[image_id]:
+            data["quality_scores"] = self.quality_dict(image_id)
+            data["overall_quality"] = self.overall_quality(image_id)
+        if record.is_expanded_copy:
+            data["expanded_copy"] = True
+            data["original_index"] = record.original_index
+
+        if fields:
+            data["image_id"] = image_id
+            return {key: data[key] for key in fields if key in data}
+        return data
+
+    def to_dicts(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        return [self.to_dict(image_id) for image_id in ids]
+
+    def summary(self, ids: Sequence[int]) -> List[Dict[str, Any]]:
+        """로그/세션 저장용 경량 요약"""
+        return [self.to_dict(image_id, SUMMARY_FIELDS) for image_id in ids]
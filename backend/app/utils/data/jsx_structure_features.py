@@ -0,0 +1,136 @@
+"""
+JSX 컴포넌트 구조 특징 (사전 계산용)
+검색 결과마다 jsx_code를 다시 분석하지 않도록 요소 수, grid/flex 사용, 이미지 슬롯 등 순위 계산에 쓰는 특징을
+색인(backfill) 또는 스냅샷 시점에 숫자 필드로 저장하고, 런타임에는 후보 특징 행렬에 대해 numpy로 점수 계산
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# 특징 계산 규칙이 바뀌면 올림 (저장된 특징의 버전이 다르면 jsx_code에서 다시 계산)
+JSX_FEATURE_VERSION = 1
+
+# 인덱스 필드명: Edm 타입 (행렬 열 순서)
+JSX_FEATURE_FIELDS = {
+    "jsx_feature_version": "Edm.Int32",
+    "jsx_element_count": "Edm.Int32",
+    "jsx_div_count": "Edm.Int32",
+    "jsx_style_count": "Edm.Int32",
+    "jsx_image_slots": "Edm.Int32",
+    "jsx_uses_grid": "Edm.Int32",
+    "jsx_uses_flex": "Edm.Int32",
+    "jsx_complexity_score": "Edm.Double",
+    "jsx_quality_score": "Edm.Int32",
+    "jsx_category_code": "Edm.Int32",
+}
+FEATURE_COLUMNS = {name: position for position, name in enumerate(JSX_FEATURE_FIELDS)}
+
+CATEGORY_CODES = {"text_focused": 0, "mixed": 1, "image_focused": 2}
+COMPLEXITY_LEVELS = ("simple", "moderate", "complex")
+# 복잡도 점수 구간 경계 (< 5 simple, < 15 moderate, 그 외 complex)
+COMPLEXITY_THRESHOLDS = (5, 15)
+# 품질 지표 5개 중 3개 이상이면 고품질
+HIGH_QUALITY_MIN_SCORE = 3
+
+_IMG_TAG_PATTERN = re.compile(r"<img[^>]*>", re.IGNORECASE)
+
+
+def infer_category_code(image_count: int, component_name: str) -> int:
+    """이미지 수 + 컴포넌트 이름 → 카테고리 코드 (1~2장은 이름으로 세분화)"""
+    image_count = image_count or 0
+    component_name = (component_name or "").lower()
+    if image_count == 0:
+        return CATEGORY_CODES["text_focused"]
+    if image_count >= 3:
+        return CATEGORY_CODES["image_focused"]
+    if any(keyword in component_name for keyword in ["image", "gallery", "photo"]):
+        return CATEGORY_CODES["image_focused"]
+    if any(keyword in component_name for keyword in ["text", "article", "content"]):
+        return CATEGORY_CODES["text_focused"]
+    return CATEGORY_CODES["mixed"]
+
+
+@lru_cache(maxsize=1024)
+def extract_jsx_features(jsx_code: str, component_name: str = "", image_count: int = 0) -> Dict[str, float]:
+    """jsx_code 1회 분석 → 특징 딕셔너리 (같은 코드는 캐시)"""
+    jsx_code = jsx_code or ""
+    element_count = jsx_code.count("<") - jsx_code.count("</")
+    div_count = jsx_code.count("<div")
+    style_count = jsx_code.count("style=")
+    quality_indicators = [
+        "import React" in jsx_code,
+        "export default" in jsx_code,
+        "style={{" in jsx_code,
+        len(jsx_code) > 200,
+        jsx_code.count("{") == jsx_code.count("}"),
+    ]
+    return {
+        "jsx_feature_version": JSX_FEATURE_VERSION,
+        "jsx_element_count": element_count,
+        "jsx_div_count": div_count,
+        "jsx_style_count": style_count,
+        "jsx_image_slots": len(_IMG_TAG_PATTERN.findall(jsx_code)),
+        "jsx_uses_grid": int('display: "grid"' in jsx_code or "gridTemplateColumns" in jsx_code),
+        "jsx_uses_flex": int('display: "flex"' in jsx_code or "flexDirection" in jsx_code),
+        "jsx_complexity_score": div_count + style_count * 0.5 + element_count * 0.3,
+        "jsx_quality_score": sum(quality_indicators),
+        "jsx_category_code": infer_category_code(image_count, component_name),
+    }
+
+
+def has_current_features(document: Dict) -> bool:
+    return document.get("jsx_feature_version") == JSX_FEATURE_VERSION
+
+
+def needs_jsx_code(document: Dict) -> bool:
+    """저장된 특징도 jsx_code도 없어 구조 특징을 계산할 수 없는 문서 (백필 전 문서를 경량 조회한 경우)"""
+    return not has_current_features(document) and not document.get("jsx_code")
+
+
+def stored_or_computed_features(document: Dict) -> Dict[str, Optional[float]]:
+    """저장된 특징(현재 버전) 우선, 없으면 jsx_code에서 계산
+    jsx_code도 없으면 코드 기반 특징은 None(알 수 없음), 카테고리만 이미지 수/이름으로 계산
+    """
+    if has_current_features(document):
+        return {name: document[name] for name in JSX_FEATURE_FIELDS}
+    component_name = document.get("component_name") or ""
+    image_count = document.get("image_count") or 0
+    if document.get("jsx_code"):
+        return extract_jsx_features(document["jsx_code"], component_name, image_count)
+    features = {name: None for name in JSX_FEATURE_FIELDS}
+    features["jsx_category_code"] = infer_category_code(image_count, component_name)
+    return features
+
+
+def add_jsx_features(document: Dict) -> Dict:
+    """스냅샷/백필용: jsx_code가 있는 문서에 특징 필드 추가"""
+    if document.get("jsx_code") and not has_current_features(document):
+        document.update(extract_jsx_features(document["jsx_code"], document.get("component_name") or "",
+                                             document.get("image_count") or 0))
+    return document
+
+
+def feature_matrix(documents: List[Dict]) -> np.ndarray:
+    """후보 목록 → (후보 수, 특징 수) 행렬 (구조 특징을 알 수 없는 문서의 코드 기반 열은 NaN)"""
+    matrix = np.zeros((len(documents), len(JSX_FEATURE_FIELDS)), dtype=np.float64)
+    for row, document in enumerate(documents):
+        features = stored_or_computed_features(document)
+        if needs_jsx_code(document):
+            matrix[row] = [np.nan if features[name] is None else features[name] for name in JSX_FEATURE_FIELDS]
+        else:
+            matrix[row] = [features[name] or 0 for name in JSX_FEATURE_FIELDS]
+    return matrix
+
+
+def unknown_feature_rows(matrix: np.ndarray) -> np.ndarray:
+    """feature_matrix 행 중 구조 특징을 알 수 없는 행 (bool 배열)"""
+    return np.isnan(matrix[:, FEATURE_COLUMNS["jsx_complexity_score"]])
+
+
+def complexity_codes(complexity_scores: np.ndarray) -> np.ndarray:
+    """복잡도 점수 → COMPLEXITY_LEVELS 인덱스"""
+    return np.digitize(complexity_scores, COMPLEXITY_THRESHOLDS)
@@ -1,6 +1,33 @@
+import asyncio
 import re
 from typing import List, Dict, Optional
+
+import numpy as np
+
 from .pdf_vector_manager import PDFVectorManager
+from .async_pdf_vector_manager import AsyncPDFVectorManager
+from .dependency_health import get_dependency_health_monitor
+from .jsx_structure_features import (
+    CATEGORY_CODES,
+    COMPLEXITY_LEVELS,
+    FEATURE_COLUMNS,
+    HIGH_QUALITY_MIN_SCORE,
+    complexity_codes,
+    feature_matrix,
+    needs_jsx_code,
+    unknown_feature_rows,
+)
+from .search_filters import combine, range_filter
+
+JSX_INDEX_NAME = "jsx-component-vector-index"
+
+# 카테고리별 image_count 범위 (infer_category_code의 이미지 수 조건을 $filter로 표현한 것,
+# 이미지 1~2개 구간의 이름 기반 세분화는 로컬 필터에서 처리)
+CATEGORY_IMAGE_COUNT_RANGES = {
+    "text_focused": (None, 2),
+    "image_focused": (1, None),
+    "mixed": (1, 2)
+}
 
 class JSXVectorManager:
     """
@@ -8,14 +35,21 @@ class JSXVectorManager:
     ✅ 기존 PDFVectorManager를 활용하면서 JSX 특화 기능 제공
     """
     
-    def __init__(self, vector_manager: PDFVectorManager = None, isolation_enabled: bool = True):
+    def __init__(self, vector_manager: PDFVectorManager = None, isolation_enabled: bool = True,
+                 search_backend: str = None, embedding_backend: str = None):
         if vector_manager:
             self.pdf_vector_manager = vector_manager
         else:
             self.pdf_vector_manager = PDFVectorManager(
                 isolation_enabled=isolation_enabled,
-                default_index="jsx-component-vector-index"
+                default_index="jsx-component-vector-index",
+                search_backend=search_backend,
+                embedding_backend=embedding_backend
             )
+        # 이벤트 루프 내부 호출용 비동기 검색 매니저 (동일한 격리 설정 사용)
+        self.async_vector_manager = AsyncPDFVectorManager.from_sync(
+            self.pdf_vector_manager, default_index="jsx-component-vector-index"
+        )
         
         # JSX 컴포넌트 카테고리 정의
         self.jsx_categories = {
@@ -61,8 +95,8 @@ class JSXVectorManager:
         try:
             # 임베딩 없이 인덱스 연결만 테스트
             search_client = self.pdf_vector_manager._get_search_client("jsx-component-vector-index")
-            # 간단한 메타데이터 조회로 연결 확인
-            return True
+            # 연결 확인은 백그라운드 상태 점검 결과 사용 (점검 전이면 사용 가능으로 간주)
+            return get_dependency_health_monitor().is_index_available(JSX_INDEX_NAME)
         except Exception as e:
             print(f"❌ JSX 인덱스 연결 실패: {e}")
             return False
@@ -75,34 +109,168 @@ class JSXVectorManager:
         PDFVectorManager의 기본 검색을 활용하면서 JSX 특화 필터링 적용
         """
         try:
-            # 1. 기본 벡터 검색 (PDFVectorManager 활용)
-            base_query = self._enhance_jsx_query(query_text, category, complexity)
-            
-            raw_results = self.pdf_vector_manager.search_similar_layouts(
-                query_text=base_query,
-                index_name="jsx-component-vector-index",
-                top_k=top_k * 3  # 필터링을 위해 더 많이 검색
-            )
-            
-            # 2. JSX 특화 필터링 적용
-            filtered_results = self._apply_jsx_filters(
-                raw_results, category, image_count, complexity
-            )
-            
-            # 3. JSX 특화 점수 조정
-            scored_results = self._calculate_jsx_relevance_scores(
-                filtered_results, query_text, category, image_count
+            # 0. 어휘 신뢰도가 충분하면 임베딩/벡터 검색 없이 BM25 후보 사용
+            ranked_results = []
+            lexical_results = self.pdf_vector_manager.search_lexical_templates(
+                query_text, self._candidate_top_k(top_k, category, image_count, complexity), image_count
             )
-            
-            # 4. 결과 정렬 및 반환
-            sorted_results = sorted(scored_results, key=lambda x: x.get("jsx_relevance_score", 0), reverse=True)
-            
-            return sorted_results[:top_k]
+            if lexical_results is not None:
+                ranked_results = self._rank_candidates(lexical_results, query_text, category, image_count,
+                                                       complexity, top_k)
+
+            # BM25는 카테고리/복잡도를 보지 않으므로 순위 필터 후 top_k에 못 미치면 벡터 검색으로 대체
+            if len(ranked_results) < top_k:
+                # 1. 기본 벡터 검색 (PDFVectorManager 활용, 속성 조건은 $filter로 푸시다운)
+                base_query = self._enhance_jsx_query(query_text, category, complexity)
+                filter_expression = self._build_jsx_filter(category, image_count)
+
+                # 후보는 순위 필드 + 저장된 구조 특징만 조회 (jsx_code는 반환할 상위 top_k만 조회)
+                raw_results = self.pdf_vector_manager.search_similar_layouts(
+                    query_text=base_query,
+                    index_name=JSX_INDEX_NAME,
+                    top_k=self._candidate_top_k(top_k, category, image_count, complexity, filter_expression),
+                    filter_expression=filter_expression,
+                    include_heavy_fields=False
+                )
+                ranked_results = self._rank_candidates(raw_results, query_text, category, image_count,
+                                                       complexity, top_k) or ranked_results
+
+            return self.pdf_vector_manager.hydrate_heavy_fields(ranked_results, JSX_INDEX_NAME)
             
         except Exception as e:
             print(f"❌ JSX 컴포넌트 검색 실패: {e}")
             return []
 
+    async def search_jsx_components_async(self, query_text: str, category: str = None,
+                                          image_count: int = None, complexity: str = None,
+                                          top_k: int = 5) -> List[Dict]:
+        """
+        ✅ JSX 컴포넌트 특화 검색 (비동기)
+        search_jsx_components와 동일한 결과 형식, AsyncPDFVectorManager 사용
+        """
+        try:
+            # 어휘 빠른 경로는 프로세스 내 CPU 연산만 수행
+            ranked_results = []
+            lexical_results = self.pdf_vector_manager.search_lexical_templates(
+                query_text, self._candidate_top_k(top_k, category, image_count, complexity), image_count
+            )
+            if lexical_results is not None:
+                ranked_results = await self._rank_candidates_async(lexical_results, query_text, category,
+                                                                   image_count, complexity, top_k)
+
+            if len(ranked_results) < top_k:
+                base_query = self._enhance_jsx_query(query_text, category, complexity)
+                # 스키마 조회는 인덱스별 최초 1회만 네트워크 호출
+                filter_expression = await asyncio.to_thread(self._build_jsx_filter, category, image_count)
+
+                raw_results = await self.async_vector_manager.search_similar_layouts(
+                    query_text=base_query,
+                    index_name=JSX_INDEX_NAME,
+                    top_k=self._candidate_top_k(top_k, category, image_count, complexity, filter_expression),
+                    filter_expression=filter_expression,
+                    include_heavy_fields=False
+                )
+                ranked_results = await self._rank_candidates_async(raw_results, query_text, category,
+                                                                   image_count, complexity, top_k) or ranked_results
+
+            return await self.async_vector_manager.hydrate_heavy_fields(ranked_results, JSX_INDEX_NAME)
+
+        except Exception as e:
+            print(f"❌ JSX 컴포넌트 비동기 검색 실패: {e}")
+            return []
+
+    def _rank_candidates(self, raw_results: List[Dict], query_text: str, category: str, image_count: int,
+                         complexity: str, top_k: int) -> List[Dict]:
+        """후보 순위 계산 (구조 특징이 백필되지 않은 후보는 순위 계산 전에 jsx_code 조회)"""
+        unfeatured_results = [result for result in raw_results if needs_jsx_code(result)]
+        if unfeatured_results:
+            self.pdf_vector_manager.hydrate_heavy_fields(unfeatured_results, JSX_INDEX_NAME)
+        return self._rank_jsx_results(raw_results, query_text, category, image_count, complexity, top_k)
+
+    async def _rank_candidates_async(self, raw_results: List[Dict], query_text: str, category: str,
+                                     image_count: int, complexity: str, top_k: int) -> List[Dict]:
+        """후보 순위 계산 (비동기 jsx_code 조회)"""
+        unfeatured_results = [result for result in raw_results if needs_jsx_code(result)]
+        if unfeatured_results:
+            await self.async_vector_manager.hydrate_heavy_fields(unfeatured_results, JSX_INDEX_NAME)
+        return self._rank_jsx_results(raw_results, query_text, category, image_count, complexity, top_k)
+
+    def _build_jsx_filter(self, category: str = None, image_count: int = None) -> Optional[str]:
+        """이미지 수/카테고리 조건 → OData $filter
+        local 백엔드는 복제본 문서에 Python으로 적용하므로 항상, 원격 검색을 거칠 수 있으면 image_count가 filterable일 때만
+        """
+        if (self.pdf_vector_manager.search_backend != "local"
+                and "image_count" not in self.pdf_vector_manager.get_filterable_fields(JSX_INDEX_NAME)):
+            return None
+
+        clauses = []
+        if image_count is not None:
+            # 정확한 매칭 또는 ±1 범위 허용 (_rank_jsx_results의 로컬 필터와 동일)
+            clauses.append(range_filter("image_count", max(0, image_count - 1), image_count + 1))
+        if category in CATEGORY_IMAGE_COUNT_RANGES:
+            clauses.append(range_filter("image_count", *CATEGORY_IMAGE_COUNT_RANGES[category]))
+        return combine(*clauses)
+
+    def _candidate_top_k(self, top_k: int, category: str = None, image_count: int = None,
+                         complexity: str = None, filter_expression: Optional[str] = None) -> int:
+        """검색할 후보 수: 모든 조건이 $filter로 처리되면 정확히 top_k, 로컬 필터가 남으면 그만큼만 여유"""
+        if filter_expression is None and (category or complexity or image_count is not None):
+            # 푸시다운 불가 (원격 스키마 미지원) → 모든 조건을 로컬 필터로 처리
+            return top_k * 3
+        if category or complexity:
+            # 이름 기반 카테고리 세분화 / JSX 코드 기반 복잡도는 로컬 필터
+            return top_k * 2
+        return top_k
+
+    def _rank_jsx_results(self, raw_results: List[Dict], query_text: str, category: str,
+                          image_count: int, complexity: str, top_k: int) -> List[Dict]:
+        """검색 원본 결과에 JSX 특화 필터링/점수 조정/정렬 적용 (사전 계산 구조 특징 행렬에 대해 벡터 연산)"""
+        if not raw_results:
+            return []
+        
+        features = feature_matrix(raw_results)
+        # 본문 조회까지 실패해 구조 특징을 알 수 없는 후보 (코드 기반 조건/보너스에서 불리하지 않게 처리)
+        unknown = unknown_feature_rows(features)
+        result_image_counts = np.array([result.get("image_count") or 0 for result in raw_results], dtype=np.float64)
+        category_codes = features[:, FEATURE_COLUMNS["jsx_category_code"]]
+        
+        # 2. JSX 특화 필터링 (카테고리 / 이미지 수 ±1 / 복잡도)
+        keep = np.ones(len(raw_results), dtype=bool)
+        if category:
+            keep &= category_codes == CATEGORY_CODES.get(category, -1)
+        if image_count is not None:
+            keep &= np.abs(result_image_counts - image_count) <= 1
+        if complexity:
+            complexity_index = COMPLEXITY_LEVELS.index(complexity) if complexity in COMPLEXITY_LEVELS else -1
+            keep &= unknown | (complexity_codes(features[:, FEATURE_COLUMNS["jsx_complexity_score"]]) == complexity_index)
+        
+        # 3. JSX 특화 점수 조정 (기본 점수 + 카테고리/이미지 수/이름/품질 보너스)
+        scores = np.array([result.get("score", 0.0) for result in raw_results], dtype=np.float64)
+        if category:
+            scores += 0.2 * (category_codes == CATEGORY_CODES.get(category, -1))
+        if image_count is not None:
+            image_count_gap = np.abs(result_image_counts - image_count)
+            scores += 0.3 * (image_count_gap == 0) + 0.1 * (image_count_gap == 1)
+        query_words = query_text.lower().split()
+        scores += 0.1 * np.array([
+            sum(1 for word in query_words if word in (result.get("component_name") or "").lower())
+            for result in raw_results
+        ], dtype=np.float64)
+        quality_bonus = 0.15 * (features[:, FEATURE_COLUMNS["jsx_quality_score"]] >= HIGH_QUALITY_MIN_SCORE)
+        if unknown.any():
+            # 품질을 알 수 없는 후보는 특징을 아는 후보들의 평균 보너스 적용
+            quality_bonus[unknown] = quality_bonus[~unknown].mean() if (~unknown).any() else 0.0
+        scores += quality_bonus
+        
+        # 4. 결과 정렬 및 반환 (동점은 검색 순서 유지)
+        ranked_positions = [position for position in np.argsort(-scores, kind="stable") if keep[position]][:top_k]
+        ranked_results = []
+        for position in ranked_positions:
+            result = raw_results[position]
+            result["jsx_relevance_score"] = float(scores[position])
+            ranked_results.append(result)
+        return ranked_results
+
     def _enhance_jsx_query(self, base_query: str, category: str = None, complexity: str = None) -> str:
         """JSX 검색을 위한 쿼리 강화"""
         enhanced_parts = [base_query]
@@ -123,143 +291,15 @@ class JSXVectorManager:
         
         return " ".join(enhanced_parts)
 
-    def _apply_jsx_filters(self, results: List[Dict], category: str = None, 
-                          image_count: int = None, complexity: str = None) -> List[Dict]:
-        """JSX 특화 필터링 적용"""
-        filtered = []
-        
-        for result in results:
-            # 카테고리 필터
-            if category:
-                result_category = self._infer_category_from_result(result)
-                if result_category != category:
-                    continue
-            
-            # 이미지 수 필터
-            if image_count is not None:
-                result_image_count = result.get("image_count", 0)
-                # 정확한 매칭 또는 ±1 범위 허용
-                if abs(result_image_count - image_count) > 1:
-                    continue
-            
-            # 복잡도 필터
-            if complexity:
-                result_complexity = self._infer_complexity_from_result(result)
-                if result_complexity != complexity:
-                    continue
-            
-            filtered.append(result)
-        
-        return filtered
-
-    def _infer_category_from_result(self, result: Dict) -> str:
-        """검색 결과에서 카테고리 추론"""
-        image_count = result.get("image_count", 0)
-        component_name = result.get("component_name", "").lower()
-        jsx_code = result.get("jsx_code", "").lower()
-        
-        # 이미지 수 기반 추론
-        if image_count == 0:
-            return "text_focused"
-        elif image_count >= 3:
-            return "image_focused"
-        else:
-            # 컴포넌트 이름과 코드 분석으로 세분화
-            if any(keyword in component_name for keyword in ["image", "gallery", "photo"]):
-                return "image_focused"
-            elif any(keyword in component_name for keyword in ["text", "article", "content"]):
-                return "text_focused"
-            else:
-                return "mixed"
-
-    def _infer_complexity_from_result(self, result: Dict) -> str:
-        """검색 결과에서 복잡도 추론"""
-        jsx_code = result.get("jsx_code", "")
-        
-        # JSX 코드 복잡도 분석
-        div_count = jsx_code.count("<div")
-        style_count = jsx_code.count("style=")
-        component_count = jsx_code.count("<") - jsx_code.count("</")
-        
-        complexity_score = div_count + (style_count * 0.5) + (component_count * 0.3)
-        
-        if complexity_score < 5:
-            return "simple"
-        elif complexity_score < 15:
-            return "moderate"
-        else:
-            return "complex"
-
-    def _calculate_jsx_relevance_scores(self, results: List[Dict], query_text: str, 
-                                      category: str = None, image_count: int = None) -> List[Dict]:
-        """JSX 특화 관련성 점수 계산"""
-        
-        for result in results:
-            base_score = result.get("score", 0.0)
-            jsx_score = base_score
-            
-            # 카테고리 매칭 보너스
-            if category:
-                inferred_category = self._infer_category_from_result(result)
-                if inferred_category == category:
-                    jsx_score += 0.2
-            
-            # 이미지 수 매칭 보너스
-            if image_count is not None:
-                result_image_count = result.get("image_count", 0)
-                if result_image_count == image_count:
-                    jsx_score += 0.3
-                elif abs(result_image_count - image_count) == 1:
-                    jsx_score += 0.1
-            
-            # 컴포넌트 이름 관련성
-            component_name = result.get("component_name", "").lower()
-            query_words = query_text.lower().split()
-            name_matches = sum(1 for word in query_words if word in component_name)
-            jsx_score += (name_matches * 0.1)
-            
-            # JSX 코드 품질 점수
-            jsx_code = result.get("jsx_code", "")
-            if self._is_high_quality_jsx(jsx_code):
-                jsx_score += 0.15
-            
-            result["jsx_relevance_score"] = jsx_score
-        
-        return results
-
-    def _is_high_quality_jsx(self, jsx_code: str) -> bool:
-        """JSX 코드 품질 평가"""
-        quality_indicators = [
-            "import React" in jsx_code,
-            "export default" in jsx_code,
-            "style={{" in jsx_code,
-            len(jsx_code) > 200,  # 충분한 길이
-            jsx_code.count("{") == jsx_code.count("}"),  # 괄호 균형
-        ]
-        
-        return sum(quality_indicators) >= 3
-
     def get_jsx_recommendations(self, content_description: str, 
                               image_count: int = None, layout_preference: str = None) -> List[Dict]:
         """
         ✅ 콘텐츠 설명을 바탕으로 JSX 컴포넌트 추천
         """
         try:
-            # 이미지 수에 따른 카테고리 결정
-            if image_count is not None:
-                if image_count == 0:
-                    category = "text_focused"
-                elif image_count <= 2:
-                    category = "mixed"
-                else:
-                    category = "image_focused"
-            else:
-                category = None
-            
-            # 레이아웃 선호도를 쿼리에 포함
-            search_query = f"{content_description} layout design component"
-            if layout_preference:
-                search_query += f" {layout_preference}"
+            category, search_query = self._build_recommendation_search(
+                content_description, image_count, layout_preference
+            )
             
             # JSX 컴포넌트 검색
             recommendations = self.search_jsx_components(
@@ -269,17 +309,62 @@ class JSXVectorManager:
                 top_k=5
             )
             
-            # 추천 점수 추가
-            for i, rec in enumerate(recommendations):
-                rec["recommendation_rank"] = i + 1
-                rec["recommendation_score"] = 1.0 - (i * 0.1)  # 순위에 따른 점수
-            
-            return recommendations
+            return self._add_recommendation_scores(recommendations)
             
         except Exception as e:
             print(f"❌ JSX 추천 실패: {e}")
             return []
 
+    async def get_jsx_recommendations_async(self, content_description: str,
+                                            image_count: int = None, layout_preference: str = None) -> List[Dict]:
+        """
+        ✅ 콘텐츠 설명을 바탕으로 JSX 컴포넌트 추천 (비동기)
+        """
+        try:
+            category, search_query = self._build_recommendation_search(
+                content_description, image_count, layout_preference
+            )
+
+            recommendations = await self.search_jsx_components_async(
+                query_text=search_query,
+                category=category,
+                image_count=image_count,
+                top_k=5
+            )
+
+            return self._add_recommendation_scores(recommendations)
+
+        except Exception as e:
+            print(f"❌ JSX 비동기 추천 실패: {e}")
+            return []
+
+    def _build_recommendation_search(self, content_description: str, image_count: int = None,
+                                     layout_preference: str = None):
+        """추천 검색용 (카테고리, 쿼리) 생성"""
+        # 이미지 수에 따른 카테고리 결정
+        if image_count is not None:
+            if image_count == 0:
+                category = "text_focused"
+            elif image_count <= 2:
+                category = "mixed"
+            else:
+                category = "image_focused"
+        else:
+            category = None
+        
+        # 레이아웃 선호도를 쿼리에 포함
+        search_query = f"{content_description} layout design component"
+        if layout_preference:
+            search_query += f" {layout_preference}"
+        return category, search_query
+
+    def _add_recommendation_scores(self, recommendations: List[Dict]) -> List[Dict]:
+        """추천 순위/점수 추가"""
+        for i, rec in enumerate(recommendations):
+            rec["recommendation_rank"] = i + 1
+            rec["recommendation_score"] = 1.0 - (i * 0.1)  # 순위에 따른 점수
+        return recommendations
+
     def get_jsx_template_by_structure(self, layout_type: str, image_count: int, 
                                     complexity: str = "moderate") -> Optional[Dict]:
         """
@@ -0,0 +1,168 @@
+"""
+레이아웃 전략 / 템플릿 사전 계산 조회 테이블
+대부분의 섹션은 (레이아웃 타입, 이미지 수, 본문 길이 구간, 스타일) 조합 몇 개로 나뉘므로
+오프라인 빌드 단계(scripts/build_layout_lookup_table.py)에서 조합별 최적 전략과 템플릿을 미리 계산해
+버전이 붙은 JSON 아티팩트로 저장하고, 런타임에는 키 조회(O(1))로 제공. 테이블에 없는 조합만 실시간 검색
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+DEFAULT_LOOKUP_TABLE_PATH = Path(__file__).parent.parent.parent / ".cache" / "layout_lookup_table.json"
+LAYOUT_LOOKUP_TABLE_PATH = Path(os.getenv("LAYOUT_LOOKUP_TABLE_PATH", str(DEFAULT_LOOKUP_TABLE_PATH)))
+LAYOUT_LOOKUP_ENABLED = os.getenv("LAYOUT_LOOKUP_ENABLED", "true").lower() == "true"
+
+# 키 구성 규칙이나 저장 형식이 바뀌면 올림 (다른 스키마의 아티팩트는 무시)
+LOOKUP_TABLE_SCHEMA_VERSION = 1
+
+# 본문 길이 구간 (전략/템플릿 선택의 기존 분기 기준 200자, 500자와 동일)
+LENGTH_BUCKETS = ((200, "short"), (500, "medium"))
+LONG_BUCKET = "long"
+# 이미지 수는 4장 이상을 하나로 취급
+MAX_IMAGE_BUCKET = 4
+
+
+def length_bucket(content_length: int) -> str:
+    for upper_bound, name in LENGTH_BUCKETS:
+        if content_length < upper_bound:
+            return name
+    return LONG_BUCKET
+
+
+def image_bucket(image_count: int) -> int:
+    return max(0, min(int(image_count or 0), MAX_IMAGE_BUCKET))
+
+
+def make_lookup_key(layout_type: str, image_count: int, content_length: int, style: str) -> str:
+    """(레이아웃 타입, 이미지 수, 길이 구간, 스타일) → 테이블 키"""
+    return f"{layout_type}|{image_bucket(image_count)}|{length_bucket(content_length)}|{style}"
+
+
+class LayoutLookupTable:
+    """사전 계산 아티팩트 로더 (최초 조회 시 1회 로드, reload()로 재적재)"""
+
+    def __init__(self, path: Path = LAYOUT_LOOKUP_TABLE_PATH):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.version: Optional[str] = None
+        self._strategies: Dict[str, Dict] = {}
+        self._templates: Dict[str, Dict] = {}
+        self.stats_counter = {"strategy_hits": 0, "strategy_misses": 0, "template_hits": 0, "template_misses": 0}
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            if not self.path.exists():
+                return
+            try:
+                artifact = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception as e:
+                print(f"⚠️ 레이아웃 조회 테이블 로드 실패 ({self.path}): {e}")
+                return
+            if artifact.get("schema_version") != LOOKUP_TABLE_SCHEMA_VERSION:
+                print(f"⚠️ 레이아웃 조회 테이블 스키마 불일치 ({artifact.get('schema_version')}) - 실시간 검색 사용")
+                return
+            self._strategies = artifact.get("strategies", {})
+            self._templates = artifact.get("templates", {})
+            self.version = artifact.get("version")
+            print(f"✅ 레이아웃 조회 테이블 로드: 전략 {len(self._strategies)}개, "
+                  f"템플릿 {len(self._templates)}개 (버전 {self.version})")
+
+    def get_strategy(self, key: str) -> Optional[Dict]:
+        """키에 해당하는 레이아웃 전략 사본 (없으면 None → 실시간 생성)"""
+        if not LAYOUT_LOOKUP_ENABLED:
+            return None
+        self._ensure_loaded()
+        strategy = self._strategies.get(key)
+        self.stats_counter["strategy_hits" if strategy is not None else "strategy_misses"] += 1
+        return copy.deepcopy(strategy) if strategy is not None else None
+
+    def get_template(self, key: str) -> Optional[Dict]:
+        """키에 해당하는 템플릿 참조 {id, component_name, score} (본문은 호출 측에서 조회)"""
+        if not LAYOUT_LOOKUP_ENABLED:
+            return None
+        self._ensure_loaded()
+        template = self._templates.get(key)
+        self.stats_counter["template_hits" if template is not None else "template_misses"] += 1
+        return dict(template) if template is not None else None
+
+    def has_strategy(self, key: str) -> bool:
+        """통계에 포함하지 않는 존재 확인 (검색 계획 수립용)"""
+        if not LAYOUT_LOOKUP_ENABLED:
+            return False
+        self._ensure_loaded()
+        return key in self._strategies
+
+    def has_template(self, key: str) -> bool:
+        if not LAYOUT_LOOKUP_ENABLED:
+            return False
+        self._ensure_loaded()
+        return key in self._templates
+
+    def reload(self):
+        with self._lock:
+            self._loaded = False
+            self.version = None
+            self._strategies = {}
+            self._templates = {}
+
+    def stats(self) -> Dict:
+        return {
+            **self.stats_counter,
+            "enabled": LAYOUT_LOOKUP_ENABLED,
+            "path": str(self.path),
+            "version": self.version,
+            "strategies": len(self._strategies),
+            "templates": len(self._templates),
+        }
+
+
+def write_lookup_table(strategies: Dict[str, Dict], templates: Dict[str, Dict],
+                       path: Path = LAYOUT_LOOKUP_TABLE_PATH, metadata: Optional[Dict] = None) -> Dict:
+    """빌드 결과를 버전이 붙은 아티팩트로 저장 (내용 해시가 버전, 임시 파일 교체로 원자적 기록)"""
+    payload = json.dumps({"strategies": strategies, "templates": templates}, ensure_ascii=False, sort_keys=True)
+    artifact = {
+        "schema_version": LOOKUP_TABLE_SCHEMA_VERSION,
+        "version": hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12],
+        "built_at": datetime.now().isoformat(),
+        **(metadata or {}),
+        "strategies": strategies,
+        "templates": templates,
+    }
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    temp_path.write_text(json.dumps(artifact, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(temp_path, path)
+    return artifact
+
+
+_lookup_table_instance: Optional[LayoutLookupTable] = None
+_lookup_table_lock = threading.Lock()
+
+
+def get_layout_lookup_table() -> LayoutLookupTable:
+    """프로세스 공유 레이아웃 조회 테이블"""
+    global _lookup_table_instance
+    if _lookup_table_instance is None:
+        with _lookup_table_lock:
+            if _lookup_table_instance is None:
+                _lookup_table_instance = LayoutLookupTable()
+    return _lookup_table_instance
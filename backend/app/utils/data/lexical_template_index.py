@@ -0,0 +1,221 @@
+"""
+JSX 템플릿 BM25 어휘 인덱스 (임베딩 없는 빠른 경로)
+로컬 스냅샷(jsx-component-vector-index 복제본 문서)의 search_keywords / component_name / layout_method로
+프로세스 내 역색인을 만들고, 어휘 신뢰도가 충분하면 임베딩·벡터 검색 없이 템플릿 후보를 반환
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from .local_vector_replica import get_local_vector_replica
+
+
+load_dotenv()
+
+LEXICAL_FAST_PATH_ENABLED = os.getenv("LEXICAL_FAST_PATH_ENABLED", "true").lower() == "true"
+# 질의 전체 단어(어휘에 없는 단어 포함) 중 1위 문서가 덮는 IDF 가중 비율 - 이 이상이면 벡터 검색 생략
+LEXICAL_CONFIDENCE_THRESHOLD = float(os.getenv("LEXICAL_CONFIDENCE_THRESHOLD", "0.6"))
+LEXICAL_MIN_MATCHED_TERMS = 2
+# 스냅샷 버전 확인 주기 (초)
+SNAPSHOT_CHECK_INTERVAL = 30.0
+
+JSX_INDEX_NAME = "jsx-component-vector-index"
+
+# 필드별 가중치 (필드 토큰을 가중치만큼 반복 계산)
+FIELD_WEIGHTS = {"search_keywords": 2, "component_name": 2, "layout_method": 1}
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD_PATTERN = re.compile(r"[0-9A-Za-z]+|[가-힣]+")
+_CAMEL_PATTERN = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_STOPWORDS = {"a", "an", "the", "and", "or", "with", "for", "of", "to", "from", "in", "on", "about", "content"}
+
+
+def tokenize(text: str) -> List[str]:
+    """영문 camelCase 분리 + 소문자화, 한글은 어절과 음절 bigram (형태소 분석 없이 조사 차이 흡수)"""
+    tokens = []
+    for word in _WORD_PATTERN.findall(_CAMEL_PATTERN.sub(" ", str(text or ""))):
+        if word[0] >= "가":
+            tokens.append(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            word = word.lower()
+            if word not in _STOPWORDS:
+                tokens.append(word)
+    return tokens
+
+
+@dataclass(frozen=True)
+class _IndexSnapshot:
+    """스냅샷 버전 하나의 역색인 (재구축 시 통째로 교체하므로 검색 중에는 잠금 없이 읽음)"""
+    version: str
+    documents: Tuple[Dict, ...]
+    postings: Dict[str, Tuple[Tuple[int, int], ...]]
+    doc_lengths: Tuple[int, ...]
+    avg_length: float
+    idf: Dict[str, float]
+    # 어휘에 없는 단어의 IDF (어떤 문서에도 없는 단어 = 최대 IDF)
+    unknown_idf: float
+
+    def term_idf(self, term: str) -> float:
+        return self.idf.get(term, self.unknown_idf)
+
+
+class LexicalTemplateIndex:
+    """BM25 역색인 (스냅샷 버전이 바뀌면 다음 조회 시 재구축)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._checked_at = 0.0
+        self.stats_counter = {"queries": 0, "confident": 0, "fallbacks": 0}
+
+    @property
+    def available(self) -> bool:
+        return LEXICAL_FAST_PATH_ENABLED and self._ensure_loaded()
+
+    @property
+    def _version(self) -> Optional[str]:
+        snapshot = self._snapshot
+        return snapshot.version if snapshot is not None else None
+
+    def _ensure_loaded(self) -> bool:
+        if self._snapshot is not None and time.monotonic() - self._checked_at < SNAPSHOT_CHECK_INTERVAL:
+            return True
+
+        replica = get_local_vector_replica()
+        meta = replica.get_snapshot_meta(JSX_INDEX_NAME)
+        self._checked_at = time.monotonic()
+        if meta is None:
+            return self._snapshot is not None
+        if meta.get("version") == self._version:
+            return True
+        with self._lock:
+            if meta.get("version") != self._version:
+                snapshot = self._build(replica.replica_dir / f"{JSX_INDEX_NAME}.docs.jsonl", meta.get("version"))
+                self._snapshot = snapshot
+        return True
+
+    def _build(self, docs_path, version: str) -> _IndexSnapshot:
+        """문서 파일 → 새 역색인 스냅샷 (기존 스냅샷은 교체 전까지 그대로 검색에 사용)"""
+        with open(docs_path, "r", encoding="utf-8") as f:
+            documents = [json.loads(line) for line in f if line.strip()]
+
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        doc_lengths = []
+        for position, document in enumerate(documents):
+            term_counts: Counter = Counter()
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(document.get(field, "")):
+                    term_counts[token] += weight
+            for term, count in term_counts.items():
+                postings[term].append((position, count))
+            doc_lengths.append(sum(term_counts.values()))
+
+        count = len(documents)
+        snapshot = _IndexSnapshot(
+            version=version,
+            documents=tuple(documents),
+            postings={term: tuple(entries) for term, entries in postings.items()},
+            doc_lengths=tuple(doc_lengths),
+            avg_length=(sum(doc_lengths) / count) if count else 0.0,
+            idf={
+                term: math.log(1 + (count - len(entries) + 0.5) / (len(entries) + 0.5))
+                for term, entries in postings.items()
+            },
+            unknown_idf=math.log(1 + (count + 0.5) / 0.5),
+        )
+        print(f"✅ JSX 어휘 인덱스 구축: {count}개 템플릿, {len(snapshot.postings)}개 단어 (스냅샷 {version})")
+        return snapshot
+
+    def search(self, query_text: str, top_k: int = 5, image_count: Optional[int] = None) -> Tuple[List[Dict], float]:
+        """→ (원시 문서 목록, 신뢰도 0~1). 인덱스가 없으면 ([], 0.0)
+        @search.score는 질의의 BM25 최대 점수(모든 단어의 IDF × (k1 + 1)) 대비 비율(0~1)로 정규화해
+        벡터 검색 점수와 같은 범위에서 JSX 순위 보너스를 더할 수 있게 함
+        """
+        if not self.available:
+            return [], 0.0
+
+        snapshot = self._snapshot
+        self.stats_counter["queries"] += 1
+        all_terms = list(dict.fromkeys(tokenize(query_text)))
+        query_terms = [term for term in all_terms if term in snapshot.idf]
+        if len(query_terms) < LEXICAL_MIN_MATCHED_TERMS:
+            self.stats_counter["fallbacks"] += 1
+            return [], 0.0
+
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Dict[int, set] = defaultdict(set)
+        for term in query_terms:
+            idf = snapshot.idf[term]
+            for position, frequency in snapshot.postings[term]:
+                length_norm = 1 - BM25_B + BM25_B * snapshot.doc_lengths[position] / (snapshot.avg_length or 1.0)
+                scores[position] += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * length_norm)
+                matched[position].add(term)
+
+        if image_count is not None:
+            # JSX 검색의 이미지 수 조건과 동일 (정확히 일치 또는 ±1)
+            scores = {
+                position: score for position, score in scores.items()
+                if abs((snapshot.documents[position].get("image_count") or 0) - image_count) <= 1
+            }
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:top_k]
+        if not ranked:
+            self.stats_counter["fallbacks"] += 1
+            return [], 0.0
+
+        # 어휘에 없는 단어도 분모에 포함 (질의 대부분이 색인에 없으면 신뢰하지 않음)
+        total_idf = sum(snapshot.term_idf(term) for term in all_terms)
+        confidence = sum(snapshot.idf[term] for term in matched[ranked[0][0]]) / total_idf if total_idf else 0.0
+        self.stats_counter["confident" if confidence >= LEXICAL_CONFIDENCE_THRESHOLD else "fallbacks"] += 1
+
+        max_score = total_idf * (BM25_K1 + 1)
+        results = []
+        for position, score in ranked:
+            document = dict(snapshot.documents[position])
+            document["@search.score"] = score / max_score
+            results.append(document)
+        return results, confidence
+
+    def is_confident(self, confidence: float) -> bool:
+        return confidence >= LEXICAL_CONFIDENCE_THRESHOLD
+
+    def reload(self):
+        """스냅샷 재동기화 후 다음 조회 시 재구축"""
+        with self._lock:
+            self._checked_at = 0.0
+
+    def stats(self) -> Dict:
+        snapshot = self._snapshot
+        return {
+            **self.stats_counter,
+            "enabled": LEXICAL_FAST_PATH_ENABLED,
+            "documents": len(snapshot.documents) if snapshot else 0,
+            "terms": len(snapshot.postings) if snapshot else 0,
+            "snapshot_version": snapshot.version if snapshot else None,
+            "confidence_threshold": LEXICAL_CONFIDENCE_THRESHOLD,
+        }
+
+
+_lexical_index_instance: Optional[LexicalTemplateIndex] = None
+_lexical_index_lock = threading.Lock()
+
+
+def get_lexical_template_index() -> LexicalTemplateIndex:
+    """프로세스 공유 JSX 템플릿 어휘 인덱스"""
+    global _lexical_index_instance
+    if _lexical_index_instance is None:
+        with _lexical_index_lock:
+            if _lexical_index_instance is None:
+                _lexical_index_instance = LexicalTemplateIndex()
+    return _lexical_index_instance
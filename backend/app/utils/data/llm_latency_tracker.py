@@ -0,0 +1,135 @@
+"""
+LLM 지연 시간 추적 / 적응형 타임아웃 / 헤지 요청 예산
+(배포, 프롬프트 종류)별 최근 응답 시간 분포를 보관해 백분위수로 호출별 타임아웃을 정하고,
+p95를 넘긴 호출에는 중복(헤지) 요청을 한 번 보내 먼저 도착한 응답을 사용.
+헤지 요청은 일반 요청 수의 일정 비율(LLM_HEDGE_BUDGET_RATIO)까지만 허용해 추가 부하를 제한
+"""
+
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "true").lower() == "true"
+# 일반 요청 1건당 적립되는 헤지 예산 (0.05 → 요청 20건당 헤지 1건), 최대 적립량
+LLM_HEDGE_BUDGET_RATIO = float(os.getenv("LLM_HEDGE_BUDGET_RATIO", "0.05"))
+LLM_HEDGE_BUDGET_MAX = float(os.getenv("LLM_HEDGE_BUDGET_MAX", "5"))
+# 적응형 타임아웃 = p99 × 배수 (최소/최대 범위 안으로 제한)
+LLM_TIMEOUT_P99_MULTIPLIER = float(os.getenv("LLM_TIMEOUT_P99_MULTIPLIER", "3"))
+LLM_MIN_TIMEOUT = float(os.getenv("LLM_MIN_TIMEOUT", "20"))
+LLM_MAX_TIMEOUT = float(os.getenv("LLM_REQUEST_TIMEOUT", "120"))
+# 백분위수를 신뢰하기 위한 최소 표본 수 / 보관할 최근 표본 수
+LATENCY_MIN_SAMPLES = int(os.getenv("LLM_LATENCY_MIN_SAMPLES", "20"))
+LATENCY_WINDOW = int(os.getenv("LLM_LATENCY_WINDOW", "200"))
+
+LatencyKey = Tuple[str, str]
+
+
+def _percentile(sorted_samples, percentile: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, int(round(percentile / 100 * (len(sorted_samples) - 1)))))
+    return sorted_samples[index]
+
+
+class LLMLatencyTracker:
+    """(배포, 프롬프트 종류)별 최근 지연 시간 + 헤지 예산 (스레드 안전)"""
+
+    def __init__(self, window: int = LATENCY_WINDOW, min_samples: int = LATENCY_MIN_SAMPLES):
+        self.window = window
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._samples: Dict[LatencyKey, Deque[float]] = {}
+        self._hedge_budget = 0.0
+        self.stats_counter = {"requests": 0, "hedges_sent": 0, "hedges_won": 0, "hedges_denied": 0, "timeouts": 0}
+
+    def record(self, key: LatencyKey, seconds: float, timed_out: bool = False):
+        """응답 시간 표본 추가 (타임아웃은 타임아웃 값을 표본으로 넣어 다음 타임아웃이 과도하게 줄지 않게 함)"""
+        with self._lock:
+            self._samples.setdefault(key, deque(maxlen=self.window)).append(seconds)
+            if timed_out:
+                self.stats_counter["timeouts"] += 1
+
+    def percentiles(self, key: LatencyKey) -> Optional[Dict[str, float]]:
+        """표본이 충분하면 p50/p95/p99 (초), 아니면 None"""
+        with self._lock:
+            samples = sorted(self._samples.get(key, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return {"p50": _percentile(samples, 50), "p95": _percentile(samples, 95), "p99": _percentile(samples, 99)}
+
+    def adaptive_timeout(self, key: LatencyKey) -> float:
+        """p99 × 배수 (표본이 부족하면 최대 타임아웃)"""
+        percentiles = self.percentiles(key)
+        if percentiles is None:
+            return LLM_MAX_TIMEOUT
+        return min(LLM_MAX_TIMEOUT, max(LLM_MIN_TIMEOUT, percentiles["p99"] * LLM_TIMEOUT_P99_MULTIPLIER))
+
+    def hedge_delay(self, key: LatencyKey) -> Optional[float]:
+        """헤지 요청을 보낼 시점 (p95, 헤지 비활성화 또는 표본 부족이면 None)"""
+        if not LLM_HEDGING_ENABLED:
+            return None
+        percentiles = self.percentiles(key)
+        return percentiles["p95"] if percentiles else None
+
+    def note_request(self):
+        """일반 요청 1건 → 헤지 예산 적립"""
+        with self._lock:
+            self.stats_counter["requests"] += 1
+            self._hedge_budget = min(LLM_HEDGE_BUDGET_MAX, self._hedge_budget + LLM_HEDGE_BUDGET_RATIO)
+
+    def try_acquire_hedge(self) -> bool:
+        """헤지 예산 1건 예약 (실제 전송 시 note_hedge_sent, 보내지 못하면 refund_hedge 호출)"""
+        with self._lock:
+            if self._hedge_budget < 1:
+                self.stats_counter["hedges_denied"] += 1
+                return False
+            self._hedge_budget -= 1
+            return True
+
+    def refund_hedge(self):
+        """예약했지만 보내지 못한 헤지(레이트 리밋 등) → 예산 반환"""
+        with self._lock:
+            self._hedge_budget = min(LLM_HEDGE_BUDGET_MAX, self._hedge_budget + 1)
+            self.stats_counter["hedges_denied"] += 1
+
+    def note_hedge_sent(self):
+        with self._lock:
+            self.stats_counter["hedges_sent"] += 1
+
+    def note_hedge_won(self):
+        with self._lock:
+            self.stats_counter["hedges_won"] += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            sample_counts = {key: len(samples) for key, samples in self._samples.items()}
+            counter = dict(self.stats_counter)
+            budget = self._hedge_budget
+        return {
+            **counter,
+            "hedging_enabled": LLM_HEDGING_ENABLED,
+            "hedge_budget": round(budget, 2),
+            "latency": {f"{deployment}/{prompt_class}": {
+                "samples": count,
+                "percentiles": self.percentiles((deployment, prompt_class)),
+                "timeout": self.adaptive_timeout((deployment, prompt_class)),
+            } for (deployment, prompt_class), count in sample_counts.items()},
+        }
+
+
+_tracker_instance: Optional[LLMLatencyTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_llm_latency_tracker() -> LLMLatencyTracker:
+    """프로세스 공유 LLM 지연 시간 추적기"""
+    global _tracker_instance
+    if _tracker_instance is None:
+        with _tracker_lock:
+            if _tracker_instance is None:
+                _tracker_instance = LLMLatencyTracker()
+    return _tracker_instance
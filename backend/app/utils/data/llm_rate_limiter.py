@@ -0,0 +1,273 @@
+"""
+LLM 호출 전역 토큰 버킷 제한기 (배포별 RPM / TPM)
+모든 AzureOpenAILLM 인스턴스가 배포별 버킷 하나를 공유해 요청 수와 추정 토큰 수를 함께 예산 관리.
+할당량 안에서는 대기 없이 통과하고, 부족할 때만 필요한 만큼 대기(비동기/동기 모두 지원).
+429 응답의 Retry-After는 버킷에 반영해 같은 배포의 다른 호출도 함께 물러나게 함.
+LLM_RATE_LIMIT_SHARED_DIR를 지정하면 파일 잠금(fcntl)으로 여러 프로세스(워커)가 같은 버킷을 공유
+"""
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Hashable, Iterator, List, Optional, Union
+
+from dotenv import load_dotenv
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+
+load_dotenv()
+
+LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "true").lower() == "true"
+# 배포 할당량 기본값 (LLM_RPM_LIMIT_<배포명>, LLM_TPM_LIMIT_<배포명>으로 배포별 재정의)
+LLM_RPM_LIMIT = float(os.getenv("LLM_RPM_LIMIT", "60"))
+LLM_TPM_LIMIT = float(os.getenv("LLM_TPM_LIMIT", "80000"))
+LLM_RATE_LIMIT_SHARED_DIR = os.getenv("LLM_RATE_LIMIT_SHARED_DIR", "")
+# Retry-After 헤더가 없는 429의 기본 대기 시간
+DEFAULT_RETRY_AFTER = 10.0
+# 응답 크기 이력이 없는 프롬프트 클래스의 예상 응답 토큰 수 (이후에는 실제 응답 크기의 이동 평균)
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "1000"))
+COMPLETION_SIZE_ALPHA = 0.2
+
+
+def estimate_tokens(messages: Union[str, List[Dict]], max_tokens: int = 0) -> int:
+    """요청 토큰 추정 (ASCII 4자당 1토큰, 한글 등 비ASCII는 1자당 1토큰) + 응답 토큰 예약분"""
+    if isinstance(messages, str):
+        text = messages
+    else:
+        text = "".join(str(message.get("content") or "") if isinstance(message, dict) else str(message)
+                       for message in messages)
+    ascii_chars = sum(1 for char in text if ord(char) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + max_tokens
+
+
+class CompletionSizeTracker:
+    """프롬프트 클래스별 응답(completion) 토큰 수 이동 평균
+    예산은 최대 토큰(max_tokens) 대신 예상 응답 크기로 예약하고, 차이는 record_usage로 보정
+    """
+
+    def __init__(self, default_tokens: int = LLM_EXPECTED_COMPLETION_TOKENS, alpha: float = COMPLETION_SIZE_ALPHA):
+        self.default_tokens = default_tokens
+        self.alpha = alpha
+        self._lock = threading.Lock()
+        self._averages: Dict[Hashable, float] = {}
+
+    def expected(self, key: Hashable, max_tokens: int) -> int:
+        with self._lock:
+            average = self._averages.get(key)
+        return min(max_tokens, round(average if average is not None else self.default_tokens))
+
+    def record(self, key: Hashable, completion_tokens: Optional[int]):
+        if completion_tokens is None:
+            return
+        with self._lock:
+            average = self._averages.get(key)
+            self._averages[key] = (completion_tokens if average is None
+                                   else average + self.alpha * (completion_tokens - average))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            averages = dict(self._averages)
+        return {"/".join(map(str, key)) if isinstance(key, tuple) else str(key): round(average)
+                for key, average in averages.items()}
+
+
+def _env_limit(prefix: str, deployment: str, default: float) -> float:
+    suffix = re.sub(r"[^0-9A-Za-z]", "_", deployment).upper()
+    return float(os.getenv(f"{prefix}_{suffix}", default))
+
+
+class DeploymentRateLimiter:
+    """배포 하나의 요청/토큰 버킷 (1분 동안 할당량만큼 선형 충전, 최대 1분치까지 적립)"""
+
+    def __init__(self, deployment: str, rpm: float, tpm: float, shared_dir: str = ""):
+        self.deployment = deployment
+        self.rpm = rpm
+        self.tpm = tpm
+        self._lock = threading.Lock()
+        self._state = {"requests": rpm, "tokens": tpm, "updated": time.time(), "blocked_until": 0.0}
+        self._state_path: Optional[Path] = None
+        if shared_dir and FCNTL_AVAILABLE:
+            Path(shared_dir).mkdir(parents=True, exist_ok=True)
+            safe_name = re.sub(r"[^0-9A-Za-z_-]", "_", deployment)
+            self._state_path = Path(shared_dir) / f"llm_rate_{safe_name}.json"
+        self.stats_counter = {"acquired": 0, "waited": 0, "wait_seconds": 0.0, "rate_limited": 0}
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict]:
+        """버킷 상태 잠금 (프로세스 공유 모드면 파일 잠금 후 읽기/쓰기)"""
+        with self._lock:
+            if self._state_path is None:
+                yield self._state
+                return
+            with open(self._state_path, "a+", encoding="utf-8") as state_file:
+                fcntl.flock(state_file, fcntl.LOCK_EX)
+                try:
+                    state_file.seek(0)
+                    content = state_file.read()
+                    if content:
+                        try:
+                            self._state = json.loads(content)
+                        except ValueError:
+                            pass
+                    yield self._state
+                    state_file.seek(0)
+                    state_file.truncate()
+                    state_file.write(json.dumps(self._state))
+                    state_file.flush()
+                finally:
+                    fcntl.flock(state_file, fcntl.LOCK_UN)
+
+    def _refill(self, state: Dict, now: float):
+        elapsed = max(0.0, now - state["updated"])
+        state["requests"] = min(self.rpm, state["requests"] + elapsed * self.rpm / 60.0)
+        state["tokens"] = min(self.tpm, state["tokens"] + elapsed * self.tpm / 60.0)
+        state["updated"] = now
+
+    def _try_reserve(self, tokens: int) -> float:
+        """예산이 있으면 차감 후 0, 없으면 필요한 대기 시간(초) 반환"""
+        # 할당량보다 큰 요청은 가득 찬 버킷에서 통과시킴 (영원히 대기하지 않도록)
+        tokens = min(tokens, self.tpm)
+        now = time.time()
+        with self._locked_state() as state:
+            self._refill(state, now)
+            if now < state["blocked_until"]:
+                return state["blocked_until"] - now
+            request_wait = (1 - state["requests"]) * 60.0 / self.rpm if state["requests"] < 1 else 0.0
+            token_wait = (tokens - state["tokens"]) * 60.0 / self.tpm if state["tokens"] < tokens else 0.0
+            if request_wait or token_wait:
+                return max(request_wait, token_wait)
+            state["requests"] -= 1
+            state["tokens"] -= tokens
+            return 0.0
+
+    def _record_wait(self, waited: float) -> float:
+        self.stats_counter["acquired"] += 1
+        if waited:
+            self.stats_counter["waited"] += 1
+            self.stats_counter["wait_seconds"] += waited
+        return waited
+
+    async def acquire(self, tokens: int) -> float:
+        """요청 1건 + 추정 토큰 예산 확보 (부족하면 이벤트 루프를 막지 않고 대기), 대기한 시간(초) 반환
+        프로세스 공유 모드의 파일 잠금/입출력은 스레드에서 실행
+        """
+        waited = 0.0
+        while True:
+            if self._state_path is None:
+                wait = self._try_reserve(tokens)
+            else:
+                wait = await asyncio.to_thread(self._try_reserve, tokens)
+            if not wait:
+                break
+            await asyncio.sleep(wait)
+            waited += wait
+        return self._record_wait(waited)
+
+    def acquire_sync(self, tokens: int) -> float:
+        """동기 호출 경로(CrewAI)용 acquire"""
+        waited = 0.0
+        while True:
+            wait = self._try_reserve(tokens)
+            if not wait:
+                break
+            time.sleep(wait)
+            waited += wait
+        return self._record_wait(waited)
+
+    def try_acquire(self, tokens: int) -> bool:
+        """대기 없이 예산 확보 시도 (헤지 요청처럼 지금 보낼 수 없으면 보내지 않는 호출용)"""
+        if self._try_reserve(tokens):
+            return False
+        self._record_wait(0.0)
+        return True
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: Optional[int]):
+        """실제 사용량으로 추정치 보정 (남은 예산 환급 또는 초과분 차감)"""
+        if actual_tokens is None:
+            return
+        with self._locked_state() as state:
+            state["tokens"] = min(self.tpm, state["tokens"] + min(estimated_tokens, self.tpm) - actual_tokens)
+
+    def penalize(self, retry_after: Optional[float]):
+        """429 응답 반영: Retry-After 동안 이 배포의 모든 호출 보류"""
+        retry_after = retry_after if retry_after is not None else DEFAULT_RETRY_AFTER
+        self.stats_counter["rate_limited"] += 1
+        with self._locked_state() as state:
+            state["blocked_until"] = max(state["blocked_until"], time.time() + retry_after)
+            state["requests"] = 0.0
+        print(f"⚠️ LLM 429 수신: {self.deployment} 배포 호출 {retry_after:.1f}초 보류")
+
+    def stats(self) -> Dict:
+        with self._locked_state() as state:
+            self._refill(state, time.time())
+            available = {"available_requests": round(state["requests"], 2),
+                         "available_tokens": round(state["tokens"])}
+        return {
+            **self.stats_counter,
+            **available,
+            "deployment": self.deployment,
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "shared": self._state_path is not None,
+        }
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """openai 예외의 응답 헤더에서 재시도 대기 시간 추출 (retry-after-ms 우선)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        pass
+    return None
+
+
+_limiters: Dict[str, DeploymentRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_llm_rate_limiter(deployment: str) -> Optional[DeploymentRateLimiter]:
+    """배포별 프로세스 공유 제한기 (비활성화 시 None)"""
+    if not LLM_RATE_LIMIT_ENABLED:
+        return None
+    limiter = _limiters.get(deployment)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(deployment)
+            if limiter is None:
+                limiter = DeploymentRateLimiter(
+                    deployment,
+                    rpm=_env_limit("LLM_RPM_LIMIT", deployment, LLM_RPM_LIMIT),
+                    tpm=_env_limit("LLM_TPM_LIMIT", deployment, LLM_TPM_LIMIT),
+                    shared_dir=LLM_RATE_LIMIT_SHARED_DIR,
+                )
+                _limiters[deployment] = limiter
+    return limiter
+
+
+_completion_size_tracker = CompletionSizeTracker()
+
+
+def get_completion_size_tracker() -> CompletionSizeTracker:
+    """프로세스 공유 예상 응답 크기 추적기"""
+    return _completion_size_tracker
+
+
+def get_llm_rate_limiter_stats() -> Dict[str, Dict]:
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.deployment: limiter.stats() for limiter in limiters}
@@ -0,0 +1,202 @@
+"""
+LLM 응답 캐시 (정확 일치)
+입력이 같으면 재생성 시에도 같은 프롬프트가 반복되는 호출(섹션 분할, JSX 생성, 이미지 위치 분석)의 응답을
+(배포, 전체 메시지, temperature, max_tokens, 프롬프트 템플릿 버전) 키로 저장하는 2단계 캐시 (메모리 LRU → SQLite 디스크).
+호출 측이 cacheable로 표시한 호출에만 적용하며, TTL이 지난 항목은 미적중으로 처리
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent.parent / ".cache" / "llm_responses.sqlite3"
+
+LLM_RESPONSE_CACHE_ENABLED = os.getenv("LLM_RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+LLM_RESPONSE_CACHE_PATH = Path(os.getenv("LLM_RESPONSE_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+LLM_RESPONSE_CACHE_TTL = float(os.getenv("LLM_RESPONSE_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_RESPONSE_CACHE_MEMORY_SIZE = int(os.getenv("LLM_RESPONSE_CACHE_MEMORY_SIZE", "512"))
+# "false"로 설정하면 디스크 계층 없이 메모리 LRU만 사용
+LLM_RESPONSE_CACHE_DISK_ENABLED = os.getenv("LLM_RESPONSE_CACHE_DISK_ENABLED", "true").lower() == "true"
+
+
+def make_llm_cache_key(deployment: str, messages: Union[str, List[Dict[str, Any]]], temperature: float,
+                       max_tokens: int, prompt_version: str) -> str:
+    """요청 전체를 정렬된 JSON으로 직렬화한 SHA-256 (메시지 한 글자만 달라도 다른 키)"""
+    payload = json.dumps({
+        "deployment": deployment,
+        "messages": messages,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "prompt_version": prompt_version,
+    }, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """메모리 LRU + SQLite 디스크 2단계 응답 캐시 (TTL, 에이전트별 적중률 집계, 스레드 안전)"""
+
+    def __init__(self, ttl_seconds: float = LLM_RESPONSE_CACHE_TTL, memory_size: int = LLM_RESPONSE_CACHE_MEMORY_SIZE,
+                 disk_path: Optional[Path] = LLM_RESPONSE_CACHE_PATH if LLM_RESPONSE_CACHE_DISK_ENABLED else None):
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._agent_stats: Dict[str, Dict[str, int]] = {}
+        self.disk_path = None
+
+        if disk_path is not None:
+            try:
+                disk_path = Path(disk_path)
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                self._conn = sqlite3.connect(str(disk_path), check_same_thread=False)
+                self._conn.execute("PRAGMA journal_mode=WAL")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses ("
+                    "key TEXT PRIMARY KEY, agent TEXT, response TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self._conn.commit()
+                self.disk_path = disk_path
+            except Exception as e:
+                print(f"⚠️ LLM 응답 디스크 캐시 초기화 실패, 메모리 캐시만 사용합니다: {e}")
+                self._conn = None
+
+    def _count(self, agent: str, key: str):
+        counter = self._agent_stats.setdefault(agent, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0})
+        counter[key] += 1
+
+    def _is_fresh(self, created_at: float) -> bool:
+        return time.time() - created_at <= self.ttl_seconds
+
+    # ===== 디스크 계층 =====
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str]]:
+        if self._conn is None:
+            return None
+        try:
+            with self._disk_lock:
+                row = self._conn.execute(
+                    "SELECT created_at, response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+        except Exception as e:
+            print(f"⚠️ LLM 응답 디스크 캐시 조회 실패: {e}")
+            return None
+        return (row[0], row[1]) if row else None
+
+    def _disk_put(self, key: str, agent: str, response: str, created_at: float):
+        if self._conn is None:
+            return
+        try:
+            with self._disk_lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, agent, response, created_at) VALUES (?, ?, ?, ?)",
+                    (key, agent, response, created_at)
+                )
+                self._conn.commit()
+        except Exception as e:
+            print(f"⚠️ LLM 응답 디스크 캐시 저장 실패: {e}")
+
+    # ===== 공개 API =====
+    def get(self, key: str, agent: str = "unknown") -> Optional[str]:
+        """TTL 안의 캐시된 응답 (없거나 만료되면 None)"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and self._is_fresh(entry[0]):
+                self._memory.move_to_end(key)
+                self._count(agent, "memory_hits")
+                return entry[1]
+            if entry is not None:
+                del self._memory[key]
+
+        entry = self._disk_get(key)
+        with self._lock:
+            if entry is not None and self._is_fresh(entry[0]):
+                self._memory_put(key, entry)
+                self._count(agent, "disk_hits")
+                return entry[1]
+            self._count(agent, "misses")
+        return None
+
+    def _memory_put(self, key: str, entry: Tuple[float, str]):
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def put(self, key: str, response: str, agent: str = "unknown"):
+        """유효한 응답만 저장 (빈 응답/오류는 호출 측에서 저장하지 않음)"""
+        if not response:
+            return
+        created_at = time.time()
+        with self._lock:
+            self._memory_put(key, (created_at, response))
+            self._count(agent, "writes")
+        self._disk_put(key, agent, response, created_at)
+
+    def purge_expired(self) -> int:
+        """만료된 디스크 항목 삭제, 삭제 수 반환"""
+        if self._conn is None:
+            return 0
+        try:
+            with self._disk_lock:
+                cursor = self._conn.execute("DELETE FROM responses WHERE created_at < ?",
+                                            (time.time() - self.ttl_seconds,))
+                self._conn.commit()
+                return cursor.rowcount
+        except Exception as e:
+            print(f"⚠️ LLM 응답 디스크 캐시 정리 실패: {e}")
+            return 0
+
+    def clear_memory(self):
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self) -> Dict:
+        """전체 및 에이전트별 적중률"""
+        with self._lock:
+            agents = {agent: dict(counter) for agent, counter in self._agent_stats.items()}
+            memory_entries = len(self._memory)
+
+        totals = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        for counter in agents.values():
+            lookups = counter["memory_hits"] + counter["disk_hits"] + counter["misses"]
+            counter["hit_rate"] = (counter["memory_hits"] + counter["disk_hits"]) / lookups if lookups else 0.0
+            for name in totals:
+                totals[name] += counter[name]
+        lookups = totals["memory_hits"] + totals["disk_hits"] + totals["misses"]
+        return {
+            **totals,
+            "hit_rate": (totals["memory_hits"] + totals["disk_hits"]) / lookups if lookups else 0.0,
+            "agents": agents,
+            "memory_entries": memory_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "disk_enabled": self._conn is not None,
+            "disk_path": str(self.disk_path) if self.disk_path else None,
+        }
+
+
+_cache_instance: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_response_cache() -> Optional[LLMResponseCache]:
+    """프로세스 공유 LLM 응답 캐시 (비활성화 시 None)"""
+    global _cache_instance
+    if not LLM_RESPONSE_CACHE_ENABLED:
+        return None
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = LLMResponseCache()
+    return _cache_instance
@@ -0,0 +1,225 @@
+"""
+LLM 호출 스케줄러 (우선순위 클래스 + 사용자별 가중 공정 큐잉)
+동시 LLM 요청 수를 LLM_SCHEDULER_MAX_CONCURRENCY로 제한하고, 슬롯이 모자라면 대기열에서 순서를 정해 배정.
+- 우선순위 클래스: interactive(사용자가 응답을 기다리는 호출) / background(비동기 작업) / batch(스크립트 등 일괄 작업)
+- (클래스, 사용자) 흐름마다 가중치만큼 몫을 받는 start-time 공정 큐잉: 가중치가 큰 interactive 호출은
+  쌓여 있는 background/batch 대기열을 앞질러 배정되고 (시작 태그가 같으면 높은 클래스 우선),
+  같은 클래스 안에서는 한 사용자가 대기열을 독점하지 못함. 낮은 클래스도 가중치만큼은 계속 배정되므로 굶지 않음
+우선순위와 사용자는 contextvars로 전달 (llm_priority_context), 동기(스레드)/비동기 호출 모두 지원
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+LLM_SCHEDULER_ENABLED = os.getenv("LLM_SCHEDULER_ENABLED", "true").lower() == "true"
+LLM_SCHEDULER_MAX_CONCURRENCY = int(os.getenv("LLM_SCHEDULER_MAX_CONCURRENCY", "8"))
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BACKGROUND = "background"
+PRIORITY_BATCH = "batch"
+DEFAULT_PRIORITY = PRIORITY_BACKGROUND
+# 클래스별 가중치 (LLM_SCHEDULER_WEIGHT_<CLASS>로 재정의)
+PRIORITY_WEIGHTS: Dict[str, float] = {
+    PRIORITY_INTERACTIVE: float(os.getenv("LLM_SCHEDULER_WEIGHT_INTERACTIVE", "8")),
+    PRIORITY_BACKGROUND: float(os.getenv("LLM_SCHEDULER_WEIGHT_BACKGROUND", "2")),
+    PRIORITY_BATCH: float(os.getenv("LLM_SCHEDULER_WEIGHT_BATCH", "1")),
+}
+PRIORITY_RANKS = {PRIORITY_INTERACTIVE: 0, PRIORITY_BACKGROUND: 1, PRIORITY_BATCH: 2}
+# 비용 단위 (추정 토큰 1000개 = 1)
+_COST_UNIT_TOKENS = 1000.0
+
+_current_priority: ContextVar[Optional[Tuple[str, Optional[str]]]] = ContextVar("llm_priority", default=None)
+
+FlowKey = Tuple[str, str]
+
+
+@contextmanager
+def llm_priority_context(priority: str, user_id: Optional[str] = None) -> Iterator[None]:
+    """이 블록에서 (그리고 여기서 만든 태스크/to_thread에서) 발생한 LLM 호출의 우선순위 클래스와 사용자 지정"""
+    if priority not in PRIORITY_WEIGHTS:
+        raise ValueError(f"알 수 없는 LLM 우선순위: {priority}")
+    token = _current_priority.set((priority, user_id))
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_llm_priority() -> Tuple[str, str]:
+    """현재 컨텍스트의 (우선순위 클래스, 사용자) - 지정되지 않으면 (background, anonymous)"""
+    priority, user_id = _current_priority.get() or (DEFAULT_PRIORITY, None)
+    return priority, user_id or "anonymous"
+
+
+class _Waiter:
+    """대기 중인 호출 1건 (동기 호출은 Event, 비동기 호출은 자기 이벤트 루프의 Future로 깨움)"""
+
+    __slots__ = ("priority", "enqueued_at", "granted", "cancelled", "event", "loop", "future")
+
+    def __init__(self, priority: str, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self.priority = priority
+        self.enqueued_at = time.perf_counter()
+        self.granted = False
+        self.cancelled = False
+        self.loop = loop
+        self.event = None if loop else threading.Event()
+        self.future = loop.create_future() if loop else None
+
+    def wake(self):
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self._resolve)
+
+    def _resolve(self):
+        if not self.future.done():
+            self.future.set_result(None)
+
+
+def _empty_class_stats() -> Dict:
+    return {"queued": 0, "max_queued": 0, "in_flight": 0, "dispatched": 0, "immediate": 0,
+            "wait_seconds": 0.0, "max_wait_seconds": 0.0}
+
+
+class LLMCallScheduler:
+    """동시 요청 슬롯 배정기 (스레드 안전, 여러 이벤트 루프/스레드에서 공유)"""
+
+    def __init__(self, max_concurrency: int = LLM_SCHEDULER_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._queue: List[Tuple[float, int, int, _Waiter]] = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._flow_finish: Dict[FlowKey, float] = {}
+        self._stats: Dict[str, Dict] = {priority: _empty_class_stats() for priority in PRIORITY_WEIGHTS}
+
+    def _enqueue_or_grant(self, priority: str, user_id: str, tokens: int, waiter: _Waiter) -> bool:
+        """슬롯이 비어 있고 대기열이 없으면 즉시 배정(True), 아니면 공정 큐잉 태그를 붙여 대기열에 추가(False)"""
+        stats = self._stats[priority]
+        with self._lock:
+            if self._in_flight < self.max_concurrency and not self._queue:
+                self._in_flight += 1
+                stats["in_flight"] += 1
+                stats["dispatched"] += 1
+                stats["immediate"] += 1
+                return True
+            flow = (priority, user_id)
+            start_tag = max(self._virtual_time, self._flow_finish.get(flow, 0.0))
+            self._flow_finish[flow] = start_tag + max(tokens, 1) / _COST_UNIT_TOKENS / PRIORITY_WEIGHTS[priority]
+            heapq.heappush(self._queue, (start_tag, PRIORITY_RANKS[priority], next(self._sequence), waiter))
+            stats["queued"] += 1
+            stats["max_queued"] = max(stats["max_queued"], stats["queued"])
+            return False
+
+    def _dispatch_locked(self):
+        """빈 슬롯을 시작 태그가 가장 작은 대기 호출에 배정 (잠금 보유 상태에서 호출)"""
+        while self._queue and self._in_flight < self.max_concurrency:
+            start_tag, _, _, waiter = heapq.heappop(self._queue)
+            if waiter.cancelled:
+                continue
+            self._virtual_time = max(self._virtual_time, start_tag)
+            waiter.granted = True
+            self._in_flight += 1
+            stats = self._stats[waiter.priority]
+            waited = time.perf_counter() - waiter.enqueued_at
+            stats["queued"] -= 1
+            stats["in_flight"] += 1
+            stats["dispatched"] += 1
+            stats["wait_seconds"] += waited
+            stats["max_wait_seconds"] = max(stats["max_wait_seconds"], waited)
+            waiter.wake()
+        if not self._queue:
+            # 유휴 흐름의 태그 정리 (대기열이 비면 모든 흐름이 같은 출발선)
+            self._flow_finish.clear()
+
+    def _release(self, priority: str):
+        with self._lock:
+            self._in_flight -= 1
+            self._stats[priority]["in_flight"] -= 1
+            self._dispatch_locked()
+
+    def _abandon(self, waiter: _Waiter):
+        """대기 중 취소/중단된 호출 정리 (이미 배정됐으면 슬롯 반납)"""
+        with self._lock:
+            if not waiter.granted:
+                waiter.cancelled = True
+                self._stats[waiter.priority]["queued"] -= 1
+                return
+        self._release(waiter.priority)
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0) -> AsyncIterator[float]:
+        """비동기 호출용 슬롯 (현재 컨텍스트의 우선순위/사용자로 배정), 대기 시간(초)을 반환"""
+        priority, user_id = current_llm_priority()
+        waiter = _Waiter(priority, asyncio.get_running_loop())
+        waited = 0.0
+        if not self._enqueue_or_grant(priority, user_id, tokens, waiter):
+            try:
+                await waiter.future
+            except BaseException:
+                self._abandon(waiter)
+                raise
+            waited = time.perf_counter() - waiter.enqueued_at
+        try:
+            yield waited
+        finally:
+            self._release(priority)
+
+    @contextmanager
+    def slot_sync(self, tokens: int = 0) -> Iterator[float]:
+        """동기 호출 경로(CrewAI 스레드)용 slot"""
+        priority, user_id = current_llm_priority()
+        waiter = _Waiter(priority)
+        waited = 0.0
+        if not self._enqueue_or_grant(priority, user_id, tokens, waiter):
+            try:
+                waiter.event.wait()
+            except BaseException:
+                self._abandon(waiter)
+                raise
+            waited = time.perf_counter() - waiter.enqueued_at
+        try:
+            yield waited
+        finally:
+            self._release(priority)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            classes = {priority: dict(stats) for priority, stats in self._stats.items()}
+            in_flight = self._in_flight
+        for priority, stats in classes.items():
+            queued_dispatches = stats["dispatched"] - stats["immediate"]
+            stats["avg_wait_seconds"] = round(stats["wait_seconds"] / queued_dispatches, 3) if queued_dispatches else 0.0
+            stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+            stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+            stats["weight"] = PRIORITY_WEIGHTS[priority]
+        return {"max_concurrency": self.max_concurrency, "in_flight": in_flight, "classes": classes}
+
+
+_scheduler_instance: Optional[LLMCallScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> Optional[LLMCallScheduler]:
+    """프로세스 공유 LLM 호출 스케줄러 (비활성화 시 None)"""
+    global _scheduler_instance
+    if not LLM_SCHEDULER_ENABLED:
+        return None
+    if _scheduler_instance is None:
+        with _scheduler_lock:
+            if _scheduler_instance is None:
+                _scheduler_instance = LLMCallScheduler()
+    return _scheduler_instance
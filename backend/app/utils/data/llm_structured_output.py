@@ -0,0 +1,201 @@
+"""
+LLM 구조화 출력 (JSON 스키마 응답 형식 + pydantic 검증)
+에이전트 출력마다 pydantic 모델을 등록해 두고, 호출 시 그 모델의 JSON 스키마를 response_format으로 보내
+모델이 스키마에 맞는 JSON만 생성하게 함. 응답은 정규식 추출 없이 모델로 한 번에 검증하므로
+파싱 실패로 인한 복구 호출/재시도/기본값 폴백이 필요 없음.
+LLM_STRUCTURED_OUTPUT_MODE=json_object면 스키마 강제 없이 JSON 모드만 사용 (json_schema 미지원 배포용)
+"""
+
+import copy
+import hashlib
+import json
+import os
+import re
+from typing import Annotated, Any, Dict, List, Literal, Type, TypeVar
+
+from dotenv import load_dotenv
+from pydantic import BaseModel, BeforeValidator, ValidationError
+
+
+load_dotenv()
+
+LLM_STRUCTURED_OUTPUT_MODE = os.getenv("LLM_STRUCTURED_OUTPUT_MODE", "json_schema").lower()
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+_CODE_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)\s*```", re.DOTALL | re.IGNORECASE)
+
+_registry: Dict[str, Type[BaseModel]] = {}
+
+
+class LLMOutputValidationError(ValueError):
+    """LLM 응답이 등록된 스키마를 만족하지 않음"""
+
+    def __init__(self, schema_name: str, detail: str, text: str):
+        super().__init__(f"{schema_name} 스키마 검증 실패: {detail}")
+        self.schema_name = schema_name
+        self.text = text
+
+
+def register_llm_schema(name: str):
+    """에이전트 출력 스키마 등록 데코레이터 (이름은 response_format의 스키마 이름으로도 사용)"""
+    def decorator(model: Type[SchemaT]) -> Type[SchemaT]:
+        if name in _registry and _registry[name] is not model:
+            raise ValueError(f"이미 등록된 LLM 출력 스키마: {name}")
+        _registry[name] = model
+        model.__llm_schema_name__ = name
+        return model
+    return decorator
+
+
+def get_llm_schema(name: str) -> Type[BaseModel]:
+    return _registry[name]
+
+
+def list_llm_schemas() -> Dict[str, Dict[str, Any]]:
+    """등록된 스키마 이름 → JSON 스키마"""
+    return {name: model.model_json_schema() for name, model in _registry.items()}
+
+
+def _schema_name(schema: Type[BaseModel]) -> str:
+    return getattr(schema, "__llm_schema_name__", schema.__name__)
+
+
+def _to_strict_json_schema(node: Any) -> Any:
+    """strict 모드 제약 반영: 모든 객체에 additionalProperties=false, 모든 속성을 required로, default 제거"""
+    if isinstance(node, list):
+        return [_to_strict_json_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    result = {}
+    for key, value in node.items():
+        if key == "default":
+            continue
+        if key in ("properties", "$defs"):
+            result[key] = {name: _to_strict_json_schema(child) for name, child in value.items()}
+        else:
+            result[key] = _to_strict_json_schema(value)
+    if result.get("type") == "object" and "properties" in result:
+        result["additionalProperties"] = False
+        result["required"] = list(result["properties"])
+    return result
+
+
+def response_format_for(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """chat.completions response_format 값 (json_schema strict, 또는 json_object 모드)"""
+    if LLM_STRUCTURED_OUTPUT_MODE == "json_object":
+        return {"type": "json_object"}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": re.sub(r"[^0-9A-Za-z_-]", "_", _schema_name(schema)),
+            "schema": _to_strict_json_schema(copy.deepcopy(schema.model_json_schema())),
+            "strict": True,
+        },
+    }
+
+
+def response_format_fingerprint(response_format: Dict[str, Any]) -> str:
+    """응답 캐시 키용 응답 형식 지문 (스키마가 바뀌면 이전 캐시 응답을 재사용하지 않음)"""
+    payload = json.dumps(response_format, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def parse_llm_output(text: str, schema: Type[SchemaT]) -> SchemaT:
+    """JSON 응답 → 스키마 모델 (JSON 모드가 아닌 응답의 코드 블록도 허용)"""
+    fenced = _CODE_FENCE_PATTERN.search(text or "")
+    json_text = fenced.group(1) if fenced else (text or "").strip()
+    try:
+        return schema.model_validate_json(json_text)
+    except ValidationError as e:
+        raise LLMOutputValidationError(_schema_name(schema), str(e), text) from e
+
+
+def salvage_llm_output(text: str, schema: Type[BaseModel]) -> Dict[str, str]:
+    """검증에 실패한 응답(max_tokens에서 잘린 JSON 등)에서 읽을 수 있는 최상위 문자열 필드만 추출
+    닫히지 않은 마지막 값도 그 지점까지 포함 (부분 결과라도 기본값보다 나은 경우용)
+    """
+    fields = {}
+    for name, field in schema.model_fields.items():
+        if field.annotation is not str:
+            continue
+        match = re.search(r'"%s"\s*:\s*"((?:[^"\\]|\\.)*)' % re.escape(name), text or "")
+        if match:
+            try:
+                fields[name] = json.loads(f'"{match.group(1)}"')
+            except ValueError:
+                fields[name] = match.group(1)
+    return fields
+
+
+def agent_system_message(agent) -> Dict[str, str]:
+    """CrewAI 에이전트의 역할/목표/배경을 직접 호출용 system 메시지로 변환"""
+    return {"role": "system", "content": f"{agent.role}\n\n목표: {agent.goal}\n\n{agent.backstory}"}
+
+
+# ===== 에이전트 출력 스키마 =====
+
+# 모델이 숫자로 답해도 문자열 ID로 받음
+SectionId = Annotated[str, BeforeValidator(str)]
+
+
+class PlannedSection(BaseModel):
+    section_id: SectionId
+    title: str
+    subtitle: str
+    summary: str
+    estimated_length: Literal["짧음", "중간", "김"]
+
+
+@register_llm_schema("content_structure_plan")
+class StructurePlan(BaseModel):
+    """ContentPlannerAgent: 매거진 섹션 구조 설계"""
+    proposed_title: str
+    proposed_subtitle: str
+    sections: List[PlannedSection]
+
+
+@register_llm_schema("section_content")
+class SectionContent(BaseModel):
+    """ContentCreatorV2Agent: 섹션 하나의 본문"""
+    section_id: SectionId
+    title: str
+    subtitle: str
+    body: str
+
+
+@register_llm_schema("image_location_analysis")
+class ImageLocationAnalysis(BaseModel):
+    """ImageAnalyzerAgent: GPS 정보가 없는 이미지의 위치 추정"""
+    country: str
+    city: str
+    location: str
+    description: str
+
+
+@register_llm_schema("image_feature_analysis")
+class ImageFeatureAnalysis(BaseModel):
+    """ImageAnalyzerAgent: GPS로 국가/도시를 확인한 이미지의 장소/특징"""
+    location: str
+    description: str
+
+
+class TemplateRecommendations(BaseModel):
+    primary: str
+    alternative: str
+    reason: str
+
+
+class SectionStructureAnalysis(BaseModel):
+    title: str
+    template_recommendations: TemplateRecommendations
+    style_preferences: List[str]
+    layout_suggestions: List[str]
+
+
+@register_llm_schema("content_structure_analysis")
+class ContentStructureAnalysis(BaseModel):
+    """UnifiedMultimodalAgent: 섹션별 템플릿/스타일/레이아웃 추천"""
+    analysis: str
+    sections: List[SectionStructureAnalysis]
+    status: str
@@ -0,0 +1,109 @@
+"""
+로컬 ONNX 다국어 문장 임베딩 (쿼리 임베딩 백엔드)
+paraphrase-multilingual-MiniLM-L12-v2를 ONNX로 변환한 모델을 CPU onnxruntime으로 실행.
+벡터 공간이 ada-002와 다르므로 같은 모델로 재구축한 로컬 HNSW 복제본과 함께만 사용
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+# ✅ 선택적 의존성 - 없으면 Azure OpenAI 임베딩 사용 (chromadb 설치 시 함께 설치됨)
+try:
+    import numpy as np
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+    ONNX_EMBEDDING_AVAILABLE = True
+except ImportError:
+    ONNX_EMBEDDING_AVAILABLE = False
+
+
+load_dotenv()
+
+DEFAULT_LOCAL_EMBEDDING_MODEL_DIR = Path(__file__).parent.parent.parent / "model" / "multilingual_embedding_onnx"
+LOCAL_EMBEDDING_MODEL_DIR = Path(os.getenv("LOCAL_EMBEDDING_MODEL_DIR", str(DEFAULT_LOCAL_EMBEDDING_MODEL_DIR)))
+LOCAL_EMBEDDING_MAX_LENGTH = int(os.getenv("LOCAL_EMBEDDING_MAX_LENGTH", "128"))
+
+# 쿼리 임베딩 백엔드 선택: azure(기본, ada-002) / local_onnx
+EMBEDDING_BACKENDS = ("azure", "local_onnx")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "azure").lower()
+
+
+def resolve_embedding_backend(embedding_backend: Optional[str] = None) -> str:
+    backend = (embedding_backend or EMBEDDING_BACKEND).lower()
+    if backend not in EMBEDDING_BACKENDS:
+        print(f"⚠️ 알 수 없는 임베딩 백엔드 '{backend}' - azure 사용")
+        return "azure"
+    if backend == "local_onnx":
+        if not ONNX_EMBEDDING_AVAILABLE:
+            print("⚠️ onnxruntime/tokenizers 미설치 - 로컬 임베딩을 사용할 수 없어 azure 사용")
+            return "azure"
+        if not (LOCAL_EMBEDDING_MODEL_DIR / "tokenizer.json").exists():
+            print(f"⚠️ 로컬 임베딩 모델이 없습니다 ({LOCAL_EMBEDDING_MODEL_DIR}) - azure 사용")
+            return "azure"
+    return backend
+
+
+class LocalOnnxEmbedder:
+    """토크나이저 + ONNX 트랜스포머 → mean pooling → L2 정규화 (코사인 검색용)"""
+
+    def __init__(self, model_dir: Path = LOCAL_EMBEDDING_MODEL_DIR, max_length: int = LOCAL_EMBEDDING_MAX_LENGTH):
+        if not ONNX_EMBEDDING_AVAILABLE:
+            raise RuntimeError("onnxruntime/tokenizers가 설치되어 있지 않습니다")
+
+        self.model_dir = Path(model_dir)
+        meta_path = self.model_dir / "meta.json"
+        self.meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+
+        # 양자화 모델이 있으면 우선 사용
+        model_path = self.model_dir / "model.quant.onnx"
+        if not model_path.exists():
+            model_path = self.model_dir / "model.onnx"
+
+        self.tokenizer = Tokenizer.from_file(str(self.model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding(pad_id=self.meta.get("pad_token_id", 1), pad_token=self.meta.get("pad_token", "<pad>"))
+
+        self.session = ort.InferenceSession(str(model_path), providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        # 임베딩 캐시/복제본 구분용 식별자 (ada-002 배포 이름과 같은 역할)
+        self.model_id = f"local-onnx:{self.meta.get('model_name', self.model_dir.name)}"
+        self.dimensions = int(self.meta.get("dimensions", 0)) or len(self.embed(["dimension probe"])[0])
+        print(f"✅ 로컬 임베딩 모델 로드: {self.model_id} ({self.dimensions}차원, {model_path.name})")
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        encodings = self.tokenizer.encode_batch(list(texts))
+        input_ids = np.asarray([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.asarray([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.zeros_like(input_ids)
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        # 패딩 토큰을 제외한 평균 (sentence-transformers mean pooling과 동일)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+        return pooled.astype(np.float32).tolist()
+
+
+_embedder_instance: Optional[LocalOnnxEmbedder] = None
+_embedder_lock = threading.Lock()
+
+
+def get_local_embedder() -> LocalOnnxEmbedder:
+    """프로세스 공유 로컬 임베딩 모델 (ONNX 세션은 스레드 안전)"""
+    global _embedder_instance
+    if _embedder_instance is None:
+        with _embedder_lock:
+            if _embedder_instance is None:
+                _embedder_instance = LocalOnnxEmbedder()
+    return _embedder_instance
@@ -0,0 +1,318 @@
+"""
+Azure AI Search 인덱스의 로컬 HNSW 복제본
+동기화 작업이 세 벡터 인덱스(벡터 + 검색 시 읽는 필드)를 스냅샷하여 hnswlib 인덱스로 저장하고,
+벡터 매니저는 네트워크 왕복 없이 프로세스 내에서 k-NN 검색을 수행
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from dotenv import load_dotenv
+
+# ✅ 선택적 의존성 - 없으면 원격(Azure AI Search) 검색만 사용
+try:
+    import hnswlib
+    import numpy as np
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+
+load_dotenv()
+
+DEFAULT_REPLICA_DIR = Path(__file__).parent.parent.parent / ".cache" / "vector_replica"
+LOCAL_VECTOR_REPLICA_DIR = Path(os.getenv("LOCAL_VECTOR_REPLICA_DIR", str(DEFAULT_REPLICA_DIR)))
+
+# 검색 백엔드 선택: remote(기본) / local / local_fallback(로컬 실패 시 원격)
+SEARCH_BACKENDS = ("remote", "local", "local_fallback")
+VECTOR_SEARCH_BACKEND = os.getenv("VECTOR_SEARCH_BACKEND", "remote").lower()
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+# 조건 필터 검색 시 먼저 조회할 후보 배수 (걸러낸 결과가 모자라면 전체 문서에서 다시 조회)
+LOCAL_FILTER_OVERSAMPLE = 4
+
+
+def resolve_search_backend(search_backend: Optional[str] = None) -> str:
+    backend = (search_backend or VECTOR_SEARCH_BACKEND).lower()
+    if backend not in SEARCH_BACKENDS:
+        print(f"⚠️ 알 수 없는 벡터 검색 백엔드 '{backend}' - remote 사용")
+        return "remote"
+    if backend != "remote" and not HNSWLIB_AVAILABLE:
+        print("⚠️ hnswlib 미설치 - 로컬 벡터 복제본을 사용할 수 없어 remote 사용")
+        return "remote"
+    return backend
+
+
+class _ReplicaIndex:
+    """인덱스 1개의 HNSW 그래프 + 문서 목록 (label = 문서 목록 위치)"""
+
+    def __init__(self, index_name: str, hnsw_index, documents: List[Dict], meta: Dict):
+        self.index_name = index_name
+        self.hnsw_index = hnsw_index
+        self.documents = documents
+        self.meta = meta
+        self._positions: Optional[Dict[str, int]] = None
+
+    def get_documents(self, document_ids: Sequence[str]) -> List[Dict]:
+        """id로 문서 조회 (id → 위치 맵은 최초 조회 시 생성)"""
+        if self._positions is None:
+            self._positions = {document.get("id"): i for i, document in enumerate(self.documents)}
+        return [
+            dict(self.documents[self._positions[document_id]])
+            for document_id in document_ids if document_id in self._positions
+        ]
+
+    def search(self, query_vector: Sequence[float], k: int,
+               predicate: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """k-NN 검색 (predicate가 있으면 조건을 만족하는 문서만 유사도 순으로 k개)"""
+        count = len(self.documents)
+        if count == 0:
+            return []
+        if predicate is None:
+            return self._knn(query_vector, min(k, count))
+
+        oversampled = min(count, k * LOCAL_FILTER_OVERSAMPLE)
+        matched = [document for document in self._knn(query_vector, oversampled) if predicate(document)]
+        if len(matched) < k and oversampled < count:
+            matched = [document for document in self._knn(query_vector, count) if predicate(document)]
+        return matched[:k]
+
+    def _knn(self, query_vector: Sequence[float], k: int) -> List[Dict]:
+        query = np.asarray(query_vector, dtype=np.float32).reshape(1, -1)
+        labels, distances = self.hnsw_index.knn_query(query, k=k)
+
+        results = []
+        for label, distance in zip(labels[0], distances[0]):
+            document = dict(self.documents[int(label)])
+            # Azure AI Search 코사인 점수와 동일한 스케일: 1 / (1 + (1 - cos))
+            document["@search.score"] = 1.0 / (1.0 + float(distance))
+            results.append(document)
+        return results
+
+
+class LocalVectorReplica:
+    """로컬 HNSW 복제본 로더/검색기 (인덱스별 지연 로딩)"""
+
+    def __init__(self, replica_dir: Path = LOCAL_VECTOR_REPLICA_DIR):
+        self.replica_dir = Path(replica_dir)
+        self._indexes: Dict[str, _ReplicaIndex] = {}
+        self._lock = threading.Lock()
+
+    def _paths(self, index_name: str) -> Dict[str, Path]:
+        return {
+            "hnsw": self.replica_dir / f"{index_name}.hnsw",
+            "docs": self.replica_dir / f"{index_name}.docs.jsonl",
+            "meta": self.replica_dir / f"{index_name}.meta.json",
+        }
+
+    def has_index(self, index_name: str) -> bool:
+        if not HNSWLIB_AVAILABLE:
+            return False
+        if index_name in self._indexes:
+            return True
+        return all(path.exists() for path in self._paths(index_name).values())
+
+    def _load(self, index_name: str) -> Optional[_ReplicaIndex]:
+        replica = self._indexes.get(index_name)
+        if replica is not None:
+            return replica
+
+        with self._lock:
+            replica = self._indexes.get(index_name)
+            if replica is not None:
+                return replica
+            if not self.has_index(index_name):
+                return None
+
+            paths = self._paths(index_name)
+            meta = json.loads(paths["meta"].read_text(encoding="utf-8"))
+            with open(paths["docs"], "r", encoding="utf-8") as f:
+                documents = [json.loads(line) for line in f if line.strip()]
+
+            hnsw_index = hnswlib.Index(space="cosine", dim=int(meta["dimensions"]))
+            hnsw_index.load_index(str(paths["hnsw"]), max_elements=max(1, len(documents)))
+            hnsw_index.set_ef(max(HNSW_EF_SEARCH, int(meta.get("ef_search", HNSW_EF_SEARCH))))
+
+            replica = _ReplicaIndex(index_name, hnsw_index, documents, meta)
+            self._indexes[index_name] = replica
+            print(f"✅ 로컬 벡터 복제본 로드: {index_name} ({len(documents)}개 문서, 동기화 {meta.get('synced_at')})")
+            return replica
+
+    def search(self, index_name: str, query_vector: Sequence[float], k: int,
+               predicate: Optional[Callable[[Dict], bool]] = None) -> List[Dict]:
+        """원격 검색 결과와 같은 형태의 원시 문서 목록 반환 (@search.score 포함, predicate는 $filter 대응)"""
+        replica = self._load(index_name)
+        if replica is None:
+            raise FileNotFoundError(f"로컬 벡터 복제본이 없습니다: {index_name}")
+        return replica.search(query_vector, k, predicate)
+
+    def get_documents(self, index_name: str, document_ids: Sequence[str]) -> List[Dict]:
+        """문서 id 포인트 조회 (원격 get_document와 같은 원시 필드)"""
+        replica = self._load(index_name)
+        if replica is None:
+            raise FileNotFoundError(f"로컬 벡터 복제본이 없습니다: {index_name}")
+        return replica.get_documents(document_ids)
+
+    def get_snapshot_meta(self, index_name: str) -> Optional[Dict]:
+        """HNSW 그래프를 로드하지 않고 스냅샷 메타데이터만 읽기 (없으면 None)"""
+        paths = self._paths(index_name)
+        if not paths["meta"].exists() or not paths["docs"].exists():
+            return None
+        try:
+            return json.loads(paths["meta"].read_text(encoding="utf-8"))
+        except Exception:
+            return None
+
+    def get_version(self, index_name: str) -> Optional[str]:
+        replica = self._load(index_name)
+        return replica.meta.get("version") if replica else None
+
+    def reload(self, index_name: Optional[str] = None):
+        """동기화 후 메모리의 복제본을 버리고 다음 검색 시 다시 로드"""
+        with self._lock:
+            if index_name is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(index_name, None)
+
+    def status(self) -> Dict[str, Dict]:
+        status = {}
+        for meta_path in sorted(self.replica_dir.glob("*.meta.json")):
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                status[meta["index_name"]] = {
+                    "document_count": meta.get("document_count", 0),
+                    "synced_at": meta.get("synced_at"),
+                    "version": meta.get("version"),
+                    "loaded": meta["index_name"] in self._indexes,
+                }
+            except Exception as e:
+                status[meta_path.name] = {"error": str(e)}
+        return status
+
+    # ===== 동기화 =====
+    def sync_index(self, search_client, index_name: str, vector_field: str, select_fields: List[str],
+                   document_transform: Optional[Callable[[Dict], Dict]] = None) -> Dict:
+        """원격 인덱스 전체를 스냅샷하여 로컬 HNSW 인덱스로 저장 (임시 파일 → 원자적 교체)
+        document_transform: 저장 전 문서별 후처리 (사전 계산 특징 추가 등)"""
+        if not HNSWLIB_AVAILABLE:
+            raise RuntimeError("hnswlib가 설치되어 있지 않습니다 (chroma-hnswlib)")
+
+        start = time.time()
+        fields = list(dict.fromkeys(["id", *select_fields, vector_field]))
+        vectors: List[List[float]] = []
+        documents: List[Dict] = []
+
+        # 전체 문서 순회 (SDK가 페이지 단위로 이어서 조회)
+        results = search_client.search(search_text="*", select=fields)
+        for result in results:
+            vector = result.get(vector_field)
+            if not vector:
+                continue
+            vectors.append(vector)
+            document = {field: result.get(field) for field in select_fields}
+            documents.append(document_transform(document) if document_transform else document)
+
+        return self._write_index(index_name, vector_field, vectors, documents, start)
+
+    def rebuild_index(self, search_client, index_name: str, select_fields: List[str], text_fields: List[str],
+                      embed_fn: Callable[[List[str]], List[List[float]]], embedding_model: str,
+                      batch_size: int = 32) -> Dict:
+        """원격 문서를 가져와 text_fields를 다른 임베딩 모델(embed_fn)로 다시 임베딩한 복제본 구축"""
+        if not HNSWLIB_AVAILABLE:
+            raise RuntimeError("hnswlib가 설치되어 있지 않습니다 (chroma-hnswlib)")
+
+        start = time.time()
+        fields = list(dict.fromkeys(["id", *select_fields, *text_fields]))
+        documents: List[Dict] = []
+        texts: List[str] = []
+
+        for result in search_client.search(search_text="*", select=fields):
+            text = " ".join(str(result.get(field) or "") for field in text_fields).strip()
+            if not text:
+                continue
+            texts.append(text)
+            documents.append({field: result.get(field) for field in select_fields})
+
+        vectors: List[List[float]] = []
+        for batch_start in range(0, len(texts), batch_size):
+            vectors.extend(embed_fn(texts[batch_start:batch_start + batch_size]))
+            print(f"  📊 {index_name}: {min(batch_start + batch_size, len(texts))}/{len(texts)}개 임베딩")
+
+        return self._write_index(index_name, "local_embedding", vectors, documents, start,
+                                 {"embedding_model": embedding_model, "text_fields": text_fields})
+
+    def _write_index(self, index_name: str, vector_field: str, vectors: List[List[float]], documents: List[Dict],
+                     start: float, extra_meta: Optional[Dict] = None) -> Dict:
+        """HNSW 인덱스 + 문서 목록 저장 (임시 파일 → 원자적 교체)"""
+        if not vectors:
+            raise ValueError(f"{index_name}: 벡터가 있는 문서가 없습니다")
+
+        dimensions = len(vectors[0])
+        data = np.asarray(vectors, dtype=np.float32)
+
+        hnsw_index = hnswlib.Index(space="cosine", dim=dimensions)
+        hnsw_index.init_index(max_elements=len(documents), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        hnsw_index.add_items(data, np.arange(len(documents)))
+
+        self.replica_dir.mkdir(parents=True, exist_ok=True)
+        paths = self._paths(index_name)
+        version = f"{int(start)}-{len(documents)}"
+        meta = {
+            "index_name": index_name,
+            "vector_field": vector_field,
+            "dimensions": dimensions,
+            "document_count": len(documents),
+            "ef_search": HNSW_EF_SEARCH,
+            "synced_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(start)),
+            "version": version,
+            **(extra_meta or {}),
+        }
+
+        tmp_hnsw = paths["hnsw"].with_suffix(".hnsw.tmp")
+        tmp_docs = paths["docs"].with_suffix(".jsonl.tmp")
+        tmp_meta = paths["meta"].with_suffix(".json.tmp")
+        hnsw_index.save_index(str(tmp_hnsw))
+        with open(tmp_docs, "w", encoding="utf-8") as f:
+            for document in documents:
+                f.write(json.dumps(document, ensure_ascii=False) + "\n")
+        tmp_meta.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+
+        os.replace(tmp_hnsw, paths["hnsw"])
+        os.replace(tmp_docs, paths["docs"])
+        os.replace(tmp_meta, paths["meta"])
+        self.reload(index_name)
+
+        meta["elapsed_seconds"] = round(time.time() - start, 2)
+        print(f"✅ 로컬 벡터 복제본 저장 완료: {index_name} ({len(documents)}개, {meta['elapsed_seconds']}초)")
+        return meta
+
+
+_replica_instances: Dict[str, LocalVectorReplica] = {}
+_replica_lock = threading.Lock()
+
+
+def replica_dir_for(embedding_space: Optional[str] = None) -> Path:
+    """임베딩 공간별 복제본 경로 (기본: ada-002 원격 벡터, 그 외: 하위 디렉토리)"""
+    if not embedding_space:
+        return LOCAL_VECTOR_REPLICA_DIR
+    return LOCAL_VECTOR_REPLICA_DIR / embedding_space.replace(":", "_").replace("/", "_")
+
+
+def get_local_vector_replica(embedding_space: Optional[str] = None) -> LocalVectorReplica:
+    """프로세스 공유 로컬 벡터 복제본 (임베딩 공간별 1개)"""
+    key = embedding_space or ""
+    replica = _replica_instances.get(key)
+    if replica is None:
+        with _replica_lock:
+            replica = _replica_instances.get(key)
+            if replica is None:
+                replica = LocalVectorReplica(replica_dir_for(embedding_space))
+                _replica_instances[key] = replica
+    return replica
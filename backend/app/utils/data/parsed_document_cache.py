@@ -0,0 +1,142 @@
+"""
+파싱된 검색 문서 캐시
+검색 결과의 JSON 문자열 필드(layout_info, image_info, jsx_structure)를 매 쿼리마다 다시 파싱하지 않도록
+(인덱스, 문서 id) 단위로 파싱/정규화가 끝난 문서를 읽기 전용 매핑으로 보관하고 적중 시 얕은 사본만 반환.
+각 항목은 저장 당시의 인덱스 버전 스탬프(문서별 @odata.etag가 아니라, 재적재/동기화 시 이 프로세스가 갱신하는
+검색 결과 캐시 또는 로컬 복제본 버전)를 함께 기록하며, 버전이 바뀐 항목은 미적중으로 처리.
+다른 프로세스에서 재적재한 경우는 버전이 전달되지 않으므로 TTL로 최대 지연을 제한.
+무거운 필드(jsx_code 등)는 별도의 본문 캐시에 보관하여 필요한 문서만 지연 조회
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+PARSED_DOCUMENT_CACHE_SIZE = int(os.getenv("PARSED_DOCUMENT_CACHE_SIZE", "4096"))
+PARSED_DOCUMENT_CACHE_TTL = float(os.getenv("PARSED_DOCUMENT_CACHE_TTL", "3600"))
+# 본문(무거운 필드)은 항목당 수 KB이므로 더 작게 유지
+DOCUMENT_BODY_CACHE_SIZE = int(os.getenv("DOCUMENT_BODY_CACHE_SIZE", "512"))
+# 인덱스별 "조회한 문서가 모두 캐시에 있던 비율" 지수 이동 평균의 가중치
+FULL_HIT_RATE_ALPHA = 0.2
+
+DocumentKey = Tuple[str, str]  # (index_name, document_id)
+
+
+class ParsedDocumentCache:
+    """(인덱스, 문서 id) → (버전, 저장 시각, 파싱된 문서) LRU 캐시
+    (중첩 값은 사본과 공유되므로 호출 측은 최상위 키만 추가/수정)
+    """
+
+    def __init__(self, max_entries: int = PARSED_DOCUMENT_CACHE_SIZE, ttl_seconds: float = PARSED_DOCUMENT_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[DocumentKey, Tuple[str, float, Mapping[str, Any]]]" = OrderedDict()
+        self._full_hit_rates: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.stats_counter = {"hits": 0, "misses": 0, "stale": 0, "stored": 0}
+
+    def get_many(self, index_name: str, document_ids: Iterable[str], version: str) -> Tuple[Dict[str, Dict], List[str]]:
+        """→ ({문서 id: 문서 사본} 적중분, 미적중 문서 id 목록). 버전이 다르거나 만료된 항목은 제거 후 미적중"""
+        hits: Dict[str, Mapping[str, Any]] = {}
+        misses: List[str] = []
+        now = time.monotonic()
+        with self._lock:
+            for document_id in dict.fromkeys(document_ids):
+                key = (index_name, document_id)
+                entry = self._entries.get(key)
+                if entry is not None and (entry[0] != version or now - entry[1] > self.ttl_seconds):
+                    del self._entries[key]
+                    self.stats_counter["stale"] += 1
+                    entry = None
+                if entry is None:
+                    self.stats_counter["misses"] += 1
+                    misses.append(document_id)
+                    continue
+                self._entries.move_to_end(key)
+                self.stats_counter["hits"] += 1
+                hits[document_id] = entry[2]
+            if hits or misses:
+                previous = self._full_hit_rates.get(index_name, 0.0)
+                self._full_hit_rates[index_name] = previous + FULL_HIT_RATE_ALPHA * ((0.0 if misses else 1.0) - previous)
+
+        # 호출 측에서 점수 등을 추가하므로 잠금 밖에서 문서별 얕은 사본 반환
+        return {document_id: dict(document) for document_id, document in hits.items()}, misses
+
+    def full_hit_rate(self, index_name: str) -> float:
+        """최근 조회에서 요청한 문서가 모두 적중한 비율 (지수 이동 평균, 조회 전에는 0)"""
+        with self._lock:
+            return self._full_hit_rates.get(index_name, 0.0)
+
+    def put_many(self, index_name: str, documents: Dict[str, Dict], version: str):
+        now = time.monotonic()
+        with self._lock:
+            for document_id, document in documents.items():
+                key = (index_name, document_id)
+                self._entries[key] = (version, now, MappingProxyType(dict(document)))
+                self._entries.move_to_end(key)
+                self.stats_counter["stored"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_index(self, index_name: str) -> int:
+        """인덱스 재적재 후 해당 인덱스 문서 제거 (버전 확인만으로도 무효화되지만 메모리 즉시 반환)"""
+        with self._lock:
+            stale_keys = [key for key in self._entries if key[0] == index_name]
+            for key in stale_keys:
+                del self._entries[key]
+        return len(stale_keys)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counter = dict(self.stats_counter)
+            size = len(self._entries)
+            full_hit_rates = dict(self._full_hit_rates)
+        lookups = counter["hits"] + counter["misses"]
+        return {
+            **counter,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": counter["hits"] / lookups if lookups else 0.0,
+            "full_hit_rates": {index_name: round(rate, 3) for index_name, rate in full_hit_rates.items()},
+        }
+
+
+_document_cache_instance: Optional[ParsedDocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+
+def get_parsed_document_cache() -> ParsedDocumentCache:
+    """프로세스 공유 파싱 문서 캐시 (동기/비동기 벡터 매니저 공용)"""
+    global _document_cache_instance
+    if _document_cache_instance is None:
+        with _document_cache_lock:
+            if _document_cache_instance is None:
+                _document_cache_instance = ParsedDocumentCache()
+    return _document_cache_instance
+
+
+_body_cache_instance: Optional[ParsedDocumentCache] = None
+_body_cache_lock = threading.Lock()
+
+
+def get_document_body_cache() -> ParsedDocumentCache:
+    """프로세스 공유 문서 본문 캐시 ((인덱스, 문서 id) → 무거운 필드)"""
+    global _body_cache_instance
+    if _body_cache_instance is None:
+        with _body_cache_lock:
+            if _body_cache_instance is None:
+                _body_cache_instance = ParsedDocumentCache(max_entries=DOCUMENT_BODY_CACHE_SIZE)
+    return _body_cache_instance
@@ -1,13 +1,26 @@
 import os
 import json
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from typing import List, Dict, Optional, Set, Tuple
 from openai import AzureOpenAI
 from azure.core.credentials import AzureKeyCredential
 from azure.search.documents import SearchClient
 from azure.search.documents.indexes import SearchIndexClient
+from azure.search.documents.indexes.models import SearchFieldDataType, SimpleField
 from azure.search.documents.models import VectorizedQuery
 from dotenv import load_dotenv
 
+from .embedding_cache import FREQUENT_QUERIES, get_embedding_cache, normalize_embedding_text
+from .embedding_batcher import get_embedding_batcher
+from .search_filters import compile_local_filter
+from .search_result_cache import get_search_result_cache
+from .parsed_document_cache import get_document_body_cache, get_parsed_document_cache
+from .local_vector_replica import get_local_vector_replica, resolve_search_backend
+from .local_embedding import get_local_embedder, resolve_embedding_backend
+from .lexical_template_index import get_lexical_template_index
+from .dependency_health import get_dependency_health_monitor
+from .jsx_structure_features import JSX_FEATURE_FIELDS, add_jsx_features, has_current_features
+
 # AI Search 격리 시스템 import
 try:
     from ..isolation.ai_search_isolation import AISearchIsolationManager
@@ -19,10 +32,558 @@ except ImportError:
 
 load_dotenv()
 
-class PDFVectorManager:
+EMBEDDING_DIMENSIONS = 1536
+
+# 격리 필터링으로 제외될 문서 대비 여유분 (격리 비활성 시 정확히 top_k만 검색)
+ISOLATION_HEADROOM = int(os.getenv("VECTOR_SEARCH_ISOLATION_HEADROOM", "2"))
+
+# id만 검색하고 미적중 문서를 따로 조회하는 방식은 최근 검색의 이 비율 이상에서 문서가 모두 캐시에 있을 때만 사용
+# (그 전에는 첫 검색에서 필드를 함께 받아 왕복 1회로 처리)
+ID_ONLY_SEARCH_MIN_HIT_RATE = float(os.getenv("VECTOR_SEARCH_ID_ONLY_MIN_HIT_RATE", "0.8"))
+
+# 지원하는 인덱스 목록 (동기/비동기 매니저 공용)
+SUPPORTED_INDEXES = {
+    "magazine-vector-index": {
+        "description": "매거진 레이아웃 패턴",
+        "vector_field": "content_vector",
+        "select_fields": ["id", "pdf_name", "page_number", "content_type", 
+                        "text_content", "layout_info", "image_info"],
+        # 로컬 임베딩 모델로 복제본을 재구축할 때 임베딩할 텍스트 필드
+        "embedding_text_fields": ["text_content", "pdf_name"],
+        # OData $filter 푸시다운 대상 (필드명: (타입, facetable))
+        "filterable_fields": {
+            "pdf_name": ("Edm.String", False),
+            "page_number": ("Edm.Int32", False),
+            "content_type": ("Edm.String", True)
+        }
+    },
+    "jsx-component-vector-index": {
+        "description": "JSX 컴포넌트 패턴", 
+        "vector_field": "jsx_vector",
+        "select_fields": ["id", "component_name", "jsx_structure", "layout_method",
+                        "image_count", "jsx_code", "search_keywords"],
+        # 검색 후보에는 포함하지 않고 선택된 문서만 지연 조회하는 필드
+        "heavy_fields": ["jsx_code"],
+        "embedding_text_fields": ["component_name", "layout_method", "search_keywords"],
+        "filterable_fields": {
+            "component_name": ("Edm.String", False),
+            "layout_method": ("Edm.String", True),
+            "image_count": ("Edm.Int32", True)
+        },
+        # jsx_code에서 사전 계산한 구조 특징 (필드명: 타입, 스키마에 있을 때만 후보 조회에 포함)
+        "feature_fields": JSX_FEATURE_FIELDS
+    },
+    "text-semantic-patterns-index": {
+        "description": "텍스트 의미 분석 패턴",
+        "vector_field": "semantic_vector", 
+        "select_fields": ["id", "text_content", "emotional_tone", "primary_theme",
+                        "visual_keywords", "search_keywords", "semantic_tags"],
+        "embedding_text_fields": ["text_content", "primary_theme", "visual_keywords", "search_keywords"],
+        "filterable_fields": {
+            "emotional_tone": ("Edm.String", True),
+            "primary_theme": ("Edm.String", True)
+        }
+    }
+}
+
+# 인덱스 스키마에 실제로 존재하는 것으로 확인된 feature_fields (스키마 조회 시 갱신, 동기/비동기 매니저 공용)
+_schema_feature_fields: Dict[str, Set[str]] = {}
+
+
+class VectorSearchCommonMixin:
+    """PDFVectorManager / AsyncPDFVectorManager 공용 로직 (쿼리 정제, 결과 파싱, 격리 후처리)"""
+
+    def _init_isolation(self, isolation_enabled: bool, manager_name: str):
+        """AI Search 격리 시스템 초기화"""
+        self.isolation_enabled = isolation_enabled and ISOLATION_AVAILABLE
+        if self.isolation_enabled:
+            self.isolation_manager = AISearchIsolationManager()
+            print(f"🛡️ {manager_name} AI Search 격리 시스템 활성화")
+        else:
+            self.isolation_manager = None
+            print(f"⚠️ {manager_name} AI Search 격리 시스템 비활성화")
+
+    def _init_search_backend(self, search_backend: Optional[str]):
+        """벡터 검색 백엔드 초기화 (remote / local / local_fallback)"""
+        self.search_backend = resolve_search_backend(search_backend)
+        self.local_replica = get_local_vector_replica() if self.search_backend != "remote" else None
+        if self.local_replica is not None:
+            print(f"🗂️ 로컬 HNSW 복제본 검색 사용 (백엔드: {self.search_backend}, 경로: {self.local_replica.replica_dir})")
+
+    def _init_embedding_backend(self, embedding_backend: Optional[str]):
+        """쿼리 임베딩 백엔드 초기화 (azure / local_onnx) - _init_search_backend 이후 호출
+
+        로컬 모델 벡터는 ada-002 원격 인덱스와 공간이 다르므로 같은 모델로 재구축한 로컬 복제본만 검색합니다.
+        """
+        self.embedding_backend = resolve_embedding_backend(embedding_backend)
+        self.local_embedder = None
+        if self.embedding_backend != "local_onnx":
+            return
+        if self.search_backend == "remote":
+            print("⚠️ 로컬 임베딩은 로컬 복제본 검색에서만 사용할 수 있습니다 (VECTOR_SEARCH_BACKEND=local) - azure 임베딩 사용")
+            self.embedding_backend = "azure"
+            return
+
+        self.local_embedder = get_local_embedder()
+        self.embedding_model = self.local_embedder.model_id
+        # 원격 인덱스로 폴백하면 벡터 차원/공간이 맞지 않으므로 로컬 전용
+        self.search_backend = "local"
+        self.local_replica = get_local_vector_replica(self.local_embedder.model_id)
+        print(f"🧠 로컬 ONNX 쿼리 임베딩 사용 ({self.embedding_model}, 복제본: {self.local_replica.replica_dir})")
+
+    def _search_local(self, target_index: str, query_vector: List[float], top_k: int,
+                      filter_expression: Optional[str] = None) -> List[Dict]:
+        """로컬 HNSW 복제본 k-NN 검색 → 원격과 동일한 파싱/격리 후처리 ($filter는 복제본 문서에 Python으로 적용)"""
+        raw_results = self.local_replica.search(
+            target_index, query_vector, self._candidate_count(top_k), compile_local_filter(filter_expression)
+        )
+        # 복제본 문서는 이미 메모리에 있으므로 미적중분만 파싱하여 캐시
+        return self._finalize_full_results(target_index, raw_results, top_k)
+
+    def _finalize_full_results(self, target_index: str, raw_results: List[Dict], top_k: int) -> List[Dict]:
+        """필드를 함께 받은 검색 결과 → 캐시된 파싱 문서 재사용, 미적중분만 파싱 → 격리 후처리"""
+        hits = [(result["id"], result.get("@search.score", 0.0)) for result in raw_results]
+        version = self._document_version(target_index)
+        documents, missing_ids = get_parsed_document_cache().get_many(target_index, [hit[0] for hit in hits], version)
+        if missing_ids:
+            missing = set(missing_ids)
+            documents.update(self._cache_parsed_documents(
+                target_index, [result for result in raw_results if result["id"] in missing], version
+            ))
+        return self._finalize_results(self._assemble_hits(hits, documents), target_index, top_k)
+
+    def _use_id_only_search(self, target_index: str) -> bool:
+        """id만 검색할지 여부 (미적중이 있으면 search.in 조회가 한 번 더 필요하므로 캐시가 충분히 찼을 때만)"""
+        return get_parsed_document_cache().full_hit_rate(target_index) >= ID_ONLY_SEARCH_MIN_HIT_RATE
+
+    def _try_local_search(self, target_index: str, query_vector: List[float], top_k: int,
+                          filter_expression: Optional[str] = None) -> Optional[List[Dict]]:
+        """로컬 백엔드 검색 시도. None이면 원격 검색 필요 (local_fallback 모드)"""
+        if self.search_backend == "remote":
+            return None
+        try:
+            return self._search_local(target_index, query_vector, top_k, filter_expression)
+        except Exception as e:
+            if self.search_backend == "local":
+                raise
+            print(f"⚠️ 로컬 벡터 검색 불가 ({target_index}): {e} - 원격 검색으로 폴백")
+            return None
+
+    def _clean_query(self, query_text: str) -> str:
+        """쿼리 격리 (AI Search 키워드 제거)"""
+        if not self.isolation_enabled:
+            return query_text
+        clean_query = self.isolation_manager.clean_query_from_azure_keywords(query_text)
+        print(f"🛡️ 쿼리 격리: '{query_text[:50]}...' → '{clean_query[:50]}...'")
+        return clean_query
+
+    def _split_cached_embeddings(self, texts: List[str]) -> Tuple[List[Optional[List[float]]], "OrderedDict[str, List[int]]"]:
+        """임베딩 캐시 조회 → (결과 자리표시 목록, {정규화 텍스트: 결과 인덱스 목록} 미적중분)"""
+        hits, misses = get_embedding_cache().get_many(self.embedding_model, texts)
+        return self._pending_embeddings(texts, hits, misses)
+
+    def _pending_embeddings(self, texts: List[str], hits: Dict[int, List[float]],
+                            misses: List[int]) -> Tuple[List[Optional[List[float]]], "OrderedDict[str, List[int]]"]:
+        results = [hits.get(i) for i in range(len(texts))]
+
+        # 같은 배치 안의 중복 텍스트는 한 번만 요청
+        pending: "OrderedDict[str, List[int]]" = OrderedDict()
+        for i in misses:
+            pending.setdefault(normalize_embedding_text(texts[i]), []).append(i)
+        return results, pending
+
+    def _fill_embeddings(self, results: List[Optional[List[float]]], pending: "OrderedDict[str, List[int]]",
+                         outcomes: List) -> List[List[float]]:
+        """배처 결과(벡터 또는 예외)를 결과 자리에 채우고 성공분만 캐시에 저장. 실패 항목이 있으면 예외 전파"""
+        succeeded_texts, succeeded_vectors, errors = self._collect_embeddings(results, pending, outcomes)
+        get_embedding_cache().put_many(self.embedding_model, succeeded_texts, succeeded_vectors)
+        return self._finish_embeddings(results, pending, succeeded_vectors, errors)
+
+    def _collect_embeddings(self, results: List[Optional[List[float]]], pending: "OrderedDict[str, List[int]]",
+                            outcomes: List) -> Tuple[List[str], List[List[float]], List[Exception]]:
+        """배처 결과를 결과 자리에 채우고 (성공 텍스트, 성공 벡터, 예외 목록) 반환"""
+        if len(outcomes) != len(pending):
+            raise ValueError(f"임베딩 응답 개수 불일치: 요청 {len(pending)}개, 응답 {len(outcomes)}개")
+
+        succeeded_texts, succeeded_vectors, errors = [], [], []
+        for text, indices, outcome in zip(pending.keys(), pending.values(), outcomes):
+            if isinstance(outcome, Exception):
+                errors.append(outcome)
+                continue
+            succeeded_texts.append(text)
+            succeeded_vectors.append(outcome)
+            for i in indices:
+                results[i] = outcome
+        return succeeded_texts, succeeded_vectors, errors
+
+    def _finish_embeddings(self, results: List[Optional[List[float]]], pending: "OrderedDict[str, List[int]]",
+                           succeeded_vectors: List[List[float]], errors: List[Exception]) -> List[List[float]]:
+        if errors:
+            print(f"❌ 임베딩 생성 실패: {len(errors)}/{len(pending)}개 - {errors[0]}")
+            raise errors[0]
+
+        print(f"✅ 임베딩 생성 완료: {len(succeeded_vectors)}개")
+        return results
+
+    def _warmup_texts(self, queries: Optional[List[str]]) -> List[str]:
+        """워밍 대상 쿼리를 실제 검색과 동일하게 격리 정제"""
+        return [self._clean_query(query) for query in (queries or FREQUENT_QUERIES)]
+
+    def get_embedding_cache_stats(self) -> Dict:
+        """임베딩 캐시 적중률/크기 통계"""
+        return get_embedding_cache().stats()
+
+    def _candidate_count(self, top_k: int) -> int:
+        """검색할 후보 수 (속성 조건은 $filter로 처리되므로 격리 제외분만 여유)"""
+        return top_k + ISOLATION_HEADROOM if self.isolation_enabled else top_k
+
+    def _build_search_params(self, target_index: str, query_vector: List[float], top_k: int,
+                             filter_expression: Optional[str] = None,
+                             select: Optional[List[str]] = None) -> Dict:
+        """인덱스 설정에 맞는 벡터 검색 파라미터 생성 (select 미지정 시 인덱스 전체 필드)"""
+        index_config = self.supported_indexes[target_index]
+        candidate_count = self._candidate_count(top_k)
+        vector_query = VectorizedQuery(
+            vector=query_vector,
+            k_nearest_neighbors=candidate_count,
+            fields=index_config["vector_field"]
+        )
+        params = {
+            "vector_queries": [vector_query],
+            "top": candidate_count,
+            "select": select or index_config["select_fields"]
+        }
+        if filter_expression:
+            params["filter"] = filter_expression
+        return params
+
+    def _search_cache_key(self, target_index: str, query_vector: List[float], top_k: int,
+                          filter_expression: Optional[str] = None):
+        """검색 결과 캐시 키 (격리 여부에 따라 후처리 결과가 다르므로 키에 포함)"""
+        return get_search_result_cache().make_key(
+            target_index, query_vector, top_k, filter_expression,
+            variant=f"{'isolated' if self.isolation_enabled else 'raw'}:{self.search_backend}"
+        )
+
+    def invalidate_search_cache(self, index_name: str, version: Optional[str] = None) -> str:
+        """인덱스 재적재 후 검색 결과/파싱 문서/본문 캐시 무효화 (버전 스탬프 갱신)"""
+        get_parsed_document_cache().invalidate_index(index_name)
+        get_document_body_cache().invalidate_index(index_name)
+        return get_search_result_cache().invalidate_index(index_name, version)
+
+    def get_search_cache_stats(self) -> Dict:
+        """검색 결과 캐시 적중률/크기 통계"""
+        return get_search_result_cache().stats()
+
+    def get_document_cache_stats(self) -> Dict:
+        """파싱 문서 캐시 적중률/크기 통계"""
+        return get_parsed_document_cache().stats()
+
+    def _document_version(self, target_index: str) -> str:
+        """문서 캐시 버전 (로컬 복제본: 복제본 버전, 원격: 검색 결과 캐시의 인덱스 버전 스탬프 = 재적재 시 갱신)"""
+        if self.local_replica is not None and self.local_replica.has_index(target_index):
+            return self.local_replica.get_version(target_index) or "0"
+        return get_search_result_cache().get_index_version(target_index)
+
+    def _heavy_fields(self, target_index: str) -> List[str]:
+        return self.supported_indexes[target_index].get("heavy_fields", [])
+
+    def _light_select_fields(self, target_index: str) -> List[str]:
+        """검색 후보 조회용 필드 (무거운 필드 제외)"""
+        heavy_fields = set(self._heavy_fields(target_index))
+        fields = [field for field in self.supported_indexes[target_index]["select_fields"] if field not in heavy_fields]
+        # 사전 계산 특징은 스키마에 추가된 뒤에만 조회 (없는 필드를 select하면 검색 실패)
+        return fields + sorted(_schema_feature_fields.get(target_index, ()))
+
+    def _build_document_lookup_params(self, target_index: str, document_ids: List[str],
+                                      select: Optional[List[str]] = None) -> Dict:
+        """문서 id 목록 일괄 조회 파라미터 (search.in 필터 1회 요청, 기본: 무거운 필드 제외)"""
+        id_list = ",".join(document_id.replace("'", "''") for document_id in document_ids)
+        return {
+            "search_text": "*",
+            "filter": f"search.in(id, '{id_list}', ',')",
+            "select": select or self._light_select_fields(target_index),
+            "top": len(document_ids)
+        }
+
+    def _cache_parsed_documents(self, target_index: str, raw_documents, version: str) -> Dict[str, Dict]:
+        """원시 문서를 파싱하여 파싱 문서 캐시에 저장 → {문서 id: 파싱된 문서}
+        (무거운 필드가 포함된 경우 본문 캐시로 분리)"""
+        heavy_fields = self._heavy_fields(target_index)
+        parsed, bodies = {}, {}
+        for raw_document in raw_documents:
+            document = self._parse_document(target_index, raw_document)
+            if document is None:
+                continue
+            body = {field: document.pop(field) for field in heavy_fields if field in document}
+            if body:
+                bodies[document["id"]] = body
+            parsed[document["id"]] = document
+        get_parsed_document_cache().put_many(target_index, parsed, version)
+        if bodies:
+            get_document_body_cache().put_many(target_index, bodies, version)
+        return parsed
+
+    def _split_cached_bodies(self, target_index: str, results: List[Dict]) -> Tuple[Dict[str, Dict], List[str], str]:
+        """무거운 필드가 빠진 결과의 본문 캐시 조회 → (적중 본문, 미적중 문서 id, 버전)"""
+        heavy_fields = self._heavy_fields(target_index)
+        version = self._document_version(target_index)
+        document_ids = [
+            result["id"] for result in results
+            if result.get("id") and any(field not in result for field in heavy_fields)
+        ]
+        if not heavy_fields or not document_ids:
+            return {}, [], version
+        bodies, missing_ids = get_document_body_cache().get_many(target_index, document_ids, version)
+        return bodies, missing_ids, version
+
+    def _store_bodies(self, target_index: str, raw_documents, version: str) -> Dict[str, Dict]:
+        """조회한 무거운 필드를 본문 캐시에 저장 → {문서 id: 본문}"""
+        heavy_fields = self._heavy_fields(target_index)
+        bodies = {
+            raw_document["id"]: {field: raw_document.get(field) for field in heavy_fields}
+            for raw_document in raw_documents
+        }
+        get_document_body_cache().put_many(target_index, bodies, version)
+        return bodies
+
+    def _attach_bodies(self, results: List[Dict], bodies: Dict[str, Dict]) -> List[Dict]:
+        for result in results:
+            body = bodies.get(result.get("id"))
+            if body:
+                result.update(body)
+        return results
+
+    def get_document_body_cache_stats(self) -> Dict:
+        """문서 본문(무거운 필드) 캐시 적중률/크기 통계"""
+        return get_document_body_cache().stats()
+
+    def _assemble_hits(self, hits: List[Tuple[str, float]], documents: Dict[str, Dict]) -> List[Dict]:
+        """(문서 id, 점수) 검색 순서대로 파싱된 문서에 점수를 붙여 결과 목록 구성"""
+        raw_data = []
+        for document_id, score in hits:
+            document = documents.get(document_id)
+            if document is None:
+                # 검색과 본문 조회 사이에 삭제된 문서
+                continue
+            document["score"] = score
+            raw_data.append(document)
+        return raw_data
+
+    def search_lexical_templates(self, query_text: str, top_k: int = 5,
+                                 image_count: Optional[int] = None) -> Optional[List[Dict]]:
+        """JSX 템플릿 BM25 빠른 경로 - 어휘 신뢰도가 충분하면 검색 결과 형식의 후보, 아니면 None (벡터 검색 필요)"""
+        lexical_index = get_lexical_template_index()
+        raw_results, confidence = lexical_index.search(query_text, self._candidate_count(top_k), image_count)
+        if not raw_results or not lexical_index.is_confident(confidence):
+            return None
+
+        candidates = []
+        for raw_result in raw_results:
+            data = self._parse_search_result("jsx-component-vector-index", raw_result)
+            if data is not None:
+                data["source"] = "jsx_lexical_search"
+                data["lexical_confidence"] = confidence
+                candidates.append(data)
+        print(f"⚡ 어휘 빠른 경로: '{query_text[:40]}...' → {len(candidates)}개 (신뢰도 {confidence:.2f})")
+        return self._finalize_results(candidates, "jsx-component-vector-index", top_k)
+
+    def get_lexical_index_stats(self) -> Dict:
+        """JSX 템플릿 어휘 인덱스 통계 (빠른 경로 적중/폴백 수)"""
+        return get_lexical_template_index().stats()
+
+    def _parse_search_result(self, target_index: str, result) -> Optional[Dict]:
+        """원시 검색 결과를 인덱스별 형식으로 변환 (점수 포함)"""
+        data = self._parse_document(target_index, result)
+        if data is not None:
+            data["score"] = result.get("@search.score", 0.0)
+        return data
+
+    def _parse_document(self, target_index: str, result) -> Optional[Dict]:
+        """원시 문서를 인덱스별 형식으로 변환 (JSON 문자열 필드 파싱, 점수 제외)"""
+        if target_index == "magazine-vector-index":
+            # 매거진 레이아웃 데이터 형식
+            layout_info = json.loads(result.get("layout_info", "{}"))
+            image_info = json.loads(result.get("image_info", "[]"))
+            
+            return {
+                "id": result["id"],
+                "pdf_name": result["pdf_name"],
+                "page_number": result["page_number"],
+                "text_content": result["text_content"],
+                "layout_info": layout_info,
+                "image_info": image_info,
+                "source": "pdf_vector_search",
+                "index_type": "magazine_layout"
+            }
+            
+        elif target_index == "jsx-component-vector-index":
+            # JSX 컴포넌트 데이터 형식
+            jsx_structure = json.loads(result.get("jsx_structure", "{}"))
+            
+            document = {
+                "id": result["id"],
+                "component_name": result["component_name"],
+                "jsx_structure": jsx_structure,
+                "layout_method": result["layout_method"],
+                "image_count": result["image_count"],
+                "search_keywords": result["search_keywords"],
+                "source": "jsx_vector_search",
+                "index_type": "jsx_component"
+            }
+            # 2단계 조회에서는 jsx_code가 없을 수 있음 (선택된 문서만 본문 조회)
+            if result.get("jsx_code") is not None:
+                document["jsx_code"] = result["jsx_code"]
+            # 구조 특징: 색인된 값 우선, 없으면 jsx_code에서 1회 계산 (파싱 문서 캐시에 함께 저장)
+            if has_current_features(result):
+                document.update({name: result[name] for name in JSX_FEATURE_FIELDS})
+            else:
+                add_jsx_features(document)
+            return document
+            
+        elif target_index == "text-semantic-patterns-index":
+            # 텍스트 의미 분석 데이터 형식
+            return {
+                "id": result["id"],
+                "text_content": result["text_content"],
+                "emotional_tone": result["emotional_tone"],
+                "primary_theme": result["primary_theme"],
+                "visual_keywords": result["visual_keywords"],
+                "search_keywords": result["search_keywords"],
+                "semantic_tags": result["semantic_tags"],
+                "source": "semantic_vector_search",
+                "index_type": "text_semantic"
+            }
+        
+        return None
+
+    def _finalize_results(self, raw_data: List[Dict], target_index: str, top_k: int) -> List[Dict]:
+        """AI Search 격리 필터링 + 원본 데이터 우선순위 적용"""
+        if self.isolation_enabled:
+            filtered_data = self.isolation_manager.filter_contaminated_data(
+                raw_data, f"{target_index}_search"
+            )
+            
+            prioritized_data = self._prioritize_original_data(filtered_data, target_index)
+            
+            print(f"🛡️ 검색 결과 격리: {len(raw_data)} → {len(prioritized_data)}개")
+            return prioritized_data[:top_k]
+        return raw_data[:top_k]
+
+    def _build_recommendation_query(self, content_description: str, image_count: int) -> str:
+        """이미지 수에 따른 레이아웃 추천 검색 쿼리 생성"""
+        if image_count <= 1:
+            base_query = f"single image layout simple clean {content_description}"
+        elif image_count <= 3:
+            base_query = f"multiple images grid layout {content_description}"
+        else:
+            base_query = f"many images gallery layout complex {content_description}"
+
+        # AI Search 격리 적용
+        if self.isolation_enabled:
+            print(f"🛡️ 레이아웃 추천 쿼리 격리 적용")
+            return self.isolation_manager.clean_query_from_azure_keywords(base_query)
+        return base_query
+
+    def _prioritize_original_data(self, data: List[Dict], index_type: str) -> List[Dict]:
+        """인덱스 타입별 원본 데이터 우선순위 적용"""
+        if not self.isolation_enabled:
+            return data
+
+        prioritized = []
+        
+        for item in data:
+            # 인덱스별 신뢰도 기준
+            if index_type == "magazine-vector-index":
+                pdf_name = item.get('pdf_name', '').lower()
+                if any(pattern in pdf_name for pattern in ['template', 'layout', 'design', 'magazine']):
+                    item['priority'] = 1
+                    prioritized.insert(0, item)
+                else:
+                    item['priority'] = 2
+                    prioritized.append(item)
+                    
+            elif index_type == "jsx-component-vector-index":
+                component_name = item.get('component_name', '').lower()
+                if any(pattern in component_name for pattern in ['magazine', 'article', 'content']):
+                    item['priority'] = 1
+                    prioritized.insert(0, item)
+                else:
+                    item['priority'] = 2
+                    prioritized.append(item)
+                    
+            elif index_type == "text-semantic-patterns-index":
+                semantic_tags = item.get('semantic_tags', '').lower()
+                if any(pattern in semantic_tags for pattern in ['travel', 'magazine', 'descriptive']):
+                    item['priority'] = 1
+                    prioritized.insert(0, item)
+                else:
+                    item['priority'] = 2
+                    prioritized.append(item)
+            else:
+                item['priority'] = 3
+                prioritized.append(item)
+
+        return prioritized
+
+    def _get_isolated_fallback_data(self, index_type: str) -> List[Dict]:
+        """인덱스 타입별 격리된 폴백 데이터 반환"""
+        if index_type == "magazine-vector-index":
+            return [{
+                "id": "fallback_magazine_1",
+                "pdf_name": "isolated_default_layout",
+                "page_number": 1,
+                "text_content": "기본 매거진 레이아웃",
+                "layout_info": {
+                    "text_blocks": [],
+                    "images": [],
+                    "layout_structure": ["single_column"]
+                },
+                "image_info": [],
+                "score": 0.5,
+                "source": "isolated_fallback",
+                "index_type": "magazine_layout",
+                "priority": 1
+            }]
+            
+        elif index_type == "jsx-component-vector-index":
+            return [{
+                "id": "fallback_jsx_1",
+                "component_name": "DefaultMagazineComponent",
+                "jsx_structure": {"type": "basic", "layout": "single_column"},
+                "layout_method": "flex",
+                "image_count": 1,
+                "jsx_code": "// 기본 JSX 컴포넌트",
+                "search_keywords": "기본 컴포넌트",
+                "score": 0.5,
+                "source": "isolated_fallback",
+                "index_type": "jsx_component",
+                "priority": 1
+            }]
+            
+        elif index_type == "text-semantic-patterns-index":
+            return [{
+                "id": "fallback_semantic_1",
+                "text_content": "기본 여행 경험 텍스트",
+                "emotional_tone": "neutral",
+                "primary_theme": "travel",
+                "visual_keywords": "일반적인, 기본적인",
+                "search_keywords": "여행 경험 기본",
+                "semantic_tags": "travel basic",
+                "score": 0.5,
+                "source": "isolated_fallback",
+                "index_type": "text_semantic",
+                "priority": 1
+            }]
+        
+        return []
+
+
+class PDFVectorManager(VectorSearchCommonMixin):
     """다중 인덱스 지원 벡터 데이터 관리자 - 인덱스 연결 및 검색 전용"""
 
-    def __init__(self, isolation_enabled=True, default_index="magazine-vector-index"):
+    def __init__(self, isolation_enabled=True, default_index="magazine-vector-index", search_backend: Optional[str] = None,
+                 embedding_backend: Optional[str] = None):
         # Azure 서비스 초기화
         self.search_endpoint = os.getenv("AZURE_SEARCH_ENDPOINT")
         self.search_key = os.getenv("AZURE_SEARCH_KEY")
@@ -47,35 +608,19 @@ class PDFVectorManager:
         self.embedding_model = "text-embedding-ada-002"
         
         # AI Search 격리 시스템 초기화
-        self.isolation_enabled = isolation_enabled and ISOLATION_AVAILABLE
-        if self.isolation_enabled:
-            self.isolation_manager = AISearchIsolationManager()
-            print("🛡️ PDFVectorManager AI Search 격리 시스템 활성화")
-        else:
-            self.isolation_manager = None
-            print("⚠️ PDFVectorManager AI Search 격리 시스템 비활성화")
+        self._init_isolation(isolation_enabled, "PDFVectorManager")
+
+        # 벡터 검색 백엔드 (VECTOR_SEARCH_BACKEND 환경 변수 또는 인자)
+        self._init_search_backend(search_backend)
+
+        # 쿼리 임베딩 백엔드 (EMBEDDING_BACKEND 환경 변수 또는 인자)
+        self._init_embedding_backend(embedding_backend)
         
         # 지원하는 인덱스 목록
-        self.supported_indexes = {
-            "magazine-vector-index": {
-                "description": "매거진 레이아웃 패턴",
-                "vector_field": "content_vector",
-                "select_fields": ["id", "pdf_name", "page_number", "content_type", 
-                                "text_content", "layout_info", "image_info"]
-            },
-            "jsx-component-vector-index": {
-                "description": "JSX 컴포넌트 패턴", 
-                "vector_field": "jsx_vector",
-                "select_fields": ["id", "component_name", "jsx_structure", "layout_method",
-                                "image_count", "jsx_code", "search_keywords"]
-            },
-            "text-semantic-patterns-index": {
-                "description": "텍스트 의미 분석 패턴",
-                "vector_field": "semantic_vector", 
-                "select_fields": ["id", "text_content", "emotional_tone", "primary_theme",
-                                "visual_keywords", "search_keywords", "semantic_tags"]
-            }
-        }
+        self.supported_indexes = SUPPORTED_INDEXES
+        
+        # 인덱스별 실제 filterable 필드 (필터 푸시다운 가능 여부 판단용)
+        self._filterable_fields: Dict[str, Set[str]] = {}
         
         print(f"✅ PDFVectorManager 초기화 완료 (기본 인덱스: {default_index})")
 
@@ -164,32 +709,58 @@ class PDFVectorManager:
         return results
 
     def _create_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Azure OpenAI Embeddings API로 벡터 생성 (배치 처리 지원)"""
+        """Azure OpenAI Embeddings API로 벡터 생성 (임베딩 캐시 우선, 배치 처리 지원)
+
+        API 실패 시 예외를 그대로 전파합니다 (0 벡터로 검색하거나 캐시하지 않음).
+        """
         if not texts:
             return []
-            
-        print(f"📊 {len(texts)}개 텍스트에 대한 임베딩 생성 중...")
+
+        results, pending = self._split_cached_embeddings(texts)
+        if not pending:
+            return results
+
+        print(f"📊 {len(pending)}개 텍스트에 대한 임베딩 생성 중... (캐시 적중 {len(texts) - sum(len(v) for v in pending.values())}개)")
+
+        if self.local_embedder is not None:
+            # 로컬 ONNX 모델 (네트워크 없이 수 ms)
+            return self._fill_embeddings(results, pending, self.local_embedder.embed(list(pending.keys())))
         
-        try:
-            # Azure OpenAI API는 입력으로 리스트를 받아 배치 처리를 지원합니다.
-            response = self.openai_client.embeddings.create(
-                input=texts,
-                model=self.embedding_model
-            )
-            
-            # 응답에서 임베딩 리스트를 추출합니다.
-            embeddings = [item.embedding for item in response.data]
-            
-            print(f"✅ 임베딩 생성 완료: {len(embeddings)}개")
-            return embeddings
-            
-        except Exception as e:
-            print(f"❌ 배치 임베딩 생성 실패: {e}")
-            # 실패 시, 모든 텍스트에 대해 0 벡터를 반환합니다.
-            return [[0.0] * 1536 for _ in texts]
+        # 프로세스 공유 마이크로 배처가 다른 호출자의 요청과 모아 한 번에 전송합니다.
+        batcher = get_embedding_batcher(self.openai_client, self.embedding_model)
+        outcomes = []
+        for future in batcher.submit_many(list(pending.keys())):
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                outcomes.append(e)
+
+        return self._fill_embeddings(results, pending, outcomes)
+
+    def get_embedding_batcher_stats(self) -> Dict:
+        """임베딩 마이크로 배처 통계 (평균 배치 크기, 항목별 재시도/실패 수)"""
+        return get_embedding_batcher(self.openai_client, self.embedding_model).stats.snapshot()
 
-    def search_similar_layouts(self, query_text: str, index_name: str = None, top_k: int = 5, query_vector: Optional[List[float]] = None) -> List[Dict]:
-        """다중 인덱스 지원 유사 레이아웃 검색 (AI Search 격리 적용 및 사전 계산된 벡터 지원)"""
+    def warm_embedding_cache(self, queries: Optional[List[str]] = None, batch_size: int = 16) -> Dict:
+        """자주 쓰는 쿼리 목록으로 임베딩 캐시 워밍 (기본: FREQUENT_QUERIES)"""
+        texts = self._warmup_texts(queries)
+        for start in range(0, len(texts), batch_size):
+            try:
+                self._create_embeddings(texts[start:start + batch_size])
+            except Exception as e:
+                print(f"⚠️ 임베딩 캐시 워밍 실패: {e}")
+                break
+        return self.get_embedding_cache_stats()
+
+    def search_similar_layouts(self, query_text: str, index_name: str = None, top_k: int = 5,
+                               query_vector: Optional[List[float]] = None,
+                               filter_expression: Optional[str] = None,
+                               include_heavy_fields: bool = True) -> List[Dict]:
+        """다중 인덱스 지원 유사 레이아웃 검색 (AI Search 격리 적용, 사전 계산된 벡터 및 결과 캐시 지원)
+
+        include_heavy_fields=False이면 jsx_code 등 무거운 필드 없이 순위 필드만 반환합니다.
+        선택한 문서의 본문은 hydrate_heavy_fields로 채웁니다.
+        """
         target_index = index_name or self.default_index
         
         # 지원하는 인덱스인지 확인
@@ -201,11 +772,7 @@ class PDFVectorManager:
             # query_vector가 제공되지 않은 경우에만 임베딩을 생성합니다.
             if query_vector is None:
                 # 1. 쿼리 격리 (AI Search 키워드 제거)
-                if self.isolation_enabled:
-                    clean_query = self.isolation_manager.clean_query_from_azure_keywords(query_text)
-                    print(f"🛡️ 쿼리 격리: '{query_text[:50]}...' → '{clean_query[:50]}...'")
-                else:
-                    clean_query = query_text
+                clean_query = self._clean_query(query_text)
 
                 # 2. 쿼리 텍스트를 벡터로 변환 (배치 크기 1)
                 query_embeddings = self._create_embeddings([clean_query])
@@ -213,96 +780,13 @@ class PDFVectorManager:
                     raise ValueError("임베딩 생성에 실패했습니다.")
                 query_vector = query_embeddings[0]
 
-            # 3. 인덱스별 설정 가져오기
-            index_config = self.supported_indexes[target_index]
-            vector_field = index_config["vector_field"]
-            select_fields = index_config["select_fields"]
-
-            # 4. 벡터 검색 쿼리 생성
-            vector_query = VectorizedQuery(
-                vector=query_vector,
-                k_nearest_neighbors=top_k * 2,  # 격리 필터링을 위해 더 많이 검색
-                fields=vector_field
+            # 3~8. 결과 캐시 조회, 미적중 시 검색 실행 (동일 검색 동시 요청은 1회만 실행)
+            cache_key = self._search_cache_key(target_index, query_vector, top_k, filter_expression)
+            results = get_search_result_cache().get_or_compute(
+                cache_key,
+                lambda: self._execute_vector_search(target_index, query_vector, top_k, filter_expression)
             )
-
-            # 5. SearchClient 가져오기 및 검색 실행
-            search_client = self._get_search_client(target_index)
-            
-            search_params = {
-                "vector_queries": [vector_query],
-                "top": top_k * 2,
-                "select": select_fields
-            }
-
-            raw_results = search_client.search(**search_params)
-
-            # 6. 원시 결과 수집 (인덱스별 형식에 맞게)
-            raw_data = []
-            for result in raw_results:
-                if target_index == "magazine-vector-index":
-                    # 매거진 레이아웃 데이터 형식
-                    layout_info = json.loads(result.get("layout_info", "{}"))
-                    image_info = json.loads(result.get("image_info", "[]"))
-                    
-                    data = {
-                        "id": result["id"],
-                        "pdf_name": result["pdf_name"],
-                        "page_number": result["page_number"],
-                        "text_content": result["text_content"],
-                        "layout_info": layout_info,
-                        "image_info": image_info,
-                        "score": result.get("@search.score", 0.0),
-                        "source": "pdf_vector_search",
-                        "index_type": "magazine_layout"
-                    }
-                    
-                elif target_index == "jsx-component-vector-index":
-                    # JSX 컴포넌트 데이터 형식
-                    jsx_structure = json.loads(result.get("jsx_structure", "{}"))
-                    
-                    data = {
-                        "id": result["id"],
-                        "component_name": result["component_name"],
-                        "jsx_structure": jsx_structure,
-                        "layout_method": result["layout_method"],
-                        "image_count": result["image_count"],
-                        "jsx_code": result["jsx_code"],
-                        "search_keywords": result["search_keywords"],
-                        "score": result.get("@search.score", 0.0),
-                        "source": "jsx_vector_search",
-                        "index_type": "jsx_component"
-                    }
-                    
-                elif target_index == "text-semantic-patterns-index":
-                    # 텍스트 의미 분석 데이터 형식
-                    data = {
-                        "id": result["id"],
-                        "text_content": result["text_content"],
-                        "emotional_tone": result["emotional_tone"],
-                        "primary_theme": result["primary_theme"],
-                        "visual_keywords": result["visual_keywords"],
-                        "search_keywords": result["search_keywords"],
-                        "semantic_tags": result["semantic_tags"],
-                        "score": result.get("@search.score", 0.0),
-                        "source": "semantic_vector_search",
-                        "index_type": "text_semantic"
-                    }
-                
-                raw_data.append(data)
-
-            # 7. AI Search 격리 필터링
-            if self.isolation_enabled:
-                filtered_data = self.isolation_manager.filter_contaminated_data(
-                    raw_data, f"{target_index}_search"
-                )
-                
-                # 8. 원본 데이터 우선순위 적용
-                prioritized_data = self._prioritize_original_data(filtered_data, target_index)
-                
-                print(f"🛡️ 검색 결과 격리: {len(raw_data)} → {len(prioritized_data)}개")
-                return prioritized_data[:top_k]
-            else:
-                return raw_data[:top_k]
+            return self.hydrate_heavy_fields(results, target_index) if include_heavy_fields else results
 
         except Exception as e:
             print(f"❌ 벡터 검색 실패 ({target_index}): {e}")
@@ -311,122 +795,240 @@ class PDFVectorManager:
                 return self._get_isolated_fallback_data(target_index)
             return []
 
-    def _prioritize_original_data(self, data: List[Dict], index_type: str) -> List[Dict]:
-        """인덱스 타입별 원본 데이터 우선순위 적용"""
-        if not self.isolation_enabled:
-            return data
+    def _execute_vector_search(self, target_index: str, query_vector: List[float], top_k: int,
+                               filter_expression: Optional[str] = None) -> List[Dict]:
+        """AI Search 벡터 검색 실행 → 파싱 → 격리 후처리 (실패 시 예외 전파)"""
+        local_results = self._try_local_search(target_index, query_vector, top_k, filter_expression)
+        if local_results is not None:
+            return local_results
 
-        prioritized = []
-        
-        for item in data:
-            # 인덱스별 신뢰도 기준
-            if index_type == "magazine-vector-index":
-                pdf_name = item.get('pdf_name', '').lower()
-                if any(pattern in pdf_name for pattern in ['template', 'layout', 'design', 'magazine']):
-                    item['priority'] = 1
-                    prioritized.insert(0, item)
-                else:
-                    item['priority'] = 2
-                    prioritized.append(item)
-                    
-            elif index_type == "jsx-component-vector-index":
-                component_name = item.get('component_name', '').lower()
-                if any(pattern in component_name for pattern in ['magazine', 'article', 'content']):
-                    item['priority'] = 1
-                    prioritized.insert(0, item)
-                else:
-                    item['priority'] = 2
-                    prioritized.append(item)
-                    
-            elif index_type == "text-semantic-patterns-index":
-                semantic_tags = item.get('semantic_tags', '').lower()
-                if any(pattern in semantic_tags for pattern in ['travel', 'magazine', 'descriptive']):
-                    item['priority'] = 1
-                    prioritized.insert(0, item)
-                else:
-                    item['priority'] = 2
-                    prioritized.append(item)
-            else:
-                item['priority'] = 3
-                prioritized.append(item)
+        search_client = self._get_search_client(target_index)
+        if not self._use_id_only_search(target_index):
+            # 3~5. 캐시가 차기 전: 필드까지 한 번에 조회 (왕복 1회)
+            raw_results = list(search_client.search(**self._build_search_params(
+                target_index, query_vector, top_k, filter_expression, select=self._light_select_fields(target_index)
+            )))
+            return self._finalize_full_results(target_index, raw_results, top_k)
 
-        return prioritized
+        # 3~5. 캐시 적중률이 높으면 id와 점수만 조회
+        raw_results = search_client.search(
+            **self._build_search_params(target_index, query_vector, top_k, filter_expression, select=["id"])
+        )
+        hits = [(result["id"], result.get("@search.score", 0.0)) for result in raw_results]
 
-    def _get_isolated_fallback_data(self, index_type: str) -> List[Dict]:
-        """인덱스 타입별 격리된 폴백 데이터 반환"""
-        if index_type == "magazine-vector-index":
-            return [{
-                "id": "fallback_magazine_1",
-                "pdf_name": "isolated_default_layout",
-                "page_number": 1,
-                "text_content": "기본 매거진 레이아웃",
-                "layout_info": {
-                    "text_blocks": [],
-                    "images": [],
-                    "layout_structure": ["single_column"]
-                },
-                "image_info": [],
-                "score": 0.5,
-                "source": "isolated_fallback",
-                "index_type": "magazine_layout",
-                "priority": 1
-            }]
-            
-        elif index_type == "jsx-component-vector-index":
-            return [{
-                "id": "fallback_jsx_1",
-                "component_name": "DefaultMagazineComponent",
-                "jsx_structure": {"type": "basic", "layout": "single_column"},
-                "layout_method": "flex",
-                "image_count": 1,
-                "jsx_code": "// 기본 JSX 컴포넌트",
-                "search_keywords": "기본 컴포넌트",
-                "score": 0.5,
-                "source": "isolated_fallback",
-                "index_type": "jsx_component",
-                "priority": 1
-            }]
-            
-        elif index_type == "text-semantic-patterns-index":
-            return [{
-                "id": "fallback_semantic_1",
-                "text_content": "기본 여행 경험 텍스트",
-                "emotional_tone": "neutral",
-                "primary_theme": "travel",
-                "visual_keywords": "일반적인, 기본적인",
-                "search_keywords": "여행 경험 기본",
-                "semantic_tags": "travel basic",
-                "score": 0.5,
-                "source": "isolated_fallback",
-                "index_type": "text_semantic",
-                "priority": 1
-            }]
-        
-        return []
+        # 6. 파싱 문서 캐시에서 본문 채우기 (미적중 문서만 id 일괄 조회 후 파싱)
+        version = self._document_version(target_index)
+        documents, missing_ids = get_parsed_document_cache().get_many(target_index, [hit[0] for hit in hits], version)
+        if missing_ids:
+            documents.update(self._cache_parsed_documents(
+                target_index,
+                search_client.search(**self._build_document_lookup_params(target_index, missing_ids)),
+                version
+            ))
+
+        # 7~8. AI Search 격리 필터링 + 원본 데이터 우선순위 적용
+        return self._finalize_results(self._assemble_hits(hits, documents), target_index, top_k)
+
+    def hydrate_heavy_fields(self, results: List[Dict], index_name: str = None) -> List[Dict]:
+        """검색 결과에 무거운 필드(jsx_code 등)를 채움 (본문 캐시 우선, 미적중분만 포인트 조회)"""
+        target_index = index_name or self.default_index
+        bodies, missing_ids, version = self._split_cached_bodies(target_index, results)
+        if missing_ids:
+            try:
+                bodies.update(self._store_bodies(
+                    target_index, self._fetch_raw_bodies(target_index, missing_ids), version
+                ))
+            except Exception as e:
+                print(f"⚠️ 문서 본문 조회 실패 ({target_index}): {e}")
+        return self._attach_bodies(results, bodies)
+
+    def _fetch_raw_bodies(self, target_index: str, document_ids: List[str]) -> List[Dict]:
+        """무거운 필드 원시 조회 (1건: get_document 포인트 조회, 여러 건: search.in 1회)"""
+        if self.local_replica is not None and self.local_replica.has_index(target_index):
+            return self.local_replica.get_documents(target_index, document_ids)
+
+        fields = ["id", *self._heavy_fields(target_index)]
+        search_client = self._get_search_client(target_index)
+        if len(document_ids) == 1:
+            return [search_client.get_document(key=document_ids[0], selected_fields=fields)]
+        return list(search_client.search(**self._build_document_lookup_params(target_index, document_ids, fields)))
 
     def get_layout_recommendations(self, content_description: str, image_count: int, 
-                                 index_type: str = "magazine-vector-index") -> List[Dict]:
+                                 index_type: str = "magazine-vector-index",
+                                 include_heavy_fields: bool = True) -> List[Dict]:
         """콘텐츠 설명과 이미지 수를 바탕으로 레이아웃 추천 (다중 인덱스 지원)"""
-        
-        # 이미지 수에 따른 검색 쿼리 조정
-        if image_count <= 1:
-            base_query = f"single image layout simple clean {content_description}"
-        elif image_count <= 3:
-            base_query = f"multiple images grid layout {content_description}"
-        else:
-            base_query = f"many images gallery layout complex {content_description}"
+        clean_query = self._build_recommendation_query(content_description, image_count)
+        return self.search_similar_layouts(clean_query, index_type, top_k=3, include_heavy_fields=include_heavy_fields)
 
-        # AI Search 격리 적용
-        if self.isolation_enabled:
-            clean_query = self.isolation_manager.clean_query_from_azure_keywords(base_query)
-            print(f"🛡️ 레이아웃 추천 쿼리 격리 적용")
-        else:
-            clean_query = base_query
+    def sync_local_replica(self, index_names: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """원격 인덱스를 로컬 HNSW 복제본으로 스냅샷 (동기화된 인덱스는 검색 결과 캐시 무효화)"""
+        replica = get_local_vector_replica()
+        results = {}
+        for index_name in index_names or list(self.supported_indexes.keys()):
+            config = self.supported_indexes[index_name]
+            try:
+                meta = replica.sync_index(
+                    self._get_search_client(index_name),
+                    index_name,
+                    config["vector_field"],
+                    config["select_fields"],
+                    # 스냅샷 시점에 구조 특징 계산
+                    document_transform=add_jsx_features if "feature_fields" in config else None
+                )
+                self.invalidate_search_cache(index_name, meta["version"])
+                if index_name == "jsx-component-vector-index":
+                    get_lexical_template_index().reload()
+                results[index_name] = {"status": "synced", **meta}
+            except Exception as e:
+                print(f"❌ 로컬 벡터 복제본 동기화 실패 ({index_name}): {e}")
+                results[index_name] = {"status": "error", "error": str(e)}
+        return results
+
+    def get_filterable_fields(self, index_name: str) -> Set[str]:
+        """실제 인덱스 스키마에서 filterable로 설정된 필드 (인덱스별 1회 조회 후 캐시, 실패 시 빈 집합)"""
+        if index_name not in self._filterable_fields:
+            try:
+                index = self.search_index_client.get_index(index_name)
+                self._filterable_fields[index_name] = {field.name for field in index.fields if field.filterable}
+                feature_fields = self.supported_indexes[index_name].get("feature_fields", {})
+                _schema_feature_fields[index_name] = {field.name for field in index.fields if field.name in feature_fields}
+            except Exception as e:
+                print(f"⚠️ 인덱스 스키마 조회 실패 ({index_name}): {e} - 필터 푸시다운 비활성")
+                return set()
+        return self._filterable_fields[index_name]
+
+    def migrate_filterable_fields(self, index_names: Optional[List[str]] = None, dry_run: bool = False) -> Dict[str, Dict]:
+        """filterable_fields 설정에 맞게 인덱스 스키마 보정 (여러 번 실행해도 결과 동일)
+
+        - 없는 필드: filterable/facetable 필드로 추가 (기존 문서는 null)
+        - 있지만 속성이 다른 필드: Azure AI Search는 기존 필드의 filterable/facetable 변경을 허용하지 않으므로
+          rebuild_required로 보고 (해당 필드는 get_filterable_fields에 포함되지 않아 푸시다운되지 않음)
+        - feature_fields: 없으면 일반(retrievable) 숫자 필드로 추가 (값은 backfill_jsx_structure_features로 채움)
+        """
+        results = {}
+        for index_name in index_names or list(self.supported_indexes.keys()):
+            desired = self.supported_indexes[index_name].get("filterable_fields", {})
+            try:
+                index = self.search_index_client.get_index(index_name)
+                existing = {field.name: field for field in index.fields}
+                added, rebuild_required, ok = [], [], []
 
-        return self.search_similar_layouts(clean_query, index_type, top_k=3)
+                for field_name, (field_type, facetable) in desired.items():
+                    field = existing.get(field_name)
+                    if field is None:
+                        index.fields.append(SimpleField(
+                            name=field_name,
+                            type=getattr(SearchFieldDataType, field_type.split(".")[-1]),
+                            filterable=True,
+                            facetable=facetable
+                        ))
+                        added.append(field_name)
+                    elif not field.filterable or (facetable and not field.facetable):
+                        rebuild_required.append(field_name)
+                    else:
+                        ok.append(field_name)
+
+                for field_name, field_type in self.supported_indexes[index_name].get("feature_fields", {}).items():
+                    if field_name in existing:
+                        ok.append(field_name)
+                        continue
+                    index.fields.append(SimpleField(
+                        name=field_name,
+                        type=getattr(SearchFieldDataType, field_type.split(".")[-1])
+                    ))
+                    added.append(field_name)
+
+                if added and not dry_run:
+                    self.search_index_client.create_or_update_index(index)
+                    print(f"✅ {index_name}: 필드 추가 {added}")
+                if rebuild_required:
+                    print(f"⚠️ {index_name}: 재색인 필요 필드 {rebuild_required} (기존 필드 속성 변경 불가)")
+
+                self._filterable_fields.pop(index_name, None)
+                results[index_name] = {
+                    "status": "dry_run" if dry_run else "migrated",
+                    "added": added,
+                    "rebuild_required": rebuild_required,
+                    "ok": ok
+                }
+            except Exception as e:
+                print(f"❌ 인덱스 스키마 마이그레이션 실패 ({index_name}): {e}")
+                results[index_name] = {"status": "error", "error": str(e)}
+        return results
+
+    def backfill_jsx_structure_features(self, index_name: str = "jsx-component-vector-index",
+                                        batch_size: int = 500, dry_run: bool = False) -> Dict:
+        """jsx_code에서 구조 특징을 계산해 인덱스 문서에 병합 (현재 버전 특징이 있는 문서는 건너뜀, 재실행 안전)
+
+        특징 필드가 스키마에 있어야 함 (migrate_filterable_fields로 추가)
+        """
+        feature_fields = self.supported_indexes[index_name].get("feature_fields", {})
+        search_client = self._get_search_client(index_name)
+        fields = ["id", "component_name", "image_count", "jsx_code", *feature_fields]
+
+        scanned, pending, updated = 0, [], 0
+        for result in search_client.search(search_text="*", select=fields):
+            scanned += 1
+            if has_current_features(result):
+                continue
+            document = add_jsx_features({field: result.get(field) for field in fields})
+            pending.append({"id": document["id"], **{name: document.get(name) for name in feature_fields}})
+            if len(pending) >= batch_size:
+                updated += self._merge_feature_batch(search_client, pending, dry_run)
+                pending = []
+        if pending:
+            updated += self._merge_feature_batch(search_client, pending, dry_run)
+
+        if updated and not dry_run:
+            self.invalidate_search_cache(index_name)
+        print(f"✅ {index_name}: 구조 특징 {'계산 대상' if dry_run else '저장'} {updated}/{scanned}개")
+        return {"status": "dry_run" if dry_run else "backfilled", "scanned": scanned, "updated": updated}
+
+    def _merge_feature_batch(self, search_client, documents: List[Dict], dry_run: bool) -> int:
+        if dry_run:
+            return len(documents)
+        results = search_client.merge_documents(documents=documents)
+        return sum(1 for result in results if result.succeeded)
+
+    def rebuild_local_embedding_replica(self, index_names: Optional[List[str]] = None, batch_size: int = 32) -> Dict[str, Dict]:
+        """원격 문서를 로컬 ONNX 임베딩 모델로 다시 임베딩하여 로컬 복제본 구축 (embedding_backend=local_onnx용)"""
+        embedder = get_local_embedder()
+        replica = get_local_vector_replica(embedder.model_id)
+        results = {}
+        for index_name in index_names or list(self.supported_indexes.keys()):
+            config = self.supported_indexes[index_name]
+            try:
+                meta = replica.rebuild_index(
+                    self._get_search_client(index_name),
+                    index_name,
+                    config["select_fields"],
+                    config["embedding_text_fields"],
+                    embedder.embed,
+                    embedder.model_id,
+                    batch_size=batch_size
+                )
+                self.invalidate_search_cache(index_name, meta["version"])
+                results[index_name] = {"status": "rebuilt", **meta}
+            except Exception as e:
+                print(f"❌ 로컬 임베딩 복제본 구축 실패 ({index_name}): {e}")
+                results[index_name] = {"status": "error", "error": str(e)}
+        return results
+
+    def get_index_statistics(self, use_cached: bool = True) -> Dict[str, Dict]:
+        """모든 인덱스의 통계 정보 반환 (백그라운드 상태 점검 결과가 있으면 검색 없이 사용)"""
+        cached_counts = get_dependency_health_monitor().get_index_counts() if use_cached else None
+        if cached_counts is not None:
+            return {
+                index_name: {
+                    "description": config["description"],
+                    "document_count": cached_counts.get(index_name, {}).get("document_count", 0),
+                    "vector_field": config["vector_field"],
+                    "status": cached_counts.get(index_name, {}).get("status", "error"),
+                    "cached": True
+                }
+                for index_name, config in self.supported_indexes.items()
+            }
 
-    def get_index_statistics(self) -> Dict[str, Dict]:
-        """모든 인덱스의 통계 정보 반환"""
         stats = {}
         
         for index_name, config in self.supported_indexes.items():
@@ -479,8 +1081,10 @@ class PDFVectorManager:
         
         return test_results
 
-    def check_compatibility_with_agents(self) -> Dict[str, Dict]:
-        """에이전트별 인덱스 호환성 확인"""
+    def check_compatibility_with_agents(self, use_cached: bool = True) -> Dict[str, Dict]:
+        """에이전트별 인덱스 호환성 확인 (백그라운드 상태 점검 결과가 있으면 검색 없이 사용)"""
+        health_monitor = get_dependency_health_monitor()
+        cached_counts = health_monitor.get_index_counts() if use_cached else None
         compatibility = {
             "SemanticAnalysisEngine": {
                 "required_indexes": ["text-semantic-patterns-index", "magazine-vector-index"],
@@ -507,6 +1111,9 @@ class PDFVectorManager:
             
             for index_name in required_indexes:
                 if index_name in self.supported_indexes:
+                    if cached_counts is not None:
+                        available_count += int(health_monitor.is_index_available(index_name))
+                        continue
                     # 실제 연결 테스트
                     try:
                         test_results = self.search_similar_layouts("test", index_name, top_k=1)
@@ -0,0 +1,257 @@
+import csv
+import io
+import math
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+# ✅ KD-트리 (scikit-learn) - 없으면 선형 탐색으로 폴백
+try:
+    import numpy as np
+    from sklearn.neighbors import KDTree
+    KDTREE_AVAILABLE = True
+except ImportError:
+    KDTREE_AVAILABLE = False
+
+# ✅ EXIF 파싱 (Pillow)
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+
+EARTH_RADIUS_KM = 6371.0088
+GPS_IFD_TAG = 0x8825
+
+DEFAULT_DATASET_PATH = Path(__file__).parent / "geodata" / "cities_compact.csv"
+
+# 업로드 시 EXIF GPS를 역지오코딩해 Blob 메타데이터로 저장하는 키 (좌표와 EXIF 자체는 저장/제공하지 않음)
+GEO_METADATA_COUNTRY = "geo_country"
+GEO_METADATA_CITY = "geo_city"
+GEO_METADATA_CONFIDENCE = "geo_confidence"
+
+
+def _to_unit_vector(lat: float, lon: float) -> Tuple[float, float, float]:
+    """위경도를 단위 구 위의 3차원 좌표로 변환 (유클리드 거리 = 현의 길이)"""
+    lat_r = math.radians(lat)
+    lon_r = math.radians(lon)
+    return (
+        math.cos(lat_r) * math.cos(lon_r),
+        math.cos(lat_r) * math.sin(lon_r),
+        math.sin(lat_r),
+    )
+
+
+def _chord_to_km(chord: float) -> float:
+    """단위 구 현의 길이를 대원 거리(km)로 변환"""
+    chord = min(max(chord, 0.0), 2.0)
+    return 2.0 * math.asin(chord / 2.0) * EARTH_RADIUS_KM
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """두 좌표 간 대원 거리(km)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _rational_to_float(value) -> float:
+    """EXIF 유리수(IFDRational 또는 (분자, 분모) 튜플)를 float로 변환"""
+    if isinstance(value, tuple) and len(value) == 2:
+        numerator, denominator = value
+        return float(numerator) / float(denominator) if denominator else 0.0
+    return float(value)
+
+
+def _dms_to_degrees(dms, ref: str) -> Optional[float]:
+    """도/분/초 표기를 십진 도로 변환"""
+    try:
+        degrees = _rational_to_float(dms[0])
+        minutes = _rational_to_float(dms[1]) if len(dms) > 1 else 0.0
+        seconds = _rational_to_float(dms[2]) if len(dms) > 2 else 0.0
+    except (TypeError, ValueError, ZeroDivisionError, IndexError):
+        return None
+
+    result = degrees + minutes / 60.0 + seconds / 3600.0
+    if isinstance(ref, bytes):
+        ref = ref.decode("ascii", errors="ignore")
+    if str(ref).strip().upper() in ("S", "W"):
+        result = -result
+    return result
+
+
+def extract_gps_from_image_bytes(image_bytes: bytes) -> Optional[Tuple[float, float]]:
+    """이미지 바이트의 EXIF GPS IFD에서 (위도, 경도) 추출. 없으면 None"""
+    if not PIL_AVAILABLE or not image_bytes:
+        return None
+
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as img:
+            gps_ifd = img.getexif().get_ifd(GPS_IFD_TAG)
+    except Exception:
+        return None
+
+    if not gps_ifd:
+        return None
+
+    # GPS 태그: 1=LatitudeRef, 2=Latitude, 3=LongitudeRef, 4=Longitude
+    lat_ref, lat_dms = gps_ifd.get(1), gps_ifd.get(2)
+    lon_ref, lon_dms = gps_ifd.get(3), gps_ifd.get(4)
+    if not lat_dms or not lon_dms:
+        return None
+
+    lat = _dms_to_degrees(lat_dms, lat_ref or "N")
+    lon = _dms_to_degrees(lon_dms, lon_ref or "E")
+    if lat is None or lon is None:
+        return None
+
+    # (0, 0) 및 범위 밖 좌표는 카메라가 채운 더미 값으로 간주
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0) or (lat == 0.0 and lon == 0.0):
+        return None
+
+    return lat, lon
+
+
+class OfflineReverseGeocoder:
+    """번들된 GeoNames 형식 도시 데이터셋 + KD-트리 기반 오프라인 역지오코더"""
+
+    def __init__(self, dataset_path: Optional[Path] = None, max_distance_km: float = 75.0):
+        self.dataset_path = Path(dataset_path) if dataset_path else DEFAULT_DATASET_PATH
+        self.max_distance_km = max_distance_km
+        self.places: List[Dict] = []
+        self._points: List[Tuple[float, float, float]] = []
+        self._tree = None
+
+        self._load_dataset()
+        self._build_index()
+
+    def _load_dataset(self):
+        """CSV 데이터셋 로드"""
+        with open(self.dataset_path, encoding="utf-8", newline="") as f:
+            for row in csv.DictReader(f):
+                try:
+                    lat = float(row["lat"])
+                    lon = float(row["lon"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+
+                self.places.append({
+                    "name": row.get("name", ""),
+                    "name_ko": row.get("name_ko") or row.get("name", ""),
+                    "country_code": row.get("country_code", ""),
+                    "country_ko": row.get("country_ko") or row.get("country_code", ""),
+                    "lat": lat,
+                    "lon": lon,
+                })
+                self._points.append(_to_unit_vector(lat, lon))
+
+    def _build_index(self):
+        """KD-트리 구축 (scikit-learn 미설치 시 선형 탐색 사용)"""
+        if KDTREE_AVAILABLE and self._points:
+            self._tree = KDTree(np.asarray(self._points, dtype=np.float64))
+
+    def _nearest(self, lat: float, lon: float, k: int) -> List[Tuple[int, float]]:
+        """가장 가까운 k개 장소의 (인덱스, 거리 km) 목록"""
+        if not self.places:
+            return []
+
+        k = max(1, min(k, len(self.places)))
+        query = _to_unit_vector(lat, lon)
+
+        if self._tree is not None:
+            chords, indices = self._tree.query(np.asarray([query], dtype=np.float64), k=k)
+            return [(int(i), _chord_to_km(float(c))) for c, i in zip(chords[0], indices[0])]
+
+        # 폴백: 선형 탐색
+        scored = []
+        for idx, point in enumerate(self._points):
+            chord = math.sqrt(sum((a - b) ** 2 for a, b in zip(query, point)))
+            scored.append((idx, _chord_to_km(chord)))
+        scored.sort(key=lambda x: x[1])
+        return scored[:k]
+
+    def lookup(self, lat: float, lon: float) -> Optional[Dict]:
+        """좌표를 가장 가까운 도시로 역지오코딩. 허용 거리 밖이면 None"""
+        nearest = self._nearest(lat, lon, k=1)
+        if not nearest:
+            return None
+
+        idx, distance_km = nearest[0]
+        if distance_km > self.max_distance_km:
+            return None
+
+        place = self.places[idx]
+        return {
+            "country": place["country_ko"],
+            "country_code": place["country_code"],
+            "city": place["name_ko"],
+            "city_en": place["name"],
+            "latitude": lat,
+            "longitude": lon,
+            "distance_km": round(distance_km, 2),
+            "confidence_score": self._distance_confidence(distance_km),
+            "source": "exif_gps",
+        }
+
+    def lookup_many(self, coordinates: List[Tuple[float, float]]) -> List[Optional[Dict]]:
+        """여러 좌표 일괄 역지오코딩"""
+        return [self.lookup(lat, lon) for lat, lon in coordinates]
+
+    def _distance_confidence(self, distance_km: float) -> float:
+        """거리 기반 신뢰도 (도심 10km 이내 0.95, 허용 한계에서 0.6)"""
+        if distance_km <= 10.0:
+            return 0.95
+        ratio = (distance_km - 10.0) / max(self.max_distance_km - 10.0, 1.0)
+        return round(max(0.6, 0.95 - 0.35 * ratio), 2)
+
+
+_geocoder_instance: Optional[OfflineReverseGeocoder] = None
+_geocoder_lock = threading.Lock()
+
+
+def get_reverse_geocoder() -> OfflineReverseGeocoder:
+    """프로세스 공유 역지오코더 (최초 1회만 데이터셋 로드)"""
+    global _geocoder_instance
+    if _geocoder_instance is None:
+        with _geocoder_lock:
+            if _geocoder_instance is None:
+                _geocoder_instance = OfflineReverseGeocoder()
+    return _geocoder_instance
+
+
+def location_to_blob_metadata(location: Dict) -> Dict[str, str]:
+    """역지오코딩 결과 → Blob 메타데이터 (국가/도시/신뢰도만, 메타데이터 값은 ASCII만 허용하므로 URL 인코딩)"""
+    return {
+        GEO_METADATA_COUNTRY: quote(location["country"]),
+        GEO_METADATA_CITY: quote(location["city"]),
+        GEO_METADATA_CONFIDENCE: str(location["confidence_score"]),
+    }
+
+
+def location_from_blob_metadata(metadata: Optional[Dict[str, str]]) -> Optional[Dict]:
+    """Blob 메타데이터 → 위치 (업로드 시 GPS가 없었거나 이전에 업로드된 이미지면 None)"""
+    if not metadata or not metadata.get(GEO_METADATA_COUNTRY) or not metadata.get(GEO_METADATA_CITY):
+        return None
+    try:
+        confidence_score = float(metadata.get(GEO_METADATA_CONFIDENCE) or 0.6)
+    except ValueError:
+        confidence_score = 0.6
+    return {
+        "country": unquote(metadata[GEO_METADATA_COUNTRY]),
+        "city": unquote(metadata[GEO_METADATA_CITY]),
+        "confidence_score": confidence_score,
+        "source": "exif_gps",
+    }
+
+
+def extract_location_metadata(image_bytes: bytes) -> Dict[str, str]:
+    """업로드 원본의 EXIF GPS → 위치 메타데이터 (GPS가 없거나 허용 거리 밖이면 빈 dict)"""
+    coordinates = extract_gps_from_image_bytes(image_bytes)
+    if not coordinates:
+        return {}
+    location = get_reverse_geocoder().lookup(*coordinates)
+    return location_to_blob_metadata(location) if location else {}
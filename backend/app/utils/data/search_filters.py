@@ -0,0 +1,184 @@
+"""
+Azure AI Search OData $filter 식 생성 도우미
+Python 후처리 필터 대신 검색 요청에 필터를 실어 보내기 위한 최소 빌더 (filterable 필드 전용)
+로컬 벡터 복제본은 같은 식을 compile_local_filter로 문서 판정 함수로 바꿔 Python에서 평가
+"""
+
+import operator
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def odata_literal(value) -> str:
+    """Python 값 → OData 리터럴 (문자열은 작은따옴표 이스케이프)"""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def eq(field: str, value) -> str:
+    return f"{field} eq {odata_literal(value)}"
+
+
+def range_filter(field: str, low=None, high=None) -> Optional[str]:
+    """low <= field <= high (한쪽만 지정 가능)"""
+    clauses = []
+    if low is not None:
+        clauses.append(f"{field} ge {odata_literal(low)}")
+    if high is not None:
+        clauses.append(f"{field} le {odata_literal(high)}")
+    return " and ".join(clauses) or None
+
+
+def search_in(field: str, values: Iterable[str], delimiter: str = ",") -> Optional[str]:
+    """문자열 필드가 값 목록 중 하나 (search.in은 OR 나열보다 빠름)"""
+    values = [str(value) for value in values]
+    if not values:
+        return None
+    joined = delimiter.join(value.replace("'", "''") for value in values)
+    return f"search.in({field}, '{joined}', '{delimiter}')"
+
+
+def combine(*clauses: Optional[str]) -> Optional[str]:
+    """None/빈 조건을 제외하고 and로 결합"""
+    clauses = [clause for clause in clauses if clause]
+    if not clauses:
+        return None
+    if len(clauses) == 1:
+        return clauses[0]
+    return " and ".join(f"({clause})" for clause in clauses)
+
+
+# ===== 로컬 평가 (로컬 벡터 복제본용) =====
+# 위 빌더가 만드는 식의 부분집합만 지원: 비교(eq/ne/gt/ge/lt/le), search.in, and/or/not, 괄호
+
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:"
+    r"(?P<search_in>search\.in\(\s*(?P<in_field>\w+)\s*,\s*'(?P<in_values>(?:[^']|'')*)'"
+    r"(?:\s*,\s*'(?P<in_delimiter>(?:[^']|'')*)')?\s*\))"
+    r"|(?P<paren>[()])"
+    r"|(?P<string>'(?:[^']|'')*')"
+    r"|(?P<number>-?\d+(?:\.\d+)?)"
+    r"|(?P<word>[A-Za-z_]\w*)"
+    r")"
+)
+
+_COMPARATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq, "ne": operator.ne,
+    "gt": operator.gt, "ge": operator.ge, "lt": operator.lt, "le": operator.le,
+}
+
+DocumentPredicate = Callable[[Dict], bool]
+
+
+def _tokenize(expression: str) -> List[Tuple[str, Any]]:
+    tokens, position = [], 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN_PATTERN.match(expression, position)
+        if match is None or match.end() == position:
+            raise ValueError(f"로컬 평가를 지원하지 않는 필터 식: {expression!r} (위치 {position})")
+        position = match.end()
+        if match.group("search_in"):
+            delimiter = (match.group("in_delimiter") or ",").replace("''", "'")
+            values = match.group("in_values").replace("''", "'").split(delimiter)
+            tokens.append(("search_in", (match.group("in_field"), {value.strip() for value in values})))
+        elif match.group("paren"):
+            tokens.append((match.group("paren"), None))
+        elif match.group("string"):
+            tokens.append(("literal", match.group("string")[1:-1].replace("''", "'")))
+        elif match.group("number"):
+            number = match.group("number")
+            tokens.append(("literal", float(number) if "." in number else int(number)))
+        else:
+            word = match.group("word")
+            literals = {"true": True, "false": False, "null": None}
+            tokens.append(("literal", literals[word]) if word in literals else ("word", word))
+    return tokens
+
+
+class _FilterParser:
+    """재귀 하강 파서: or < and < not < 비교/search.in/괄호"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.position = 0
+
+    def _peek(self) -> Tuple[Optional[str], Any]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else (None, None)
+
+    def _next(self) -> Tuple[Optional[str], Any]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def _error(self) -> ValueError:
+        return ValueError(f"로컬 평가를 지원하지 않는 필터 식: {self.expression!r}")
+
+    def parse(self) -> DocumentPredicate:
+        predicate = self._or()
+        if self.position != len(self.tokens):
+            raise self._error()
+        return predicate
+
+    def _or(self) -> DocumentPredicate:
+        clauses = [self._and()]
+        while self._peek() == ("word", "or"):
+            self._next()
+            clauses.append(self._and())
+        return clauses[0] if len(clauses) == 1 else (lambda document: any(clause(document) for clause in clauses))
+
+    def _and(self) -> DocumentPredicate:
+        clauses = [self._not()]
+        while self._peek() == ("word", "and"):
+            self._next()
+            clauses.append(self._not())
+        return clauses[0] if len(clauses) == 1 else (lambda document: all(clause(document) for clause in clauses))
+
+    def _not(self) -> DocumentPredicate:
+        if self._peek() == ("word", "not"):
+            self._next()
+            inner = self._not()
+            return lambda document: not inner(document)
+        return self._primary()
+
+    def _primary(self) -> DocumentPredicate:
+        kind, value = self._next()
+        if kind == "(":
+            inner = self._or()
+            if self._next()[0] != ")":
+                raise self._error()
+            return inner
+        if kind == "search_in":
+            field, values = value
+            return lambda document: str(document.get(field)) in values if document.get(field) is not None else False
+        if kind == "word":
+            op_kind, op = self._next()
+            literal_kind, literal = self._next()
+            if op_kind != "word" or op not in _COMPARATORS or literal_kind != "literal":
+                raise self._error()
+            return _comparison(value, _COMPARATORS[op], op, literal)
+        raise self._error()
+
+
+def _comparison(field: str, compare: Callable[[Any, Any], bool], op: str, literal) -> DocumentPredicate:
+    def predicate(document: Dict) -> bool:
+        value = document.get(field)
+        if value is None or literal is None:
+            # OData null 비교: eq/ne만 의미가 있고 대소 비교는 거짓
+            return compare(value, literal) if op in ("eq", "ne") else False
+        try:
+            return compare(value, literal)
+        except TypeError:
+            return False
+    return predicate
+
+
+def compile_local_filter(expression: Optional[str]) -> Optional[DocumentPredicate]:
+    """OData $filter 식 → 문서 dict 판정 함수 (지원하지 않는 식은 ValueError)"""
+    if not expression or not expression.strip():
+        return None
+    return _FilterParser(expression).parse()
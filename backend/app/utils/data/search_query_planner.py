@@ -0,0 +1,105 @@
+"""
+섹션 간 벡터 검색 쿼리 플래너
+매거진 1건 처리 중 여러 섹션/컴포넌트가 보낼 (인덱스, 쿼리, top_k, 필터) 요청을 미리 모아
+중복 제거 → 임베딩 1회 배치 → 검색 동시 실행 후, 각 컴포넌트의 검색은 계획된 결과에서 응답.
+활성 계획은 contextvar로 전달되므로 컴포넌트 코드는 평소처럼 AsyncPDFVectorManager를 호출
+"""
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .search_result_cache import FrozenResults, _freeze, _thaw
+
+SearchRequest = Tuple[str, str, int, Optional[str]]  # (index_name, query_text, top_k, filter_expression)
+
+_active_plan: ContextVar[Optional["SearchQueryPlanner"]] = ContextVar("active_search_plan", default=None)
+
+
+def get_active_search_plan() -> Optional["SearchQueryPlanner"]:
+    return _active_plan.get()
+
+
+@contextmanager
+def search_plan_scope(planner: "SearchQueryPlanner"):
+    """블록 안(및 그 안에서 생성된 태스크)의 벡터 검색이 planner 결과를 우선 사용"""
+    token = _active_plan.set(planner)
+    try:
+        yield planner
+    finally:
+        _active_plan.reset(token)
+
+
+class SearchQueryPlanner:
+    """매거진 단위 검색 계획 (계획된 결과 저장 + 통계)"""
+
+    def __init__(self, vector_manager, max_concurrency: int = 8):
+        self.vector_manager = vector_manager
+        self.max_concurrency = max_concurrency
+        self._results: Dict[Tuple, FrozenResults] = {}
+        self.stats = {"requested": 0, "planned": 0, "embedding_batches": 0, "served": 0, "unplanned": 0}
+
+    def _variant(self, manager) -> str:
+        return f"{'isolated' if manager.isolation_enabled else 'raw'}:{getattr(manager, 'search_backend', 'remote')}"
+
+    def _key(self, index_name: str, query_text: str, top_k: int,
+             filter_expression: Optional[str], variant: str) -> Tuple:
+        return (index_name, query_text, top_k, filter_expression or "", variant)
+
+    async def prefetch(self, requests: Iterable[SearchRequest]) -> int:
+        """요청 목록을 중복 제거 후 임베딩 1회 배치 + 동시 검색으로 미리 실행. 새로 계획된 수 반환"""
+        manager = self.vector_manager
+        variant = self._variant(manager)
+
+        pending: Dict[Tuple, SearchRequest] = {}
+        for index_name, query_text, top_k, filter_expression in requests:
+            self.stats["requested"] += 1
+            key = self._key(index_name, query_text, top_k, filter_expression, variant)
+            if key not in self._results and key not in pending:
+                pending[key] = (index_name, query_text, top_k, filter_expression)
+
+        if not pending:
+            return 0
+
+        # 검색 경로와 동일한 쿼리 정제 후 고유 텍스트만 임베딩
+        clean_texts = {key: manager._clean_query(request[1]) for key, request in pending.items()}
+        unique_texts = list(dict.fromkeys(clean_texts.values()))
+        try:
+            vectors = await manager._create_embeddings(unique_texts)
+            self.stats["embedding_batches"] += 1
+        except Exception as e:
+            print(f"⚠️ 검색 계획 임베딩 실패, 해당 검색은 개별 실행됩니다: {e}")
+            return 0
+        vector_by_text = dict(zip(unique_texts, vectors))
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(key: Tuple, request: SearchRequest):
+            index_name, query_text, top_k, filter_expression = request
+            async with semaphore:
+                self._results[key] = _freeze(await manager.search_similar_layouts(
+                    query_text, index_name, top_k=top_k,
+                    query_vector=vector_by_text[clean_texts[key]],
+                    filter_expression=filter_expression,
+                    include_heavy_fields=False  # 본문은 조회 측 요청에 따라 채움
+                ))
+
+        await asyncio.gather(*[run(key, request) for key, request in pending.items()])
+        self.stats["planned"] += len(pending)
+        print(f"🗺️ 검색 계획 실행: 요청 {self.stats['requested']}개 → 고유 검색 {len(pending)}개, 임베딩 {len(unique_texts)}개")
+        return len(pending)
+
+    def lookup(self, manager, index_name: str, query_text: str, top_k: int,
+               filter_expression: Optional[str] = None) -> Optional[List[Dict]]:
+        """계획된 결과가 있으면 문서별 얕은 사본 반환, 없으면 None (호출 측이 직접 검색)"""
+        key = self._key(index_name, query_text, top_k, filter_expression, self._variant(manager))
+        results = self._results.get(key)
+        if results is None:
+            self.stats["unplanned"] += 1
+            return None
+        self.stats["served"] += 1
+        return _thaw(results)
+
+    def summary(self) -> Dict:
+        return {**self.stats, "unique_searches": len(self._results)}
@@ -0,0 +1,240 @@
+"""
+벡터 검색 결과 캐시
+인덱스는 재적재 시에만 바뀌므로 (인덱스, 쿼리 벡터, top_k, 필터)가 같으면 결과도 같음.
+파싱/격리 처리까지 끝난 결과를 TTL 동안 보관하고, 인덱스 버전 스탬프로 명시적 무효화.
+동일 검색이 동시에 들어오면 한 번만 요청 (single-flight)
+결과는 읽기 전용 매핑의 튜플로 저장하고, 적중 시 잠금을 놓은 뒤 문서별 얕은 사본만 만들어 반환
+(호출 측은 최상위 키(점수 등)만 추가/수정하며, 중첩 값은 캐시와 공유되므로 읽기 전용으로 취급)
+"""
+
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+VECTOR_SEARCH_CACHE_TTL = float(os.getenv("VECTOR_SEARCH_CACHE_TTL", "600"))
+VECTOR_SEARCH_CACHE_SIZE = int(os.getenv("VECTOR_SEARCH_CACHE_SIZE", "1024"))
+# 선행 요청 대기 최대 시간 (초과 시 직접 검색)
+SINGLE_FLIGHT_WAIT_SECONDS = 30.0
+
+CacheKey = Tuple[Any, ...]
+FrozenResults = Tuple[Mapping[str, Any], ...]
+
+
+def hash_query_vector(query_vector: Sequence[float]) -> str:
+    return hashlib.sha1(array("f", query_vector).tobytes()).hexdigest()
+
+
+def _freeze(results: List[Dict]) -> FrozenResults:
+    return tuple(MappingProxyType(dict(doc)) for doc in results)
+
+
+def _thaw(frozen: FrozenResults) -> List[Dict]:
+    """호출 측 수정용 문서별 얕은 사본"""
+    return [dict(doc) for doc in frozen]
+
+
+class _Flight:
+    """진행 중인 동기 검색 (후행 요청은 event 대기 후 결과 공유)"""
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[FrozenResults] = None
+        self.error: Optional[BaseException] = None
+
+
+class SearchResultCache:
+    """TTL + LRU 검색 결과 캐시 (동기/비동기 single-flight 지원)"""
+
+    def __init__(self, ttl_seconds: float = VECTOR_SEARCH_CACHE_TTL, max_entries: int = VECTOR_SEARCH_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CacheKey, Tuple[float, FrozenResults]]" = OrderedDict()
+        self._index_versions: Dict[str, str] = {}
+        self._inflight: Dict[CacheKey, _Flight] = {}
+        self._async_inflight: Dict[Tuple[int, CacheKey], "asyncio.Future"] = {}
+        self._lock = threading.Lock()
+        self.stats_counter = {"hits": 0, "misses": 0, "coalesced": 0, "invalidations": 0}
+
+    # ===== 키/버전 =====
+    def get_index_version(self, index_name: str) -> str:
+        with self._lock:
+            return self._index_versions.get(index_name, "0")
+
+    def make_key(self, index_name: str, query_vector: Sequence[float], top_k: int,
+                 filter_expression: Optional[str] = None, variant: str = "") -> CacheKey:
+        """(인덱스, 인덱스 버전, 벡터 해시, top_k, 필터, 후처리 변형) 캐시 키"""
+        return (
+            index_name,
+            self.get_index_version(index_name),
+            hash_query_vector(query_vector),
+            top_k,
+            filter_expression or "",
+            variant,
+        )
+
+    def invalidate_index(self, index_name: str, version: Optional[str] = None) -> str:
+        """인덱스 재적재 후 호출 - 버전 스탬프 갱신 및 해당 인덱스 항목 제거"""
+        with self._lock:
+            if version is None:
+                version = str(time.time_ns())
+            self._index_versions[index_name] = version
+            stale_keys = [key for key in self._entries if key[0] == index_name]
+            for key in stale_keys:
+                del self._entries[key]
+            self.stats_counter["invalidations"] += 1
+        print(f"🧹 검색 결과 캐시 무효화: {index_name} (버전 {version}, {len(stale_keys)}개 제거)")
+        return version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    # ===== 조회/저장 =====
+    def get(self, key: CacheKey) -> Optional[List[Dict]]:
+        with self._lock:
+            frozen = self._get_locked(key)
+        return None if frozen is None else _thaw(frozen)
+
+    def _get_locked(self, key: CacheKey) -> Optional[FrozenResults]:
+        entry = self._entries.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+            if entry is not None:
+                del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        self.stats_counter["hits"] += 1
+        return entry[1]
+
+    def put(self, key: CacheKey, results: List[Dict]) -> FrozenResults:
+        frozen = _freeze(results)
+        self._put_frozen(key, frozen)
+        return frozen
+
+    def _put_frozen(self, key: CacheKey, frozen: FrozenResults):
+        with self._lock:
+            # 대기 중 무효화되었다면 이전 버전 결과는 저장하지 않음
+            if key[1] != self._index_versions.get(key[0], "0"):
+                return
+            self._entries[key] = (time.monotonic(), frozen)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: CacheKey, compute: Callable[[], List[Dict]]) -> List[Dict]:
+        """동기 single-flight 조회 (compute 예외는 캐시하지 않고 대기자에게도 전파)"""
+        with self._lock:
+            cached = self._get_locked(key)
+            if cached is None:
+                flight = self._inflight.get(key)
+                is_leader = flight is None
+                if is_leader:
+                    flight = _Flight()
+                    self._inflight[key] = flight
+                    self.stats_counter["misses"] += 1
+                else:
+                    self.stats_counter["coalesced"] += 1
+        if cached is not None:
+            return _thaw(cached)
+
+        if not is_leader:
+            if flight.event.wait(SINGLE_FLIGHT_WAIT_SECONDS) and flight.error is None and flight.result is not None:
+                return _thaw(flight.result)
+            if flight.error is not None:
+                raise flight.error
+            return compute()
+
+        try:
+            results = compute()
+            # 캐시/대기자는 고정 사본을 공유하고, 선행 요청은 직접 만든 결과를 그대로 사용
+            flight.result = self.put(key, results)
+            return results
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    async def get_or_compute_async(self, key: CacheKey,
+                                   compute: Callable[[], Awaitable[List[Dict]]]) -> List[Dict]:
+        """비동기 single-flight 조회 (Future는 이벤트 루프별로 관리)"""
+        loop = asyncio.get_running_loop()
+        flight_key = (id(loop), key)
+
+        with self._lock:
+            cached = self._get_locked(key)
+            if cached is None:
+                future = self._async_inflight.get(flight_key)
+                is_leader = future is None
+                if is_leader:
+                    future = loop.create_future()
+                    self._async_inflight[flight_key] = future
+                    self.stats_counter["misses"] += 1
+                else:
+                    self.stats_counter["coalesced"] += 1
+        if cached is not None:
+            return _thaw(cached)
+
+        if not is_leader:
+            return _thaw(await asyncio.shield(future))
+
+        try:
+            results = await compute()
+            frozen = self.put(key, results)
+            if not future.done():
+                future.set_result(frozen)
+            return results
+        except asyncio.CancelledError:
+            if not future.done():
+                future.cancel()
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+                # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+                future.exception()
+            raise
+        finally:
+            with self._lock:
+                self._async_inflight.pop(flight_key, None)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counter = dict(self.stats_counter)
+            size = len(self._entries)
+            versions = dict(self._index_versions)
+        lookups = counter["hits"] + counter["misses"] + counter["coalesced"]
+        return {
+            **counter,
+            "size": size,
+            "ttl_seconds": self.ttl_seconds,
+            "index_versions": versions,
+            "hit_rate": (counter["hits"] + counter["coalesced"]) / lookups if lookups else 0.0,
+        }
+
+
+_cache_instance: Optional[SearchResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_search_result_cache() -> SearchResultCache:
+    """프로세스 공유 검색 결과 캐시 (동기/비동기 벡터 매니저 공용)"""
+    global _cache_instance
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = SearchResultCache()
+    return _cache_instance
@@ -0,0 +1,142 @@
+"""
+스트리밍 LLM 응답 증분 파서
+응답 전체를 기다리지 않고 델타가 도착할 때마다 이어서 스캔해, 완성된 부분을 즉시 후속 처리에 넘김.
+- IncrementalJSONArrayParser: JSON 배열 응답에서 완성된 최상위 객체를 도착 순서대로 반환
+- IncrementalJSXParser: JSX 응답에서 코드 블록을 추출하고, 코드 블록이 닫히면 완료 (이후 설명 텍스트는 불필요)
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+
+class IncrementalJSONArrayParser:
+    """JSON 배열 스트림 → 완성된 최상위 요소(객체/배열) 목록 (코드 펜스 등 앞쪽 텍스트는 건너뜀)"""
+
+    def __init__(self):
+        self._text = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._element_start: Optional[int] = None
+        self.started = False
+        self.done = False
+        self.items: List[Any] = []
+        self.errors: List[str] = []
+
+    def feed(self, delta: str) -> List[Any]:
+        """델타 추가 후 이번에 완성된 요소 반환"""
+        if self.done or not delta:
+            return []
+        self._text += delta
+        completed = []
+        text = self._text
+
+        while self._position < len(text) and not self.done:
+            char = text[self._position]
+            if not self.started:
+                if char == "[":
+                    self.started = True
+                    self._depth = 1
+            elif self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 2:
+                    self._element_start = self._position
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._element_start is not None:
+                    element_text = text[self._element_start:self._position + 1]
+                    self._element_start = None
+                    try:
+                        completed.append(json.loads(element_text))
+                    except ValueError as e:
+                        self.errors.append(str(e))
+                elif self._depth == 0:
+                    self.done = True
+            self._position += 1
+
+        self.items.extend(completed)
+        return completed
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+
+class IncrementalJSXParser:
+    """JSX 응답 스트림 → 코드 블록 추출 + 괄호 균형 추적 (닫는 괄호 초과는 도착 즉시 오류로 기록)"""
+
+    FENCE = "```"
+    _PAIRS = {"}": "{", ")": "(", "]": "["}
+
+    def __init__(self):
+        self._text = ""
+        self._code_start: Optional[int] = None
+        self._code_end: Optional[int] = None
+        self._scanned = 0
+        self._balance: Dict[str, int] = {"{": 0, "(": 0, "[": 0}
+        self.errors: List[str] = []
+
+    def feed(self, delta: str) -> bool:
+        """델타 추가 후 코드 블록 완료 여부 반환"""
+        if self.complete or not delta:
+            return self.complete
+        self._text += delta
+
+        if self._code_start is None:
+            fence = self._text.find(self.FENCE)
+            if fence == -1:
+                return False
+            line_end = self._text.find("\n", fence)
+            if line_end == -1:
+                # ```jsx 언어 태그 줄이 아직 다 오지 않음
+                return False
+            self._code_start = line_end + 1
+            self._scanned = self._code_start
+
+        fence = self._text.find(self.FENCE, self._code_start)
+        scan_end = fence if fence != -1 else max(self._scanned, len(self._text) - (len(self.FENCE) - 1))
+        self._track_balance(self._text[self._scanned:scan_end])
+        self._scanned = scan_end
+        if fence != -1:
+            self._code_end = fence
+        return self.complete
+
+    def _track_balance(self, chunk: str):
+        for char in chunk:
+            if char in self._balance:
+                self._balance[char] += 1
+            elif char in self._PAIRS:
+                opener = self._PAIRS[char]
+                self._balance[opener] -= 1
+                if self._balance[opener] < 0 and len(self.errors) < 10:
+                    self.errors.append(f"여는 괄호 없는 '{char}'")
+
+    @property
+    def complete(self) -> bool:
+        return self._code_end is not None
+
+    @property
+    def code(self) -> str:
+        """추출된 코드 (코드 블록이 없으면 전체 텍스트)"""
+        if self._code_start is None:
+            return self._text.strip()
+        end = self._code_end if self._code_end is not None else len(self._text)
+        return self._text[self._code_start:end].strip()
+
+    @property
+    def is_balanced(self) -> bool:
+        return all(count == 0 for count in self._balance.values())
+
+    @property
+    def text(self) -> str:
+        return self._text
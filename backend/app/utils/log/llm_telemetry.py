@@ -0,0 +1,199 @@
+"""
+LLM 호출 텔레메트리
+AzureOpenAILLM의 모든 호출(동기/비동기/스트리밍)마다 에이전트, 토큰(usage), 대기/네트워크 시간, 재시도, 헤지/타임아웃, 종료 사유를 기록하고
+에이전트별 · 매거진 작업별로 집계. 작업 ID는 contextvars로 전달 (SystemCoordinator가 작업 시작 시 설정)
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+
+load_dotenv()
+
+# 1K 토큰당 USD (기본값은 gpt-4o 공시 단가, 배포에 맞게 재정의)
+LLM_PROMPT_PRICE_PER_1K = float(os.getenv("LLM_PROMPT_PRICE_PER_1K", "0.0025"))
+LLM_COMPLETION_PRICE_PER_1K = float(os.getenv("LLM_COMPLETION_PRICE_PER_1K", "0.01"))
+# 메모리에 보관할 최근 작업 수 / 작업별 최근 호출 기록 수
+LLM_TELEMETRY_MAX_JOBS = int(os.getenv("LLM_TELEMETRY_MAX_JOBS", "100"))
+LLM_TELEMETRY_RECENT_CALLS = int(os.getenv("LLM_TELEMETRY_RECENT_CALLS", "50"))
+
+_current_job: ContextVar[Optional[str]] = ContextVar("llm_telemetry_job", default=None)
+
+
+@contextmanager
+def llm_job_context(job_id: str) -> Iterator[None]:
+    """이 블록에서 (그리고 여기서 만든 태스크/to_thread에서) 발생한 LLM 호출을 job_id로 집계"""
+    token = _current_job.set(job_id)
+    try:
+        yield
+    finally:
+        _current_job.reset(token)
+
+
+def current_llm_job() -> Optional[str]:
+    return _current_job.get()
+
+
+@dataclass
+class LLMCallRecord:
+    """LLM 호출 1건 (재시도와 함수 호출 후속 요청 포함)"""
+    agent_name: str
+    deployment: str
+    mode: str  # sync / async / stream
+    job_id: Optional[str] = field(default_factory=current_llm_job)
+    started_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    usage_estimated: bool = False
+    queue_wait_ms: float = 0.0
+    network_ms: float = 0.0
+    ttft_ms: Optional[float] = None
+    retries: int = 0
+    requests: int = 0
+    finish_reason: Optional[str] = None
+    cached: bool = False
+    hedged: bool = False
+    timeouts: int = 0
+    success: bool = False
+    error: Optional[str] = None
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+    total_ms: float = 0.0
+
+    def add_usage(self, response):
+        """응답의 usage 누적 (함수 호출 후속 요청도 같은 기록에 합산)"""
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.prompt_tokens += getattr(usage, "prompt_tokens", 0) or 0
+            self.completion_tokens += getattr(usage, "completion_tokens", 0) or 0
+        choices = getattr(response, "choices", None)
+        if choices:
+            self.finish_reason = getattr(choices[0], "finish_reason", None) or self.finish_reason
+
+    @property
+    def cost_usd(self) -> float:
+        return (self.prompt_tokens * LLM_PROMPT_PRICE_PER_1K
+                + self.completion_tokens * LLM_COMPLETION_PRICE_PER_1K) / 1000
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data.pop("_started")
+        data["queue_wait_ms"] = round(self.queue_wait_ms, 1)
+        data["network_ms"] = round(self.network_ms, 1)
+        data["cost_usd"] = round(self.cost_usd, 6)
+        return data
+
+
+def _empty_aggregate() -> Dict:
+    return {"calls": 0, "failures": 0, "cached": 0, "hedged": 0, "timeouts": 0, "requests": 0, "retries": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+            "queue_wait_ms": 0.0, "network_ms": 0.0, "finish_reasons": {}}
+
+
+def _add_to_aggregate(aggregate: Dict, call: LLMCallRecord):
+    aggregate["calls"] += 1
+    aggregate["failures"] += 0 if call.success else 1
+    aggregate["cached"] += 1 if call.cached else 0
+    aggregate["hedged"] += 1 if call.hedged else 0
+    aggregate["timeouts"] += call.timeouts
+    aggregate["requests"] += call.requests
+    aggregate["retries"] += call.retries
+    aggregate["prompt_tokens"] += call.prompt_tokens
+    aggregate["completion_tokens"] += call.completion_tokens
+    aggregate["cost_usd"] += call.cost_usd
+    aggregate["queue_wait_ms"] += call.queue_wait_ms
+    aggregate["network_ms"] += call.network_ms
+    if call.finish_reason:
+        reasons = aggregate["finish_reasons"]
+        reasons[call.finish_reason] = reasons.get(call.finish_reason, 0) + 1
+
+
+def _finalize_aggregate(aggregate: Dict) -> Dict:
+    result = {**aggregate, "finish_reasons": dict(aggregate["finish_reasons"])}
+    requests = aggregate["requests"] or 1
+    result["cost_usd"] = round(aggregate["cost_usd"], 6)
+    result["queue_wait_ms"] = round(aggregate["queue_wait_ms"], 1)
+    result["network_ms"] = round(aggregate["network_ms"], 1)
+    result["avg_network_ms"] = round(aggregate["network_ms"] / requests, 1) if aggregate["requests"] else 0.0
+    result["total_tokens"] = aggregate["prompt_tokens"] + aggregate["completion_tokens"]
+    return result
+
+
+class LLMTelemetry:
+    """에이전트별 전체 집계 + 최근 작업별 집계 (스레드 안전)"""
+
+    def __init__(self, max_jobs: int = LLM_TELEMETRY_MAX_JOBS, recent_calls: int = LLM_TELEMETRY_RECENT_CALLS):
+        self.max_jobs = max_jobs
+        self.recent_calls = recent_calls
+        self._lock = threading.Lock()
+        self._agents: Dict[str, Dict] = {}
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def record(self, call: LLMCallRecord):
+        call.total_ms = round((time.perf_counter() - call._started) * 1000, 1)
+        with self._lock:
+            _add_to_aggregate(self._agents.setdefault(call.agent_name, _empty_aggregate()), call)
+            if call.job_id is None:
+                return
+            job = self._jobs.get(call.job_id)
+            if job is None:
+                job = {"started_at": call.started_at, "agents": {}, "totals": _empty_aggregate(),
+                       "recent_calls": deque(maxlen=self.recent_calls)}
+                self._jobs[call.job_id] = job
+                while len(self._jobs) > self.max_jobs:
+                    self._jobs.popitem(last=False)
+            job["updated_at"] = datetime.now().isoformat()
+            _add_to_aggregate(job["totals"], call)
+            _add_to_aggregate(job["agents"].setdefault(call.agent_name, _empty_aggregate()), call)
+            job["recent_calls"].append(call.to_dict())
+
+    def get_job_summary(self, job_id: str, include_calls: bool = False) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            summary = {
+                "job_id": job_id,
+                "started_at": job["started_at"],
+                "updated_at": job["updated_at"],
+                "totals": _finalize_aggregate(job["totals"]),
+                "agents": {name: _finalize_aggregate(aggregate) for name, aggregate in job["agents"].items()},
+            }
+            if include_calls:
+                summary["recent_calls"] = list(job["recent_calls"])
+        return summary
+
+    def get_summary(self) -> Dict:
+        totals = _empty_aggregate()
+        with self._lock:
+            agents = {name: _finalize_aggregate(aggregate) for name, aggregate in self._agents.items()}
+            jobs: List[str] = list(self._jobs)
+            for aggregate in self._agents.values():
+                for key in ("calls", "failures", "cached", "hedged", "timeouts", "requests", "retries", "prompt_tokens",
+                            "completion_tokens", "cost_usd", "queue_wait_ms", "network_ms"):
+                    totals[key] += aggregate[key]
+                for reason, count in aggregate["finish_reasons"].items():
+                    totals["finish_reasons"][reason] = totals["finish_reasons"].get(reason, 0) + count
+        return {"totals": _finalize_aggregate(totals), "agents": agents, "recent_jobs": jobs[::-1]}
+
+
+_telemetry_instance: Optional[LLMTelemetry] = None
+_telemetry_lock = threading.Lock()
+
+
+def get_llm_telemetry() -> LLMTelemetry:
+    """프로세스 공유 LLM 텔레메트리"""
+    global _telemetry_instance
+    if _telemetry_instance is None:
+        with _telemetry_lock:
+            if _telemetry_instance is None:
+                _telemetry_instance = LLMTelemetry()
+    return _telemetry_instance
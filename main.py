@@ -92,6 +92,25 @@ async def on_startup():
     except Exception as e:
         logger.warning(f"매거진 시스템 초기화 중 경고: {e}")
 
+    # 외부 의존성 백그라운드 상태 점검 (에이전트/API는 캐시된 상태 사용)
+    try:
+        from backend.app.utils.data.dependency_health import get_dependency_health_monitor
+        get_dependency_health_monitor().start()
+    except Exception as e:
+        logger.warning(f"의존성 상태 점검 시작 실패: {e}")
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """애플리케이션 종료 시 백그라운드 작업 정리"""
+    from backend.app.utils.data.dependency_health import get_dependency_health_monitor
+    await get_dependency_health_monitor().stop()
+
+    from backend.app.custom_llm import close_shared_llm_clients
+    await close_shared_llm_clients()
+
+    from backend.app.utils.data.async_pdf_vector_manager import close_shared_async_clients
+    await close_shared_async_clients()
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000) 
\ No newline at end of file